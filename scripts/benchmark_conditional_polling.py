@@ -0,0 +1,110 @@
+"""
+Polling micro-benchmark for conditional requests against the messaging database.
+
+Simulates the database work of a poll of check_global_msg_status for a synthetic
+deposition, answered either in full (messages, statuses and summary loaded) or, as for a request
+whose If-None-Match header matches, from the data version of the deposition alone. Reports the
+CPU time of this process per poll for each.
+
+By default a temporary SQLite database is used; pass --db-url to run against e.g. a scratch
+MySQL schema (the synthetic deposition is removed afterwards).
+
+Example:
+    python benchmark_conditional_polling.py --messages 500 --polls 200
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert
+
+from wwpdb.apps.msgmodule.db.DataAccessLayer import DataAccessLayer
+from wwpdb.apps.msgmodule.db.Models import DepositionMessageSummary, MessageInfo, MessageStatus
+
+
+def _populate(dal, depId, numMessages):
+    startTime = datetime(2020, 1, 1)
+    contentTypes = ("messages-to-depositor", "messages-from-depositor", "notes-from-annotator")
+    rows = [
+        {
+            "message_id": "%s-BENCH-%06d" % (depId, i),
+            "deposition_data_set_id": depId,
+            "timestamp": startTime + timedelta(minutes=i),
+            "sender": "annotator@example.org",
+            "message_subject": "Synthetic message %d" % i,
+            "message_text": "Dear depositor,\n\n" + "Lorem ipsum dolor sit amet. " * 40,
+            "message_type": "text",
+            "send_status": "Y",
+            "content_type": contentTypes[i % 3],
+        }
+        for i in range(numMessages)
+    ]
+    statusRows = [
+        {"message_id": row["message_id"], "deposition_data_set_id": depId, "read_status": "Y", "action_reqd": "N", "for_release": "N"}
+        for row in rows
+        if row["content_type"] == "messages-from-depositor"
+    ]
+    with dal.db_connection.engine.begin() as conn:
+        for i in range(0, len(rows), 1000):
+            conn.execute(insert(MessageInfo.__table__), rows[i:i + 1000])
+        for i in range(0, len(statusRows), 1000):
+            conn.execute(insert(MessageStatus.__table__), statusRows[i:i + 1000])
+    dal.rebuild_deposition_summary(depId)
+
+
+def _timePolls(pollFn, numPolls):
+    pollFn()  # warm up (connection, statement compilation)
+    startTime = time.process_time()
+    for _i in range(numPolls):
+        pollFn()
+    return (time.process_time() - startTime) / numPolls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full versus conditional (304) poll micro-benchmark")
+    parser.add_argument("--messages", type=int, default=500, help="number of messages in the synthetic deposition")
+    parser.add_argument("--polls", type=int, default=200, help="number of polls timed per method")
+    parser.add_argument("--db-url", default=None, help="SQLAlchemy URL of a scratch database (default: temporary SQLite file)")
+    args = parser.parse_args()
+
+    workPath = None
+    dbUrl = args.db_url
+    if not dbUrl:
+        workPath = tempfile.mkdtemp(prefix="polling-bench-")
+        dbUrl = "sqlite:///%s" % os.path.join(workPath, "messaging.sqlite")
+
+    depId = "D_8000000001"
+    dal = DataAccessLayer({"url": dbUrl})
+    dal.create_tables()
+    try:
+        _populate(dal, depId, args.messages)
+
+        def fullPoll():
+            dal.get_deposition_version(depId)
+            messages = [dict(m) for m in dal.get_deposition_message_rows(depId)]
+            statuses = [dict(st) for st in dal.get_deposition_status_rows(depId)]
+            return messages, statuses, dal.get_deposition_summary(depId)
+
+        results = [
+            ("full", _timePolls(fullPoll, args.polls)),
+            ("304", _timePolls(lambda: dal.get_deposition_version(depId, include_statuses=True), args.polls)),
+        ]
+        print("%-6s %14s" % ("poll", "cpu_ms_per_poll"))
+        for name, cpuSeconds in results:
+            print("%-6s %14.3f" % (name, cpuSeconds * 1000.0))
+        print("cpu saved per unchanged poll %.0f%%" % (100.0 * (1.0 - results[1][1] / results[0][1])))
+    finally:
+        with dal.db_connection.engine.begin() as conn:
+            for model in (MessageStatus, MessageInfo, DepositionMessageSummary):
+                conn.execute(delete(model.__table__).where(model.deposition_data_set_id == depId))
+        dal.db_connection.engine.dispose()
+        if workPath:
+            os.remove(os.path.join(workPath, "messaging.sqlite"))
+            os.rmdir(workPath)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Contention benchmark for messaging file locks.
+
+Runs many concurrent writer processes which repeatedly lock a shared file, append a
+line to it and release the lock, and reports throughput and lock wait percentiles for
+the polling O_EXCL lock (mmcif_utils.persist.LockFile) and the flock based lock
+(wwpdb.apps.msgmodule.db.LockFile.FlockLockFile).
+
+Example:
+    python benchmark_lockfile.py --writers 16 --iterations 50 --hold-ms 2
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+
+def _getLockClass(name):
+    if name == "polling":
+        from mmcif_utils.persist.LockFile import LockFile
+        return LockFile
+    from wwpdb.apps.msgmodule.db.LockFile import FlockLockFile
+    return FlockLockFile
+
+
+def _writer(lockName, filePath, iterations, holdSeconds, retrySeconds, queue):
+    lockClass = _getLockClass(lockName)
+    waits = []
+    for _i in range(iterations):
+        startTime = time.perf_counter()
+        lock = lockClass(filePath, timeoutSeconds=600, retrySeconds=retrySeconds, verbose=False, log=sys.stderr)
+        lock.acquire()
+        waits.append(time.perf_counter() - startTime)
+        try:
+            with open(filePath, "a") as ofh:
+                ofh.write("%d\n" % os.getpid())
+            if holdSeconds:
+                time.sleep(holdSeconds)
+        finally:
+            lock.release()
+    queue.put(waits)
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    idx = min(len(values) - 1, max(0, int(round(pct / 100.0 * len(values) + 0.5)) - 1))
+    return values[idx]
+
+
+def runBenchmark(lockName, writers, iterations, holdSeconds, retrySeconds):
+    workPath = tempfile.mkdtemp(prefix="lock-bench-")
+    filePath = os.path.join(workPath, "D_000000_messages-to-depositor_P1.cif.V1")
+    open(filePath, "w").close()
+
+    queue = multiprocessing.Queue()
+    procs = [multiprocessing.Process(target=_writer, args=(lockName, filePath, iterations, holdSeconds, retrySeconds, queue)) for _i in range(writers)]
+    startTime = time.perf_counter()
+    for proc in procs:
+        proc.start()
+    waits = []
+    for _proc in procs:
+        waits.extend(queue.get())
+    for proc in procs:
+        proc.join()
+    elapsed = time.perf_counter() - startTime
+
+    with open(filePath) as ifh:
+        numLines = sum(1 for _line in ifh)
+    for fName in os.listdir(workPath):
+        os.remove(os.path.join(workPath, fName))
+    os.rmdir(workPath)
+    if numLines != writers * iterations:
+        raise RuntimeError("%s lock lost updates: %d of %d lines written" % (lockName, numLines, writers * iterations))
+
+    return {
+        "lock": lockName,
+        "operations": len(waits),
+        "elapsed_seconds": elapsed,
+        "throughput_per_second": len(waits) / elapsed,
+        "p50_wait_ms": 1000.0 * _percentile(waits, 50),
+        "p99_wait_ms": 1000.0 * _percentile(waits, 99),
+        "max_wait_ms": 1000.0 * max(waits),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Contention benchmark for messaging file locks")
+    parser.add_argument("--writers", type=int, default=16, help="number of concurrent writer processes")
+    parser.add_argument("--iterations", type=int, default=50, help="lock/append/release cycles per writer")
+    parser.add_argument("--hold-ms", type=float, default=2.0, help="time the lock is held per cycle (ms)")
+    parser.add_argument("--retry-seconds", type=float, default=0.2, help="retrySeconds passed to the locks")
+    parser.add_argument("--locks", nargs="+", choices=["polling", "flock"], default=["polling", "flock"], help="lock implementations to benchmark")
+    args = parser.parse_args()
+
+    print("%-8s %8s %10s %12s %10s %10s %10s" % ("lock", "ops", "elapsed_s", "ops_per_s", "p50_ms", "p99_ms", "max_ms"))
+    for lockName in args.locks:
+        r = runBenchmark(lockName, args.writers, args.iterations, args.hold_ms / 1000.0, args.retry_seconds)
+        print(
+            "%-8s %8d %10.2f %12.1f %10.1f %10.1f %10.1f"
+            % (r["lock"], r["operations"], r["elapsed_seconds"], r["throughput_per_second"], r["p50_wait_ms"], r["p99_wait_ms"], r["max_wait_ms"])
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Response encoding micro-benchmark for the WSGI layer.
+
+Builds a synthetic DataTables response (get_dtbl_data) for a deposition with the given number of
+messages and reports, for each serializer, the encode time and, for each content coding, the
+payload size and compression time:
+
+  dumps       -- json.dumps() of the whole document, as ResponseContent does
+  stream      -- standard library encoder producing the document in chunks (ResponseEncoding.iterJsonChunks)
+  orjson      -- orjson, if installed
+
+Example:
+    python benchmark_response_encoding.py --messages 2000 --repeat 5
+"""
+
+import argparse
+import json
+import random
+import time
+
+from wwpdb.apps.msgmodule.webapp.ResponseEncoding import compressChunks, iterJsonChunks, orjson
+
+
+_WORDS = (
+    "structure model validation report ligand geometry outlier chain residue sequence density map resolution "
+    "please review processed files deposition annotation citation author release hold coordinates restraint"
+).split()
+
+
+def _payload(numMessages):
+    rnd = random.Random(0)  # message bodies of varied text, for realistic compression ratios
+    return {
+        "sEcho": 1,
+        "iTotalRecords": numMessages,
+        "iTotalDisplayRecords": numMessages,
+        "sColumns": "ordinal_id,message_id,deposition_data_set_id,timestamp,sender,message_subject,message_text",
+        "aaData": [
+            {
+                "DT_RowId": "row_%d" % i,
+                "DT_RowClass": "dt_row",
+                "ordinal_id": str(i + 1),
+                "message_id": "1f2e3d4c-%08d-4b5a-9c8d-7e6f5a4b3c2d" % i,
+                "deposition_data_set_id": "D_8000000001",
+                "timestamp": "2026-10-18 10:%02d:00" % (i % 60),
+                "sender": "annotator@example.org",
+                "message_subject": "Your processed files are ready for your review (%d)" % i,
+                "message_text": "Dear depositor,\n\n" + " ".join(rnd.choice(_WORDS) for _j in range(250)),
+            }
+            for i in range(numMessages)
+        ],
+    }
+
+
+def _time(fn, repeat):
+    fn()
+    startTime = time.perf_counter()
+    for _i in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - startTime) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON serialization and compression micro-benchmark")
+    parser.add_argument("--messages", type=int, default=2000, help="number of messages in the synthetic response")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timed runs per measurement")
+    args = parser.parse_args()
+
+    obj = _payload(args.messages)
+    serializers = [
+        ("dumps", lambda: [json.dumps(obj).encode("utf-8")]),
+        ("stream", lambda: list(iterJsonChunks(obj, useFastSerializer=False))),
+    ]
+    if orjson is not None:
+        serializers.append(("orjson", lambda: list(iterJsonChunks(obj, useFastSerializer=True))))
+
+    print("%-8s %12s" % ("encoder", "encode_ms"))
+    body = None
+    for name, fn in serializers:
+        chunks, elapsed = _time(fn, args.repeat)
+        body = body or chunks
+        print("%-8s %12.1f" % (name, elapsed * 1000.0))
+
+    rawSize = sum(len(chunk) for chunk in body)
+    print("")
+    print("%-8s %12s %8s %12s" % ("coding", "bytes", "ratio", "compress_ms"))
+    print("%-8s %12d %8.2f %12.1f" % ("identity", rawSize, 1.0, 0.0))
+    for encoding in ("gzip", "deflate"):
+        for level in (1, 6):
+            compressed, elapsed = _time(lambda: b"".join(compressChunks(body, encoding, level)), args.repeat)  # pylint: disable=cell-var-from-loop
+            print("%-8s %12d %8.2f %12.1f" % ("%s-%d" % (encoding, level), len(compressed), float(rawSize) / len(compressed), elapsed * 1000.0))
+
+
+if __name__ == "__main__":
+    main()
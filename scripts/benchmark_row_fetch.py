@@ -0,0 +1,134 @@
+"""
+Read-path micro-benchmark for the messaging database.
+
+Loads the messages of a synthetic deposition the way PdbxMessageIo does (rows converted to
+plain dicts) through ORM entities (DataAccessLayer.get_deposition_messages) and through the
+read-only Core statements (DataAccessLayer.get_deposition_message_rows), and reports rows/sec
+for each.
+
+By default a temporary SQLite database is used; pass --db-url to run against e.g. a scratch
+MySQL schema (the synthetic deposition is removed afterwards).
+
+Example:
+    python benchmark_row_fetch.py --messages 5000 --repeat 10
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert
+
+from wwpdb.apps.msgmodule.db.DataAccessLayer import DataAccessLayer
+from wwpdb.apps.msgmodule.db.Models import MessageInfo
+
+
+def _populate(dal, depId, numMessages):
+    startTime = datetime(2020, 1, 1)
+    rows = [
+        {
+            "message_id": "%s-BENCH-%06d" % (depId, i),
+            "deposition_data_set_id": depId,
+            "timestamp": startTime + timedelta(minutes=i),
+            "sender": "annotator@example.org",
+            "context_type": None,
+            "context_value": None,
+            "parent_message_id": None,
+            "message_subject": "Synthetic message %d" % i,
+            "message_text": "Dear depositor,\n\n" + "Lorem ipsum dolor sit amet. " * 40,
+            "message_type": "text",
+            "send_status": "Y",
+            "content_type": ("messages-to-depositor", "messages-from-depositor", "notes-from-annotator")[i % 3],
+        }
+        for i in range(numMessages)
+    ]
+    with dal.db_connection.engine.begin() as conn:
+        for i in range(0, len(rows), 1000):
+            conn.execute(insert(MessageInfo.__table__), rows[i:i + 1000])
+
+
+def _toDict(m):
+    return {
+        "ordinal_id": m.ordinal_id,
+        "message_id": m.message_id,
+        "deposition_data_set_id": m.deposition_data_set_id,
+        "timestamp": m.timestamp,
+        "sender": m.sender,
+        "context_type": m.context_type,
+        "context_value": m.context_value,
+        "parent_message_id": m.parent_message_id,
+        "message_subject": m.message_subject,
+        "message_text": m.message_text,
+        "message_type": m.message_type,
+        "send_status": m.send_status,
+        "content_type": m.content_type,
+    }
+
+
+def _rowToDict(m):
+    return {
+        "ordinal_id": m["ordinal_id"],
+        "message_id": m["message_id"],
+        "deposition_data_set_id": m["deposition_data_set_id"],
+        "timestamp": m["timestamp"],
+        "sender": m["sender"],
+        "context_type": m["context_type"],
+        "context_value": m["context_value"],
+        "parent_message_id": m["parent_message_id"],
+        "message_subject": m["message_subject"],
+        "message_text": m["message_text"],
+        "message_type": m["message_type"],
+        "send_status": m["send_status"],
+        "content_type": m["content_type"],
+    }
+
+
+def _timeLoads(loadFn, repeat):
+    loadFn()  # warm up (connection, statement compilation)
+    numRows = 0
+    startTime = time.perf_counter()
+    for _i in range(repeat):
+        numRows += len(loadFn())
+    return numRows, time.perf_counter() - startTime
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ORM versus Core read-path micro-benchmark")
+    parser.add_argument("--messages", type=int, default=5000, help="number of messages in the synthetic deposition")
+    parser.add_argument("--repeat", type=int, default=10, help="number of full loads timed per method")
+    parser.add_argument("--db-url", default=None, help="SQLAlchemy URL of a scratch database (default: temporary SQLite file)")
+    args = parser.parse_args()
+
+    workPath = None
+    dbUrl = args.db_url
+    if not dbUrl:
+        workPath = tempfile.mkdtemp(prefix="row-fetch-bench-")
+        dbUrl = "sqlite:///%s" % os.path.join(workPath, "messaging.sqlite")
+
+    depId = "D_8000000001"
+    dal = DataAccessLayer({"url": dbUrl})
+    dal.create_tables()
+    try:
+        _populate(dal, depId, args.messages)
+
+        results = [
+            ("orm", _timeLoads(lambda: [_toDict(m) for m in dal.get_deposition_messages(depId)], args.repeat)),
+            ("core", _timeLoads(lambda: [_rowToDict(m) for m in dal.get_deposition_message_rows(depId)], args.repeat)),
+        ]
+        print("%-6s %10s %10s %12s" % ("method", "rows", "elapsed_s", "rows_per_s"))
+        for name, (numRows, elapsed) in results:
+            print("%-6s %10d %10.2f %12.0f" % (name, numRows, elapsed, numRows / elapsed))
+        print("speedup %.1fx" % ((results[1][1][0] / results[1][1][1]) / (results[0][1][0] / results[0][1][1])))
+    finally:
+        with dal.db_connection.engine.begin() as conn:
+            conn.execute(delete(MessageInfo.__table__).where(MessageInfo.deposition_data_set_id == depId))
+        dal.db_connection.engine.dispose()
+        if workPath:
+            os.remove(os.path.join(workPath, "messaging.sqlite"))
+            os.rmdir(workPath)
+
+
+if __name__ == "__main__":
+    main()
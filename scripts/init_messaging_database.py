@@ -139,9 +139,16 @@ def get_create_table_statements():
             content_type ENUM('messages-to-depositor', 'messages-from-depositor', 'notes-from-annotator') NOT NULL,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            thread_root_id VARCHAR(64),
+            thread_depth INT,
+            thread_path VARCHAR(512),
             
             INDEX idx_deposition_id (deposition_data_set_id),
             INDEX idx_message_id (message_id),
+            INDEX idx_thread_root_id (thread_root_id),
+            INDEX idx_deposition_thread_path (deposition_data_set_id, thread_path),
+            INDEX idx_deposition_content_timestamp (deposition_data_set_id, content_type, timestamp),
+            INDEX idx_deposition_updated_at (deposition_data_set_id, updated_at),
             INDEX idx_timestamp (timestamp),
             INDEX idx_sender (sender),
             INDEX idx_context_type (context_type),
@@ -196,12 +203,62 @@ def get_create_table_statements():
             INDEX idx_read_status (read_status),
             INDEX idx_action_reqd (action_reqd),
             INDEX idx_for_release (for_release),
+            INDEX idx_status_deposition_flags (deposition_data_set_id, read_status, action_reqd, for_release),
             
             FOREIGN KEY (message_id) REFERENCES pdbx_deposition_message_info(message_id) ON DELETE CASCADE
         ) ENGINE=InnoDB CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci
     """
     )
 
+    # Per-deposition summary - derived data, maintained on every write (see db/DepositionSummary.py)
+    statements.append(
+        """
+        CREATE TABLE IF NOT EXISTS deposition_message_summary (
+            deposition_data_set_id VARCHAR(50) PRIMARY KEY,
+            num_messages_to_depositor INT NOT NULL DEFAULT 0,
+            num_messages_from_depositor INT NOT NULL DEFAULT 0,
+            num_notes INT NOT NULL DEFAULT 0,
+            num_annotator_notes INT NOT NULL DEFAULT 0,
+            num_flagged_notes INT NOT NULL DEFAULT 0,
+            num_unread INT NOT NULL DEFAULT 0,
+            num_unactioned INT NOT NULL DEFAULT 0,
+            num_for_release INT NOT NULL DEFAULT 0,
+            num_without_status INT NOT NULL DEFAULT 0,
+            last_sent_at DATETIME NULL,
+            last_received_at DATETIME NULL,
+            last_auto_reminder_at DATETIME NULL,
+            last_manual_reminder_at DATETIME NULL,
+            last_release_notice_at DATETIME NULL,
+            last_unlock_at DATETIME NULL,
+            last_validation_at DATETIME NULL,
+            last_validation_major BOOLEAN NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci
+    """
+    )
+
+    # Background jobs of message submissions (see util/JobRunner.py)
+    statements.append(
+        """
+        CREATE TABLE IF NOT EXISTS msgmodule_job (
+            job_id VARCHAR(36) PRIMARY KEY,
+            job_type VARCHAR(32) NOT NULL,
+            idempotency_key VARCHAR(128) NULL,
+            deposition_data_set_id VARCHAR(50) NULL,
+            status VARCHAR(16) NOT NULL DEFAULT 'queued',
+            payload LONGTEXT NOT NULL,
+            result LONGTEXT NULL,
+            error TEXT NULL,
+            created_at DATETIME NOT NULL,
+            started_at DATETIME NULL,
+            finished_at DATETIME NULL,
+            UNIQUE KEY uq_job_idempotency_key (deposition_data_set_id, job_type, idempotency_key),
+            INDEX idx_job_deposition (deposition_data_set_id),
+            INDEX idx_job_status_created (status, created_at)
+        ) ENGINE=InnoDB CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci
+    """
+    )
+
     return statements
 
 
@@ -240,6 +297,8 @@ def verify_tables(config):
             "pdbx_deposition_message_info",
             "pdbx_deposition_message_file_reference",
             "pdbx_deposition_message_status",
+            "deposition_message_summary",
+            "msgmodule_job",
         ]
 
         cursor.execute("SHOW TABLES")
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""
+Bring the messaging database schema up to date and report query plans.
+
+Applies the versioned migrations of wwpdb.apps.msgmodule.db.SchemaMigrations which the database
+has not seen yet. Migrations check the live schema before each change, so this is safe to run on
+databases created by init_messaging_database.py, by DataAccessLayer.create_tables() or by earlier
+versions of this script.
+
+Examples:
+    # Show current schema version and pending migrations
+    python migrate_messaging_schema.py --site-id RCSB --status
+
+    # Apply pending migrations
+    python migrate_messaging_schema.py --site-id RCSB
+
+    # Query plans of the DAO statements for a deposition
+    python migrate_messaging_schema.py --site-id RCSB --explain D_1000000001
+
+    # Against a local SQLite stand-in
+    python migrate_messaging_schema.py --db-url sqlite:///messaging.sqlite --explain D_1000000001
+"""
+
+import argparse
+import json
+import logging
+import sys
+
+from wwpdb.apps.msgmodule.db.DataAccessLayer import DataAccessLayer
+from wwpdb.apps.msgmodule.db.PdbxMessageIo import get_db_config
+from wwpdb.apps.msgmodule.db.QueryPlans import format_query_plan_report, get_query_plan_report
+from wwpdb.apps.msgmodule.db.SchemaMigrations import LATEST_VERSION, get_pending_migrations, get_schema_version, migrate
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply messaging database schema migrations")
+    parser.add_argument("--site-id", help="Site ID for ConfigInfo database configuration (e.g., RCSB, PDBe, PDBj, BMRB)")
+    parser.add_argument("--db-url", help="SQLAlchemy database URL (overrides --site-id)")
+    parser.add_argument("--status", action="store_true", help="Only report the schema version and pending migrations")
+    parser.add_argument("--dry-run", action="store_true", help="List the migrations which would be applied")
+    parser.add_argument("--target-version", type=int, help="Migrate up to this version (default: latest)")
+    parser.add_argument("--explain", metavar="DEPOSITION_ID", help="Report query plans of the DAO statements for this deposition (after migrating)")
+    parser.add_argument("--message-id", default="", help="Sample message ID for --explain")
+    parser.add_argument("--json", action="store_true", help="Write the --explain report as JSON")
+    args = parser.parse_args()
+
+    if args.db_url:
+        dal = DataAccessLayer({"url": args.db_url})
+    elif args.site_id:
+        dal = DataAccessLayer(get_db_config(args.site_id))
+    else:
+        parser.error("one of --site-id or --db-url is required")
+    engine = dal.db_connection.engine
+
+    try:
+        current = get_schema_version(engine)
+        logger.info("Schema version %d (latest %d)", current, LATEST_VERSION)
+        if args.status:
+            for migration in get_pending_migrations(engine, args.target_version):
+                logger.info("Pending migration %d: %s", migration.version, migration.description)
+        else:
+            applied = migrate(engine, target_version=args.target_version, dry_run=args.dry_run)
+            for migration in applied:
+                logger.info("%s migration %d: %s", "Would apply" if args.dry_run else "Applied", migration.version, migration.description)
+            if not applied:
+                logger.info("Schema is up to date")
+
+        if args.explain:
+            report = get_query_plan_report(engine, args.explain, message_id=args.message_id)
+            if args.json:
+                json.dump(report, sys.stdout, indent=2)
+                sys.stdout.write("\n")
+            else:
+                sys.stdout.write(format_query_plan_report(report))
+    except Exception as e:  # pylint: disable=broad-except
+        logger.error("Schema migration failed: %s", e)
+        sys.exit(1)
+    finally:
+        dal.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+"""
+Populate and check the per-deposition message summaries of the messaging database.
+
+The deposition_message_summary row of a deposition is recomputed whenever its messages, file
+references or statuses are written through the data access layer. Rows are missing for messages
+stored before the table was added (schema migration 5), and drift if the messaging tables are
+changed by other means (SQL run by hand, restores) - run this script after such changes.
+
+Examples:
+    # Report depositions whose summary is missing or out of date
+    python rebuild_message_summaries.py --site-id RCSB --check
+
+    # Recompute the summaries of all depositions
+    python rebuild_message_summaries.py --site-id RCSB
+
+    # Single deposition, without writing
+    python rebuild_message_summaries.py --site-id RCSB --deposition D_1000000001 --dry-run
+"""
+
+import argparse
+import logging
+import sys
+
+from wwpdb.apps.msgmodule.db.DataAccessLayer import DataAccessLayer
+from wwpdb.apps.msgmodule.db.PdbxMessageIo import get_db_config
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild or check the per-deposition message summaries")
+    parser.add_argument("--site-id", help="Site ID for ConfigInfo database configuration (e.g., RCSB, PDBe, PDBj, BMRB)")
+    parser.add_argument("--db-url", help="SQLAlchemy database URL (overrides --site-id)")
+    parser.add_argument("--deposition", action="append", help="Deposition ID to process (repeatable, default: all depositions)")
+    parser.add_argument("--check", action="store_true", help="Only report out of date summaries, exit status 1 if any are found")
+    parser.add_argument("--dry-run", action="store_true", help="Count the summaries which would be rewritten without writing")
+    args = parser.parse_args()
+
+    if args.db_url:
+        dal = DataAccessLayer({"url": args.db_url})
+    elif args.site_id:
+        dal = DataAccessLayer(get_db_config(args.site_id))
+    else:
+        parser.error("one of --site-id or --db-url is required")
+
+    # depositions with a summary row but no messages left have their row removed
+    depositionIds = args.deposition or sorted(set(dal.get_message_deposition_ids()) | set(dal.get_summary_deposition_ids()))
+    logger.info("Processing %d deposition(s)", len(depositionIds))
+
+    numProblemDeps = 0
+    numRebuilt = 0
+    try:
+        for depId in depositionIds:
+            if args.check:
+                problems = dal.check_deposition_summary(depId)
+                if problems:
+                    numProblemDeps += 1
+                    logger.warning("%s: summary out of date", depId)
+                    for problem in problems:
+                        logger.warning("  %s", problem)
+            elif dal.rebuild_deposition_summary(depId, dry_run=args.dry_run):
+                numRebuilt += 1
+                logger.info("%s: %s summary", depId, "would rewrite" if args.dry_run else "rewrote")
+    finally:
+        dal.close()
+
+    if args.check:
+        logger.info("%d of %d deposition(s) with out of date summaries", numProblemDeps, len(depositionIds))
+        sys.exit(1 if numProblemDeps else 0)
+    logger.info("%s %d of %d summaries", "Would rewrite" if args.dry_run else "Rewrote", numRebuilt, len(depositionIds))
+
+
+if __name__ == "__main__":
+    main()
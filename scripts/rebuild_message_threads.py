@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""
+Backfill and check the materialized thread columns of the messaging database.
+
+New messages get thread_root_id, thread_depth and thread_path when they are stored. Messages
+loaded by migrate_cif_to_db.py (which stores one content type at a time, so replies may be
+stored before the message they reply to) or stored before the columns were added need them
+computed from the parent_message_id references - run this script after each migration run.
+
+Examples:
+    # Report depositions whose thread columns are missing or inconsistent
+    python rebuild_message_threads.py --site-id RCSB --check
+
+    # Recompute the thread columns of all depositions
+    python rebuild_message_threads.py --site-id RCSB
+
+    # Single deposition, without writing
+    python rebuild_message_threads.py --site-id RCSB --deposition D_1000000001 --dry-run
+"""
+
+import argparse
+import logging
+import sys
+
+from wwpdb.apps.msgmodule.db.DataAccessLayer import DataAccessLayer
+from wwpdb.apps.msgmodule.db.PdbxMessageIo import get_db_config
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill or check the thread columns of stored messages")
+    parser.add_argument("--site-id", help="Site ID for ConfigInfo database configuration (e.g., RCSB, PDBe, PDBj, BMRB)")
+    parser.add_argument("--db-url", help="SQLAlchemy database URL (overrides --site-id)")
+    parser.add_argument("--deposition", action="append", help="Deposition ID to process (repeatable, default: all depositions)")
+    parser.add_argument("--check", action="store_true", help="Only report inconsistent thread columns, exit status 1 if any are found")
+    parser.add_argument("--dry-run", action="store_true", help="Count the messages which would be updated without writing")
+    args = parser.parse_args()
+
+    if args.db_url:
+        dal = DataAccessLayer({"url": args.db_url})
+    elif args.site_id:
+        dal = DataAccessLayer(get_db_config(args.site_id))
+    else:
+        parser.error("one of --site-id or --db-url is required")
+
+    depositionIds = args.deposition or dal.get_message_deposition_ids()
+    logger.info("Processing %d deposition(s)", len(depositionIds))
+
+    numProblemDeps = 0
+    numUpdated = 0
+    try:
+        for depId in depositionIds:
+            if args.check:
+                problems = dal.check_deposition_threads(depId)
+                if problems:
+                    numProblemDeps += 1
+                    logger.warning("%s: %d inconsistent message(s)", depId, len(problems))
+                    for problem in problems:
+                        logger.warning("  %s", problem)
+            else:
+                numChanged = dal.rebuild_deposition_threads(depId, dry_run=args.dry_run)
+                numUpdated += numChanged
+                if numChanged:
+                    logger.info("%s: %s thread columns of %d message(s)", depId, "would update" if args.dry_run else "updated", numChanged)
+    finally:
+        dal.close()
+
+    if args.check:
+        logger.info("%d of %d deposition(s) with inconsistent thread columns", numProblemDeps, len(depositionIds))
+        sys.exit(1 if numProblemDeps else 0)
+    logger.info("%s thread columns of %d message(s)", "Would update" if args.dry_run else "Updated", numUpdated)
+
+
+if __name__ == "__main__":
+    main()
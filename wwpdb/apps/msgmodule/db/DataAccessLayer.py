@@ -8,18 +8,157 @@ inheritance and polymorphism for clean, maintainable code.
 import logging
 import time
 import threading
-from typing import Dict, List, Optional, Type, TypeVar, Generic
-from sqlalchemy import create_engine, text
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Type, TypeVar, Generic
+from sqlalchemy import create_engine, text, select, func, bindparam, update, exists, or_, case, insert
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.exc import SQLAlchemyError, OperationalError
-
-from wwpdb.apps.msgmodule.db.Models import Base, MessageInfo, MessageFileReference, MessageStatus
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.exc import SQLAlchemyError, OperationalError, IntegrityError
+
+from wwpdb.apps.msgmodule.db.Models import Base, MessageInfo, MessageFileReference, MessageStatus, DepositionMessageSummary, MessageJob
+from wwpdb.apps.msgmodule.db.LockManager import DbLock, LockManager
+from wwpdb.apps.msgmodule.db.MessageThreads import child_thread_columns, compute_thread_columns, is_thread_root
+from wwpdb.apps.msgmodule.db.DepositionSummary import (  # pylint: disable=protected-access
+    _VALIDATION_LETTER_SUBJECT,
+    compute_deposition_summary,
+    diff_summary,
+    get_stored_summary,
+    get_summary_deposition_ids,
+    has_summary_table,
+    refresh_deposition_summary,
+    store_summary,
+)
 
 logger = logging.getLogger(__name__)
 
 # Generic type for SQLAlchemy models
 ModelType = TypeVar('ModelType', bound=Base)
 
+# Read-only Core statements for the per-deposition loads. They return plain rows without ORM
+# hydration or identity-map tracking; being built once here, the engine compiles each only once
+# per process and reuses the compiled form from its statement cache.
+_MESSAGE_TABLE = MessageInfo.__table__
+_FILE_REFERENCE_TABLE = MessageFileReference.__table__
+_STATUS_TABLE = MessageStatus.__table__
+_MESSAGE_ROWS_STMT = select(_MESSAGE_TABLE).where(
+    _MESSAGE_TABLE.c.deposition_data_set_id == bindparam("deposition_id")
+).order_by(_MESSAGE_TABLE.c.ordinal_id)
+_MESSAGE_ROWS_BY_CONTENT_TYPE_STMT = select(_MESSAGE_TABLE).where(
+    _MESSAGE_TABLE.c.deposition_data_set_id == bindparam("deposition_id"), _MESSAGE_TABLE.c.content_type == bindparam("content_type")
+).order_by(_MESSAGE_TABLE.c.ordinal_id)
+_FILE_REFERENCE_ROWS_STMT = select(_FILE_REFERENCE_TABLE).where(
+    _FILE_REFERENCE_TABLE.c.deposition_data_set_id == bindparam("deposition_id")
+).order_by(_FILE_REFERENCE_TABLE.c.ordinal_id)
+_STATUS_ROWS_STMT = select(_STATUS_TABLE).where(_STATUS_TABLE.c.deposition_data_set_id == bindparam("deposition_id"))
+# flag counts make the stamp change with any status change, also within the (one second) resolution of updated_at
+_STATUS_VERSION_STMT = select(
+    func.count(),
+    func.sum(case((_STATUS_TABLE.c.read_status == "Y", 1), else_=0)),
+    func.sum(case((_STATUS_TABLE.c.action_reqd == "Y", 1), else_=0)),
+    func.sum(case((_STATUS_TABLE.c.for_release == "Y", 1), else_=0)),
+    func.max(_STATUS_TABLE.c.updated_at),
+).where(_STATUS_TABLE.c.deposition_data_set_id == bindparam("deposition_id"))
+_THREAD_ROWS_STMT = select(
+    _MESSAGE_TABLE.c.ordinal_id, _MESSAGE_TABLE.c.message_id, _MESSAGE_TABLE.c.parent_message_id, _MESSAGE_TABLE.c.timestamp,
+    _MESSAGE_TABLE.c.thread_root_id, _MESSAGE_TABLE.c.thread_depth, _MESSAGE_TABLE.c.thread_path,
+).where(
+    _MESSAGE_TABLE.c.deposition_data_set_id == bindparam("deposition_id")
+).order_by(_MESSAGE_TABLE.c.thread_path, _MESSAGE_TABLE.c.ordinal_id)
+_THREAD_PARENT_STMT = select(_MESSAGE_TABLE.c.thread_root_id, _MESSAGE_TABLE.c.thread_depth, _MESSAGE_TABLE.c.thread_path).where(
+    _MESSAGE_TABLE.c.message_id == bindparam("message_id"), _MESSAGE_TABLE.c.deposition_data_set_id == bindparam("deposition_id")
+)
+_MESSAGE_COUNT_STMT = select(func.count()).select_from(_MESSAGE_TABLE).where(_MESSAGE_TABLE.c.deposition_data_set_id == bindparam("deposition_id"))
+_MESSAGE_COUNT_BY_CONTENT_TYPE_STMT = _MESSAGE_COUNT_STMT.where(_MESSAGE_TABLE.c.content_type == bindparam("content_type"))
+_MESSAGE_VERSION_STMT = select(func.count(), func.max(_MESSAGE_TABLE.c.ordinal_id), func.max(_MESSAGE_TABLE.c.updated_at)).where(
+    _MESSAGE_TABLE.c.deposition_data_set_id == bindparam("deposition_id")
+)
+_DEPOSITION_IDS_STMT = select(_MESSAGE_TABLE.c.deposition_data_set_id).distinct().order_by(_MESSAGE_TABLE.c.deposition_data_set_id)
+_FILE_REFERENCE_COUNT_STMT = select(func.count()).select_from(_FILE_REFERENCE_TABLE).where(
+    _FILE_REFERENCE_TABLE.c.deposition_data_set_id == bindparam("deposition_id")
+)
+_STATUS_LOOKUP_STMT = select(
+    _MESSAGE_TABLE.c.message_id, _STATUS_TABLE.c.message_id, _STATUS_TABLE.c.read_status, _STATUS_TABLE.c.action_reqd, _STATUS_TABLE.c.for_release
+).outerjoin(
+    _STATUS_TABLE, _STATUS_TABLE.c.message_id == _MESSAGE_TABLE.c.message_id
+).where(
+    _MESSAGE_TABLE.c.deposition_data_set_id == bindparam("deposition_id"), _MESSAGE_TABLE.c.message_id.in_(bindparam("message_ids", expanding=True))
+)
+_UPDATE_THREAD_COLUMNS_STMT = update(_MESSAGE_TABLE).where(_MESSAGE_TABLE.c.message_id == bindparam("b_message_id")).values(
+    thread_root_id=bindparam("b_thread_root_id"),
+    thread_depth=bindparam("b_thread_depth"),
+    thread_path=bindparam("b_thread_path"),
+    # keep updated_at - the thread columns are derived data
+    updated_at=_MESSAGE_TABLE.c.updated_at,
+)
+
+# Grouped statements answering one question for many depositions at once (see MessageDAO.get_last_sent_dates() and
+# friends); deposition_ids is expanded to an IN list, issued in chunks of _DEPOSITION_BATCH_SIZE
+_DEPOSITION_BATCH_SIZE = 500
+_LAST_SENT_DATES_STMT = select(_MESSAGE_TABLE.c.deposition_data_set_id, func.max(_MESSAGE_TABLE.c.timestamp)).where(
+    _MESSAGE_TABLE.c.deposition_data_set_id.in_(bindparam("deposition_ids", expanding=True)),
+    _MESSAGE_TABLE.c.content_type == bindparam("content_type"),
+    _MESSAGE_TABLE.c.send_status == "Y",
+).group_by(_MESSAGE_TABLE.c.deposition_data_set_id)
+_LAST_UNLOCK_ORDINALS = select(
+    _MESSAGE_TABLE.c.deposition_data_set_id, func.max(_MESSAGE_TABLE.c.ordinal_id).label("ordinal_id")
+).where(
+    _MESSAGE_TABLE.c.deposition_data_set_id.in_(bindparam("deposition_ids", expanding=True)),
+    _MESSAGE_TABLE.c.content_type == "messages-to-depositor",
+    or_(_MESSAGE_TABLE.c.context_type == "system-unlocked", _MESSAGE_TABLE.c.message_subject == "System Unlocked"),
+).group_by(_MESSAGE_TABLE.c.deposition_data_set_id).subquery()
+_LAST_UNLOCK_DATES_STMT = select(_MESSAGE_TABLE.c.deposition_data_set_id, _MESSAGE_TABLE.c.timestamp).join(
+    _LAST_UNLOCK_ORDINALS, _MESSAGE_TABLE.c.ordinal_id == _LAST_UNLOCK_ORDINALS.c.ordinal_id
+)
+_PENDING_FROM_DEPOSITOR_STMT = select(_MESSAGE_TABLE).where(
+    _MESSAGE_TABLE.c.deposition_data_set_id.in_(bindparam("deposition_ids", expanding=True)),
+    _MESSAGE_TABLE.c.content_type == "messages-from-depositor",
+    # no status record, or one requiring action
+    ~exists().where(_STATUS_TABLE.c.message_id == _MESSAGE_TABLE.c.message_id, func.coalesce(_STATUS_TABLE.c.action_reqd, "N") != "Y"),
+).order_by(_MESSAGE_TABLE.c.deposition_data_set_id, _MESSAGE_TABLE.c.ordinal_id)
+
+# Per-deposition statements answering the date getters of ExtractMessage in SQL, on typed columns. Subject
+# phrases are matched with LIKE here and confirmed by the caller, as the case sensitivity of LIKE depends on
+# the collation
+_LAST_MESSAGE_BY_CONTEXT_TYPE_STMT = select(_MESSAGE_TABLE.c.timestamp, _MESSAGE_TABLE.c.context_value).where(
+    _MESSAGE_TABLE.c.deposition_data_set_id == bindparam("deposition_id"),
+    _MESSAGE_TABLE.c.content_type == bindparam("content_type"),
+    _MESSAGE_TABLE.c.context_type.in_(bindparam("context_types", expanding=True)),
+).order_by(_MESSAGE_TABLE.c.ordinal_id.desc()).limit(1)
+_MESSAGES_BY_SUBJECT_STMT = select(_MESSAGE_TABLE.c.timestamp, _MESSAGE_TABLE.c.message_subject).where(
+    _MESSAGE_TABLE.c.deposition_data_set_id == bindparam("deposition_id"),
+    _MESSAGE_TABLE.c.content_type == bindparam("content_type"),
+    _MESSAGE_TABLE.c.message_subject.like(bindparam("subject_pattern"), escape="\\"),
+).order_by(_MESSAGE_TABLE.c.ordinal_id.desc())
+_VALIDATION_LETTERS_STMT = select(_MESSAGE_TABLE.c.timestamp, _MESSAGE_TABLE.c.message_subject, _MESSAGE_TABLE.c.message_text).where(
+    _MESSAGE_TABLE.c.deposition_data_set_id == bindparam("deposition_id"),
+    _MESSAGE_TABLE.c.content_type == "messages-to-depositor",
+    _MESSAGE_TABLE.c.send_status == "Y",
+    _MESSAGE_TABLE.c.timestamp.isnot(None),
+    func.lower(_MESSAGE_TABLE.c.message_subject).like("%processed files are ready for your review%"),
+    _MESSAGE_TABLE.c.message_id.in_(
+        select(_FILE_REFERENCE_TABLE.c.message_id).where(
+            _FILE_REFERENCE_TABLE.c.deposition_data_set_id == bindparam("deposition_id"),
+            _FILE_REFERENCE_TABLE.c.content_type.like("%validation-report-annotate%"),
+        )
+    ),
+    # latest first, the earliest of equal timestamps first
+).order_by(_MESSAGE_TABLE.c.timestamp.desc(), _MESSAGE_TABLE.c.ordinal_id)
+
+_JOB_TABLE = MessageJob.__table__
+_JOB_STMT = select(_JOB_TABLE).where(_JOB_TABLE.c.job_id == bindparam("job_id"))
+_JOB_BY_KEY_STMT = select(_JOB_TABLE).where(
+    _JOB_TABLE.c.idempotency_key == bindparam("idempotency_key"),
+    _JOB_TABLE.c.job_type == bindparam("job_type"),
+    _JOB_TABLE.c.deposition_data_set_id.is_not_distinct_from(bindparam("deposition_id")),
+)
+
+# Status flags which may be changed through MessageStatusDAO.bulk_upsert()
+STATUS_FLAGS = ("read_status", "action_reqd", "for_release")
+
 # Global engine cache - one engine per unique connection string
 # This ensures all PdbxMessageIo instances share the same connection pool
 _engine_cache = {}
@@ -42,6 +181,8 @@ def _get_or_create_engine(db_config: Dict):
             - password (str): Database password
             - charset (str, optional): Character set (default: 'utf8mb4')
             - pool_size (int, optional): Connection pool size (default: 3)
+            - url (str, optional): SQLAlchemy URL used instead of the MySQL settings above,
+              e.g. 'sqlite:///messaging.sqlite' for tests and benchmarks
 
     Returns:
         sqlalchemy.engine.Engine: Shared SQLAlchemy engine instance
@@ -52,15 +193,26 @@ def _get_or_create_engine(db_config: Dict):
         (vs default MySQL limit of 150).
     """
     # Create connection string for cache key
-    connection_string = (
-        f"mysql+pymysql://{db_config['username']}:{db_config['password']}"
-        f"@{db_config['host']}:{db_config['port']}/{db_config['database']}"
-        f"?charset={db_config.get('charset', 'utf8mb4')}"
-    )
+    if db_config.get('url'):
+        connection_string = db_config['url']
+    else:
+        connection_string = (
+            f"mysql+pymysql://{db_config['username']}:{db_config['password']}"
+            f"@{db_config['host']}:{db_config['port']}/{db_config['database']}"
+            f"?charset={db_config.get('charset', 'utf8mb4')}"
+        )
 
     # Thread-safe cache access
     with _engine_cache_lock:
-        if connection_string not in _engine_cache:
+        if connection_string not in _engine_cache and not connection_string.startswith("mysql"):
+            logger.info("Creating new shared engine for: %s", connection_string.split("@")[-1])
+            if connection_string in ("sqlite://", "sqlite:///:memory:"):
+                # a single connection, so that all sessions see the same in-memory database
+                engine = create_engine(connection_string, poolclass=StaticPool, connect_args={'check_same_thread': False})
+            else:
+                engine = create_engine(connection_string)
+            _engine_cache[connection_string] = engine
+        elif connection_string not in _engine_cache:
             logger.info("Creating new shared engine for: mysql+pymysql://%s:***@%s:%s/%s",
                         db_config['username'], db_config['host'],
                         db_config['port'], db_config['database'])
@@ -116,6 +268,8 @@ class DatabaseConnection:
         _engine: SQLAlchemy engine instance (shared across instances)
         _session_factory: SQLAlchemy session maker
         _is_shared_engine (bool): Flag indicating shared engine usage
+        deferred_summaries (Optional[set]): Depositions whose summary refresh is deferred,
+            None unless within DataAccessLayer.deferred_summary_refresh()
     """
 
     def __init__(self, db_config: Dict):
@@ -128,6 +282,7 @@ class DatabaseConnection:
         self._engine = None
         self._session_factory = None
         self._is_shared_engine = True  # Track that we're using a shared engine
+        self.deferred_summaries = None
         self._setup_database()
 
     def _setup_database(self):
@@ -159,6 +314,11 @@ class DatabaseConnection:
                          self.db_config.get('database'), self.db_config.get('username'))
             raise
 
+    @property
+    def engine(self):
+        """SQLAlchemy engine (shared across instances) used by this connection."""
+        return self._engine
+
     def get_session(self) -> Session:
         """Get a new database session.
 
@@ -255,6 +415,7 @@ class BaseDAO(Generic[ModelType]):
                     #     pass  # Ignore if we can't set it
 
                     session.add(obj)
+                    self._before_commit(session, obj)
                     session.commit()
                     logger.info("Created %s record", self.model_class.__name__)
                     return True
@@ -293,6 +454,52 @@ class BaseDAO(Generic[ModelType]):
                 return False
         return False
 
+    def _before_commit(self, session: Session, obj: ModelType) -> None:
+        """Hook for derived values, called by create() within the inserting session before commit.
+
+        Refreshes the summary of the object's deposition in the same transaction.
+
+        Args:
+            session (Session): Session holding the new (not yet flushed) object
+            obj (ModelType): Object being created
+        """
+        self._refresh_summary(session, obj.deposition_data_set_id)
+
+    def _refresh_summary(self, session: Session, deposition_id: str) -> None:
+        """Flush pending changes and recompute the deposition summary within the session's transaction.
+
+        Within DataAccessLayer.deferred_summary_refresh() the deposition is only noted, to be
+        refreshed once after the last write.
+
+        Args:
+            session (Session): Session of the writing transaction
+            deposition_id (str): Deposition whose messaging data changed
+        """
+        deferred = self.db_connection.deferred_summaries
+        if deferred is not None:
+            if deposition_id:
+                deferred.add(deposition_id)
+            return
+        session.flush()
+        refresh_deposition_summary(session.connection(), deposition_id)
+
+    def _fetch_rows(self, stmt, params: Dict) -> List:
+        """Execute a read-only Core statement and return its rows as mappings.
+
+        Args:
+            stmt: Core select statement
+            params (Dict): Bound parameter values
+
+        Returns:
+            List[RowMapping]: Read-only column name -> value mappings
+
+        Raises:
+            SQLAlchemyError: If the query fails - unlike the ORM getters, an incomplete
+                history is not silently returned as empty
+        """
+        with self.db_connection.engine.connect() as conn:
+            return conn.execute(stmt, params).mappings().all()
+
     def get_by_id(self, record_id: str, id_field: str = 'ordinal_id') -> Optional[ModelType]:
         """Get record by ID.
 
@@ -336,7 +543,8 @@ class BaseDAO(Generic[ModelType]):
         """
         try:
             with self.db_connection.get_session() as session:
-                session.merge(obj)
+                merged = session.merge(obj)
+                self._refresh_summary(session, getattr(merged, "deposition_data_set_id", None))
                 session.commit()
                 logger.info("Updated %s record", self.model_class.__name__)
                 return True
@@ -361,6 +569,7 @@ class BaseDAO(Generic[ModelType]):
                 ).first()
                 if obj:
                     session.delete(obj)
+                    self._refresh_summary(session, getattr(obj, "deposition_data_set_id", None))
                     session.commit()
                     logger.info("Deleted %s %s", self.model_class.__name__, record_id)
                     return True
@@ -388,6 +597,239 @@ class MessageDAO(BaseDAO[MessageInfo]):
         """
         super().__init__(db_connection, MessageInfo)
 
+    def _before_commit(self, session: Session, obj: MessageInfo) -> None:
+        """Fill in the thread columns of a new message and refresh the deposition summary."""
+        self._set_thread_columns(session, obj)
+        super()._before_commit(session, obj)
+
+    def _set_thread_columns(self, session: Session, obj: MessageInfo) -> None:
+        """Fill in the thread columns of a new message from those of its parent.
+
+        The thread columns are left empty if the parent's have not been filled in yet (see
+        rebuild_threads_by_deposition()).
+        """
+        session.flush()  # assigns ordinal_id, part of the thread path
+        parent = None
+        if not is_thread_root(obj.message_id, obj.parent_message_id):
+            parent = session.execute(
+                _THREAD_PARENT_STMT, {"message_id": obj.parent_message_id, "deposition_id": obj.deposition_data_set_id}
+            ).first()
+            if parent is not None and parent.thread_path is None:
+                logger.warning("Thread columns of parent %s of message %s not set - run the thread backfill", obj.parent_message_id, obj.message_id)
+                return
+        columns = child_thread_columns(obj.message_id, obj.timestamp, obj.ordinal_id, tuple(parent) if parent is not None else None)
+        if columns is None:
+            logger.warning("Thread path of message %s exceeds the maximum length - thread columns not set", obj.message_id)
+            return
+        obj.thread_root_id, obj.thread_depth, obj.thread_path = columns
+
+    def get_thread_rows_by_deposition(self, deposition_id: str) -> List:
+        """Get the thread columns of the messages of a deposition, in thread order.
+
+        Args:
+            deposition_id (str): Deposition dataset ID (e.g., 'D_1000000001')
+
+        Returns:
+            List[RowMapping]: Rows with ordinal_id, message_id, parent_message_id, timestamp, thread_root_id,
+            thread_depth and thread_path, ordered by thread_path (messages without thread columns first)
+        """
+        return self._fetch_rows(_THREAD_ROWS_STMT, {"deposition_id": deposition_id})
+
+    def rebuild_threads_by_deposition(self, deposition_id: str, dry_run: bool = False) -> int:
+        """Recompute the thread columns of all messages of a deposition and store those which differ.
+
+        Args:
+            deposition_id (str): Deposition dataset ID (e.g., 'D_1000000001')
+            dry_run (bool): Only count the messages which would be updated
+
+        Returns:
+            int: Number of messages whose thread columns were (or would be) updated
+
+        Raises:
+            SQLAlchemyError: If reading or updating fails
+        """
+        rows = self.get_thread_rows_by_deposition(deposition_id)
+        columnD = compute_thread_columns(rows)
+        changes = []
+        for row in rows:
+            columns = columnD[row["message_id"]] or (None, None, None)
+            if columns != (row["thread_root_id"], row["thread_depth"], row["thread_path"]):
+                changes.append({
+                    "b_message_id": row["message_id"],
+                    "b_thread_root_id": columns[0],
+                    "b_thread_depth": columns[1],
+                    "b_thread_path": columns[2],
+                })
+        if changes and not dry_run:
+            with self.db_connection.engine.begin() as conn:
+                conn.execute(_UPDATE_THREAD_COLUMNS_STMT, changes)
+        return len(changes)
+
+    def check_threads_by_deposition(self, deposition_id: str) -> List[str]:
+        """Check the stored thread columns of a deposition against the parent references.
+
+        Args:
+            deposition_id (str): Deposition dataset ID (e.g., 'D_1000000001')
+
+        Returns:
+            List[str]: Description of each inconsistency found, empty if the thread columns are consistent
+
+        Raises:
+            SQLAlchemyError: If the query fails
+        """
+        rows = self.get_thread_rows_by_deposition(deposition_id)
+        columnD = compute_thread_columns(rows)
+        problems = []
+        for row in rows:
+            stored = (row["thread_root_id"], row["thread_depth"], row["thread_path"])
+            expected = columnD[row["message_id"]] or (None, None, None)
+            if stored == expected:
+                continue
+            if row["thread_path"] is None:
+                problems.append("%s: thread columns not set" % row["message_id"])
+            else:
+                problems.append("%s: thread columns %r, expected %r" % (row["message_id"], stored, expected))
+        return problems
+
+    def get_deposition_ids(self) -> List[str]:
+        """Get the IDs of all depositions with messages.
+
+        Returns:
+            List[str]: Deposition dataset IDs, sorted
+
+        Raises:
+            SQLAlchemyError: If the query fails
+        """
+        with self.db_connection.engine.connect() as conn:
+            return list(conn.execute(_DEPOSITION_IDS_STMT).scalars())
+
+    def _fetch_rows_for_depositions(self, stmt, deposition_ids: List[str], params: Optional[Dict] = None) -> List:
+        """Execute a grouped statement for many depositions, in chunks of at most _DEPOSITION_BATCH_SIZE IDs.
+
+        Args:
+            stmt: Core select statement with an expanding 'deposition_ids' parameter
+            deposition_ids (List[str]): Deposition dataset IDs
+            params (Dict, optional): Values of the other bound parameters
+
+        Returns:
+            List[Row]: Rows of all chunks, in chunk order
+
+        Raises:
+            SQLAlchemyError: If a query fails
+        """
+        deposition_ids = list(dict.fromkeys(deposition_ids))
+        rows = []
+        with self.db_connection.engine.connect() as conn:
+            for start in range(0, len(deposition_ids), _DEPOSITION_BATCH_SIZE):
+                chunk = deposition_ids[start:start + _DEPOSITION_BATCH_SIZE]
+                rows.extend(conn.execute(stmt, dict(params or {}, deposition_ids=chunk)).all())
+        return rows
+
+    def get_last_sent_dates(self, deposition_ids: List[str], content_type: str) -> Dict[str, object]:
+        """Get the timestamp of the latest sent message of a content type for many depositions.
+
+        Args:
+            deposition_ids (List[str]): Deposition dataset IDs
+            content_type (str): 'messages-to-depositor' or 'messages-from-depositor'
+
+        Returns:
+            Dict[str, datetime]: Latest timestamp per deposition, for depositions with a sent message only
+
+        Raises:
+            SQLAlchemyError: If a query fails
+        """
+        return dict(self._fetch_rows_for_depositions(_LAST_SENT_DATES_STMT, deposition_ids, {"content_type": content_type}))
+
+    def get_last_unlock_dates(self, deposition_ids: List[str]) -> Dict[str, object]:
+        """Get the timestamp of the last "System Unlocked" message to the depositor for many depositions.
+
+        Args:
+            deposition_ids (List[str]): Deposition dataset IDs
+
+        Returns:
+            Dict[str, datetime]: Timestamp of the last (highest ordinal) unlock message per deposition, for
+            depositions with one only
+
+        Raises:
+            SQLAlchemyError: If a query fails
+        """
+        return dict(self._fetch_rows_for_depositions(_LAST_UNLOCK_DATES_STMT, deposition_ids))
+
+    def get_pending_rows_from_depositor(self, deposition_ids: List[str]) -> List:
+        """Get the messages from the depositor still requiring action for many depositions.
+
+        A message requires action unless it has a status record with action_reqd other than 'Y'.
+
+        Args:
+            deposition_ids (List[str]): Deposition dataset IDs
+
+        Returns:
+            List[Row]: Message rows ordered by deposition and ordinal_id
+
+        Raises:
+            SQLAlchemyError: If a query fails
+        """
+        return self._fetch_rows_for_depositions(_PENDING_FROM_DEPOSITOR_STMT, deposition_ids)
+
+    def get_last_by_context_type(self, deposition_id: str, content_type: str, context_types: List[str]) -> Optional[object]:
+        """Get the last (highest ordinal) message of a content type with one of the given context types.
+
+        Args:
+            deposition_id (str): Deposition dataset ID (e.g., 'D_1000000001')
+            content_type (str): Message content type
+            context_types (List[str]): Context types to match
+
+        Returns:
+            Optional[Row]: Row with timestamp and context_value, None if no message matches
+
+        Raises:
+            SQLAlchemyError: If the query fails
+        """
+        with self.db_connection.engine.connect() as conn:
+            return conn.execute(
+                _LAST_MESSAGE_BY_CONTEXT_TYPE_STMT, {"deposition_id": deposition_id, "content_type": content_type, "context_types": list(context_types)}
+            ).first()
+
+    def get_last_timestamp_by_subject(self, deposition_id: str, content_type: str, phrase: str) -> Optional[object]:
+        """Get the timestamp of the last (highest ordinal) message of a content type whose subject contains a phrase.
+
+        Args:
+            deposition_id (str): Deposition dataset ID (e.g., 'D_1000000001')
+            content_type (str): Message content type
+            phrase (str): Phrase to look for in the subject (case sensitive)
+
+        Returns:
+            Optional[datetime]: Timestamp of the message, None if no message matches
+
+        Raises:
+            SQLAlchemyError: If the query fails
+        """
+        pattern = "%" + phrase.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        with self.db_connection.engine.connect() as conn:
+            for row in conn.execute(_MESSAGES_BY_SUBJECT_STMT, {"deposition_id": deposition_id, "content_type": content_type, "subject_pattern": pattern}):
+                if phrase in row.message_subject:
+                    return row.timestamp
+        return None
+
+    def get_last_validation_letter(self, deposition_id: str) -> Optional[object]:
+        """Get the last validation letter sent to the depositor, as identified by an attached validation report and the subject.
+
+        Args:
+            deposition_id (str): Deposition dataset ID (e.g., 'D_1000000001')
+
+        Returns:
+            Optional[Row]: Row with timestamp and message_text of the latest letter (the earliest of equal
+            timestamps), None if no letter was sent
+
+        Raises:
+            SQLAlchemyError: If the query fails
+        """
+        with self.db_connection.engine.connect() as conn:
+            for row in conn.execute(_VALIDATION_LETTERS_STMT, {"deposition_id": deposition_id}):
+                if _VALIDATION_LETTER_SUBJECT.search(row.message_subject):
+                    return row
+        return None
+
     def get_by_message_id(self, message_id: str) -> Optional[MessageInfo]:
         """Get message by message_id.
 
@@ -417,6 +859,57 @@ class MessageDAO(BaseDAO[MessageInfo]):
             logger.error("Error getting messages for deposition %s: %s", deposition_id, e)
             return []
 
+    def get_rows_by_deposition(self, deposition_id: str, content_type: Optional[str] = None) -> List:
+        """Get message rows for a deposition without building ORM objects.
+
+        Args:
+            deposition_id (str): Deposition dataset ID (e.g., 'D_1000000001')
+            content_type (str, optional): Restrict to this message content type
+
+        Returns:
+            List[RowMapping]: Message rows in ordinal order
+        """
+        if content_type:
+            return self._fetch_rows(_MESSAGE_ROWS_BY_CONTENT_TYPE_STMT, {"deposition_id": deposition_id, "content_type": content_type})
+        return self._fetch_rows(_MESSAGE_ROWS_STMT, {"deposition_id": deposition_id})
+
+    def count_by_deposition(self, deposition_id: str, content_type: Optional[str] = None) -> int:
+        """Count messages for a deposition without loading them.
+
+        Args:
+            deposition_id (str): Deposition dataset ID (e.g., 'D_1000000001')
+            content_type (str, optional): Restrict the count to this message content type
+
+        Returns:
+            int: Number of messages, 0 if none found or on error
+        """
+        if content_type:
+            stmt, params = _MESSAGE_COUNT_BY_CONTENT_TYPE_STMT, {"deposition_id": deposition_id, "content_type": content_type}
+        else:
+            stmt, params = _MESSAGE_COUNT_STMT, {"deposition_id": deposition_id}
+        try:
+            with self.db_connection.get_session() as session:
+                return session.execute(stmt, params).scalar() or 0
+        except SQLAlchemyError as e:
+            logger.error("Error counting messages for deposition %s: %s", deposition_id, e)
+            return 0
+
+    def get_version_by_deposition(self, deposition_id: str) -> Optional[tuple]:
+        """Get a version stamp of the messages of a deposition, which changes whenever a message is added, changed or removed.
+
+        Args:
+            deposition_id (str): Deposition dataset ID (e.g., 'D_1000000001')
+
+        Returns:
+            tuple: (message count, highest ordinal_id, latest updated_at), or None on error
+        """
+        try:
+            with self.db_connection.engine.connect() as conn:
+                return tuple(conn.execute(_MESSAGE_VERSION_STMT, {"deposition_id": deposition_id}).one())
+        except SQLAlchemyError as e:
+            logger.error("Error getting message version for deposition %s: %s", deposition_id, e)
+            return None
+
     def get_by_content_type(self, content_type: str) -> List[MessageInfo]:
         """Get messages by content type.
 
@@ -565,6 +1058,33 @@ class FileReferenceDAO(BaseDAO[MessageFileReference]):
             logger.error("Error getting file references for message %s: %s", message_id, e)
             return []
 
+    def get_rows_by_deposition(self, deposition_id: str) -> List:
+        """Get file reference rows for a deposition without building ORM objects.
+
+        Args:
+            deposition_id (str): Deposition dataset ID (e.g., 'D_1000000001')
+
+        Returns:
+            List[RowMapping]: File reference rows in ordinal order
+        """
+        return self._fetch_rows(_FILE_REFERENCE_ROWS_STMT, {"deposition_id": deposition_id})
+
+    def count_by_deposition(self, deposition_id: str) -> int:
+        """Count file references for a deposition without loading them.
+
+        Args:
+            deposition_id (str): Deposition dataset ID (e.g., 'D_1000000001')
+
+        Returns:
+            int: Number of file references, 0 if none found or on error
+        """
+        try:
+            with self.db_connection.get_session() as session:
+                return session.execute(_FILE_REFERENCE_COUNT_STMT, {"deposition_id": deposition_id}).scalar() or 0
+        except SQLAlchemyError as e:
+            logger.error("Error counting file references for deposition %s: %s", deposition_id, e)
+            return 0
+
 
 class MessageStatusDAO(BaseDAO[MessageStatus]):
     """Data Access Object for Message Status operations with specialized methods.
@@ -594,6 +1114,33 @@ class MessageStatusDAO(BaseDAO[MessageStatus]):
         """
         return self.get_by_id(message_id, 'message_id')
 
+    def get_rows_by_deposition(self, deposition_id: str) -> List:
+        """Get status rows for a deposition without building ORM objects.
+
+        Args:
+            deposition_id (str): Deposition dataset ID (e.g., 'D_1000000001')
+
+        Returns:
+            List[RowMapping]: Status rows
+        """
+        return self._fetch_rows(_STATUS_ROWS_STMT, {"deposition_id": deposition_id})
+
+    def get_version_by_deposition(self, deposition_id: str) -> Optional[tuple]:
+        """Get a version stamp of the message statuses of a deposition, which changes whenever a status is added or changed.
+
+        Args:
+            deposition_id (str): Deposition dataset ID (e.g., 'D_1000000001')
+
+        Returns:
+            tuple: (status count, number read, number requiring action, number for release, latest updated_at), or None on error
+        """
+        try:
+            with self.db_connection.engine.connect() as conn:
+                return tuple(conn.execute(_STATUS_VERSION_STMT, {"deposition_id": deposition_id}).one())
+        except SQLAlchemyError as e:
+            logger.error("Error getting status version for deposition %s: %s", deposition_id, e)
+            return None
+
     def create_or_update(self, status: MessageStatus) -> bool:
         """Create or update message status with retry logic.
 
@@ -625,6 +1172,7 @@ class MessageStatusDAO(BaseDAO[MessageStatus]):
                         # Create new
                         session.add(status)
 
+                    self._refresh_summary(session, status.deposition_data_set_id)
                     session.commit()
                     logger.info("Created/updated status for message %s", status.message_id)
                     return True
@@ -654,6 +1202,406 @@ class MessageStatusDAO(BaseDAO[MessageStatus]):
                 return False
         return False
 
+    def bulk_upsert(self, deposition_id: str, changes: List[Dict], keep_unread: bool = False) -> Dict[str, str]:
+        """Apply status changes for many messages of a deposition in one transaction.
+
+        Current statuses of the messages concerned are read with a single query, and all
+        new or changed status records are then written with one multi-row upsert
+        (INSERT ... ON DUPLICATE KEY UPDATE on MySQL, INSERT ... ON CONFLICT DO UPDATE on
+        SQLite; record by record on other databases). Flags not given in a change keep their
+        current value ('N' for a new status record). Where several changes name the same
+        message they are merged in order; if any of them is invalid the message is left unchanged.
+
+        Callers are expected to hold the deposition lock when the statuses must not change
+        between the read and the upsert.
+
+        Args:
+            deposition_id (str): Deposition dataset ID the messages belong to
+            changes (List[Dict]): Changes with keys message_id and any of read_status,
+                action_reqd, for_release ('Y' or 'N')
+            keep_unread (bool): Apply read_status to an existing status record only if it is read
+                ('Y'), as when tagging messages, so that an unread message is never marked read
+                on the side (default: False)
+
+        Returns:
+            Dict[str, str]: Outcome per message_id, one of 'created', 'updated', 'unchanged',
+            'invalid' (flag value other than 'Y'/'N'), 'not_found' (no such message in the
+            deposition) or 'failed' (the transaction was rolled back)
+        """
+        outcomes = {}
+        requested = {}
+        for change in changes:
+            message_id = change.get("message_id")
+            if not message_id:
+                logger.warning("Ignoring status change without message_id: %r", change)
+                continue
+            flags = {k: change[k] for k in STATUS_FLAGS if change.get(k) is not None}
+            if any(v not in ("Y", "N") for v in flags.values()):
+                outcomes[message_id] = "invalid"
+                continue
+            requested.setdefault(message_id, {}).update(flags)
+
+        # a message with any invalid change is left untouched
+        for message_id in outcomes:
+            requested.pop(message_id, None)
+        if not requested:
+            return outcomes
+
+        try:
+            with self.db_connection.get_session() as session:
+                rows = []
+                existing_ids = set()
+                lookup = session.execute(_STATUS_LOOKUP_STMT, {"deposition_id": deposition_id, "message_ids": list(requested)})
+                for message_id, status_id, read_status, action_reqd, for_release in lookup:
+                    current = {"read_status": read_status or "N", "action_reqd": action_reqd or "N", "for_release": for_release or "N"}
+                    flags = requested.pop(message_id)
+                    if keep_unread and status_id is not None and read_status != "Y":
+                        flags.pop("read_status", None)
+                    new = dict(current, **flags)
+                    if status_id is None:
+                        outcomes[message_id] = "created"
+                    elif new != current:
+                        outcomes[message_id] = "updated"
+                        existing_ids.add(message_id)
+                    else:
+                        outcomes[message_id] = "unchanged"
+                        continue
+                    rows.append(dict(new, message_id=message_id, deposition_data_set_id=deposition_id))
+
+                for message_id in requested:
+                    outcomes[message_id] = "not_found"
+
+                if rows:
+                    stmt = self._upsert_statement(rows)
+                    if stmt is not None:
+                        session.execute(stmt)
+                    else:
+                        self._write_rows(session, rows, existing_ids)
+                    self._refresh_summary(session, deposition_id)
+                    session.commit()
+                logger.info("Bulk status update for %s: %d of %d records written", deposition_id, len(rows), len(outcomes))
+        except SQLAlchemyError as e:
+            logger.error("Error in bulk status update for deposition %s: %s", deposition_id, e)
+            for message_id, outcome in outcomes.items():
+                if outcome in ("created", "updated", "unchanged"):
+                    outcomes[message_id] = "failed"
+            for message_id in requested:
+                outcomes[message_id] = "failed"
+        return outcomes
+
+    def _upsert_statement(self, rows: List[Dict]):
+        """Multi-row INSERT of status records which updates the flags of records that already exist,
+        None for database dialects without upsert support."""
+        table = MessageStatus.__table__
+        dialect = self.db_connection.engine.dialect.name
+        if dialect == "mysql":
+            stmt = mysql_insert(table).values(rows)
+            set_ = {k: stmt.inserted[k] for k in STATUS_FLAGS}
+            set_["updated_at"] = func.current_timestamp()
+            return stmt.on_duplicate_key_update(set_)
+        if dialect == "sqlite":
+            stmt = sqlite_insert(table).values(rows)
+            set_ = {k: stmt.excluded[k] for k in STATUS_FLAGS}
+            set_["updated_at"] = func.current_timestamp()
+            return stmt.on_conflict_do_update(index_elements=[table.c.message_id], set_=set_)
+        return None
+
+    @staticmethod
+    def _write_rows(session: Session, rows: List[Dict], existing_ids: set) -> None:
+        """Write status records one by one, updating those already looked up (existing_ids) and inserting the others."""
+        table = MessageStatus.__table__
+        for row in rows:
+            if row["message_id"] in existing_ids:
+                values = {k: row[k] for k in STATUS_FLAGS}
+                values["updated_at"] = func.current_timestamp()
+                session.execute(update(table).where(table.c.message_id == row["message_id"]).values(**values))
+            else:
+                session.execute(insert(table).values(**row))
+
+
+class DepositionSummaryDAO(BaseDAO[DepositionMessageSummary]):
+    """Data Access Object for the per-deposition message summary.
+
+    Summary rows are written by the other DAOs as part of each write (see DepositionSummary);
+    this DAO reads them and repairs rows which have drifted from the messaging data.
+
+    Inherits from:
+        BaseDAO[DepositionMessageSummary]: Base DAO with generic CRUD operations
+    """
+
+    def __init__(self, db_connection: DatabaseConnection):
+        """Initialize DepositionSummaryDAO.
+
+        Args:
+            db_connection (DatabaseConnection): Database connection manager
+        """
+        super().__init__(db_connection, DepositionMessageSummary)
+
+    def _refresh_summary(self, session: Session, deposition_id: str) -> None:
+        """Summary rows are derived data - writing one does not trigger a refresh."""
+
+    def get_by_deposition(self, deposition_id: str) -> Optional[Dict]:
+        """Get the stored summary of a deposition with a single primary key lookup.
+
+        Args:
+            deposition_id (str): Deposition dataset ID (e.g., 'D_1000000001')
+
+        Returns:
+            Optional[Dict]: Column name -> value, None if the deposition has no summary row
+            (no messages, or not yet rebuilt) or the summary table does not exist
+
+        Raises:
+            SQLAlchemyError: If the query fails
+        """
+        with self.db_connection.engine.connect() as conn:
+            if not has_summary_table(conn):
+                return None
+            return get_stored_summary(conn, deposition_id)
+
+    def refresh_by_deposition(self, deposition_id: str) -> None:
+        """Recompute and store the summary of a deposition in a transaction of its own.
+
+        Args:
+            deposition_id (str): Deposition dataset ID (e.g., 'D_1000000001')
+
+        Raises:
+            SQLAlchemyError: If reading or writing fails
+        """
+        with self.db_connection.engine.begin() as conn:
+            refresh_deposition_summary(conn, deposition_id)
+
+    def rebuild_by_deposition(self, deposition_id: str, dry_run: bool = False) -> bool:
+        """Recompute the summary of a deposition and store it if it differs from the stored row.
+
+        Args:
+            deposition_id (str): Deposition dataset ID (e.g., 'D_1000000001')
+            dry_run (bool): Only determine whether the row would change
+
+        Returns:
+            bool: True if the summary row was (or would be) written or deleted
+
+        Raises:
+            SQLAlchemyError: If reading or writing fails
+        """
+        with self.db_connection.engine.begin() as conn:
+            expected = compute_deposition_summary(conn, deposition_id)
+            if not diff_summary(get_stored_summary(conn, deposition_id), expected):
+                return False
+            if not dry_run:
+                store_summary(conn, deposition_id, expected)
+        return True
+
+    def check_by_deposition(self, deposition_id: str) -> List[str]:
+        """Check the stored summary of a deposition against the messaging data.
+
+        Args:
+            deposition_id (str): Deposition dataset ID (e.g., 'D_1000000001')
+
+        Returns:
+            List[str]: Description of each field which differs, empty if the summary is current
+
+        Raises:
+            SQLAlchemyError: If the query fails
+        """
+        with self.db_connection.engine.connect() as conn:
+            return diff_summary(get_stored_summary(conn, deposition_id), compute_deposition_summary(conn, deposition_id))
+
+    def get_deposition_ids(self) -> List[str]:
+        """Get the IDs of all depositions with a summary row.
+
+        Returns:
+            List[str]: Deposition dataset IDs, sorted
+
+        Raises:
+            SQLAlchemyError: If the query fails
+        """
+        with self.db_connection.engine.connect() as conn:
+            return get_summary_deposition_ids(conn)
+
+
+class MessageJobDAO(BaseDAO[MessageJob]):
+    """Data Access Object for the background jobs of message submissions.
+
+    Jobs are handled as plain rows; payload and result are JSON text encoded by the caller (see
+    util/JobRunner.py). State changes are conditional updates, so that concurrent workers cannot both
+    claim or finish the same job.
+
+    Inherits from:
+        BaseDAO[MessageJob]: Base DAO with generic CRUD operations
+    """
+
+    def __init__(self, db_connection: DatabaseConnection):
+        """Initialize MessageJobDAO.
+
+        Args:
+            db_connection (DatabaseConnection): Database connection manager
+        """
+        super().__init__(db_connection, MessageJob)
+
+    def ensure_table(self) -> None:
+        """Create the job table if it does not exist, for job stores other than the migrated messaging database.
+
+        Raises:
+            SQLAlchemyError: If the table cannot be created
+        """
+        _JOB_TABLE.create(self.db_connection.engine, checkfirst=True)
+
+    def submit(self, job_type: str, payload: str, deposition_id: Optional[str] = None, idempotency_key: Optional[str] = None) -> Tuple[Dict, bool]:
+        """Queue a job, unless a job of the same type and deposition was submitted with the same idempotency key.
+
+        Args:
+            job_type (str): Kind of job
+            payload (str): Job parameters (JSON)
+            deposition_id (str, optional): Deposition the job concerns
+            idempotency_key (str, optional): Client supplied token identifying the submission
+
+        Returns:
+            Tuple[Dict, bool]: Job row, and whether it was queued by this call (False for the job of an
+            earlier submission with the same idempotency key)
+
+        Raises:
+            ValueError: If the idempotency key was used for a submission with other parameters
+            SQLAlchemyError: If the job cannot be stored
+        """
+        if idempotency_key:
+            existing = self.get_by_idempotency_key(idempotency_key, job_type, deposition_id)
+            if existing is not None:
+                return self._check_resubmission(existing, payload), False
+        row = {
+            "job_id": str(uuid.uuid4()),
+            "job_type": job_type,
+            "idempotency_key": idempotency_key or None,
+            "deposition_data_set_id": deposition_id,
+            "status": "queued",
+            "payload": payload,
+            "created_at": datetime.now(),
+        }
+        try:
+            with self.db_connection.engine.begin() as conn:
+                conn.execute(insert(_JOB_TABLE), row)
+        except IntegrityError:
+            # a concurrent submission with the same idempotency key was stored first
+            existing = self.get_by_idempotency_key(idempotency_key, job_type, deposition_id) if idempotency_key else None
+            if existing is None:
+                raise
+            return self._check_resubmission(existing, payload), False
+        return dict(row, result=None, error=None, started_at=None, finished_at=None), True
+
+    @staticmethod
+    def _check_resubmission(existing: Dict, payload: str) -> Dict:
+        """The job of an earlier submission with the same idempotency key, if made with the same parameters."""
+        if existing["payload"] != payload:
+            raise ValueError("Idempotency key %r was already used for a different submission (job %s)" % (existing["idempotency_key"], existing["job_id"]))
+        return existing
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """Get a job.
+
+        Args:
+            job_id (str): Job identifier
+
+        Returns:
+            Optional[Dict]: Job row, None if there is no such job
+
+        Raises:
+            SQLAlchemyError: If the query fails
+        """
+        rows = self._fetch_rows(_JOB_STMT, {"job_id": job_id})
+        return dict(rows[0]) if rows else None
+
+    def get_by_idempotency_key(self, idempotency_key: str, job_type: str, deposition_id: Optional[str] = None) -> Optional[Dict]:
+        """Get the job of a type submitted for a deposition with an idempotency key.
+
+        Args:
+            idempotency_key (str): Client supplied token
+            job_type (str): Kind of job
+            deposition_id (str, optional): Deposition the job concerns (None for jobs without a deposition)
+
+        Returns:
+            Optional[Dict]: Job row, None if there is no such job
+
+        Raises:
+            SQLAlchemyError: If the query fails
+        """
+        rows = self._fetch_rows(_JOB_BY_KEY_STMT, {"idempotency_key": idempotency_key, "job_type": job_type, "deposition_id": deposition_id})
+        return dict(rows[0]) if rows else None
+
+    def claim(self, job_id: str) -> bool:
+        """Move a queued job to 'running' for the calling worker.
+
+        Args:
+            job_id (str): Job identifier
+
+        Returns:
+            bool: True if the job was claimed, False if it is not queued (claimed by another worker,
+            finished or unknown)
+
+        Raises:
+            SQLAlchemyError: If the update fails
+        """
+        stmt = update(_JOB_TABLE).where(_JOB_TABLE.c.job_id == job_id, _JOB_TABLE.c.status == "queued").values(status="running", started_at=datetime.now())
+        with self.db_connection.engine.begin() as conn:
+            return conn.execute(stmt).rowcount == 1
+
+    def finish(self, job_id: str, status: str, result: Optional[str] = None, error: Optional[str] = None) -> bool:
+        """Record the outcome of a running job.
+
+        Args:
+            job_id (str): Job identifier
+            status (str): 'succeeded' or 'failed'
+            result (str, optional): Result (JSON)
+            error (str, optional): Error description
+
+        Returns:
+            bool: True if the job was running and is now finished
+
+        Raises:
+            ValueError: If status is not a final status
+            SQLAlchemyError: If the update fails
+        """
+        if status not in ("succeeded", "failed"):
+            raise ValueError("Invalid final job status %r" % status)
+        stmt = update(_JOB_TABLE).where(_JOB_TABLE.c.job_id == job_id, _JOB_TABLE.c.status == "running").values(
+            status=status, result=result, error=error, finished_at=datetime.now()
+        )
+        with self.db_connection.engine.begin() as conn:
+            return conn.execute(stmt).rowcount == 1
+
+    def get_queued_ids(self, created_before: datetime) -> List[str]:
+        """Get the jobs still queued which were queued before a given time, oldest first.
+
+        Args:
+            created_before (datetime): Queue time limit
+
+        Returns:
+            List[str]: Job identifiers
+
+        Raises:
+            SQLAlchemyError: If the query fails
+        """
+        stmt = select(_JOB_TABLE.c.job_id).where(_JOB_TABLE.c.status == "queued", _JOB_TABLE.c.created_at < created_before).order_by(_JOB_TABLE.c.created_at)
+        with self.db_connection.engine.connect() as conn:
+            return list(conn.execute(stmt).scalars())
+
+    def fail_interrupted(self, started_before: datetime, error: str = "interrupted") -> int:
+        """Mark jobs as failed which have been running since before a given time, e.g. whose worker has died.
+
+        Args:
+            started_before (datetime): Start time limit
+            error (str): Error recorded for the jobs
+
+        Returns:
+            int: Number of jobs marked as failed
+
+        Raises:
+            SQLAlchemyError: If the update fails
+        """
+        stmt = update(_JOB_TABLE).where(_JOB_TABLE.c.status == "running", _JOB_TABLE.c.started_at < started_before).values(
+            status="failed", error=error, finished_at=datetime.now()
+        )
+        with self.db_connection.engine.begin() as conn:
+            return conn.execute(stmt).rowcount
+
 
 class DataAccessLayer:
     """Main data access facade that provides all messaging database operations.
@@ -667,6 +1615,9 @@ class DataAccessLayer:
         messages (MessageDAO): DAO for message operations
         file_references (FileReferenceDAO): DAO for file reference operations
         status (MessageStatusDAO): DAO for status operations
+        summaries (DepositionSummaryDAO): DAO for the per-deposition message summaries
+        jobs (MessageJobDAO): DAO for the background jobs of message submissions
+        locks (LockManager): Factory for per-deposition database locks
 
     Example:
         >>> db_config = {
@@ -694,6 +1645,9 @@ class DataAccessLayer:
         self.messages = MessageDAO(self.db_connection)
         self.file_references = FileReferenceDAO(self.db_connection)
         self.status = MessageStatusDAO(self.db_connection)
+        self.summaries = DepositionSummaryDAO(self.db_connection)
+        self.jobs = MessageJobDAO(self.db_connection)
+        self.locks = LockManager(self.db_connection.engine)
 
     def create_tables(self):
         """Create all database tables.
@@ -764,6 +1718,248 @@ class DataAccessLayer:
         """
         return self.messages.get_by_deposition_and_content_type(deposition_id, content_type)
 
+    def get_deposition_message_rows(self, deposition_id: str, content_type: Optional[str] = None) -> List:
+        """Get message rows (read-only mappings) for a deposition.
+
+        Args:
+            deposition_id (str): Deposition dataset ID
+            content_type (str, optional): Message content type
+
+        Returns:
+            List[RowMapping]: Message rows in ordinal order
+        """
+        return self.messages.get_rows_by_deposition(deposition_id, content_type)
+
+    def get_deposition_file_reference_rows(self, deposition_id: str) -> List:
+        """Get file reference rows (read-only mappings) for a deposition.
+
+        Args:
+            deposition_id (str): Deposition dataset ID
+
+        Returns:
+            List[RowMapping]: File reference rows in ordinal order
+        """
+        return self.file_references.get_rows_by_deposition(deposition_id)
+
+    def get_deposition_status_rows(self, deposition_id: str) -> List:
+        """Get status rows (read-only mappings) for a deposition.
+
+        Args:
+            deposition_id (str): Deposition dataset ID
+
+        Returns:
+            List[RowMapping]: Status rows
+        """
+        return self.status.get_rows_by_deposition(deposition_id)
+
+    def count_deposition_messages(self, deposition_id: str, content_type: Optional[str] = None) -> int:
+        """Count messages for a deposition, optionally restricted to one content type.
+
+        Args:
+            deposition_id (str): Deposition dataset ID
+            content_type (str, optional): Message content type
+
+        Returns:
+            int: Number of messages
+        """
+        return self.messages.count_by_deposition(deposition_id, content_type)
+
+    def get_deposition_version(self, deposition_id: str, include_statuses: bool = False) -> Optional[tuple]:
+        """Get a version stamp of the messages of a deposition.
+
+        Args:
+            deposition_id (str): Deposition dataset ID
+            include_statuses (bool): Also cover the message statuses (read, action required, for release)
+
+        Returns:
+            tuple: (message count, highest ordinal_id, latest updated_at), followed by the status version stamp
+            (see MessageStatusDAO.get_version_by_deposition) if include_statuses, or None on error
+        """
+        version = self.messages.get_version_by_deposition(deposition_id)
+        if version is None or not include_statuses:
+            return version
+        status_version = self.status.get_version_by_deposition(deposition_id)
+        return None if status_version is None else version + status_version
+
+    def rebuild_deposition_threads(self, deposition_id: str, dry_run: bool = False) -> int:
+        """Recompute and store the thread columns of the messages of a deposition.
+
+        Args:
+            deposition_id (str): Deposition dataset ID
+            dry_run (bool): Only count the messages which would be updated
+
+        Returns:
+            int: Number of messages whose thread columns were (or would be) updated
+        """
+        return self.messages.rebuild_threads_by_deposition(deposition_id, dry_run)
+
+    def check_deposition_threads(self, deposition_id: str) -> List[str]:
+        """Check the thread columns of the messages of a deposition.
+
+        Args:
+            deposition_id (str): Deposition dataset ID
+
+        Returns:
+            List[str]: Inconsistencies found, empty if none
+        """
+        return self.messages.check_threads_by_deposition(deposition_id)
+
+    def get_last_sent_dates(self, deposition_ids: List[str], content_type: str) -> Dict[str, object]:
+        """Get the latest sent message timestamp of a content type for many depositions (grouped query).
+
+        Args:
+            deposition_ids (List[str]): Deposition dataset IDs
+            content_type (str): Message content type
+
+        Returns:
+            Dict[str, datetime]: Latest timestamp per deposition with a sent message
+        """
+        return self.messages.get_last_sent_dates(deposition_ids, content_type)
+
+    def get_last_unlock_dates(self, deposition_ids: List[str]) -> Dict[str, object]:
+        """Get the last unlock message timestamp for many depositions (grouped query).
+
+        Args:
+            deposition_ids (List[str]): Deposition dataset IDs
+
+        Returns:
+            Dict[str, datetime]: Timestamp per deposition with an unlock message
+        """
+        return self.messages.get_last_unlock_dates(deposition_ids)
+
+    def get_pending_depositor_message_rows(self, deposition_ids: List[str]) -> List:
+        """Get the messages from the depositor still requiring action for many depositions.
+
+        Args:
+            deposition_ids (List[str]): Deposition dataset IDs
+
+        Returns:
+            List[Row]: Message rows ordered by deposition and ordinal_id
+        """
+        return self.messages.get_pending_rows_from_depositor(deposition_ids)
+
+    def get_last_message_by_context_type(self, deposition_id: str, content_type: str, context_types: List[str]) -> Optional[object]:
+        """Get timestamp and context_value of the last message of a content type with one of the given context types.
+
+        Args:
+            deposition_id (str): Deposition dataset ID
+            content_type (str): Message content type
+            context_types (List[str]): Context types to match
+
+        Returns:
+            Optional[Row]: Row with timestamp and context_value, None if no message matches
+        """
+        return self.messages.get_last_by_context_type(deposition_id, content_type, context_types)
+
+    def get_last_message_date_by_subject(self, deposition_id: str, content_type: str, phrase: str) -> Optional[object]:
+        """Get the timestamp of the last message of a content type whose subject contains a phrase.
+
+        Args:
+            deposition_id (str): Deposition dataset ID
+            content_type (str): Message content type
+            phrase (str): Phrase to look for in the subject
+
+        Returns:
+            Optional[datetime]: Timestamp of the message, None if no message matches
+        """
+        return self.messages.get_last_timestamp_by_subject(deposition_id, content_type, phrase)
+
+    def get_last_validation_letter(self, deposition_id: str) -> Optional[object]:
+        """Get the last validation letter sent to the depositor.
+
+        Args:
+            deposition_id (str): Deposition dataset ID
+
+        Returns:
+            Optional[Row]: Row with timestamp and message_text, None if no letter was sent
+        """
+        return self.messages.get_last_validation_letter(deposition_id)
+
+    def get_message_deposition_ids(self) -> List[str]:
+        """Get the IDs of all depositions with messages.
+
+        Returns:
+            List[str]: Deposition dataset IDs, sorted
+        """
+        return self.messages.get_deposition_ids()
+
+    def get_deposition_summary(self, deposition_id: str) -> Optional[Dict]:
+        """Get the message summary of a deposition (one primary key lookup).
+
+        Args:
+            deposition_id (str): Deposition dataset ID
+
+        Returns:
+            Optional[Dict]: Summary columns (see DepositionMessageSummary), None if there is no summary row
+        """
+        return self.summaries.get_by_deposition(deposition_id)
+
+    @contextmanager
+    def deferred_summary_refresh(self):
+        """Context in which writes refresh the summary of their deposition once, on leaving it.
+
+        Each write otherwise recomputes the summary of its deposition, which reads all of the
+        deposition's messages. The summary is refreshed after the writes of the context have been
+        committed (or rolled back), in a transaction of its own; if that fails it is left for
+        rebuild_deposition_summary(). Nested contexts refresh when the outermost one is left.
+        """
+        if self.db_connection.deferred_summaries is not None:
+            yield
+            return
+        self.db_connection.deferred_summaries = set()
+        try:
+            yield
+        finally:
+            deposition_ids = self.db_connection.deferred_summaries
+            self.db_connection.deferred_summaries = None
+            for deposition_id in sorted(deposition_ids):
+                try:
+                    self.summaries.refresh_by_deposition(deposition_id)
+                except SQLAlchemyError as e:
+                    logger.error("Error refreshing message summary of %s - rebuild it: %s", deposition_id, e)
+
+    def rebuild_deposition_summary(self, deposition_id: str, dry_run: bool = False) -> bool:
+        """Recompute and store the message summary of a deposition.
+
+        Args:
+            deposition_id (str): Deposition dataset ID
+            dry_run (bool): Only determine whether the stored summary is out of date
+
+        Returns:
+            bool: True if the summary row was (or would be) changed
+        """
+        return self.summaries.rebuild_by_deposition(deposition_id, dry_run)
+
+    def check_deposition_summary(self, deposition_id: str) -> List[str]:
+        """Check the message summary of a deposition.
+
+        Args:
+            deposition_id (str): Deposition dataset ID
+
+        Returns:
+            List[str]: Differences found, empty if none
+        """
+        return self.summaries.check_by_deposition(deposition_id)
+
+    def get_summary_deposition_ids(self) -> List[str]:
+        """Get the IDs of all depositions with a message summary row.
+
+        Returns:
+            List[str]: Deposition dataset IDs, sorted
+        """
+        return self.summaries.get_deposition_ids()
+
+    def count_deposition_file_references(self, deposition_id: str) -> int:
+        """Count file references for a deposition.
+
+        Args:
+            deposition_id (str): Deposition dataset ID
+
+        Returns:
+            int: Number of file references
+        """
+        return self.file_references.count_by_deposition(deposition_id)
+
     def get_file_references_for_message(self, message_id: str) -> List[MessageFileReference]:
         """Get file references for a message.
 
@@ -796,3 +1992,29 @@ class DataAccessLayer:
             bool: True if operation succeeded, False otherwise
         """
         return self.status.create_or_update(status)
+
+    def bulk_update_status(self, deposition_id: str, changes: List[Dict], keep_unread: bool = False) -> Dict[str, str]:
+        """Apply status changes for many messages of a deposition in one transaction.
+
+        Args:
+            deposition_id (str): Deposition dataset ID
+            changes (List[Dict]): Changes with keys message_id and any of read_status, action_reqd, for_release
+            keep_unread (bool): Keep the read_status of existing unread statuses (see MessageStatusDAO.bulk_upsert)
+
+        Returns:
+            Dict[str, str]: Outcome per message_id (see MessageStatusDAO.bulk_upsert)
+        """
+        return self.status.bulk_upsert(deposition_id, changes, keep_unread=keep_unread)
+
+    def get_deposition_lock(self, deposition_id: str, timeout_seconds=15, retry_seconds=0.2) -> DbLock:
+        """Get a database lock serializing updates to a deposition's messaging data.
+
+        Args:
+            deposition_id (str): Deposition dataset ID
+            timeout_seconds (float): Maximum time to wait for the lock
+            retry_seconds (float): Polling interval where the backend requires polling
+
+        Returns:
+            DbLock: Unacquired lock, to be used as a context manager
+        """
+        return self.locks.getDepositionLock(deposition_id, timeoutSeconds=timeout_seconds, retrySeconds=retry_seconds)
@@ -0,0 +1,247 @@
+##
+# File: DepositionSummary.py
+# Date: 18-Oct-2026
+#
+# Computation and maintenance of the per-deposition message summary row.
+##
+"""
+Per-deposition message summary.
+
+The deposition_message_summary table holds, for each deposition with messages, the facts which the
+status checks (MessagingIo.areAllMsgsRead() and friends), the WFM notification updates and the
+date getters of ExtractMessage otherwise derive by scanning every message of the deposition.
+
+compute_deposition_summary() derives the row from the message, file reference and status tables
+with the same rules as those scans:
+
+- last sent/received: latest timestamp of the sent (send_status 'Y') messages to/from the depositor
+- reminders, release notices and unlocks: timestamp of the last matching message (by ordinal),
+  matched by context_type, or, where no message carries the context type, by subject
+- validation letter: last message to the depositor with context_type vldtn/maponly-authstatus-em,
+  or failing that the latest sent message with an attached validation report and a validation
+  letter subject; "major issues" is taken from context_value or the message text respectively
+- unread/unactioned: messages from the depositor with read_status 'N'/action_reqd 'Y' or without
+  a status record; for release: messages to or from the depositor with for_release 'Y'
+
+refresh_deposition_summary() recomputes and stores the row on the connection of the writing
+transaction; the data access objects call it before committing every write, so the summary commits
+or rolls back together with the change it reflects. A series of writes (PdbxMessageIo.write()) defers
+the refresh to a single one after its last write instead (DataAccessLayer.deferred_summary_refresh()).
+"""
+
+import logging
+import re
+import time
+import weakref
+from typing import Dict, List, Optional
+
+from sqlalchemy import bindparam, delete, func, inspect, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
+
+from wwpdb.apps.msgmodule.db.Models import DepositionMessageSummary, MessageFileReference, MessageInfo, MessageStatus
+
+logger = logging.getLogger(__name__)
+
+_MESSAGE_TABLE = MessageInfo.__table__
+_FILE_REFERENCE_TABLE = MessageFileReference.__table__
+_STATUS_TABLE = MessageStatus.__table__
+_SUMMARY_TABLE = DepositionMessageSummary.__table__
+
+# the narrow per-deposition selects the summary is computed from (no message text)
+_SUMMARY_MESSAGES_STMT = select(
+    _MESSAGE_TABLE.c.message_id, _MESSAGE_TABLE.c.timestamp, _MESSAGE_TABLE.c.content_type, _MESSAGE_TABLE.c.send_status,
+    _MESSAGE_TABLE.c.context_type, _MESSAGE_TABLE.c.context_value, _MESSAGE_TABLE.c.message_subject, _MESSAGE_TABLE.c.message_type,
+).where(
+    _MESSAGE_TABLE.c.deposition_data_set_id == bindparam("deposition_id")
+).order_by(_MESSAGE_TABLE.c.ordinal_id)
+_SUMMARY_STATUS_STMT = select(
+    _STATUS_TABLE.c.message_id, _STATUS_TABLE.c.read_status, _STATUS_TABLE.c.action_reqd, _STATUS_TABLE.c.for_release
+).where(_STATUS_TABLE.c.deposition_data_set_id == bindparam("deposition_id"))
+_VALIDATION_REPORT_MESSAGE_IDS_STMT = select(_FILE_REFERENCE_TABLE.c.message_id).distinct().where(
+    _FILE_REFERENCE_TABLE.c.deposition_data_set_id == bindparam("deposition_id"),
+    _FILE_REFERENCE_TABLE.c.content_type.like("%validation-report-annotate%"),
+)
+_MESSAGE_TEXT_STMT = select(_MESSAGE_TABLE.c.message_text).where(_MESSAGE_TABLE.c.message_id == bindparam("message_id"))
+_SUMMARY_ROW_STMT = select(_SUMMARY_TABLE).where(_SUMMARY_TABLE.c.deposition_data_set_id == bindparam("deposition_id"))
+_SUMMARY_DEPOSITION_IDS_STMT = select(_SUMMARY_TABLE.c.deposition_data_set_id).order_by(_SUMMARY_TABLE.c.deposition_data_set_id)
+_DELETE_SUMMARY_STMT = delete(_SUMMARY_TABLE).where(_SUMMARY_TABLE.c.deposition_data_set_id == bindparam("deposition_id"))
+
+# Columns holding derived facts (all but the key and updated_at)
+SUMMARY_FIELDS = tuple(c.name for c in _SUMMARY_TABLE.columns if c.name not in ("deposition_data_set_id", "updated_at"))
+
+_TO_DEPOSITOR = "messages-to-depositor"
+_FROM_DEPOSITOR = "messages-from-depositor"
+_NOTES = "notes-from-annotator"
+_REMINDER_SUBJECT_PHRASE = "Still awaiting feedback for"
+_RELEASE_SUBJECT_PHRASE = "Release of"
+_VALIDATION_LETTER_SUBJECT = re.compile("processed files are ready for your review", re.IGNORECASE)
+_MAJOR_VALIDATION_ISSUES = re.compile("Some major issues", re.IGNORECASE)
+
+# engine -> (has the summary table, time.monotonic() of the check); a missing table is looked up
+# again after _MISSING_TABLE_RECHECK_SECONDS, so a migration applied while the application runs is picked up
+_summaryTableByEngine = weakref.WeakKeyDictionary()
+_MISSING_TABLE_RECHECK_SECONDS = 60.0
+
+
+def _last_timestamp(rows: List, predicate) -> Optional[object]:
+    """Timestamp of the last of rows (in ordinal order) satisfying predicate."""
+    ret = None
+    for row in rows:
+        if predicate(row):
+            ret = row.timestamp
+    return ret
+
+
+def _last_by_context_or_subject(rows: List, context_types: tuple, subject_phrase: str) -> Optional[object]:
+    return _last_timestamp(rows, lambda r: r.context_type in context_types) or _last_timestamp(rows, lambda r: subject_phrase in (r.message_subject or ""))
+
+
+def _last_validation(conn: Connection, deposition_id: str, to_rows: List) -> tuple:
+    """(timestamp, major issues) of the last validation letter."""
+    last = None
+    for row in to_rows:
+        if row.context_type in ("vldtn", "maponly-authstatus-em"):
+            last = row
+    if last is not None and last.timestamp:
+        return last.timestamp, last.context_value == "major-issue-in-validation"
+
+    report_message_ids = set(conn.execute(_VALIDATION_REPORT_MESSAGE_IDS_STMT, {"deposition_id": deposition_id}).scalars())
+    if not report_message_ids:
+        return None, None
+    letter = None
+    for row in to_rows:
+        if row.send_status == "Y" and row.message_id in report_message_ids and _VALIDATION_LETTER_SUBJECT.search(row.message_subject or ""):
+            # earliest of equal timestamps, as in ExtractMessage.getLastValidation()
+            if letter is None or (row.timestamp and row.timestamp > letter.timestamp):
+                letter = row
+    if letter is None:
+        return None, None
+    text = conn.execute(_MESSAGE_TEXT_STMT, {"message_id": letter.message_id}).scalar() or ""
+    return letter.timestamp, _MAJOR_VALIDATION_ISSUES.search(text) is not None
+
+
+def compute_deposition_summary(conn: Connection, deposition_id: str) -> Optional[Dict]:
+    """Compute the summary of the messages of a deposition.
+
+    Args:
+        conn (Connection): Connection to read from (that of the writing transaction, for refreshes)
+        deposition_id (str): Deposition dataset ID (e.g., 'D_1000000001')
+
+    Returns:
+        Optional[Dict]: Values of the SUMMARY_FIELDS columns, None if the deposition has no messages
+    """
+    rows = conn.execute(_SUMMARY_MESSAGES_STMT, {"deposition_id": deposition_id}).all()
+    if not rows:
+        return None
+    statusD = {s.message_id: s for s in conn.execute(_SUMMARY_STATUS_STMT, {"deposition_id": deposition_id})}
+
+    to_rows = [r for r in rows if r.content_type == _TO_DEPOSITOR]
+    from_rows = [r for r in rows if r.content_type == _FROM_DEPOSITOR]
+    notes = [r for r in rows if r.content_type == _NOTES]
+    sent_to = [r.timestamp for r in to_rows if r.send_status == "Y" and r.timestamp]
+    sent_from = [r.timestamp for r in from_rows if r.send_status == "Y" and r.timestamp]
+    from_status = [statusD.get(r.message_id) for r in from_rows]
+    last_validation_at, last_validation_major = _last_validation(conn, deposition_id, to_rows)
+
+    return {
+        "num_messages_to_depositor": len(to_rows),
+        "num_messages_from_depositor": len(from_rows),
+        "num_notes": len(notes),
+        "num_annotator_notes": sum(1 for r in notes if "archive" not in (r.message_type or "")),
+        "num_flagged_notes": sum(1 for r in notes if "_flag" in (r.message_type or "")),
+        "num_unread": sum(1 for s in from_status if s is None or s.read_status == "N"),
+        "num_unactioned": sum(1 for s in from_status if s is None or s.action_reqd == "Y"),
+        "num_for_release": sum(1 for r in to_rows + from_rows if r.message_id in statusD and statusD[r.message_id].for_release == "Y"),
+        "num_without_status": sum(1 for s in from_status if s is None),
+        "last_sent_at": max(sent_to) if sent_to else None,
+        "last_received_at": max(sent_from) if sent_from else None,
+        "last_auto_reminder_at": _last_by_context_or_subject(notes, ("reminder", "reminder-auth-to-rel"), _REMINDER_SUBJECT_PHRASE),
+        "last_manual_reminder_at": _last_by_context_or_subject(to_rows, ("reminder",), _REMINDER_SUBJECT_PHRASE),
+        "last_release_notice_at": _last_by_context_or_subject(to_rows, ("release-publ", "release-nopubl"), _RELEASE_SUBJECT_PHRASE),
+        "last_unlock_at": _last_timestamp(to_rows, lambda r: r.context_type == "system-unlocked" or r.message_subject == "System Unlocked"),
+        "last_validation_at": last_validation_at,
+        "last_validation_major": last_validation_major,
+    }
+
+
+def has_summary_table(conn: Connection) -> bool:
+    """Whether the database has the deposition_message_summary table (schema migration 5)."""
+    engine = conn.engine
+    cached = _summaryTableByEngine.get(engine)
+    if cached is not None and (cached[0] or time.monotonic() - cached[1] < _MISSING_TABLE_RECHECK_SECONDS):
+        return cached[0]
+    present = inspect(conn).has_table(_SUMMARY_TABLE.name)
+    _summaryTableByEngine[engine] = (present, time.monotonic())
+    return present
+
+
+def get_stored_summary(conn: Connection, deposition_id: str) -> Optional[Dict]:
+    """Stored summary row of a deposition (primary key lookup), None if there is none."""
+    row = conn.execute(_SUMMARY_ROW_STMT, {"deposition_id": deposition_id}).mappings().first()
+    return dict(row) if row is not None else None
+
+
+def get_summary_deposition_ids(conn: Connection) -> List[str]:
+    """IDs of the depositions with a stored summary row, sorted."""
+    return list(conn.execute(_SUMMARY_DEPOSITION_IDS_STMT).scalars())
+
+
+def diff_summary(stored: Optional[Dict], expected: Optional[Dict]) -> List[str]:
+    """Fields in which a stored summary differs from the expected one.
+
+    Returns:
+        List[str]: Descriptions of the differences, empty if the summaries agree
+    """
+    if stored is None and expected is None:
+        return []
+    if stored is None:
+        return ["summary row missing"]
+    if expected is None:
+        return ["summary row present for a deposition without messages"]
+    return ["%s: %r, expected %r" % (name, stored.get(name), expected[name]) for name in SUMMARY_FIELDS if stored.get(name) != expected[name]]
+
+
+def store_summary(conn: Connection, deposition_id: str, summary: Optional[Dict]) -> None:
+    """Replace the stored summary row of a deposition (delete it if summary is None)."""
+    if summary is None:
+        conn.execute(_DELETE_SUMMARY_STMT, {"deposition_id": deposition_id})
+        return
+    row = dict(summary, deposition_data_set_id=deposition_id)
+    dialect = conn.dialect.name
+    if dialect == "mysql":
+        stmt = mysql_insert(_SUMMARY_TABLE).values(row)
+        set_ = {k: stmt.inserted[k] for k in SUMMARY_FIELDS}
+        set_["updated_at"] = func.current_timestamp()
+        conn.execute(stmt.on_duplicate_key_update(set_))
+    elif dialect == "sqlite":
+        stmt = sqlite_insert(_SUMMARY_TABLE).values(row)
+        set_ = {k: stmt.excluded[k] for k in SUMMARY_FIELDS}
+        set_["updated_at"] = func.current_timestamp()
+        conn.execute(stmt.on_conflict_do_update(index_elements=[_SUMMARY_TABLE.c.deposition_data_set_id], set_=set_))
+    else:
+        conn.execute(_DELETE_SUMMARY_STMT, {"deposition_id": deposition_id})
+        conn.execute(_SUMMARY_TABLE.insert().values(row))
+
+
+def refresh_deposition_summary(conn: Connection, deposition_id: str) -> Optional[Dict]:
+    """Recompute and store the summary of a deposition within the transaction of conn.
+
+    Does nothing (with a warning) on databases not yet migrated to include the summary table.
+
+    Args:
+        conn (Connection): Connection of the writing transaction
+        deposition_id (str): Deposition dataset ID (e.g., 'D_1000000001')
+
+    Returns:
+        Optional[Dict]: The summary stored, None if the deposition has no messages or the table is absent
+    """
+    if not deposition_id:
+        return None
+    if not has_summary_table(conn):
+        logger.warning("Table %s missing - run migrate_messaging_schema.py; summary of %s not updated", _SUMMARY_TABLE.name, deposition_id)
+        return None
+    summary = compute_deposition_summary(conn, deposition_id)
+    store_summary(conn, deposition_id, summary)
+    return summary
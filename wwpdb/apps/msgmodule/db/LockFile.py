@@ -3,20 +3,247 @@
 #
 # This module provides a LockFile class that has the same interface as the original
 # mmcif_utils.persist.LockFile but is compatible with database adaptors that return
-# dummy file paths. It automatically detects dummy paths and uses no-op operations
-# for them while preserving real file locking for actual file paths.
+# dummy file paths. It automatically detects dummy paths and takes a per-deposition
+# database lock for them while preserving real file locking for actual file paths.
 ##
 
 import os
 import sys
 import time
-import errno
+import fcntl
+import socket
+import hashlib
+import logging
+import tempfile
+
+logger = logging.getLogger(__name__)
 
 
 class LockFileTimeoutException(Exception):
     pass
 
 
+# bounds of the interval between attempts to take the flock of a wait file
+_FLOCK_POLL_MIN_SECONDS = 0.001
+_FLOCK_POLL_MAX_SECONDS = 0.05
+
+
+def _flockWithTimeout(fd, timeoutSeconds):
+    """Take an exclusive flock on fd, waiting for at most timeoutSeconds.
+
+    The flock is polled without blocking, with the interval between attempts doubling from
+    _FLOCK_POLL_MIN_SECONDS up to _FLOCK_POLL_MAX_SECONDS, so a waiter takes the lock within
+    that interval of its release and nothing is left waiting once the call returns.
+
+    Returns:
+        True if the lock was acquired (caller owns fd), False on timeout (fd has been closed)
+    """
+    deadline = time.time() + timeoutSeconds
+    sleepSeconds = _FLOCK_POLL_MIN_SECONDS
+    while True:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            pass
+        except BaseException:
+            os.close(fd)
+            raise
+        remainingSeconds = deadline - time.time()
+        if remainingSeconds <= 0:
+            os.close(fd)
+            return False
+        time.sleep(min(sleepSeconds, remainingSeconds))
+        sleepSeconds = min(2 * sleepSeconds, _FLOCK_POLL_MAX_SECONDS)
+
+
+def _pidAlive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class FlockLockFile:
+    """Lock file with a blocking fcntl.flock wait, a timeout and stale owner recovery.
+
+    The lock itself is filePath + ".lock", created with O_EXCL and removed on release as
+    by mmcif_utils.persist.LockFile, so processes still using that lock remain mutually
+    excluded with this one, on this and on other hosts. Before creating it, waiters on
+    this host queue on an exclusive flock of a persistent wait file kept in a local lock
+    directory (not next to the archive file). The flock is polled at intervals of at most
+    50 ms, so a waiter takes over soon after a holder on this host releases, instead of
+    sleeping retrySeconds between attempts.
+
+    The holder records "<pid> <host>" in the lock file. A lock file of this host whose
+    process is no longer running was left behind by a crashed process; it is taken over
+    (and logged) rather than blocking writers until timeout. flock gives no exclusion
+    between hosts sharing the archive over NFS, so a lock file of another host is never
+    taken over on the strength of the flock: it is waited for like that of an O_EXCL style
+    holder (a lock file without owner record), polling every retrySeconds, and only broken
+    once older than staleSeconds if that is set. An empty lock file is respected for
+    emptyStaleSeconds: it is held by an O_EXCL style holder, or was left by a holder which
+    crashed between creating it and recording its owner, and is broken once older.
+
+    Args:
+        filePath: Path to file to lock
+        timeoutSeconds: Lock timeout in seconds (default: 15)
+        retrySeconds: Retry interval in seconds while the lock file is held elsewhere (default: 0.2)
+        verbose: Enable verbose logging (default: False)
+        log: File handle for logging output (default: sys.stderr)
+        staleSeconds: Age after which a lock file of another host is taken as stale (default: None, never)
+        lockDir: Local directory of the wait files (default: "msgmodule-locks" in the temporary directory)
+        emptyStaleSeconds: Age after which an empty lock file is taken as stale (default: 300)
+
+    Raises:
+        LockFileTimeoutException: If lock cannot be acquired within timeoutSeconds
+    """
+
+    def __init__(self, filePath, timeoutSeconds=15, retrySeconds=.2, verbose=False, log=sys.stderr, staleSeconds=None, lockDir=None, emptyStaleSeconds=300):
+        self.__filePath = filePath
+        self.__lockFilePath = filePath + ".lock"
+        self.__waitFilePath = self.getWaitFilePath(filePath, lockDir)
+        self.__staleSeconds = staleSeconds
+        self.__emptyStaleSeconds = emptyStaleSeconds
+        self.__timeoutSeconds = timeoutSeconds
+        self.__retrySeconds = retrySeconds
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__waitFd = None
+        self.__fd = None
+        self.__isLocked = False
+        self.__foreignWarned = False
+
+    @staticmethod
+    def getWaitFilePath(filePath, lockDir=None):
+        """Path of the wait file queuing the lock holders of filePath on this host"""
+        if lockDir is None:
+            lockDir = os.path.join(tempfile.gettempdir(), "msgmodule-locks")
+        if not os.path.isdir(lockDir):
+            os.makedirs(lockDir, exist_ok=True)
+        digest = hashlib.sha1(os.path.abspath(filePath).encode("utf-8")).hexdigest()
+        return os.path.join(lockDir, "%s-%s.wait" % (os.path.basename(filePath)[:64], digest))
+
+    def acquire(self):
+        """Acquire the lock, waiting at most timeoutSeconds.
+
+        Raises:
+            LockFileTimeoutException: If lock cannot be acquired within timeoutSeconds
+        """
+        if self.__isLocked:
+            return
+        timeBegin = time.time()
+        waitFd = os.open(self.__waitFilePath, os.O_CREAT | os.O_RDWR, 0o664)
+        if not _flockWithTimeout(waitFd, self.__timeoutSeconds):
+            raise LockFileTimeoutException("LockFile(acquire) Internal timeout of %d (seconds) exceeded for %s" % (self.__timeoutSeconds, self.__filePath))
+        try:
+            while True:
+                try:
+                    fd = os.open(self.__lockFilePath, os.O_CREAT | os.O_EXCL | os.O_RDWR, 0o664)
+                    break
+                except FileExistsError:
+                    pass
+                if not self.__removeIfStale():
+                    if (time.time() - timeBegin) >= self.__timeoutSeconds:
+                        raise LockFileTimeoutException("LockFile(acquire) Internal timeout of %d (seconds) exceeded for %s" % (self.__timeoutSeconds, self.__filePath))
+                    time.sleep(self.__retrySeconds)
+            os.write(fd, ("%d %s\n" % (os.getpid(), socket.gethostname())).encode("utf-8"))
+        except BaseException:
+            self.__unlockAndClose(waitFd)
+            raise
+        self.__waitFd = waitFd
+        self.__fd = fd
+        self.__isLocked = True
+        if self.__verbose:
+            logger.debug("LockFile(acquire) locked %s after %.3f seconds", self.__lockFilePath, time.time() - timeBegin)
+
+    def release(self):
+        """Remove the lock file and release the lock."""
+        if not self.__isLocked:
+            return
+        self.__isLocked = False
+        try:
+            os.close(self.__fd)
+            os.unlink(self.__lockFilePath)
+        finally:
+            self.__unlockAndClose(self.__waitFd)
+            self.__fd = None
+            self.__waitFd = None
+
+    def __removeIfStale(self):
+        """Remove the existing lock file if it was left behind by a lock holder that has gone.
+
+        Returns:
+            True if the lock file was removed (or had already gone)
+        """
+        try:
+            with open(self.__lockFilePath, "rb") as ifh:
+                fields = ifh.read(512).decode("utf-8", "replace").split()
+        except FileNotFoundError:
+            return True
+        if not fields:
+            # held by a lock holder which does not use flock, or left by one which crashed before recording itself
+            try:
+                ageSeconds = time.time() - os.path.getmtime(self.__lockFilePath)
+            except FileNotFoundError:
+                return True
+            if self.__emptyStaleSeconds is None or ageSeconds < self.__emptyStaleSeconds:
+                return False
+            logger.warning("Breaking empty lock file %s, unchanged for %.0f seconds", self.__lockFilePath, ageSeconds)
+            return self.__unlinkLockFile()
+        if len(fields) < 2 or not fields[0].isdigit():
+            # not an owner record of this class
+            return False
+        pid, host = int(fields[0]), fields[1]
+        if host == socket.gethostname():
+            if pid != os.getpid() and _pidAlive(pid):
+                return False
+            logger.warning("Recovered stale lock file %s left by process %d, which is no longer running", self.__lockFilePath, pid)
+        else:
+            # held by another host -- its process cannot be checked, and flock does not exclude across hosts
+            try:
+                ageSeconds = time.time() - os.path.getmtime(self.__lockFilePath)
+            except FileNotFoundError:
+                return True
+            if self.__staleSeconds is None or ageSeconds < self.__staleSeconds:
+                if not self.__foreignWarned:
+                    logger.warning("Lock file %s is held by process %d on %s, waiting", self.__lockFilePath, pid, host)
+                    self.__foreignWarned = True
+                return False
+            logger.warning("Breaking lock file %s of process %d on %s, held for %.0f seconds", self.__lockFilePath, pid, host, ageSeconds)
+        return self.__unlinkLockFile()
+
+    def __unlinkLockFile(self):
+        try:
+            os.unlink(self.__lockFilePath)
+        except FileNotFoundError:
+            pass
+        return True
+
+    @staticmethod
+    def __unlockAndClose(fd):
+        try:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, value, traceback):
+        self.release()
+
+    def __del__(self):
+        try:
+            self.release()
+        except Exception:  # pylint: disable=broad-except
+            pass
+
+
 class FileSizeLogger:
     """Drop-in replacement for MessagingIo's FileSizeLogger with dummy path detection.
 
@@ -143,8 +370,10 @@ class FileSizeLogger:
 class LockFile:
     """Drop-in replacement for mmcif_utils.persist.LockFile with dummy path detection.
 
-    Automatically detects dummy paths returned by database adaptors and uses no-op
-    locking operations for them, while preserving real file locking for actual file paths.
+    Automatically detects dummy paths returned by database adaptors and locks the
+    deposition in the messaging database for them (see LockManager.DbLock), while
+    preserving real file locking for actual file paths. Database locks are re-entrant
+    within a thread, so nested LockFile blocks on the same deposition do not deadlock.
 
     Args:
         filePath: Path to file to lock
@@ -152,6 +381,7 @@ class LockFile:
         retrySeconds: Retry interval in seconds (default: 0.2)
         verbose: Enable verbose logging (default: False)
         log: File handle for logging output (default: sys.stderr)
+        site_id: Site whose messaging database holds the lock (default: current site)
 
     Example:
         >>> with LockFile("/path/to/file.txt") as lock:
@@ -160,11 +390,13 @@ class LockFile:
         >>> # Lock is automatically released
 
     Note:
-        Dummy paths (containing '/dummy/' or '\\dummy\\') are detected automatically
-        and locking is skipped for compatibility with database backend.
+        Dummy paths (containing '/dummy/' or '\\dummy\\') are detected automatically.
+        If no deposition ID can be parsed from the path locking is skipped; if the
+        messaging database cannot be used for locking, acquire() fails rather than
+        proceeding without mutual exclusion.
     """
 
-    def __init__(self, filePath, timeoutSeconds=15, retrySeconds=.2, verbose=False, log=sys.stderr):
+    def __init__(self, filePath, timeoutSeconds=15, retrySeconds=.2, verbose=False, log=sys.stderr, site_id=None):
         """
         Initialize LockFile with same interface as original.
 
@@ -174,18 +406,19 @@ class LockFile:
             retrySeconds: Retry interval in seconds (default .2)
             verbose: Enable verbose logging (default False)
             log: File handle for logging (default sys.stderr)
+            site_id: Site whose messaging database holds the lock (default None, i.e. current site)
         """
         self.__filePath = filePath
+        self.__siteId = site_id
         self.__timeoutSeconds = timeoutSeconds
         self.__retrySeconds = retrySeconds
         self.__verbose = verbose
         self.__lfh = log
         self.__debug = False
         self.__isLocked = False
-        self.__lockFilePath = os.path.join(filePath + ".lock")
-        self.__fd = None
         self._is_dummy = self._is_dummy_path(filePath)
-        self._original_lock = None
+        self._file_lock = None
+        self._db_lock = None
 
     def _is_dummy_path(self, file_path):
         """Check if a file path is a dummy path returned by database adaptors.
@@ -214,87 +447,79 @@ class LockFile:
 
         return has_dummy_indicator or is_message_file
 
-    def acquire(self):
-        """Acquire the file lock (no-op for dummy paths).
+    def _get_db_lock(self):
+        """Get the database lock for the deposition referenced by a dummy path.
 
-        Creates a lock file if none exists. If a lock file already exists, retries
-        at retrySeconds intervals until the lock is acquired or timeoutSeconds expires.
+        The lock backend follows the dialect of the messaging database engine (see
+        LockManager.DbLock): MySQL user locks, or a lease table for other databases.
 
-        For dummy paths, this is a no-op that always succeeds immediately.
+        Returns:
+            Unacquired DbLock, or None if no deposition ID is found in the path
 
         Raises:
-            LockFileTimeoutException: If lock cannot be acquired within timeoutSeconds
+            Exception: If the messaging database is not configured or cannot be reached
+        """
+        from wwpdb.apps.msgmodule.db.PdbxMessageIo import _parse_context_from_path, get_db_config
+        from wwpdb.apps.msgmodule.db.DataAccessLayer import DataAccessLayer
+
+        depId, _contentType = _parse_context_from_path(str(self.__filePath))
+        if not depId:
+            return None
+        if self.__siteId is None:
+            from wwpdb.utils.config.ConfigInfo import getSiteId
+            self.__siteId = getSiteId()
+        try:
+            return DataAccessLayer(get_db_config(self.__siteId)).get_deposition_lock(depId, timeout_seconds=self.__timeoutSeconds, retry_seconds=self.__retrySeconds)
+        except Exception as e:
+            logger.error("LockFile(acquire) database lock unavailable for %s: %s", self.__filePath, e)
+            raise
 
-        Note:
-            For real file paths, attempts to use mmcif_utils.persist.LockFile if available,
-            otherwise falls back to local os.open() implementation.
+    def acquire(self):
+        """Acquire the file lock (database lock for dummy paths).
+
+        For real file paths the lock is a FlockLockFile, waiting until the lock is
+        acquired or timeoutSeconds expires. For dummy paths, the deposition is locked
+        in the messaging database instead.
+
+        Raises:
+            LockFileTimeoutException: If lock cannot be acquired within timeoutSeconds
         """
         if self._is_dummy:
-            # No-op for dummy paths
-            if self.__debug and self.__lfh:
+            # Database lock keyed by deposition for dummy paths
+            self._db_lock = self._get_db_lock()
+            if self._db_lock is not None:
+                self._db_lock.acquire()
+            elif self.__debug and self.__lfh:
                 self.__lfh.write("LockFile(acquire) bypassing lock for dummy path %s\n" % self.__filePath)
             self.__isLocked = True
             return
 
         # Use real locking for actual file paths
-        try:
-            from mmcif_utils.persist.LockFile import LockFile as OriginalLockFile
-            self._original_lock = OriginalLockFile(
-                self.__filePath,
-                timeoutSeconds=self.__timeoutSeconds,
-                retrySeconds=self.__retrySeconds,
-                verbose=self.__verbose,
-                log=self.__lfh
-            )
-            self._original_lock.acquire()
-            self.__isLocked = True
-        except ImportError:
-            # Fallback to local implementation if original not available
-            timeBegin = time.time()
-            while True:
-                try:
-                    self.__fd = os.open(self.__lockFilePath, os.O_CREAT | os.O_EXCL | os.O_RDWR)
-                    if self.__debug and self.__lfh:
-                        self.__lfh.write("LockFile(acquire) created lock file %s\n" % self.__lockFilePath)
-                    break
-                except OSError as myErr:
-                    if myErr.errno != errno.EEXIST:
-                        # pass on some unanticipated problem ---
-                        raise
-                    # handle timeout and retry -
-                    if (time.time() - timeBegin) >= self.__timeoutSeconds:
-                        raise LockFileTimeoutException("LockFile(acquire) Internal timeout of %d (seconds) exceeded for %s" %  # pylint: disable=raise-missing-from
-                                                       (self.__timeoutSeconds, self.__filePath))
-                    time.sleep(self.__retrySeconds)
-            self.__isLocked = True
+        self._file_lock = FlockLockFile(self.__filePath, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh)
+        self._file_lock.acquire()
+        self.__isLocked = True
 
     def release(self):
-        """Release the file lock (no-op for dummy paths).
+        """Release the file lock.
 
-        Removes an existing lock file. For dummy paths, this is a no-op.
+        Removes an existing lock file. For dummy paths, releases the database lock.
         """
         if not self.__isLocked:
             return
 
         if self._is_dummy:
-            # No-op for dummy paths
-            if self.__debug and self.__lfh:
+            if self._db_lock is not None:
+                self._db_lock.release()
+                self._db_lock = None
+            elif self.__debug and self.__lfh:
                 self.__lfh.write("LockFile(release) bypassing unlock for dummy path %s\n" % self.__filePath)
             self.__isLocked = False
             return
 
         # Use real unlocking for actual file paths
-        if self._original_lock:
-            self._original_lock.release()
-        else:
-            # Fallback to local implementation
-            if self.__fd is not None:
-                os.close(self.__fd)
-                self.__fd = None
-            if os.path.exists(self.__lockFilePath):
-                os.unlink(self.__lockFilePath)
-            if self.__debug and self.__lfh:
-                self.__lfh.write("LockFile(release) removed lock file %s\n" % self.__lockFilePath)
+        if self._file_lock is not None:
+            self._file_lock.release()
+            self._file_lock = None
         self.__isLocked = False
 
     def __enter__(self):
@@ -0,0 +1,320 @@
+##
+# File: LockManager.py
+# Date: 18-Oct-2026
+#
+# Database-native advisory locks used to serialize updates to the messaging data of a deposition.
+##
+"""
+Database-native advisory locks for the messaging database.
+
+On MySQL locks are taken with GET_LOCK()/RELEASE_LOCK() on a connection held for the lifetime of
+the lock, so the server does the waiting and the lock is dropped automatically if the process dies.
+Other backends (e.g. SQLite used in testing) fall back to a lease table in which a row per lock name
+records the owner and an expiry time, so that a lock left behind by a crashed process is eventually
+reclaimed. While a lease table lock is held its lease is renewed in the background, every third of
+its lifetime, so that only the lock of a process which has died (or hung in the database) expires.
+
+DbLock offers the same acquire()/release()/context manager interface as LockFile and raises
+LockFileTimeoutException on timeout, so it can be used wherever LockFile is used. Locks are
+re-entrant within a thread.
+"""
+
+import logging
+import math
+import os
+import socket
+import threading
+import time
+import uuid
+import hashlib
+import weakref
+from typing import Dict
+
+from sqlalchemy import Column, Float, MetaData, String, Table, delete, insert, text, update
+from sqlalchemy.exc import IntegrityError
+
+from wwpdb.apps.msgmodule.db.LockFile import LockFileTimeoutException
+
+logger = logging.getLogger(__name__)
+
+# MySQL limits user lock names to 64 characters
+_MAX_LOCK_NAME_LENGTH = 64
+
+_leaseMetadata = MetaData()
+_leaseTable = Table(
+    "msgmodule_lock_lease",
+    _leaseMetadata,
+    Column("lock_name", String(_MAX_LOCK_NAME_LENGTH), primary_key=True),
+    Column("owner", String(128), nullable=False),
+    Column("expires_at", Float, nullable=False),
+)
+
+# Engines whose lease table is known to exist
+_leaseTableEngines = weakref.WeakSet()
+_leaseTableLock = threading.Lock()
+
+# Locks held by the current thread: lock key -> [count, DbLock]
+_held = threading.local()
+
+_statsLock = threading.Lock()
+_stats = {"acquired": 0, "timeouts": 0, "total_wait_seconds": 0.0, "max_wait_seconds": 0.0}
+
+
+def getLockStats() -> Dict:
+    """Wait-time metrics for locks acquired by this process.
+
+    Returns:
+        Dict with keys: acquired, timeouts, total_wait_seconds, max_wait_seconds, mean_wait_seconds
+    """
+    with _statsLock:
+        stats = dict(_stats)
+    stats["mean_wait_seconds"] = stats["total_wait_seconds"] / stats["acquired"] if stats["acquired"] else 0.0
+    return stats
+
+
+def resetLockStats() -> None:
+    """Reset the wait-time metrics returned by getLockStats()."""
+    with _statsLock:
+        _stats.update({"acquired": 0, "timeouts": 0, "total_wait_seconds": 0.0, "max_wait_seconds": 0.0})
+
+
+def _recordWait(waitSeconds: float, acquired: bool) -> None:
+    with _statsLock:
+        if acquired:
+            _stats["acquired"] += 1
+            _stats["total_wait_seconds"] += waitSeconds
+            _stats["max_wait_seconds"] = max(_stats["max_wait_seconds"], waitSeconds)
+        else:
+            _stats["timeouts"] += 1
+
+
+def _ensureLeaseTable(engine) -> None:
+    """Create the lease table, once per engine."""
+    with _leaseTableLock:
+        if engine in _leaseTableEngines:
+            return
+        _leaseMetadata.create_all(engine, checkfirst=True)
+        _leaseTableEngines.add(engine)
+
+
+def _heldLocks() -> Dict:
+    if not hasattr(_held, "locks"):
+        _held.locks = {}
+    return _held.locks
+
+
+def _renewLease(engine, lockName: str, owner: str, leaseSeconds: float, stop: threading.Event) -> None:
+    """Extend the lease of a held lease table lock every third of its lifetime until stop is set."""
+    while not stop.wait(leaseSeconds / 3.0):
+        try:
+            with engine.begin() as conn:
+                result = conn.execute(
+                    update(_leaseTable).where(_leaseTable.c.lock_name == lockName, _leaseTable.c.owner == owner).values(expires_at=time.time() + leaseSeconds)
+                )
+            if result.rowcount == 0:
+                logger.error("Lease of lock %s was lost (expired and reclaimed) before it could be renewed", lockName)
+                return
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Problem renewing lease of lock %s", lockName)
+
+
+class DbLock:
+    """Named advisory lock held in the database.
+
+    Args:
+        engine: SQLAlchemy engine for the messaging database
+        lockName: Name of the lock (names longer than 64 characters are hashed)
+        timeoutSeconds: Maximum time to wait for the lock (default: 15)
+        retrySeconds: Polling interval while waiting on a lease table lock (default: 0.2)
+        leaseSeconds: Lifetime of a lease table lock before it may be reclaimed, renewed while
+            the lock is held; not renewed if zero or less (default: 300)
+
+    Example:
+        >>> with DbLock(engine, "msgmodule:D_1000000001", timeoutSeconds=10):
+        ...     pass  # exclusive access to the deposition's messaging data
+
+    Raises:
+        LockFileTimeoutException: If the lock cannot be acquired within timeoutSeconds
+    """
+
+    def __init__(self, engine, lockName: str, timeoutSeconds=15, retrySeconds=0.2, leaseSeconds=300):
+        if len(lockName) > _MAX_LOCK_NAME_LENGTH:
+            lockName = "msgmodule:" + hashlib.sha1(lockName.encode("utf-8")).hexdigest()
+        self.__engine = engine
+        self.__lockName = lockName
+        self.__timeoutSeconds = timeoutSeconds
+        self.__retrySeconds = retrySeconds
+        self.__leaseSeconds = leaseSeconds
+        self.__key = (str(engine.url), lockName)
+        self.__useLease = engine.dialect.name != "mysql"
+        self.__conn = None
+        self.__owner = None
+        self.__renewStop = None
+        self.__renewThread = None
+        self.__isLocked = False
+
+    @property
+    def lockName(self) -> str:
+        """Name of the lock as held in the database."""
+        return self.__lockName
+
+    def acquire(self):
+        """Acquire the lock, waiting up to timeoutSeconds.
+
+        Raises:
+            LockFileTimeoutException: If the lock cannot be acquired within timeoutSeconds
+        """
+        if self.__isLocked:
+            return
+        held = _heldLocks()
+        if self.__key in held:
+            # re-entrant acquisition by the thread already holding the lock
+            held[self.__key][0] += 1
+            self.__isLocked = True
+            return
+
+        startTime = time.time()
+        if self.__useLease:
+            acquired = self.__acquireLease(startTime)
+        else:
+            acquired = self.__acquireMysql()
+        waitSeconds = time.time() - startTime
+        _recordWait(waitSeconds, acquired)
+
+        if not acquired:
+            logger.warning("Timed out after %.2f seconds waiting for lock %s", waitSeconds, self.__lockName)
+            raise LockFileTimeoutException("DbLock(acquire) Internal timeout of %d (seconds) exceeded for %s" % (self.__timeoutSeconds, self.__lockName))
+
+        if waitSeconds > 1.0:
+            logger.info("Acquired lock %s after waiting %.2f seconds", self.__lockName, waitSeconds)
+        else:
+            logger.debug("Acquired lock %s after waiting %.3f seconds", self.__lockName, waitSeconds)
+        # the instance which took the lock in the database releases it, whichever instance is released last
+        held[self.__key] = [1, self]
+        self.__isLocked = True
+
+    def release(self):
+        """Release the lock if held by this instance.
+
+        The lock is released in the database when the last of the thread's re-entrant
+        acquisitions is released, in whichever order they are released.
+        """
+        if not self.__isLocked:
+            return
+        self.__isLocked = False
+        held = _heldLocks()
+        entry = held.get(self.__key)
+        if entry is None:
+            return
+        entry[0] -= 1
+        if entry[0] > 0:
+            return
+        del held[self.__key]
+        entry[1].__releaseHeld()
+
+    def __releaseHeld(self):
+        """Give up the lock taken in the database by this instance."""
+        if self.__renewStop is not None:
+            self.__renewStop.set()
+            self.__renewThread.join()
+            self.__renewStop = self.__renewThread = None
+        conn, self.__conn = self.__conn, None
+        owner, self.__owner = self.__owner, None
+        try:
+            if conn is not None:
+                if conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": self.__lockName}).scalar() != 1:
+                    logger.warning("Lock %s was no longer held by its connection when released", self.__lockName)
+            elif owner is not None:
+                with self.__engine.begin() as leaseConn:
+                    result = leaseConn.execute(delete(_leaseTable).where(_leaseTable.c.lock_name == self.__lockName, _leaseTable.c.owner == owner))
+                if result.rowcount == 0:
+                    logger.error("Lease of lock %s expired and was reclaimed while the lock was held", self.__lockName)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Problem releasing lock %s", self.__lockName)
+            if conn is not None:
+                # the user lock may still be held - discard the connection (which drops the lock
+                # on the server) rather than return it to the pool with the lock
+                conn.invalidate()
+        finally:
+            if conn is not None:
+                # returns the connection to the pool, or closes it if invalidated
+                conn.close()
+
+    def __acquireMysql(self) -> bool:
+        conn = self.__engine.connect()
+        try:
+            result = conn.execute(
+                text("SELECT GET_LOCK(:name, :timeout)"), {"name": self.__lockName, "timeout": int(math.ceil(self.__timeoutSeconds))}
+            ).scalar()
+        except Exception:
+            conn.close()
+            raise
+        if result == 1:
+            self.__conn = conn
+            return True
+        conn.close()
+        return False
+
+    def __acquireLease(self, startTime: float) -> bool:
+        _ensureLeaseTable(self.__engine)
+        owner = "%s:%d:%s" % (socket.gethostname(), os.getpid(), uuid.uuid4().hex)
+        while True:
+            now = time.time()
+            try:
+                with self.__engine.begin() as conn:
+                    conn.execute(delete(_leaseTable).where(_leaseTable.c.lock_name == self.__lockName, _leaseTable.c.expires_at < now))
+                    conn.execute(insert(_leaseTable).values(lock_name=self.__lockName, owner=owner, expires_at=now + self.__leaseSeconds))
+                self.__owner = owner
+                if self.__leaseSeconds > 0:
+                    self.__renewStop = threading.Event()
+                    self.__renewThread = threading.Thread(
+                        target=_renewLease, args=(self.__engine, self.__lockName, owner, self.__leaseSeconds, self.__renewStop),
+                        name="lease-renewal:%s" % self.__lockName, daemon=True,
+                    )
+                    self.__renewThread.start()
+                return True
+            except IntegrityError:
+                pass
+            if (time.time() - startTime) >= self.__timeoutSeconds:
+                return False
+            time.sleep(self.__retrySeconds)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+    def __del__(self):
+        try:
+            self.release()
+        except Exception:  # pylint: disable=broad-except
+            pass
+
+
+class LockManager:
+    """Factory for per-deposition database locks.
+
+    Args:
+        engine: SQLAlchemy engine for the messaging database
+    """
+
+    def __init__(self, engine):
+        self.__engine = engine
+        if engine.dialect.name != "mysql":
+            # one-time setup of the lease table backend
+            _ensureLeaseTable(engine)
+
+    def getDepositionLock(self, depositionId: str, timeoutSeconds=15, retrySeconds=0.2) -> DbLock:
+        """Lock serializing updates to the messaging data of a deposition.
+
+        Args:
+            depositionId: Deposition dataset ID (e.g., 'D_1000000001')
+            timeoutSeconds: Maximum time to wait for the lock
+            retrySeconds: Polling interval where the backend requires polling
+
+        Returns:
+            DbLock: Unacquired lock, to be used as a context manager
+        """
+        return DbLock(self.__engine, "msgmodule:%s" % depositionId, timeoutSeconds=timeoutSeconds, retrySeconds=retrySeconds)
@@ -0,0 +1,119 @@
+##
+# File: MessageThreads.py
+# Date: 18-Oct-2026
+#
+# Materialized thread path computation for message rows.
+##
+"""
+Materialized message thread structure.
+
+Each message row carries the message_id of the root of its thread (thread_root_id), its depth below
+that root (thread_depth, 0 for a root) and a sortable materialized path (thread_path).  The path is the
+parent's path followed by a fixed width segment made of the message timestamp and ordinal_id, so that
+ordering a deposition's messages by thread_path yields the threaded display order - every message
+directly after its parent, replies to the same message in chronological order, threads in order of
+their root message.
+
+A message is a thread root when its parent_message_id is empty or its own message_id (the convention
+used when storing messages), or when the parent is not a message of the same deposition.
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+THREAD_PATH_SEPARATOR = "/"
+THREAD_PATH_MAX_LENGTH = 512
+_SEGMENT_TIMESTAMP_FORMAT = "%Y%m%d%H%M%S"
+
+
+def thread_segment(timestamp, ordinal_id: int) -> str:
+    """Path segment for one message.
+
+    Args:
+        timestamp: Message timestamp (datetime, or string in "%Y-%m-%d %H:%M:%S" form)
+        ordinal_id (int): Message ordinal, breaks ties between messages with equal timestamps
+
+    Returns:
+        str: 24 character segment, e.g. '202610181000000000000042'
+    """
+    if isinstance(timestamp, datetime):
+        ts = timestamp.strftime(_SEGMENT_TIMESTAMP_FORMAT)
+    else:
+        ts = "".join(ch for ch in str(timestamp or "") if ch.isdigit())[:14].ljust(14, "0")
+    return "%s%010d" % (ts, int(ordinal_id or 0))
+
+
+def is_thread_root(message_id: str, parent_message_id: Optional[str]) -> bool:
+    """Whether a message starts a thread, judged from its own parent reference only."""
+    return not parent_message_id or parent_message_id == message_id
+
+
+def child_thread_columns(message_id: str, timestamp, ordinal_id: int,
+                         parent: Optional[Tuple[str, int, str]]) -> Optional[Tuple[str, int, str]]:
+    """Thread columns for a message, given the thread columns of its parent.
+
+    Args:
+        message_id (str): Message ID
+        timestamp: Message timestamp
+        ordinal_id (int): Message ordinal
+        parent (tuple, optional): Parent's (thread_root_id, thread_depth, thread_path), None for a thread root
+
+    Returns:
+        tuple: (thread_root_id, thread_depth, thread_path), or None if the path would exceed THREAD_PATH_MAX_LENGTH
+    """
+    segment = thread_segment(timestamp, ordinal_id)
+    if parent is None:
+        return (message_id, 0, segment)
+    path = parent[2] + THREAD_PATH_SEPARATOR + segment
+    if len(path) > THREAD_PATH_MAX_LENGTH:
+        return None
+    return (parent[0], parent[1] + 1, path)
+
+
+def compute_thread_columns(rows: Iterable) -> Dict[str, Optional[Tuple[str, int, str]]]:
+    """Compute the thread columns of all messages of a deposition.
+
+    Args:
+        rows: Mappings with message_id, parent_message_id, timestamp and ordinal_id for every
+            message of the deposition
+
+    Returns:
+        Dict[str, tuple]: message_id -> (thread_root_id, thread_depth, thread_path); None where the
+        path would exceed THREAD_PATH_MAX_LENGTH. Reference cycles are broken by treating the
+        message where the cycle is detected as a thread root.
+    """
+    rowD = {row["message_id"]: row for row in rows}
+    columnD: Dict[str, Optional[Tuple[str, int, str]]] = {}
+
+    for message_id in rowD:
+        if message_id in columnD:
+            continue
+        # walk up to a thread root or to the nearest ancestor with known columns
+        chain: List[str] = []
+        seen = set()
+        current = message_id
+        has_parent = False
+        parent = None
+        while True:
+            seen.add(current)
+            chain.append(current)
+            parent_id = rowD[current]["parent_message_id"]
+            if is_thread_root(current, parent_id) or parent_id not in rowD or parent_id in seen:
+                break
+            if parent_id in columnD:
+                has_parent = True
+                parent = columnD[parent_id]
+                break
+            current = parent_id
+
+        # then fill in the columns on the way back down
+        for msg_id in reversed(chain):
+            if has_parent and parent is None:
+                columnD[msg_id] = None
+                continue
+            row = rowD[msg_id]
+            parent = child_thread_columns(msg_id, row["timestamp"], row["ordinal_id"], parent)
+            columnD[msg_id] = parent
+            has_parent = True
+
+    return columnD
@@ -8,11 +8,14 @@ the CIF structure used by the PDBx/mmCIF format:
 - **pdbx_deposition_message_file_reference** - File attachment metadata
 - **pdbx_deposition_message_status** - Message status tracking
 
+plus **deposition_message_summary**, derived per-deposition facts maintained alongside them, and
+**msgmodule_job**, the queue of message submissions run in the background (see util/JobRunner.py).
+
 The models use SQLAlchemy ORM to provide a Pythonic interface while maintaining
 exact correspondence with the mmCIF category definitions.
 """
 
-from sqlalchemy import Column, String, Text, DateTime, Integer, ForeignKey, CHAR, Enum, BigInteger, UniqueConstraint
+from sqlalchemy import Column, String, Text, DateTime, Integer, ForeignKey, CHAR, Enum, BigInteger, UniqueConstraint, Index, Boolean
 from sqlalchemy.dialects.mysql import LONGTEXT
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -47,6 +50,14 @@ class MessageInfo(Base):
             - 'notes-from-annotator': Internal annotator notes
         created_at (DateTime): Record creation timestamp (indexed)
         updated_at (DateTime): Record last update timestamp
+        thread_root_id (String): message_id of the first message of the thread (indexed)
+        thread_depth (Integer): Number of replies between the thread root and this message (0 for a root)
+        thread_path (String): Sortable materialized path of the message in its thread, see MessageThreads
+            (indexed together with deposition_data_set_id)
+
+    Composite indexes:
+        (deposition_data_set_id, content_type, timestamp): per-deposition listings by content type
+        (deposition_data_set_id, updated_at): covers the per-deposition version stamp (count/max)
 
     Relationships:
         status: One-to-one relationship with MessageStatus
@@ -58,7 +69,7 @@ class MessageInfo(Base):
     __tablename__ = 'pdbx_deposition_message_info'
 
     # Database columns - exactly matching mmCIF attributes
-    ordinal_id = Column(BigInteger, primary_key=True, autoincrement=True)
+    ordinal_id = Column(BigInteger().with_variant(Integer, 'sqlite'), primary_key=True, autoincrement=True)
     message_id = Column(String(64), unique=True, nullable=False, index=True)
     deposition_data_set_id = Column(String(50), nullable=False, index=True)
     timestamp = Column(DateTime, nullable=False, index=True)
@@ -67,13 +78,24 @@ class MessageInfo(Base):
     context_value = Column(String(255), nullable=True)
     parent_message_id = Column(String(64), ForeignKey('pdbx_deposition_message_info.message_id'), nullable=True, index=True)
     message_subject = Column(Text, nullable=False)
-    message_text = Column(LONGTEXT, nullable=False)
+    message_text = Column(Text().with_variant(LONGTEXT, 'mysql'), nullable=False)
     message_type = Column(String(20), nullable=True, default='text')
     send_status = Column(CHAR(1), nullable=True, default='Y')
     content_type = Column(Enum('messages-to-depositor', 'messages-from-depositor', 'notes-from-annotator', name='content_type_enum'), nullable=False, index=True)
     created_at = Column(DateTime, nullable=True, default=func.current_timestamp(), index=True)
     updated_at = Column(DateTime, nullable=True, default=func.current_timestamp(), onupdate=func.current_timestamp())
 
+    # Materialized thread structure, maintained when messages are stored (not part of the mmCIF category)
+    thread_root_id = Column(String(64), nullable=True, index=True)
+    thread_depth = Column(Integer, nullable=True)
+    thread_path = Column(String(512), nullable=True)
+
+    __table_args__ = (
+        Index('idx_deposition_thread_path', 'deposition_data_set_id', 'thread_path'),
+        Index('idx_deposition_content_timestamp', 'deposition_data_set_id', 'content_type', 'timestamp'),
+        Index('idx_deposition_updated_at', 'deposition_data_set_id', 'updated_at'),
+    )
+
     # Relationships
     status = relationship("MessageStatus", back_populates="message", uselist=False, cascade="all, delete-orphan")
     file_references = relationship("MessageFileReference", back_populates="message", cascade="all, delete-orphan")
@@ -111,7 +133,7 @@ class MessageFileReference(Base):
     __tablename__ = 'pdbx_deposition_message_file_reference'
 
     # Database columns - exactly matching mmCIF attributes
-    ordinal_id = Column(BigInteger, primary_key=True, autoincrement=True)
+    ordinal_id = Column(BigInteger().with_variant(Integer, 'sqlite'), primary_key=True, autoincrement=True)
     message_id = Column(String(64), ForeignKey('pdbx_deposition_message_info.message_id'), nullable=False, index=True)
     deposition_data_set_id = Column(String(50), nullable=False, index=True)
     content_type = Column(String(50), nullable=False, index=True)
@@ -153,6 +175,10 @@ class MessageStatus(Base):
         created_at (DateTime): Record creation timestamp
         updated_at (DateTime): Record last update timestamp
 
+    Composite indexes:
+        (deposition_data_set_id, read_status, action_reqd, for_release): covers per-deposition
+        status counts, which are then answered from the index alone
+
     Relationships:
         message: One-to-one relationship with MessageInfo
 
@@ -170,5 +196,111 @@ class MessageStatus(Base):
     created_at = Column(DateTime, nullable=True, default=func.current_timestamp())
     updated_at = Column(DateTime, nullable=True, default=func.current_timestamp(), onupdate=func.current_timestamp())
 
+    __table_args__ = (
+        Index('idx_status_deposition_flags', 'deposition_data_set_id', 'read_status', 'action_reqd', 'for_release'),
+    )
+
     # Relationships
     message = relationship("MessageInfo", back_populates="status")
+
+
+class DepositionMessageSummary(Base):
+    """Per-deposition summary of the messaging data (not an mmCIF category).
+
+    Holds the facts otherwise recomputed by scanning all messages of a deposition (last message dates,
+    status counts, notes, dates of reminders, unlocks and validation letters). The row is recomputed in
+    the same transaction as every message, file reference and status write of the deposition, see
+    DepositionSummary; scripts/rebuild_message_summaries.py repairs rows which have drifted.
+
+    Attributes:
+        deposition_data_set_id (String): Deposition ID (primary key)
+        num_messages_to_depositor (Integer): Number of messages to the depositor
+        num_messages_from_depositor (Integer): Number of messages from the depositor
+        num_notes (Integer): Number of notes, including messages archived to notes
+        num_annotator_notes (Integer): Number of notes other than archived messages
+        num_flagged_notes (Integer): Number of notes whose message_type requests flagging (e.g. BMRB notes)
+        num_unread (Integer): Messages from the depositor not marked as read
+        num_unactioned (Integer): Messages from the depositor not marked as not requiring action
+        num_for_release (Integer): Messages to or from the depositor flagged for release
+        num_without_status (Integer): Messages from the depositor without a status record
+        last_sent_at (DateTime): Latest sent message to the depositor
+        last_received_at (DateTime): Latest message from the depositor
+        last_auto_reminder_at (DateTime): Latest automatic reminder (in notes)
+        last_manual_reminder_at (DateTime): Latest reminder message to the depositor
+        last_release_notice_at (DateTime): Latest release notice
+        last_unlock_at (DateTime): Latest "System Unlocked" message
+        last_validation_at (DateTime): Latest validation letter
+        last_validation_major (Boolean): Whether the latest validation letter reported major issues
+        updated_at (DateTime): When the row was last recomputed
+
+    Table:
+        deposition_message_summary
+    """
+    __tablename__ = 'deposition_message_summary'
+
+    deposition_data_set_id = Column(String(50), primary_key=True)
+    num_messages_to_depositor = Column(Integer, nullable=False, default=0)
+    num_messages_from_depositor = Column(Integer, nullable=False, default=0)
+    num_notes = Column(Integer, nullable=False, default=0)
+    num_annotator_notes = Column(Integer, nullable=False, default=0)
+    num_flagged_notes = Column(Integer, nullable=False, default=0)
+    num_unread = Column(Integer, nullable=False, default=0)
+    num_unactioned = Column(Integer, nullable=False, default=0)
+    num_for_release = Column(Integer, nullable=False, default=0)
+    num_without_status = Column(Integer, nullable=False, default=0)
+    last_sent_at = Column(DateTime, nullable=True)
+    last_received_at = Column(DateTime, nullable=True)
+    last_auto_reminder_at = Column(DateTime, nullable=True)
+    last_manual_reminder_at = Column(DateTime, nullable=True)
+    last_release_notice_at = Column(DateTime, nullable=True)
+    last_unlock_at = Column(DateTime, nullable=True)
+    last_validation_at = Column(DateTime, nullable=True)
+    last_validation_major = Column(Boolean, nullable=True)
+    updated_at = Column(DateTime, nullable=True, default=func.current_timestamp(), onupdate=func.current_timestamp())
+
+
+class MessageJob(Base):
+    """Message submission run in the background (not an mmCIF category).
+
+    Jobs are queued by the web application and run by the process pool of util/JobRunner.py. A job is
+    claimed by moving it from 'queued' to 'running' with a conditional update, so that it runs at most
+    once however often it is dispatched. The idempotency key supplied by the client is unique per
+    deposition and kind of job: a retried submission finds the job of the first one rather than
+    queuing the work again. (For jobs without a deposition the key is only checked by lookup, as
+    NULL columns are not compared by unique keys.)
+
+    Attributes:
+        job_id (String): Job identifier (UUID, primary key)
+        job_type (String): Kind of job, e.g. 'submit_msg' or 'auto_msg'
+        idempotency_key (String): Client supplied token identifying the submission (optional, unique with
+            deposition_data_set_id and job_type)
+        deposition_data_set_id (String): Deposition the job concerns, if any (indexed)
+        status (String): One of 'queued', 'running', 'succeeded', 'failed' (indexed)
+        payload (LONGTEXT): Job parameters (JSON)
+        result (LONGTEXT): Result of a finished job (JSON)
+        error (Text): Error of a failed job
+        created_at (DateTime): When the job was queued
+        started_at (DateTime): When the job was claimed by a worker
+        finished_at (DateTime): When the job finished
+
+    Table:
+        msgmodule_job
+    """
+    __tablename__ = 'msgmodule_job'
+
+    job_id = Column(String(36), primary_key=True)
+    job_type = Column(String(32), nullable=False)
+    idempotency_key = Column(String(128), nullable=True)
+    deposition_data_set_id = Column(String(50), nullable=True, index=True)
+    status = Column(String(16), nullable=False, default='queued')
+    payload = Column(Text().with_variant(LONGTEXT, 'mysql'), nullable=False)
+    result = Column(Text().with_variant(LONGTEXT, 'mysql'), nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint('deposition_data_set_id', 'job_type', 'idempotency_key', name='uq_job_idempotency_key'),
+        Index('idx_job_status_created', 'status', 'created_at'),
+    )
@@ -20,6 +20,8 @@ from wwpdb.utils.config.ConfigInfo import ConfigInfo
 
 from wwpdb.apps.msgmodule.db.DataAccessLayer import DataAccessLayer
 from wwpdb.apps.msgmodule.db.Models import MessageInfo as ORMMessageInfo, MessageFileReference as ORMFileRef, MessageStatus as ORMStatus
+from wwpdb.apps.msgmodule.models.MessageRecord import MessageRecord
+from wwpdb.apps.msgmodule.util.SiteRegistry import getSiteInstance, getSiteValue
 
 from wwpdb.io.locator.PathInfo import PathInfo
 
@@ -89,6 +91,37 @@ def _parse_context_from_path(file_path: str) -> Tuple[Optional[str], Optional[st
     return None, None
 
 
+def get_db_config(site_id: str) -> Dict:
+    """Read the messaging database configuration for a site from ConfigInfo.
+
+    The configuration is read once per site and process (see SiteRegistry.reload()).
+
+    Args:
+        site_id: WWPDB site identifier
+
+    Returns:
+        Dict with keys host, port, database, username, password, charset and, if configured, unix_socket.
+        Values which are not configured are None.
+    """
+    return dict(getSiteValue(site_id, "messaging_db_config", lambda: _read_db_config(site_id)))
+
+
+def _read_db_config(site_id: str) -> Dict:
+    cI = getSiteInstance(ConfigInfo, site_id)
+    db_config = {
+        "host": cI.get("SITE_MESSAGE_DB_HOST_NAME"),
+        "port": int(cI.get("SITE_MESSAGE_DB_PORT_NUMBER", "3306")),
+        "database": cI.get("SITE_MESSAGE_DB_NAME"),
+        "username": cI.get("SITE_MESSAGE_DB_USER_NAME"),
+        "password": cI.get("SITE_MESSAGE_DB_PASSWORD", ""),
+        "charset": "utf8mb4",
+    }
+    socket = cI.get("SITE_MESSAGE_DB_SOCKET")  # Optional socket parameter
+    if socket:
+        db_config["unix_socket"] = socket
+    return db_config
+
+
 def _fmt_ts(ts) -> str:
     """Format timestamp to string representation.
 
@@ -105,6 +138,25 @@ def _fmt_ts(ts) -> str:
     return ""
 
 
+def _message_dict(m) -> Dict:
+    """Message row (mapping) as dictionary compatible with the CIF backend (see getMessageInfo())."""
+    return {
+        "ordinal_id": m["ordinal_id"],
+        "message_id": m["message_id"],
+        "deposition_data_set_id": m["deposition_data_set_id"],
+        "timestamp": _fmt_ts(m["timestamp"]),
+        "sender": m["sender"],
+        "context_type": m["context_type"],
+        "context_value": m["context_value"],
+        "parent_message_id": m["parent_message_id"],
+        "message_subject": m["message_subject"],
+        "message_text": m["message_text"],
+        "message_type": m["message_type"],
+        "send_status": m["send_status"],
+        "content_type": m["content_type"],
+    }
+
+
 def _parse_ts(ts_str: Optional[str]) -> datetime:
     """Parse timestamp string to datetime object.
 
@@ -178,51 +230,30 @@ class PdbxMessageIo:
         if self.__verbose:
             self.__lfh.write("PdbxMessageIo: Using site_id: %r\n" % self.__site_id)
         if not db_config:
-            cI = ConfigInfo(self.__site_id)
-
-            # Debug configuration values
-            host = cI.get("SITE_MESSAGE_DB_HOST_NAME")
-            port = cI.get("SITE_MESSAGE_DB_PORT_NUMBER", "3306")
-            database = cI.get("SITE_MESSAGE_DB_NAME")
-            username = cI.get("SITE_MESSAGE_DB_USER_NAME")
-            password = cI.get("SITE_MESSAGE_DB_PASSWORD", "")
-            socket = cI.get("SITE_MESSAGE_DB_SOCKET")  # Optional socket parameter
+            db_config = get_db_config(self.__site_id)
 
             if self.__verbose:
                 self.__lfh.write("PdbxMessageIo: Database config for site_id=%s:\n" % self.__site_id)
-                self.__lfh.write("  SITE_MESSAGE_DB_HOST_NAME: %s\n" % host)
-                self.__lfh.write("  SITE_MESSAGE_DB_PORT_NUMBER: %s\n" % port)
-                self.__lfh.write("  SITE_MESSAGE_DB_NAME: %s\n" % database)
-                self.__lfh.write("  SITE_MESSAGE_DB_USER_NAME: %s\n" % username)
-                self.__lfh.write("  SITE_MESSAGE_DB_PASSWORD: %s\n" % ('***' if password else 'None'))
-                if socket:
-                    self.__lfh.write("  SITE_MESSAGE_DB_SOCKET: %s\n" % socket)
-
-            db_config = {
-                "host": host,
-                "port": int(port),
-                "database": database,
-                "username": username,
-                "password": password,
-                "charset": "utf8mb4",
-            }
-
-            # Add socket if specified
-            if socket:
-                db_config["unix_socket"] = socket
+                self.__lfh.write("  SITE_MESSAGE_DB_HOST_NAME: %s\n" % db_config["host"])
+                self.__lfh.write("  SITE_MESSAGE_DB_PORT_NUMBER: %s\n" % db_config["port"])
+                self.__lfh.write("  SITE_MESSAGE_DB_NAME: %s\n" % db_config["database"])
+                self.__lfh.write("  SITE_MESSAGE_DB_USER_NAME: %s\n" % db_config["username"])
+                self.__lfh.write("  SITE_MESSAGE_DB_PASSWORD: %s\n" % ('***' if db_config["password"] else 'None'))
+                if db_config.get("unix_socket"):
+                    self.__lfh.write("  SITE_MESSAGE_DB_SOCKET: %s\n" % db_config["unix_socket"])
 
             # Validate critical configuration
-            if not host:
+            if not db_config["host"]:
                 if self.__verbose:
                     self.__lfh.write("PdbxMessageIo: ERROR - SITE_MESSAGE_DB_HOST_NAME not configured for site_id=%s\n" % self.__site_id)
                 raise ValueError(f"Database host not configured for site_id={self.__site_id}. Check SITE_MESSAGE_DB_HOST_NAME in ConfigInfo.")
 
-            if not database:
+            if not db_config["database"]:
                 if self.__verbose:
                     self.__lfh.write("PdbxMessageIo: ERROR - SITE_MESSAGE_DB_NAME not configured for site_id=%s\n" % self.__site_id)
                 raise ValueError(f"Database name not configured for site_id={self.__site_id}. Check SITE_MESSAGE_DB_NAME in ConfigInfo.")
 
-            if not username:
+            if not db_config["username"]:
                 if self.__verbose:
                     self.__lfh.write("PdbxMessageIo: ERROR - SITE_MESSAGE_DB_USER_NAME not configured for site_id=%s\n" % self.__site_id)
                 raise ValueError(f"Database username not configured for site_id={self.__site_id}. Check SITE_MESSAGE_DB_USER_NAME in ConfigInfo.")
@@ -246,6 +277,11 @@ class PdbxMessageIo:
         self._loaded_file_refs: List[Dict] = []
         self._loaded_statuses: List[Dict] = []
         self._loaded_origcomm_refs: List[Dict] = []  # no DB persistence in current schema
+        # Typed records for the loaded messages, built from the fetched rows on load (see getMessageRecords())
+        self._loaded_records: List[MessageRecord] = []
+
+        # History for the current context is only loaded when first requested (see _ensure_loaded())
+        self._history_loaded = False
 
         # Pending (to be committed on write())
         self._pending_messages: List[Dict] = []
@@ -299,11 +335,12 @@ class PdbxMessageIo:
     # --------- Query (read) API ---------
 
     def read(self, filePath: str, logtag: str = "", deposition_id: str = None) -> bool:
-        """Select deposition context and load existing messages from database.
+        """Select deposition context for subsequent operations.
 
-        Sets the current deposition ID and content type context by parsing the file path,
-        then loads all matching messages, file references, and status records from the
-        database. Subsequent get* and append* operations work within this context.
+        Sets the current deposition ID and content type context by parsing the file path.
+        Existing messages, file references, and status records are loaded from the database
+        the first time one of the get*/update methods needs them, so callers which only
+        append (e.g. sending a new message) never read the deposition history.
 
         Args:
             filePath: File path to parse for context. Supported formats:
@@ -318,6 +355,9 @@ class PdbxMessageIo:
         Note:
             The file path is used only for context parsing - no actual file I/O occurs.
             All data is loaded from the database based on the parsed deposition ID and content type.
+
+        Raises:
+            ValueError: If no deposition ID could be determined
         """
         dep_id, content_type = _parse_context_from_path(filePath)
 
@@ -334,9 +374,15 @@ class PdbxMessageIo:
             logger.info("DB MessageIo read() filePath=%s dep_id=%s content_type=%s logtag=%s",
                         filePath, self._deposition_id, self._content_type, logtag)
 
-        # Always try to load from DB, even if no deposition_id
-        # _load_from_db() will handle the no-deposition case gracefully
-        self._load_from_db()
+        if not self._deposition_id:
+            error_msg = (
+                f"DB read: FATAL - No deposition_id specified (content_type={self._content_type}). "
+                "Cannot load messages without deposition context."
+            )
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        self._history_loaded = False
         return True
 
     def getCategory(self, catName: str = "pdbx_deposition_message_info") -> List[Dict]:
@@ -372,8 +418,122 @@ class PdbxMessageIo:
             timestamp, sender, context_type, context_value, parent_message_id, message_subject,
             message_text, message_type, send_status, content_type
         """
+        self._ensure_loaded()
         return list(self._loaded_messages)
 
+    def getMessageRecords(self) -> List[MessageRecord]:
+        """Get the loaded messages for the current context as typed records.
+
+        Records are built once per load, directly from the fetched rows, so timestamps are
+        parsed a single time rather than on every sort or comparison.
+
+        Returns:
+            List of MessageRecord objects in the same order as getMessageInfo()
+        """
+        self._ensure_loaded()
+        return list(self._loaded_records)
+
+    def getDataVersion(self, includeStatuses: bool = False) -> Optional[tuple]:
+        """Get a version stamp of the stored messages of the current deposition (all content types).
+
+        The stamp changes whenever a message of the deposition is added, changed or removed, and is
+        obtained with a single aggregate query, without loading the history.
+
+        Args:
+            includeStatuses: Also change the stamp with the message statuses (one more aggregate query)
+
+        Returns:
+            Hashable version stamp, or None if it could not be determined
+        """
+        if not self._deposition_id:
+            return None
+        return self._dal.get_deposition_version(self._deposition_id, include_statuses=includeStatuses)
+
+    def getDepositionSummary(self) -> Optional[Dict]:
+        """Get the stored message summary of the current deposition (all content types).
+
+        The summary (see DepositionMessageSummary) is maintained with every write and read with a
+        single primary key lookup, without loading the history.
+
+        Returns:
+            Dict of summary columns, or None if the deposition has no summary row
+        """
+        if not self._deposition_id:
+            return None
+        return self._dal.get_deposition_summary(self._deposition_id)
+
+    def getLastMessageByContextType(self, contentType: str, contextTypes: List[str]) -> Optional[Dict]:
+        """Get the last message (by ordinal) of a content type with one of the given context types, for the current deposition.
+
+        Returns:
+            Dict with keys timestamp (datetime) and context_value, or None if no message matches
+        """
+        if not self._deposition_id:
+            return None
+        row = self._dal.get_last_message_by_context_type(self._deposition_id, contentType, contextTypes)
+        return {"timestamp": row.timestamp, "context_value": row.context_value} if row is not None else None
+
+    def getLastMessageDateBySubject(self, contentType: str, phrase: str) -> Optional[datetime]:
+        """Get the date of the last message (by ordinal) of a content type whose subject contains phrase, for the current deposition.
+
+        Returns:
+            datetime, or None if no message matches
+        """
+        if not self._deposition_id:
+            return None
+        return self._dal.get_last_message_date_by_subject(self._deposition_id, contentType, phrase)
+
+    def getLastValidationLetter(self) -> Optional[Dict]:
+        """Get the last validation letter sent to the depositor of the current deposition: the latest sent message
+        with a validation report attached and a validation letter subject.
+
+        Returns:
+            Dict with keys timestamp (datetime) and message_text, or None if no letter was sent
+        """
+        if not self._deposition_id:
+            return None
+        row = self._dal.get_last_validation_letter(self._deposition_id)
+        return {"timestamp": row.timestamp, "message_text": row.message_text or ""} if row is not None else None
+
+    def getLastSentDates(self, depositionIds: List[str], contentType: str) -> Dict[str, Optional[datetime]]:
+        """Get the date of the latest sent message of a content type for many depositions with one grouped query.
+
+        Independent of the current context.
+
+        Args:
+            depositionIds: Deposition IDs
+            contentType: 'messages-to-depositor' or 'messages-from-depositor'
+
+        Returns:
+            Dict of deposition ID -> datetime, None for depositions without a sent message
+        """
+        datesD = self._dal.get_last_sent_dates(depositionIds, contentType)
+        return {depId: datesD.get(depId) for depId in depositionIds}
+
+    def getLastUnlockDates(self, depositionIds: List[str]) -> Dict[str, Optional[datetime]]:
+        """Get the date of the last "System Unlocked" message for many depositions with one grouped query.
+
+        Independent of the current context.
+
+        Returns:
+            Dict of deposition ID -> datetime, None for depositions never unlocked
+        """
+        datesD = self._dal.get_last_unlock_dates(depositionIds)
+        return {depId: datesD.get(depId) for depId in depositionIds}
+
+    def getPendingDepositorMessages(self, depositionIds: List[str]) -> Dict[str, List[Dict]]:
+        """Get the messages from the depositor still requiring action for many depositions with one query.
+
+        Independent of the current context.
+
+        Returns:
+            Dict of deposition ID -> list of message dictionaries as returned by getMessageInfo()
+        """
+        pendingD = {depId: [] for depId in depositionIds}
+        for m in self._dal.get_pending_depositor_message_rows(depositionIds):
+            pendingD[m.deposition_data_set_id].append(_message_dict(m._mapping))
+        return pendingD
+
     def getFileReferenceInfo(self) -> List[Dict]:
         """Get all file reference rows loaded from database for current context.
 
@@ -382,6 +542,7 @@ class PdbxMessageIo:
             deposition_data_set_id, content_type, content_format, partition_number,
             version_id, storage_type, upload_file_name
         """
+        self._ensure_loaded()
         return list(self._loaded_file_refs)
 
     def getOrigCommReferenceInfo(self) -> List[Dict]:
@@ -400,6 +561,7 @@ class PdbxMessageIo:
             List of status dictionaries with keys: message_id, deposition_data_set_id,
             read_status, action_reqd, for_release
         """
+        self._ensure_loaded()
         return list(self._loaded_statuses)
 
     # --------- Mutation API (append/update) ---------
@@ -427,6 +589,7 @@ class PdbxMessageIo:
             For status updates, automatically ensures the row is added to pending
             writes even if it wasn't originally in the pending list.
         """
+        self._ensure_loaded()
         loaded_target = None
         pending_target = None
 
@@ -448,6 +611,12 @@ class PdbxMessageIo:
 
         # Update the loaded row
         loaded_target[iRow][attributeName] = value
+        if catName == "pdbx_deposition_message_info":
+            oldRecord = self._loaded_records[iRow]
+            record = MessageRecord.fromDict(loaded_target[iRow])
+            record.updated_at = oldRecord.updated_at
+            record.thread_root_id, record.thread_depth, record.thread_path = oldRecord.thread_root_id, oldRecord.thread_depth, oldRecord.thread_path
+            self._loaded_records[iRow] = record
 
         # For status updates, we need to ensure the row gets written to DB
         if catName == "pdbx_deposition_message_status":
@@ -534,12 +703,35 @@ class PdbxMessageIo:
         self._pending_statuses.append(dict(rowAttribDict))
         return True
 
+    def bulkUpdateMsgStatus(self, changes: List[Dict], keep_unread: bool = False) -> Dict[str, str]:
+        """Apply status changes for many messages of the current deposition in one transaction.
+
+        Unlike appendMsgReadStatus()/update(), the changes are committed immediately with a
+        single multi-row upsert rather than being held until write().
+
+        Args:
+            changes: List of dictionaries with message_id and any of read_status,
+                action_reqd, for_release ('Y' or 'N')
+            keep_unread: Keep the read_status of existing unread statuses (see MessageStatusDAO.bulk_upsert)
+
+        Returns:
+            Outcome per message_id: 'created', 'updated', 'unchanged', 'invalid', 'not_found' or 'failed'
+
+        Raises:
+            ValueError: If no deposition context has been selected with read()
+        """
+        if not self._deposition_id:
+            raise ValueError("DB bulkUpdateMsgStatus: no deposition_id specified - call read() first")
+        outcomes = self._dal.bulk_update_status(self._deposition_id, changes, keep_unread=keep_unread)
+        self._history_loaded = False
+        return outcomes
+
     def write(self, filePath: str) -> bool:  # pylint: disable=unused-argument
         """Commit all pending changes to the database.
 
         Writes all pending messages, file references, and status records to the database
-        using the DataAccessLayer. On success, clears pending lists and reloads data
-        from database to refresh the current context.
+        using the DataAccessLayer. On success, clears pending lists; the loaded view
+        of the current context is refreshed from the database when next requested.
 
         Args:
             filePath: File path (retained for API compatibility but ignored - no file I/O occurs)
@@ -555,6 +747,31 @@ class PdbxMessageIo:
             logger.info("DB MessageIo write() pending: msgs=%d files=%d statuses=%d",
                         len(self._pending_messages), len(self._pending_file_refs), len(self._pending_statuses))
 
+        # the deposition summary is refreshed once, after the last of the writes below
+        with self._dal.deferred_summary_refresh():
+            success = self._write_pending()
+
+        # merge in-memory origcomm refs (not persisted)
+        self._loaded_origcomm_refs.extend(self._pending_origcomm_refs)
+
+        # clear pendings and refresh loaded view only if all operations succeeded
+        if success:
+            self._pending_messages.clear()
+            self._pending_file_refs.clear()
+            self._pending_statuses.clear()
+            self._pending_origcomm_refs.clear()
+            self._history_loaded = False
+        else:
+            logger.error("Database write operations failed - keeping pending data for potential retry")
+
+        return success
+
+    def _write_pending(self) -> bool:
+        """Write the pending messages, file references and status records, each in a transaction of its own.
+
+        Returns:
+            True if all were written, False if any failed
+        """
         success = True
 
         # Messages
@@ -617,19 +834,6 @@ class PdbxMessageIo:
                 logger.error("Failed to create/update status for message ID: %s", st['message_id'])
                 success = False
 
-        # merge in-memory origcomm refs (not persisted)
-        self._loaded_origcomm_refs.extend(self._pending_origcomm_refs)
-
-        # clear pendings and refresh loaded view only if all operations succeeded
-        if success:
-            self._pending_messages.clear()
-            self._pending_file_refs.clear()
-            self._pending_statuses.clear()
-            self._pending_origcomm_refs.clear()
-            self._load_from_db()
-        else:
-            logger.error("Database write operations failed - keeping pending data for potential retry")
-
         return success
 
     # --------- Style/container compatibility (no-ops for DB) ---------
@@ -672,18 +876,29 @@ class PdbxMessageIo:
     def nextMessageOrdinal(self) -> int:
         """Get next available ordinal ID for a message.
 
+        Uses a COUNT query for the current context rather than the loaded history, so the
+        deposition's messages need not be read first.
+
         Returns:
-            Next ordinal ID (count of loaded + pending messages + 1)
+            Next ordinal ID (count of stored + pending messages + 1)
+
+        Note:
+            The value is informational only. Stored rows take their ordinal_id from the
+            database auto-increment key, so concurrent writers cannot collide on it.
         """
-        return len(self._loaded_messages) + len(self._pending_messages) + 1
+        if not self._deposition_id:
+            return len(self._pending_messages) + 1
+        return self._dal.count_deposition_messages(self._deposition_id, self._content_type) + len(self._pending_messages) + 1
 
     def nextFileReferenceOrdinal(self) -> int:
         """Get next available ordinal ID for a file reference.
 
         Returns:
-            Next ordinal ID (count of loaded + pending file references + 1)
+            Next ordinal ID (count of stored + pending file references + 1)
         """
-        return len(self._loaded_file_refs) + len(self._pending_file_refs) + 1
+        if not self._deposition_id:
+            return len(self._pending_file_refs) + 1
+        return self._dal.count_deposition_file_references(self._deposition_id) + len(self._pending_file_refs) + 1
 
     def nextOrigCommReferenceOrdinal(self) -> int:
         """Get next available ordinal ID for an original communication reference.
@@ -710,99 +925,80 @@ class PdbxMessageIo:
             if self._content_type and kind in ("message", "file_ref"):
                 row.setdefault("content_type", self._content_type)
 
+    def _ensure_loaded(self) -> None:
+        """Load the history of the current context from the database if not already loaded."""
+        if not self._history_loaded:
+            self._load_from_db()
+
     def _load_from_db(self) -> None:
         """Load message data from database for current deposition context.
 
         Queries the database for all messages, file references, and status records
-        matching the current deposition ID and content type. Converts ORM objects
-        to dictionaries compatible with the CIF backend interface.
+        matching the current deposition ID and content type. Rows are fetched with
+        read-only Core statements (no ORM objects are built) and converted to
+        dictionaries compatible with the CIF backend interface.
 
         Note:
             Clears existing loaded data before loading. Status records are loaded for
             the entire deposition regardless of content_type filter, matching legacy
             CIF behavior where all statuses are stored in messages-to-depositor.
         """
-        try:
-            self._loaded_messages.clear()
-            self._loaded_file_refs.clear()
-            self._loaded_statuses.clear()
+        self._loaded_messages.clear()
+        self._loaded_records.clear()
+        self._loaded_file_refs.clear()
+        self._loaded_statuses.clear()
+
+        if not self._deposition_id:
+            # No deposition ID available - this is a FATAL error condition
+            error_msg = (
+                f"DB _load_from_db: FATAL - No deposition_id specified (content_type={self._content_type}). "
+                "Cannot load messages without deposition context. This typically means the file path "
+                "could not be parsed or read() was called without proper context."
+            )
+            logger.error(error_msg)
+            raise ValueError(error_msg)
 
-            if self._deposition_id:
-                # Load messages for specific deposition (optionally filter content_type)
-                msgs = self._dal.get_deposition_messages(self._deposition_id)
-                if self.__verbose:
-                    logger.info("DB _load_from_db: Found %d total messages for deposition %s", len(msgs), self._deposition_id)
-                    for m in msgs:
-                        logger.info("  Message %s: content_type=%s, subject=%s", m.message_id, m.content_type, m.message_subject)
-            else:
-                # No deposition ID available - this is a FATAL error condition
-                error_msg = (
-                    f"DB _load_from_db: FATAL - No deposition_id specified (content_type={self._content_type}). "
-                    "Cannot load messages without deposition context. This typically means the file path "
-                    "could not be parsed or read() was called without proper context."
-                )
-                logger.error(error_msg)
-                raise ValueError(error_msg)
+        # Messages for the deposition - only filtered by content_type if explicitly set (not empty/None)
+        try:
+            msgs = self._dal.get_deposition_message_rows(self._deposition_id, self._content_type or None)
         except Exception as e:
             logger.error("DB _load_from_db: FATAL - Failed to load messages for deposition %s: %s",
                          self._deposition_id, str(e), exc_info=True)
             # Re-raise so caller knows something went wrong
             raise
+        if self.__verbose:
+            logger.info("DB _load_from_db: Found %d messages for deposition %s (content_type=%s)",
+                        len(msgs), self._deposition_id, self._content_type or "any")
+            for m in msgs:
+                logger.info("  Message %s: content_type=%s, subject=%s", m["message_id"], m["content_type"], m["message_subject"])
 
-        # Only filter by content_type if explicitly set (not empty/None)
-        if self._content_type:
-            msgs = [m for m in msgs if m.content_type == self._content_type]
-            if self.__verbose:
-                logger.info("DB _load_from_db: After filtering by content_type=%s, found %d messages", self._content_type, len(msgs))
-        else:
-            if self.__verbose:
-                logger.info("DB _load_from_db: No content_type filter, returning all %d messages for deposition", len(msgs))
-
-        self._loaded_messages = [
-            {
-                "ordinal_id": m.ordinal_id,
-                "message_id": m.message_id,
-                "deposition_data_set_id": m.deposition_data_set_id,
-                "timestamp": _fmt_ts(m.timestamp),
-                "sender": m.sender,
-                "context_type": m.context_type,
-                "context_value": m.context_value,
-                "parent_message_id": m.parent_message_id,
-                "message_subject": m.message_subject,
-                "message_text": m.message_text,
-                "message_type": m.message_type,
-                "send_status": m.send_status,
-                "content_type": m.content_type,
-            }
-            for m in msgs
-        ]
+        self._loaded_messages = [_message_dict(m) for m in msgs]
+        self._loaded_records = [MessageRecord.fromDict(m) for m in msgs]
 
-        # File references for deposition (+ content type if set)
+        # File references for deposition
+        # No content_type filtering for file references since they use different content types
+        # than messages (e.g., 'auxiliary-file-annotate' vs 'messages-to-depositor')
         try:
-            with self._dal.db_connection.get_session() as sess:
-                q = sess.query(ORMFileRef).filter(ORMFileRef.deposition_data_set_id == self._deposition_id)
-                # Remove content_type filtering for file references since they use different content types
-                # than messages (e.g., 'auxiliary-file-annotate' vs 'messages-to-depositor')
-                file_refs = q.all()
-
-            self._loaded_file_refs = [
-                {
-                    "ordinal_id": fr.ordinal_id,
-                    "message_id": fr.message_id,
-                    "deposition_data_set_id": fr.deposition_data_set_id,
-                    "content_type": fr.content_type,
-                    "content_format": fr.content_format,
-                    "partition_number": fr.partition_number,
-                    "version_id": fr.version_id,
-                    "storage_type": fr.storage_type,
-                    "upload_file_name": fr.upload_file_name or "",
-                }
-                for fr in file_refs
-            ]
+            file_refs = self._dal.get_deposition_file_reference_rows(self._deposition_id)
         except Exception:
             logger.error("DB _load_from_db: FATAL - Failed to load file references for deposition %s", self._deposition_id, exc_info=True)
             raise
 
+        self._loaded_file_refs = [
+            {
+                "ordinal_id": fr["ordinal_id"],
+                "message_id": fr["message_id"],
+                "deposition_data_set_id": fr["deposition_data_set_id"],
+                "content_type": fr["content_type"],
+                "content_format": fr["content_format"],
+                "partition_number": fr["partition_number"],
+                "version_id": fr["version_id"],
+                "storage_type": fr["storage_type"],
+                "upload_file_name": fr["upload_file_name"] or "",
+            }
+            for fr in file_refs
+        ]
+
         # Status for all messages in this deposition
         # NOTE: Status records are deposition-scoped, not file-scoped.
         # In legacy CIF files, all status records are stored in messages-to-depositor,
@@ -810,20 +1006,20 @@ class PdbxMessageIo:
         # contains the actual message. Therefore, we must NOT filter by msg_ids here,
         # as that would exclude status records for messages in other content_types.
         try:
-            with self._dal.db_connection.get_session() as sess:
-                q = sess.query(ORMStatus).filter(ORMStatus.deposition_data_set_id == self._deposition_id)
-                statuses = q.all()
-
-            self._loaded_statuses = [
-                {
-                    "message_id": st.message_id,
-                    "deposition_data_set_id": st.deposition_data_set_id,
-                    "read_status": st.read_status,
-                    "action_reqd": st.action_reqd,
-                    "for_release": st.for_release,
-                }
-                for st in statuses
-            ]
+            statuses = self._dal.get_deposition_status_rows(self._deposition_id)
         except Exception:
             logger.error("DB _load_from_db: FATAL - Failed to load status records for deposition %s", self._deposition_id, exc_info=True)
             raise
+
+        self._loaded_statuses = [
+            {
+                "message_id": st["message_id"],
+                "deposition_data_set_id": st["deposition_data_set_id"],
+                "read_status": st["read_status"],
+                "action_reqd": st["action_reqd"],
+                "for_release": st["for_release"],
+            }
+            for st in statuses
+        ]
+
+        self._history_loaded = True
@@ -0,0 +1,173 @@
+##
+# File: QueryPlans.py
+# Date: 18-Oct-2026
+#
+# Query plan (EXPLAIN) report for the statements issued by the data access objects.
+##
+"""
+Query plan report for the messaging database.
+
+Runs EXPLAIN (MySQL) or EXPLAIN QUERY PLAN (SQLite) for the statement behind each DAO query
+method, with sample parameters, so that index use can be reviewed after schema changes and on
+production data. The Core statements are those used by DataAccessLayer itself; ORM queries are
+represented by the equivalent select().
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, List
+
+from sqlalchemy import bindparam, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from wwpdb.apps.msgmodule.db.DataAccessLayer import (  # pylint: disable=protected-access
+    _DEPOSITION_IDS_STMT,
+    _FILE_REFERENCE_COUNT_STMT,
+    _FILE_REFERENCE_ROWS_STMT,
+    _LAST_MESSAGE_BY_CONTEXT_TYPE_STMT,
+    _LAST_SENT_DATES_STMT,
+    _LAST_UNLOCK_DATES_STMT,
+    _MESSAGE_COUNT_BY_CONTENT_TYPE_STMT,
+    _MESSAGE_COUNT_STMT,
+    _MESSAGE_ROWS_BY_CONTENT_TYPE_STMT,
+    _MESSAGE_ROWS_STMT,
+    _MESSAGE_VERSION_STMT,
+    _MESSAGES_BY_SUBJECT_STMT,
+    _PENDING_FROM_DEPOSITOR_STMT,
+    _STATUS_LOOKUP_STMT,
+    _STATUS_ROWS_STMT,
+    _STATUS_VERSION_STMT,
+    _THREAD_PARENT_STMT,
+    _THREAD_ROWS_STMT,
+    _VALIDATION_LETTERS_STMT,
+)
+from wwpdb.apps.msgmodule.db.DepositionSummary import (  # pylint: disable=protected-access
+    _SUMMARY_MESSAGES_STMT,
+    _SUMMARY_ROW_STMT,
+    _SUMMARY_STATUS_STMT,
+    _VALIDATION_REPORT_MESSAGE_IDS_STMT,
+)
+from wwpdb.apps.msgmodule.db.Models import MessageFileReference, MessageInfo, MessageStatus
+
+logger = logging.getLogger(__name__)
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN of a select statement, in the syntax of the dialect."""
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_Explain)
+def _compile_explain(element, compiler, **kw):
+    prefix = "EXPLAIN QUERY PLAN " if compiler.dialect.name == "sqlite" else "EXPLAIN "
+    return prefix + compiler.process(element.statement, **kw)
+
+
+def get_dao_queries() -> List[tuple]:
+    """Statements issued by the DAO query methods.
+
+    Returns:
+        List[tuple]: (DAO method, statement, parameter names) for each query shape
+    """
+    return [
+        ("MessageDAO.get_rows_by_deposition", _MESSAGE_ROWS_STMT, ["deposition_id"]),
+        ("MessageDAO.get_rows_by_deposition(content_type)", _MESSAGE_ROWS_BY_CONTENT_TYPE_STMT, ["deposition_id", "content_type"]),
+        ("MessageDAO.count_by_deposition", _MESSAGE_COUNT_STMT, ["deposition_id"]),
+        ("MessageDAO.count_by_deposition(content_type)", _MESSAGE_COUNT_BY_CONTENT_TYPE_STMT, ["deposition_id", "content_type"]),
+        ("MessageDAO.get_version_by_deposition", _MESSAGE_VERSION_STMT, ["deposition_id"]),
+        ("MessageDAO.get_thread_rows_by_deposition", _THREAD_ROWS_STMT, ["deposition_id"]),
+        ("MessageDAO.create (thread parent lookup)", _THREAD_PARENT_STMT, ["message_id", "deposition_id"]),
+        ("MessageDAO.get_deposition_ids", _DEPOSITION_IDS_STMT, []),
+        ("MessageDAO.get_last_sent_dates", _LAST_SENT_DATES_STMT, ["deposition_ids", "content_type"]),
+        ("MessageDAO.get_last_unlock_dates", _LAST_UNLOCK_DATES_STMT, ["deposition_ids"]),
+        ("MessageDAO.get_pending_rows_from_depositor", _PENDING_FROM_DEPOSITOR_STMT, ["deposition_ids"]),
+        ("MessageDAO.get_last_by_context_type", _LAST_MESSAGE_BY_CONTEXT_TYPE_STMT, ["deposition_id", "content_type", "context_types"]),
+        ("MessageDAO.get_last_timestamp_by_subject", _MESSAGES_BY_SUBJECT_STMT, ["deposition_id", "content_type", "subject_pattern"]),
+        ("MessageDAO.get_last_validation_letter", _VALIDATION_LETTERS_STMT, ["deposition_id"]),
+        ("MessageDAO.get_by_message_id", select(MessageInfo).where(MessageInfo.message_id == bindparam("message_id")), ["message_id"]),
+        ("MessageDAO.get_by_deposition", select(MessageInfo).where(MessageInfo.deposition_data_set_id == bindparam("deposition_id")), ["deposition_id"]),
+        (
+            "MessageDAO.get_by_deposition_and_content_type",
+            select(MessageInfo).where(
+                MessageInfo.deposition_data_set_id == bindparam("deposition_id"), MessageInfo.content_type == bindparam("content_type")
+            ).order_by(MessageInfo.timestamp.asc()),
+            ["deposition_id", "content_type"],
+        ),
+        (
+            "MessageDAO.get_by_date_range",
+            select(MessageInfo).where(MessageInfo.timestamp >= bindparam("start_date")).order_by(MessageInfo.timestamp.desc()),
+            ["start_date"],
+        ),
+        ("FileReferenceDAO.get_rows_by_deposition", _FILE_REFERENCE_ROWS_STMT, ["deposition_id"]),
+        ("FileReferenceDAO.count_by_deposition", _FILE_REFERENCE_COUNT_STMT, ["deposition_id"]),
+        (
+            "FileReferenceDAO.get_by_message_id",
+            select(MessageFileReference).where(MessageFileReference.message_id == bindparam("message_id")),
+            ["message_id"],
+        ),
+        ("MessageStatusDAO.get_rows_by_deposition", _STATUS_ROWS_STMT, ["deposition_id"]),
+        ("MessageStatusDAO.get_version_by_deposition", _STATUS_VERSION_STMT, ["deposition_id"]),
+        ("MessageStatusDAO.get_by_message_id", select(MessageStatus).where(MessageStatus.message_id == bindparam("message_id")), ["message_id"]),
+        ("MessageStatusDAO.bulk_upsert (lookup)", _STATUS_LOOKUP_STMT, ["deposition_id", "message_ids"]),
+        ("DepositionSummaryDAO.get_by_deposition", _SUMMARY_ROW_STMT, ["deposition_id"]),
+        ("refresh_deposition_summary (messages)", _SUMMARY_MESSAGES_STMT, ["deposition_id"]),
+        ("refresh_deposition_summary (statuses)", _SUMMARY_STATUS_STMT, ["deposition_id"]),
+        ("refresh_deposition_summary (validation reports)", _VALIDATION_REPORT_MESSAGE_IDS_STMT, ["deposition_id"]),
+    ]
+
+
+def get_query_plan_report(engine: Engine, deposition_id: str, message_id: str = "", content_type: str = "messages-to-depositor") -> List[Dict]:
+    """Query plans of the DAO statements.
+
+    Args:
+        engine (Engine): Engine of the messaging database
+        deposition_id (str): Deposition ID used as sample parameter
+        message_id (str): Message ID used as sample parameter
+        content_type (str): Content type used as sample parameter
+
+    Returns:
+        List[Dict]: One entry per DAO query with keys 'query', 'sql' and 'plan' (list of plan rows as
+        strings), or 'error' if the statement could not be explained
+    """
+    sample = {
+        "deposition_id": deposition_id,
+        "deposition_ids": [deposition_id],
+        "content_type": content_type,
+        "context_types": ["reminder"],
+        "subject_pattern": "%Still awaiting feedback for%",
+        "message_id": message_id,
+        "message_ids": [message_id],
+        "start_date": datetime(2000, 1, 1),
+    }
+    report = []
+    with engine.connect() as conn:
+        for name, stmt, param_names in get_dao_queries():
+            entry = {"query": name, "sql": str(stmt.compile(dialect=engine.dialect))}
+            try:
+                rows = conn.execute(_Explain(stmt), {k: sample[k] for k in param_names})
+                entry["plan"] = [" | ".join("%s=%s" % (k, v) for k, v in row._mapping.items()) for row in rows]
+            except Exception as e:  # pylint: disable=broad-except
+                logger.warning("Could not explain %s: %s", name, e)
+                entry["error"] = str(e)
+            report.append(entry)
+    return report
+
+
+def format_query_plan_report(report: List[Dict]) -> str:
+    """Plain text rendering of get_query_plan_report()."""
+    lines = []
+    for entry in report:
+        lines.append("== %s" % entry["query"])
+        lines.extend("   " + line for line in entry["sql"].splitlines())
+        if "error" in entry:
+            lines.append("   ERROR: %s" % entry["error"])
+        else:
+            lines.extend("   -> " + row for row in entry["plan"])
+        lines.append("")
+    return "\n".join(lines)
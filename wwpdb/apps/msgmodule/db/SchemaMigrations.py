@@ -0,0 +1,186 @@
+##
+# File: SchemaMigrations.py
+# Date: 18-Oct-2026
+#
+# Versioned, idempotent schema migrations for the messaging database.
+##
+"""
+Versioned schema migrations for the messaging database.
+
+The schema version of a database is the highest version recorded in the msgmodule_schema_version
+table (0 if the table is absent). migrate() applies the migrations above that version in order and
+records each one as it completes.
+
+Every migration step inspects the live schema before changing it: tables, columns and indexes which
+already exist are left alone, whatever created them (DataAccessLayer.create_tables(), the DDL of
+scripts/init_messaging_database.py or an earlier, interrupted migration run). Indexes are matched by
+their column list rather than by name, since the DDL script and SQLAlchemy name them differently.
+Migrations therefore can be re-run safely, and MySQL, which commits DDL statements implicitly, is left
+consistent if a run fails part way.
+
+Only portable DDL (CREATE TABLE/INDEX, ALTER TABLE ... ADD COLUMN) is used, so migrations run against
+MySQL and against the SQLite databases used in testing alike.
+
+To add a migration, append a Migration with the next version number to MIGRATIONS, and make the
+corresponding change to the models in Models.py (from which new databases are created).
+"""
+
+import logging
+from datetime import datetime
+from typing import Callable, List, NamedTuple, Optional
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select, func
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateColumn
+
+from wwpdb.apps.msgmodule.db.Models import Base
+
+logger = logging.getLogger(__name__)
+
+_versionMetadata = MetaData()
+_versionTable = Table(
+    "msgmodule_schema_version",
+    _versionMetadata,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+class Migration(NamedTuple):
+    """One schema migration step.
+
+    Attributes:
+        version (int): Schema version reached by applying this migration
+        description (str): Short description, recorded with the version
+        apply (Callable[[Connection], None]): Applies the change; must be idempotent
+    """
+
+    version: int
+    description: str
+    apply: Callable[[Connection], None]
+
+
+def _table(name: str) -> Table:
+    return Base.metadata.tables[name]
+
+
+def _add_columns(conn: Connection, table_name: str, column_names: List[str]) -> None:
+    """Add the model's columns table_name.column_names which the database table is lacking."""
+    existing = {col["name"] for col in inspect(conn).get_columns(table_name)}
+    for name in column_names:
+        if name in existing:
+            continue
+        ddl = CreateColumn(_table(table_name).c[name]).compile(dialect=conn.dialect)
+        logger.info("Adding column %s.%s", table_name, name)
+        conn.exec_driver_sql("ALTER TABLE %s ADD COLUMN %s" % (table_name, ddl))
+
+
+def _create_indexes(conn: Connection, table_name: str, index_names: List[str]) -> None:
+    """Create the model's indexes index_names on table_name unless an index on the same columns exists."""
+    inspector = inspect(conn)
+    existing = {tuple(idx["column_names"]) for idx in inspector.get_indexes(table_name)}
+    existing.update(tuple(uc["column_names"]) for uc in inspector.get_unique_constraints(table_name))
+    for index in _table(table_name).indexes:
+        if index.name not in index_names:
+            continue
+        columns = tuple(col.name for col in index.columns)
+        if columns in existing:
+            continue
+        logger.info("Creating index %s on %s%r", index.name, table_name, columns)
+        index.create(conn)
+
+
+def _create_tables(conn: Connection) -> None:
+    Base.metadata.create_all(conn, checkfirst=True)
+
+
+def _add_thread_columns(conn: Connection) -> None:
+    _add_columns(conn, "pdbx_deposition_message_info", ["thread_root_id", "thread_depth", "thread_path"])
+    _create_indexes(conn, "pdbx_deposition_message_info", ["ix_pdbx_deposition_message_info_thread_root_id", "idx_deposition_thread_path"])
+
+
+def _add_message_composite_indexes(conn: Connection) -> None:
+    _create_indexes(conn, "pdbx_deposition_message_info", ["idx_deposition_content_timestamp", "idx_deposition_updated_at"])
+
+
+def _add_status_covering_index(conn: Connection) -> None:
+    _create_indexes(conn, "pdbx_deposition_message_status", ["idx_status_deposition_flags"])
+
+
+def _create_summary_table(conn: Connection) -> None:
+    _table("deposition_message_summary").create(conn, checkfirst=True)
+
+
+def _create_job_table(conn: Connection) -> None:
+    _table("msgmodule_job").create(conn, checkfirst=True)
+
+
+MIGRATIONS = [
+    Migration(1, "Messaging tables", _create_tables),
+    Migration(2, "Materialized thread columns", _add_thread_columns),
+    Migration(3, "Composite indexes for per-deposition message listings and version stamps", _add_message_composite_indexes),
+    Migration(4, "Covering index for per-deposition status counts", _add_status_covering_index),
+    # populate with scripts/rebuild_message_summaries.py after migrating
+    Migration(5, "Per-deposition message summary table", _create_summary_table),
+    Migration(6, "Background job table for message submissions", _create_job_table),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def get_schema_version(engine: Engine) -> int:
+    """Current schema version of the database.
+
+    Args:
+        engine (Engine): Engine of the messaging database
+
+    Returns:
+        int: Highest applied migration version, 0 for a database never migrated
+    """
+    with engine.connect() as conn:
+        if not inspect(conn).has_table(_versionTable.name):
+            return 0
+        return conn.execute(select(func.max(_versionTable.c.version))).scalar() or 0
+
+
+def get_pending_migrations(engine: Engine, target_version: Optional[int] = None) -> List[Migration]:
+    """Migrations not yet applied to the database.
+
+    Args:
+        engine (Engine): Engine of the messaging database
+        target_version (int, optional): Stop at this version (default: latest)
+
+    Returns:
+        List[Migration]: Migrations to apply, in order
+    """
+    current = get_schema_version(engine)
+    target = LATEST_VERSION if target_version is None else target_version
+    return [m for m in MIGRATIONS if current < m.version <= target]
+
+
+def migrate(engine: Engine, target_version: Optional[int] = None, dry_run: bool = False) -> List[Migration]:
+    """Bring the database schema up to date.
+
+    Args:
+        engine (Engine): Engine of the messaging database
+        target_version (int, optional): Stop at this version (default: latest)
+        dry_run (bool): Only determine the migrations which would be applied
+
+    Returns:
+        List[Migration]: Migrations applied (or pending, for a dry run), in order
+
+    Raises:
+        SQLAlchemyError: If a migration fails; migrations completed before it remain recorded
+    """
+    pending = get_pending_migrations(engine, target_version)
+    if dry_run or not pending:
+        return pending
+
+    _versionMetadata.create_all(engine, checkfirst=True)
+    for migration in pending:
+        logger.info("Applying schema migration %d: %s", migration.version, migration.description)
+        with engine.begin() as conn:
+            migration.apply(conn)
+            conn.execute(_versionTable.insert().values(version=migration.version, description=migration.description, applied_at=datetime.utcnow()))
+    return pending
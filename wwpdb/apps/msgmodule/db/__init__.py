@@ -12,6 +12,8 @@ from wwpdb.apps.msgmodule.db.Models import (
     MessageInfo,
     MessageFileReference,
     MessageStatus,
+    DepositionMessageSummary,
+    MessageJob,
 )
 
 # Import database services
@@ -35,12 +37,17 @@ from wwpdb.apps.msgmodule.db.MessagingDataExport import MessagingDataExport
 # Import database-compatible file system utilities
 from wwpdb.apps.msgmodule.db.LockFile import LockFile, FileSizeLogger
 
+# Import database-native locks
+from wwpdb.apps.msgmodule.db.LockManager import DbLock, LockManager
+
 __all__ = [
     # SQLAlchemy Models
     "Base",
     "MessageInfo",
     "MessageFileReference",
     "MessageStatus",
+    "DepositionMessageSummary",
+    "MessageJob",
     # Database Services
     "DataAccessLayer",
     # Database-backed message I/O classes
@@ -55,4 +62,7 @@ __all__ = [
     # Database-compatible file system utilities
     "LockFile",
     "FileSizeLogger",
+    # Database-native locks
+    "DbLock",
+    "LockManager",
 ]
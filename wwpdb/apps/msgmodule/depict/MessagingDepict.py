@@ -50,6 +50,7 @@ __email__ = "rsala@rcsb.rutgers.edu"
 __license__ = "Creative Commons Attribution 3.0 Unported"
 __version__ = "V0.02"
 
+import html
 import os
 import sys
 import time
@@ -59,6 +60,7 @@ from wwpdb.apps.msgmodule.util.MessagingDataRouter import MessagingDataImport
 # from wwpdb.apps.msgmodule.db.MessagingDataImport import MessagingDataImport
 from wwpdb.apps.msgmodule.depict.MessagingTemplates import MessagingTemplates
 from wwpdb.utils.config.ConfigInfo import ConfigInfo
+from wwpdb.apps.msgmodule.util.SiteRegistry import getSiteInstance
 
 import logging
 
@@ -117,7 +119,7 @@ class MessagingDepict(object):
         autoLaunchCompose = str(p_reqObj.getValue("auto_launch_compose"))
         allowUnlockDepUI = str(p_reqObj.getValue("allowunlock"))
         siteId = str(p_reqObj.getValue("WWPDB_SITE_ID"))
-        cI = ConfigInfo(siteId)
+        cI = getSiteInstance(ConfigInfo, siteId)
         fileFormatExtDict = cI.get("FILE_FORMAT_EXTENSION_DICTIONARY")
         #
         contentType = (
@@ -468,12 +470,12 @@ class MessagingDepict(object):
         if len(p_msgDict["files_referenced"]) > 0:
             htmlStr = ""
             for fileRef in p_msgDict["files_referenced"]:
-                filePathSplitArr = fileRef["relative_file_url"].split("/")
-                fileName = filePathSplitArr[len(filePathSplitArr) - 1]
+                fileName = fileRef.get("file_name") or fileRef["relative_file_url"].split("?")[0].split("/")[-1]
                 # Normalize upload_file_name to prevent None/null crashes (DAOTHER-10245)
                 uploadName = (fileRef.get("upload_file_name") or "").strip()
                 displayUploadFlName = f" ({uploadName})" if len(uploadName) > 1 else ""
-                htmlStr += '<p><span class=""><a href="' + fileRef["relative_file_url"] + '" target="_blank">' + fileName + displayUploadFlName + "</a></span></p>"
+                fileUrl = html.escape(fileRef["relative_file_url"], quote=True)
+                htmlStr += '<p><span class=""><a href="' + fileUrl + '" target="_blank">' + html.escape(fileName + displayUploadFlName) + "</a></span></p>"
 
             myD["files_rfrncd_dsply"] = ""
             myD["files_rfrncd"] = htmlStr
@@ -546,7 +548,7 @@ class MessagingDepict(object):
 
         return rtrnDict
 
-    def getDataTableTemplate(self, p_reqObj):
+    def getDataTableTemplate(self, p_reqObj, p_msgingIo=None):
         """
         For given deposition data set ID, obtain "staging" components to be used in
         preparation for loading webpage with DataTable for display of text messages:
@@ -555,6 +557,7 @@ class MessagingDepict(object):
         :Params:
 
             + ``p_reqObj``: Web Request object
+            + ``p_msgingIo``: MessagingIo instance to read messages with, e.g. one shared with other parts of the request (optional)
 
         :Returns:
             ``mrkpList``: output list consisting of HTML markup serving as skeleton starter template for DataTable
@@ -568,7 +571,7 @@ class MessagingDepict(object):
         #
         # if self.__verbose:
         #     logger.info("CStrack+++ call MessagingIo class from MessagingDepict.getDataTableTemplate()")
-        msgingIo = MessagingIo(p_reqObj, self.__verbose, self.__lfh)
+        msgingIo = p_msgingIo if p_msgingIo is not None else MessagingIo(p_reqObj, self.__verbose, self.__lfh)
         bOk, msgColList = msgingIo.getMsgColList(bCommHstryRqstd)
         #
         if bOk:
@@ -676,8 +679,8 @@ class MessagingDepict(object):
                 newRecordJsonObj["DT_RowClass"] = "dt_row"
                 row = value
             #
-            for colName, rcrdValue in zip(p_colList, row):
-                newRecordJsonObj[colName] = str(rcrdValue)
+            # cell values are mostly strings already, which need no conversion
+            newRecordJsonObj.update(zip(p_colList, [rcrdValue if type(rcrdValue) is str else str(rcrdValue) for rcrdValue in row]))
             #
             rtrnLst.append(newRecordJsonObj)
 
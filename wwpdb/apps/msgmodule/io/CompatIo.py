@@ -6,13 +6,14 @@ from typing import Dict, List, Optional
 
 from wwpdb.utils.config.ConfigInfo import getSiteId
 from wwpdb.utils.config.ConfigInfoApp import ConfigInfoAppMessaging
+from wwpdb.apps.msgmodule.util.SiteRegistry import getSiteInstance
 
 from mmcif_utils.message.PdbxMessageIo import PdbxMessageIo as PdbxMessageIoLegacy
 from wwpdb.apps.msgmodule.db.PdbxMessageIo import PdbxMessageIo as PdbxMessageIoDb
-from wwpdb.apps.msgmodule.db.LockFile import LockFile as LockFileDb
-from mmcif_utils.persist.LockFile import LockFile as LockFileLegacy
+from wwpdb.apps.msgmodule.db.LockFile import LockFile as LockFileDb, FlockLockFile
 
 from wwpdb.apps.msgmodule.db.LockFile import FileSizeLogger as FileSizeLoggerDb
+from wwpdb.apps.msgmodule.models.MessageRecord import MessageRecord
 
 import logging
 
@@ -24,7 +25,7 @@ class PdbxMessageIo:
     def __init__(self, site_id: str = None, verbose=True, log=sys.stderr, db_config: Optional[Dict] = None):
         # Use provided site_id or auto-detect - consistent with LockFile
         actual_site_id = site_id if site_id is not None else getSiteId()
-        self.__legacycomm = not ConfigInfoAppMessaging(actual_site_id).get_msgdb_support()
+        self.__legacycomm = not getSiteInstance(ConfigInfoAppMessaging, actual_site_id).get_msgdb_support()
         if self.__legacycomm:
             self.__impl = PdbxMessageIoLegacy(verbose, log)
         else:
@@ -42,6 +43,59 @@ class PdbxMessageIo:
     def getMessageInfo(self) -> List[Dict]:
         return self.__impl.getMessageInfo()
 
+    def getMessageRecords(self) -> List[MessageRecord]:
+        if self.__legacycomm:
+            return [MessageRecord.fromDict(m) for m in self.__impl.getMessageInfo()]
+        return self.__impl.getMessageRecords()
+
+    def getDataVersion(self, includeStatuses=False):
+        """Database backend only - for legacy cif files the file modification times serve as version"""
+        if self.__legacycomm:
+            raise NotImplementedError("getDataVersion requires the messaging database")
+        return self.__impl.getDataVersion(includeStatuses)
+
+    def getDepositionSummary(self):
+        """Database backend only - the cif files have no stored summary"""
+        if self.__legacycomm:
+            raise NotImplementedError("getDepositionSummary requires the messaging database")
+        return self.__impl.getDepositionSummary()
+
+    def getLastMessageByContextType(self, contentType: str, contextTypes: List[str]):
+        """Database backend only - filtered in SQL"""
+        if self.__legacycomm:
+            raise NotImplementedError("getLastMessageByContextType requires the messaging database")
+        return self.__impl.getLastMessageByContextType(contentType, contextTypes)
+
+    def getLastMessageDateBySubject(self, contentType: str, phrase: str):
+        """Database backend only - filtered in SQL"""
+        if self.__legacycomm:
+            raise NotImplementedError("getLastMessageDateBySubject requires the messaging database")
+        return self.__impl.getLastMessageDateBySubject(contentType, phrase)
+
+    def getLastValidationLetter(self):
+        """Database backend only - filtered in SQL"""
+        if self.__legacycomm:
+            raise NotImplementedError("getLastValidationLetter requires the messaging database")
+        return self.__impl.getLastValidationLetter()
+
+    def getLastSentDates(self, depositionIds: List[str], contentType: str) -> Dict:
+        """Database backend only - grouped query over many depositions"""
+        if self.__legacycomm:
+            raise NotImplementedError("getLastSentDates requires the messaging database")
+        return self.__impl.getLastSentDates(depositionIds, contentType)
+
+    def getLastUnlockDates(self, depositionIds: List[str]) -> Dict:
+        """Database backend only - grouped query over many depositions"""
+        if self.__legacycomm:
+            raise NotImplementedError("getLastUnlockDates requires the messaging database")
+        return self.__impl.getLastUnlockDates(depositionIds)
+
+    def getPendingDepositorMessages(self, depositionIds: List[str]) -> Dict:
+        """Database backend only - single query over many depositions"""
+        if self.__legacycomm:
+            raise NotImplementedError("getPendingDepositorMessages requires the messaging database")
+        return self.__impl.getPendingDepositorMessages(depositionIds)
+
     def getFileReferenceInfo(self) -> List[Dict]:
         return self.__impl.getFileReferenceInfo()
 
@@ -69,6 +123,12 @@ class PdbxMessageIo:
     def write(self, filePath: str) -> bool:
         return self.__impl.write(filePath)
 
+    def bulkUpdateMsgStatus(self, changes: List[Dict], keep_unread: bool = False) -> Dict[str, str]:
+        """Database backend only - legacy cif files are updated through update()/appendMsgReadStatus()"""
+        if self.__legacycomm:
+            raise NotImplementedError("bulkUpdateMsgStatus requires the messaging database")
+        return self.__impl.bulkUpdateMsgStatus(changes, keep_unread=keep_unread)
+
     def complyStyle(self) -> bool:
         return self.__impl.complyStyle()
 
@@ -103,7 +163,7 @@ class LockFile(object):
     def __init__(self, filePath, timeoutSeconds=15, retrySeconds=.2, verbose=False, log=sys.stderr, site_id=None):
         # Use provided site_id or auto-detect - consistent with PdbxMessageIo
         actual_site_id = site_id if site_id is not None else getSiteId()
-        msgdb_support = ConfigInfoAppMessaging(actual_site_id).get_msgdb_support()
+        msgdb_support = getSiteInstance(ConfigInfoAppMessaging, actual_site_id).get_msgdb_support()
         self.__legacycomm = not msgdb_support
 
         # Debug logging to understand routing decisions
@@ -113,9 +173,10 @@ class LockFile(object):
             log.write(f"LockFile: Will use {'Legacy' if self.__legacycomm else 'Database'} implementation\n")
 
         if self.__legacycomm:
-            self.__limpl = LockFileLegacy(filePath, timeoutSeconds, retrySeconds, verbose, log)
+            # flock based, but interoperates with the O_EXCL lock files of mmcif_utils.persist.LockFile
+            self.__limpl = FlockLockFile(filePath, timeoutSeconds, retrySeconds, verbose, log)
         else:
-            self.__limpl = LockFileDb(filePath, timeoutSeconds, retrySeconds, verbose, log)
+            self.__limpl = LockFileDb(filePath, timeoutSeconds, retrySeconds, verbose, log, site_id=actual_site_id)
         #
 
     def acquire(self):
@@ -137,9 +198,10 @@ class LockFile(object):
 
 
 class FileSizeLogger(object):
-    def __init__(self, filePath, verbose=False, log=sys.stderr):  # pylint: disable=unused-argument
+    def __init__(self, filePath, verbose=False, log=sys.stderr, site_id=None):  # pylint: disable=unused-argument
         """Prepare the file size logger. Specify the file to report on"""
-        self.__legacycomm = not ConfigInfoAppMessaging().get_msgdb_support()
+        actual_site_id = site_id if site_id is not None else getSiteId()
+        self.__legacycomm = not getSiteInstance(ConfigInfoAppMessaging, actual_site_id).get_msgdb_support()
         if self.__legacycomm:
             self.__limpl = FileSizeLoggerLegacy(filePath, verbose, log)
         else:
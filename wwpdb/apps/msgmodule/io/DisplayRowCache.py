@@ -0,0 +1,88 @@
+##
+# File: DisplayRowCache.py
+# Date: 18-Oct-2026
+#
+# Bounded in-process cache of message rows rendered for display.
+##
+"""
+Cache of message rows as rendered for the messaging user interface.
+
+Rendering a message row (local time conversion of timestamps, decoding of CIF-safe content, escaping of
+angle brackets and line breaks) only depends on the stored message and the display time zone, and a
+message does not change once sent.  Rendered rows are therefore kept per process, keyed by message id,
+last update time and display time zone, so that redraws of a message table only render messages not
+seen before.
+
+Memory is bounded both by number of rows and by total number of characters held; least recently used
+rows are evicted first.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class DisplayRowCache(object):
+    """Thread-safe LRU cache of rendered display rows (lists of display strings)."""
+
+    def __init__(self, maxEntries=20000, maxChars=64 * 1024 * 1024):
+        """
+        :param `maxEntries`:    upper bound on number of cached rows
+        :param `maxChars`:      upper bound on total length of the strings held in cached rows
+        """
+        self.__maxEntries = maxEntries
+        self.__maxChars = maxChars
+        self.__rowD = OrderedDict()
+        self.__numChars = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def getKey(p_record, p_tzKey, *p_variant):
+        """Cache key for rendering p_record (a MessageRecord) in the display time zone identified by p_tzKey
+
+        :param `p_variant`:     any further values the rendered row depends on (e.g. column set)
+        """
+        return (p_record.message_id, p_record.updated_at or p_record.rawTimestamp, p_tzKey) + tuple(p_variant)
+
+    def get(self, key):
+        """Copy of the cached row for key, or None"""
+        with self.__lock:
+            row = self.__rowD.get(key)
+            if row is None:
+                self.__misses += 1
+                return None
+            self.__rowD.move_to_end(key)
+            self.__hits += 1
+            return list(row)
+
+    def put(self, key, row):
+        numChars = self.__rowSize(row)
+        if numChars > self.__maxChars:
+            return
+        with self.__lock:
+            oldRow = self.__rowD.pop(key, None)
+            if oldRow is not None:
+                self.__numChars -= self.__rowSize(oldRow)
+            self.__rowD[key] = tuple(row)
+            self.__numChars += numChars
+            while len(self.__rowD) > self.__maxEntries or self.__numChars > self.__maxChars:
+                _key, evicted = self.__rowD.popitem(last=False)
+                self.__numChars -= self.__rowSize(evicted)
+
+    def clear(self):
+        with self.__lock:
+            self.__rowD.clear()
+            self.__numChars = 0
+
+    def getStats(self):
+        """Dictionary of entries, characters held, hits and misses"""
+        with self.__lock:
+            return {"entries": len(self.__rowD), "chars": self.__numChars, "hits": self.__hits, "misses": self.__misses}
+
+    @staticmethod
+    def __rowSize(row):
+        return sum(len(value) if isinstance(value, str) else 8 for value in row)
@@ -35,6 +35,7 @@ import os.path
 
 from wwpdb.io.locator.DataReference import DataFileReference
 from wwpdb.utils.config.ConfigInfo import ConfigInfo
+from wwpdb.apps.msgmodule.util.SiteRegistry import getSiteInstance
 import logging
 
 logger = logging.getLogger(__name__)
@@ -71,7 +72,7 @@ class MessagingDataExport(object):
             self.__identifier = str(self.__reqObj.getValue("identifier")).upper()
             self.__instance = str(self.__reqObj.getValue("instance")).upper()
             self.__siteId = str(self.__reqObj.getValue("WWPDB_SITE_ID"))
-            self.__cI = ConfigInfo(self.__siteId)
+            self.__cI = getSiteInstance(ConfigInfo, self.__siteId)
             self.__dpstStoragePath = os.path.join(self.__cI.get("SITE_ARCHIVE_STORAGE_PATH"), "deposit", self.__identifier)
             self.__fileSource = "deposit"  # fixing value to "deposit" for now
             #
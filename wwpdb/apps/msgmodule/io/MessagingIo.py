@@ -145,13 +145,21 @@ import shutil
 import smtplib
 import sys
 import textwrap
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, nullcontext
+
+try:
+    from urllib.parse import urlencode
+except ImportError:
+    from urllib import urlencode
 
 try:
     from html import unescape
 except ImportError:
     from HTMLParser import HTMLParser
-from datetime import datetime, date, timedelta
+from datetime import datetime, date, timedelta, timezone
 from dateutil import tz
 
 #
@@ -165,9 +173,6 @@ from wwpdb.apps.msgmodule.db.PdbxMessage import PdbxMessageInfo, PdbxMessageFile
 # from mmcif_utils.message.PdbxMessageIo import PdbxMessageIo
 from mmcif_utils.style.PdbxMessageCategoryStyle import PdbxMessageCategoryStyle
 
-#
-from mmcif.io.PdbxReader import PdbxReader
-
 #
 from wwpdb.utils.config.ConfigInfo import ConfigInfo
 from wwpdb.utils.config.ConfigInfoApp import ConfigInfoAppMessaging
@@ -175,27 +180,22 @@ from wwpdb.utils.config.ConfigInfoApp import ConfigInfoAppEm
 # Use routing wrapper that selectively chooses between db and file implementations
 from wwpdb.apps.msgmodule.util.MessagingDataRouter import MessagingDataImport, MessagingDataExport
 from wwpdb.utils.wf.dbapi.StatusDbApi import StatusDbApi
+from wwpdb.apps.msgmodule.util.SiteRegistry import getSiteInstance, getStats as getSiteRegistryStats
 from wwpdb.apps.msgmodule.depict.MessagingTemplates import MessagingTemplates
 from wwpdb.apps.msgmodule.models.Message import AutoMessage, AutoNote
 from wwpdb.apps.msgmodule.io.DateUtil import DateUtil
+from wwpdb.apps.msgmodule.io.ReviewArtifactCache import ReviewArtifactCache
+from wwpdb.apps.msgmodule.io.DisplayRowCache import DisplayRowCache
+from wwpdb.apps.msgmodule.io.MessageSearchIndex import SearchIndexCache
+from wwpdb.apps.msgmodule.io.ResultSetCache import ResultSetCache
 
 #
-from wwpdb.utils.dp.RcsbDpUtility import RcsbDpUtility
-from wwpdb.utils.dp.DataFileAdapter import DataFileAdapter
-from wwpdb.utils.wf.dbapi.dbAPI import dbAPI
-from wwpdb.utils.nmr.NmrDpUtility import NmrDpUtility
-
-#
+# The annotation tool stack (wwpdb.utils.dp, wwpdb.utils.nmr, dbAPI, InstanceMapper, EmHeaderUtils, oslo_concurrency,
+# IoAdapterCore, PdbxReader) is only needed for data store initialization, review copies of attached files and
+# notification emails, so it is imported where used rather than on loading this module.
 from mmcif_utils.persist.PdbxPersist import PdbxPersist
 # from wwpdb.apps.msgmodule.db.LockFile import LockFile as LockFileDb
 # from wwpdb.apps.msgmodule.db.LockFile import FileSizeLogger as FileSizeLoggerDb
-from mmcif.io.IoAdapterCore import IoAdapterCore
-from mmcif_utils.trans.InstanceMapper import InstanceMapper
-from oslo_concurrency import lockutils
-
-#
-# Here for now - should be relocated.
-from wwpdb.apps.msgmodule.io.EmHeaderUtils import EmHeaderUtils
 
 import os
 import filecmp
@@ -204,6 +204,13 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# rendered message table rows, shared by the requests served by this process
+_DISPLAY_ROW_CACHE = DisplayRowCache()
+# search haystacks for the rendered rows of recently viewed depositions
+_SEARCH_INDEX_CACHE = SearchIndexCache()
+# fully processed message lists, reused by DataTables paging/sorting requests for a short time
+_RESULT_SET_CACHE = ResultSetCache(ttlSeconds=60)
+
 
 ###########################
 class MessagingIo(object):
@@ -257,9 +264,10 @@ class MessagingIo(object):
         # self.__emDeposition = True if ("ELECTRON MICROSCOPY" in self.__expMethodList or "ELECTRON CRYSTALLOGRAPHY" in self.__expMethodList) else False
         #
         self.__siteId = str(self.__reqObj.getValue("WWPDB_SITE_ID"))
-        self.__legacycomm = not ConfigInfoAppMessaging(self.__siteId).get_msgdb_support()
-        self.__cI = ConfigInfo(self.__siteId)
-        self.__cIA = ConfigInfoAppEm(self.__siteId)
+        # configuration objects are built once per site and shared within the process
+        self.__legacycomm = not getSiteInstance(ConfigInfoAppMessaging, self.__siteId).get_msgdb_support()
+        self.__cI = getSiteInstance(ConfigInfo, self.__siteId)
+        self.__cIA = getSiteInstance(ConfigInfoAppEm, self.__siteId)
         self.__emdDialectMappingFile = self.__cIA.get_emd_mapping_file_path()
         self.__contentTypeDict = self.__cI.get("CONTENT_TYPE_DICTIONARY")
         self.__release_message_subjects = self.__cI.get("COMMUNICATION_RELEASE_MESSAGE_SUBJECTS")
@@ -272,6 +280,17 @@ class MessagingIo(object):
         # Parameters to tune lock file management --
         self.__timeoutSeconds = 10
         self.__retrySeconds = 0.2
+        #
+        # Generated "-review" copies are reused across messages when the attached input file is unchanged
+        self.__reviewCache = ReviewArtifactCache(
+            self.__cI.get("SITE_MSGMODULE_REVIEW_CACHE_PATH", os.path.join(os.path.dirname(self.__sessionPath), "msgmodule-review-cache")), verbose=verbose, log=log
+        )
+        # Upper bound on number of attachments (milestone and review copies) processed concurrently for a single message
+        self.__maxAttachmentWorkers = 4
+        # Milestone/version files written by the attachment task of the current thread, see __trackNewFile()
+        self.__attachmentFiles = threading.local()
+        # Message files already read by this instance, by (file path, deposition id) -- only kept once setReuseReads() was called
+        self.__readD = None
 
         # BELOW SETTINGS ARE DEFAULTS THAT KICK IN FOR TESTING PURPOSES
         # self.__testMsgFilePath = "/net/wwpdb_da/da_top/wwpdb_da_test/source/python/pdbx_v2/message/testMessageFile.cif"
@@ -292,6 +311,9 @@ class MessagingIo(object):
             logger.info("--------------------------------------------")
             logger.info("Starting at %s", time.strftime("%Y %m %d %H:%M:%S", time.localtime()))
 
+            from oslo_concurrency import lockutils  # pylint: disable=import-outside-toplevel
+            from mmcif.io.IoAdapterCore import IoAdapterCore  # pylint: disable=import-outside-toplevel
+
             dirp = os.path.dirname(self.__dbFilePath)
 
             @lockutils.synchronized("msgmoduledb-lock", external=True, lock_path=dirp)
@@ -415,6 +437,23 @@ class MessagingIo(object):
                 logger.error("problem recovering data from PdbxPersist for category: '%s'", ctgryNm)
             logger.exception("Error retrieving format compatiblilty")
 
+    @staticmethod
+    def getCacheStats():
+        """Usage statistics of the message list caches held by this process"""
+        return {"result_sets": _RESULT_SET_CACHE.getStats(), "display_rows": _DISPLAY_ROW_CACHE.getStats(), "site_registry": getSiteRegistryStats()}
+
+    def setReuseReads(self, p_bReuse=True):
+        """Have this instance read each message file (or the messages of the deposition in the messaging database)
+        at most once, serving later reads from the data already loaded.
+
+        For request handlers which only display messages but consult them from several places, e.g. the tables of
+        each content type and the lists of read/actioned/for release messages. Do not use on an instance which
+        updates messages.
+
+        :param `p_bReuse`:      reuse data read (True) or read anew each time (False, the default behaviour)
+        """
+        self.__readD = {} if p_bReuse else None
+
     def getMsgColList(self, p_bCommHstryRqstd=False):
         """Retrieval of list of attributes (i.e. columns) for message data"""
         logger.info("--------------------------------------------\n")
@@ -588,6 +627,7 @@ class MessagingIo(object):
         :param `p_iDisplayLength`:     DataTables related parameter for indicating limit of total records
                                         to be displayed on screen (i.e. only subset of entire resultset is being shown)
         :param `p_sSrchFltr`:          DataTables related parameter indicating search term against which records will be filtered
+        :param `p_colSearchDict`:      column specific search terms, by column index (none if not given)
         :param `p_bThreadedRslts`:    Whether the messages are to be displayed in conventional chronological order or threaded message view
 
 
@@ -595,6 +635,7 @@ class MessagingIo(object):
         logger.info("--------------------------------------------")
         logger.info("Starting %s", time.strftime("%Y %m %d %H:%M:%S", time.localtime()))
         #
+        p_colSearchDict = p_colSearchDict or {}
         contentType = str(self.__reqObj.getValue("content_type"))
         logger.info("contentType is: %s", contentType)
         #
@@ -605,6 +646,7 @@ class MessagingIo(object):
         origCommsLst = []
         #
         bCommHstryRqstd = True if (contentType == "commhstry") else False
+        rsltSetKey = None
 
         try:
             if self.__isWorkflow():
@@ -616,6 +658,31 @@ class MessagingIo(object):
                 if contentType == "notes" or bCommHstryRqstd:
                     self.__notesFilePath = msgDI.getFilePath(contentType="notes-from-annotator", format="pdbx")
 
+            if p_bServerSide:
+                # DataTables paging/sorting/searching requests are served from the fully processed result set when
+                # an identical request was processed recently against the same version of the stored messages
+                dataVersion = self.__getMsgDataVersion(contentType)
+                if dataVersion is not None:
+                    ordL, descL = self.__getRequestedSortOrder((self.getMsgColList(bCommHstryRqstd))[1])
+                    rsltSetKey = (
+                        str(self.__reqObj.getValue("identifier")),
+                        contentType,
+                        p_sSendStatus,
+                        p_sSrchFltr if (p_sSrchFltr and len(p_sSrchFltr) > 1) else "",
+                        tuple(sorted(p_colSearchDict.items())) if p_colSearchDict else (),
+                        tuple(ordL),
+                        tuple(descL),
+                        bool(p_bThreadedRslts),
+                        tuple(time.tzname),
+                        dataVersion,
+                    )
+                    cachedRsltSet = _RESULT_SET_CACHE.get(rsltSetKey)
+                    if cachedRsltSet is not None:
+                        rtrnList, iTotalRecords, iTotalDisplayRecords, extraD = cachedRsltSet
+                        rtrnDict.update(extraD)
+                        logger.info("message list for %s served from result set cache", contentType)
+                        return self.__pageRsltSet(rtrnDict, rtrnList, iTotalRecords, iTotalDisplayRecords, p_iDisplayStart, p_iDisplayLength)
+
             # obtain data from relevant datafiles based on contentType requested
             if contentType == "msgs" or bCommHstryRqstd:
                 logger.info("self.__msgsFrmDpstrFilePath is: %s", self.__msgsFrmDpstrFilePath)
@@ -623,25 +690,21 @@ class MessagingIo(object):
 
                 # For database-backed storage (dummy paths), skip file existence checks
                 if self.__msgsFrmDpstrFilePath is not None and (self.__msgsFrmDpstrFilePath.startswith("/dummy") or os.access(self.__msgsFrmDpstrFilePath, os.R_OK)):
-                    pdbxMsgIo_frmDpstr = PdbxMessageIo(site_id=self.__siteId, verbose=self.__verbose, log=self.__lfh)
-                    depId = str(self.__reqObj.getValue("identifier"))
-                    ok = pdbxMsgIo_frmDpstr.read(self.__msgsFrmDpstrFilePath, deposition_id=depId)
+                    ok, pdbxMsgIo_frmDpstr = self.__readMsgFile(self.__msgsFrmDpstrFilePath)
                     if ok:
                         recordSetLst = (
-                            pdbxMsgIo_frmDpstr.getMessageInfo()
-                        )  # in recordSetLst we now have a list of dictionaries with item names as keys and respective data for values
+                            pdbxMsgIo_frmDpstr.getMessageRecords()
+                        )  # in recordSetLst we now have a list of MessageRecord objects (timestamps already parsed)
 
                         if bCommHstryRqstd:
                             origCommsLst.extend(pdbxMsgIo_frmDpstr.getOrigCommReferenceInfo())
 
                 if self.__msgsToDpstrFilePath is not None and (self.__msgsToDpstrFilePath.startswith("/dummy") or os.access(self.__msgsToDpstrFilePath, os.R_OK)):
-                    pdbxMsgIo_toDpstr = PdbxMessageIo(site_id=self.__siteId, verbose=self.__verbose, log=self.__lfh)
-                    depId = str(self.__reqObj.getValue("identifier"))
-                    ok = pdbxMsgIo_toDpstr.read(self.__msgsToDpstrFilePath, deposition_id=depId)
+                    ok, pdbxMsgIo_toDpstr = self.__readMsgFile(self.__msgsToDpstrFilePath)
                     if ok:
-                        msgsToDpstrLst = pdbxMsgIo_toDpstr.getMessageInfo()
+                        msgsToDpstrLst = pdbxMsgIo_toDpstr.getMessageRecords()
                         rtrnDict["CURRENT_NUM_MSGS_TO_DPSTR"] = len(msgsToDpstrLst)
-                        recordSetLst.extend(msgsToDpstrLst)  # in recordSetLst we now have a list of dictionaries with item names as keys and respective data for values
+                        recordSetLst.extend(msgsToDpstrLst)  # in recordSetLst we now have a list of MessageRecord objects (timestamps already parsed)
 
                         if bCommHstryRqstd:
                             origCommsLst.extend(pdbxMsgIo_toDpstr.getOrigCommReferenceInfo())
@@ -660,18 +723,16 @@ class MessagingIo(object):
 
                 # For database-backed storage (dummy paths), skip file existence checks
                 if self.__notesFilePath is not None and (self.__notesFilePath.startswith("/dummy") or os.access(self.__notesFilePath, os.R_OK)):
-                    pdbxMsgIo_notes = PdbxMessageIo(site_id=self.__siteId, verbose=self.__verbose, log=self.__lfh)
-                    depId = str(self.__reqObj.getValue("identifier"))
-                    ok = pdbxMsgIo_notes.read(self.__notesFilePath, deposition_id=depId)
+                    ok, pdbxMsgIo_notes = self.__readMsgFile(self.__notesFilePath)
 
                     if ok:
                         if contentType == "notes":
                             recordSetLst = (
-                                pdbxMsgIo_notes.getMessageInfo()
-                            )  # in recordSetLst we now have a list of dictionaries with item names as keys and respective data for values
+                                pdbxMsgIo_notes.getMessageRecords()
+                            )  # in recordSetLst we now have a list of MessageRecord objects (timestamps already parsed)
                             rtrnDict["CURRENT_NUM_NOTES"] = len(recordSetLst)
                         elif bCommHstryRqstd:
-                            fullNotesLst = pdbxMsgIo_notes.getMessageInfo()
+                            fullNotesLst = pdbxMsgIo_notes.getMessageRecords()
                             onlyArchvdCommsLst = [record for record in fullNotesLst if ("archive" in record["message_type"])]
                             recordSetLst.extend(onlyArchvdCommsLst)
                             origCommsLst.extend(pdbxMsgIo_notes.getOrigCommReferenceInfo())
@@ -679,9 +740,10 @@ class MessagingIo(object):
                         # no notes content created yet
                         rtrnDict["CURRENT_NUM_NOTES"] = 0
             #
-            recordSetLst = [record for record in recordSetLst if (record["send_status"] == p_sSendStatus)]
-            # Need to sort by datetime using e.g.:   aDateTime = datetime.strptime('2013-08-14 15:41:52', '%Y-%m-%d %H:%M:%S')
-            recordSetLst.sort(key=lambda record: datetime.strptime(record["timestamp"], "%Y-%m-%d %H:%M:%S"))
+            bSent = p_sSendStatus == "Y"
+            recordSetLst = [record for record in recordSetLst if (record.isSent is bSent)]
+            # timestamps were parsed to UTC datetimes when the records were loaded
+            recordSetLst.sort(key=lambda record: record.sortKey)
             #
             if bCommHstryRqstd:
                 if self.__verbose and self.__debug and self.__debugLvl2:
@@ -714,16 +776,26 @@ class MessagingIo(object):
                 #
                 iTotalRecords = len(fullRsltSet)
 
+                searchIndex = None
+                if (p_sSrchFltr and len(p_sSrchFltr) > 1) or len(p_colSearchDict) > 0:
+                    # search haystacks are prepared once per row set and reused by subsequent (per keystroke) search requests
+                    searchIndex = _SEARCH_INDEX_CACHE.getIndex(
+                        str(self.__reqObj.getValue("identifier")),
+                        (contentType, p_sSendStatus, bool(p_bThreadedRslts), tuple(time.tzname)),
+                        _SEARCH_INDEX_CACHE.getFingerprint(recordSetLst),
+                        fullRsltSet,
+                    )
+
                 if p_sSrchFltr and len(p_sSrchFltr) > 1:
                     if self.__debug:
                         logger.debug("p_sSrchFltr is: %r", p_sSrchFltr)
 
-                    filteredRsltSet = self.__filterRsltSet(fullRsltSet, p_sGlobalSrchFilter=p_sSrchFltr)
+                    filteredRsltSet = self.__filterRsltSet(fullRsltSet, p_sGlobalSrchFilter=p_sSrchFltr, p_searchIndex=searchIndex)
                     iTotalDisplayRecords = len(filteredRsltSet)
                     rtrnList = filteredRsltSet
 
                 elif len(p_colSearchDict) > 0:  # applying column specific filtering here
-                    fltrdRsltSet = self.__filterRsltSet(fullRsltSet, p_dictColSrchFilter=p_colSearchDict)
+                    fltrdRsltSet = self.__filterRsltSet(fullRsltSet, p_dictColSrchFilter=p_colSearchDict, p_searchIndex=searchIndex)
                     iTotalDisplayRecords = len(fltrdRsltSet)
                     rtrnList = fltrdRsltSet
                 else:
@@ -735,29 +807,7 @@ class MessagingIo(object):
                 # we also need to accommodate any sorting requested by the user
                 ##################################################################
 
-                # number of columns selected for sorting --
-                iSortingCols = int(self.__reqObj.getValue("iSortingCols")) if self.__reqObj.getValue("iSortingCols") else 0
-                #
-                ordL = []
-                descL = []
-                for i in range(iSortingCols):
-                    iS = str(i)
-                    idxCol = int(self.__reqObj.getValue("iSortCol_" + iS)) if self.__reqObj.getValue("iSortCol_" + iS) else 0
-                    sortFlag = self.__reqObj.getValue("bSortable_" + iS) if self.__reqObj.getValue("bSortable_" + iS) else "false"
-                    sortOrder = self.__reqObj.getValue("sSortDir_" + iS) if self.__reqObj.getValue("sSortDir_" + iS) else "asc"
-                    if sortFlag == "true":
-                        # idxCol at this point reflects display order and not necessarily the true index of the column as it sits in persistent storage
-                        # so can reference "mDataProp_[idxCol]" parameter sent by DataTables which will give true name of the column being sorted
-                        colName = self.__reqObj.getValue("mDataProp_" + str(idxCol)) if self.__reqObj.getValue("mDataProp_" + str(idxCol)) else ""
-                        colIndx = columnList.index(colName)
-                        #
-                        if self.__verbose:
-                            logger.info("colIndx for %s is %s as derived from columnList is %r", colName, colIndx, columnList)
-                        #
-                        ordL.append(colIndx)
-                        if sortOrder == "desc":
-                            descL.append(colIndx)
-                #
+                ordL, descL = self.__getRequestedSortOrder(columnList)
                 if len(ordL) > 0:
                     if self.__verbose and self.__debug and self.__debugLvl2:
                         for idx, row in enumerate(rtrnList):
@@ -767,21 +817,135 @@ class MessagingIo(object):
                 if self.__verbose:
                     logger.info("p_iDisplayStart is %s and p_iDisplayLength is %s", p_iDisplayStart, p_iDisplayLength)
                     #
+                if rsltSetKey is not None:
+                    extraD = {k: rtrnDict[k] for k in ("CURRENT_NUM_MSGS_TO_DPSTR", "CURRENT_NUM_NOTES", "INDENT_DICT") if k in rtrnDict}
+                    _RESULT_SET_CACHE.put(rsltSetKey, (rtrnList, iTotalRecords, iTotalDisplayRecords, extraD))
         except:  # noqa: E722 pylint: disable=bare-except
             logger.exception("In getting message row")
         #
         if p_bServerSide:
-            if p_iDisplayLength > 0:
-                rtrnDict["RECORD_LIST"] = rtrnList[(p_iDisplayStart) : (p_iDisplayStart + p_iDisplayLength)]
-            else:
-                rtrnDict["RECORD_LIST"] = rtrnList
-            rtrnDict["TOTAL_RECORDS"] = iTotalRecords
-            rtrnDict["TOTAL_DISPLAY_RECORDS"] = iTotalDisplayRecords
-            return rtrnDict
+            return self.__pageRsltSet(rtrnDict, rtrnList, iTotalRecords, iTotalDisplayRecords, p_iDisplayStart, p_iDisplayLength)
         else:
             rtrnDict["RECORD_LIST"] = fullRsltSet
             return rtrnDict
 
+    def __pageRsltSet(self, p_rtrnDict, p_rsltSetList, p_iTotalRecords, p_iTotalDisplayRecords, p_iDisplayStart, p_iDisplayLength):
+        """Populate p_rtrnDict with the requested page of the ordered (and filtered) result set
+
+        Filtered rows (dictionaries of true row index to row) are copied as they are consumed when rendered for DataTables,
+        and the result set may be held in the result set cache.
+        """
+        if p_iDisplayLength > 0:
+            pageList = p_rsltSetList[(p_iDisplayStart) : (p_iDisplayStart + p_iDisplayLength)]
+        else:
+            pageList = p_rsltSetList
+        p_rtrnDict["RECORD_LIST"] = [dict(row) if isinstance(row, dict) else row for row in pageList]
+        p_rtrnDict["TOTAL_RECORDS"] = p_iTotalRecords
+        p_rtrnDict["TOTAL_DISPLAY_RECORDS"] = p_iTotalDisplayRecords
+        return p_rtrnDict
+
+    def __getRequestedSortOrder(self, p_columnList):
+        """Column indexes to sort the result set by, as requested by DataTables
+
+        :Returns:
+            ordL : list of column indexes in sort order
+            descL : list of column indexes to be sorted in descending order
+        """
+        # number of columns selected for sorting --
+        iSortingCols = int(self.__reqObj.getValue("iSortingCols")) if self.__reqObj.getValue("iSortingCols") else 0
+        #
+        ordL = []
+        descL = []
+        for i in range(iSortingCols):
+            iS = str(i)
+            idxCol = int(self.__reqObj.getValue("iSortCol_" + iS)) if self.__reqObj.getValue("iSortCol_" + iS) else 0
+            sortFlag = self.__reqObj.getValue("bSortable_" + iS) if self.__reqObj.getValue("bSortable_" + iS) else "false"
+            sortOrder = self.__reqObj.getValue("sSortDir_" + iS) if self.__reqObj.getValue("sSortDir_" + iS) else "asc"
+            if sortFlag == "true":
+                # idxCol at this point reflects display order and not necessarily the true index of the column as it sits in persistent storage
+                # so can reference "mDataProp_[idxCol]" parameter sent by DataTables which will give true name of the column being sorted
+                colName = self.__reqObj.getValue("mDataProp_" + str(idxCol)) if self.__reqObj.getValue("mDataProp_" + str(idxCol)) else ""
+                colIndx = p_columnList.index(colName)
+                #
+                if self.__verbose:
+                    logger.info("colIndx for %s is %s as derived from columnList is %r", colName, colIndx, p_columnList)
+                #
+                ordL.append(colIndx)
+                if sortOrder == "desc":
+                    descL.append(colIndx)
+        return ordL, descL
+
+    def __getDepositionSummary(self):
+        """Stored message summary of the deposition (see DepositionMessageSummary), or None if not available
+
+        Only the messaging database maintains the summary; None is also returned where the deposition has
+        no summary row yet, and callers then fall back to scanning the messages.
+        """
+        if self.__legacycomm:
+            return None
+        try:
+            pdbxMsgIo = PdbxMessageIo(site_id=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+            try:
+                pdbxMsgIo.read("", deposition_id=str(self.__reqObj.getValue("identifier")))
+                return pdbxMsgIo.getDepositionSummary()  # pylint: disable=no-member
+            finally:
+                pdbxMsgIo.close()  # pylint: disable=no-member
+        except:  # noqa: E722 pylint: disable=bare-except
+            logger.exception("Could not read message summary")
+            return None
+
+    def getDataVersion(self):
+        """Version stamp of all stored messages and message statuses of the deposition, or None if not available
+
+        Cheap to obtain, without reading any messages: from two aggregate queries with the messaging database,
+        from the modification times and sizes of the message files for legacy cif files. Serves as validator
+        for conditional requests.
+        """
+        if self.__isWorkflow():
+            msgDI = MessagingDataImport(self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+            self.__msgsFrmDpstrFilePath = msgDI.getFilePath(contentType="messages-from-depositor", format="pdbx")
+            self.__msgsToDpstrFilePath = msgDI.getFilePath(contentType="messages-to-depositor", format="pdbx")
+            self.__notesFilePath = msgDI.getFilePath(contentType="notes-from-annotator", format="pdbx")
+        return self.__getMsgDataVersion("commhstry", p_bInclStatuses=True)
+
+    def __getMsgDataVersion(self, p_contentType, p_bInclStatuses=False):
+        """Version stamp of the stored messages underlying a message list request, or None if not available
+
+        With the messaging database this is obtained from a single aggregate query for the deposition
+        (plus one over the message statuses if p_bInclStatuses), for legacy cif files it is made up of
+        the modification times and sizes of the files involved, which also hold the statuses.
+        """
+        bCommHstryRqstd = p_contentType == "commhstry"
+        filePathList = []
+        if p_contentType == "msgs" or bCommHstryRqstd:
+            filePathList.extend([self.__msgsFrmDpstrFilePath, self.__msgsToDpstrFilePath])
+        if p_contentType == "notes" or bCommHstryRqstd:
+            filePathList.append(self.__notesFilePath)
+        filePathList = [filePath for filePath in filePathList if filePath is not None]
+        if not filePathList:
+            return None
+
+        try:
+            if self.__legacycomm:
+                versionList = []
+                for filePath in filePathList:
+                    if os.access(filePath, os.R_OK):
+                        st = os.stat(filePath)
+                        versionList.append((filePath, st.st_mtime_ns, st.st_size))
+                    else:
+                        versionList.append((filePath, None, None))
+                return tuple(versionList)
+
+            pdbxMsgIo = PdbxMessageIo(site_id=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+            try:
+                pdbxMsgIo.read(filePathList[0], deposition_id=str(self.__reqObj.getValue("identifier")))
+                return pdbxMsgIo.getDataVersion(p_bInclStatuses)  # pylint: disable=no-member
+            finally:
+                pdbxMsgIo.close()  # pylint: disable=no-member
+        except:  # noqa: E722 pylint: disable=bare-except
+            logger.exception("Could not determine data version for %s", p_contentType)
+            return None
+
     def checkAvailFiles(self, p_depDataSetId):  # pylint: disable=unused-argument
         """Retrieve list of deposition files that have been produced thus far for dataset
 
@@ -852,59 +1016,19 @@ class MessagingIo(object):
     def getFilesRfrncd(self, p_depDataSetId, p_msgIdFilter=None):  # pylint: disable=unused-argument
         """Retrieve list of files referenced by any messages for this dataset ID
 
+        Files are not copied anywhere -- each entry carries a link to the "download_file" service which streams
+        the file straight from the archive when (and if) the user actually requests it.
+
         :param `p_depDataSetId`:       ID of deposition dataset for which list of messages being requested
 
         """
         logger.info("--------------------------------------------")
         logger.info("Starting at %s", time.strftime("%Y %m %d %H:%M:%S", time.localtime()))
         #
-        recordSetLst = []
         rtrnDict = {}
         #
         try:
-            if self.__isWorkflow():
-                msgDI = MessagingDataImport(self.__reqObj, verbose=self.__verbose, log=self.__lfh)
-                self.__msgsFrmDpstrFilePath = msgDI.getFilePath(contentType="messages-from-depositor", format="pdbx")
-                self.__msgsToDpstrFilePath = msgDI.getFilePath(contentType="messages-to-depositor", format="pdbx")
-                logger.info("self.__msgsFrmDpstrFilePath is: %s", self.__msgsFrmDpstrFilePath)
-                logger.info("self.__msgsToDpstrFilePath is: %s", self.__msgsToDpstrFilePath)
-
-            # For database-backed storage (dummy paths), skip file existence checks
-            if self.__msgsFrmDpstrFilePath is not None and (self.__msgsFrmDpstrFilePath.startswith("/dummy") or os.access(self.__msgsFrmDpstrFilePath, os.R_OK)):
-                mIIo = PdbxMessageIo(site_id=self.__siteId, verbose=self.__verbose, log=self.__lfh)
-                with LockFile(
-                    self.__msgsFrmDpstrFilePath, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh
-                ) as _lf, FileSizeLogger(self.__msgsFrmDpstrFilePath, verbose=self.__verbose, log=self.__lfh) as _fsl:
-                    pid = os.getpid()
-                    depId = str(self.__reqObj.getValue("identifier"))
-                    ok = mIIo.read(self.__msgsFrmDpstrFilePath, "msgingmod" + str(pid), deposition_id=depId)
-                if ok:
-                    recordSetLst = mIIo.getFileReferenceInfo()  # in recordSetLst we now have a list of dictionaries with item names as keys and respective data for values
-
-            # For database-backed storage (dummy paths), skip file existence checks
-            if self.__msgsToDpstrFilePath is not None and (self.__msgsToDpstrFilePath.startswith("/dummy") or os.access(self.__msgsToDpstrFilePath, os.R_OK)):
-                mIIo2 = PdbxMessageIo(site_id=self.__siteId, verbose=self.__verbose, log=self.__lfh)
-                with LockFile(
-                    self.__msgsToDpstrFilePath, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh
-                ) as _lf, FileSizeLogger(  # noqa: F841
-                    self.__msgsToDpstrFilePath, verbose=self.__verbose, log=self.__lfh
-                ) as _fsl:  # noqa: F841
-                    pid = os.getpid()
-                    depId = str(self.__reqObj.getValue("identifier"))
-                    ok = mIIo2.read(self.__msgsToDpstrFilePath, "msgingmod" + str(pid), deposition_id=depId)
-                if ok:
-                    recordSetLst.extend(mIIo2.getFileReferenceInfo())  # in recordSetLst we now have a list of dictionaries with item names as keys and respective data for values
-            #
-            # Filter out duplicate dictionaries based on 'ordinal_id'
-            unique_ordinal_ids = set()
-            filtered_recordSetLst = []
-            for record in recordSetLst:
-                ordinal_id = record.get('ordinal_id')  # Extract 'ordinal_id' from the dictionary
-                if ordinal_id not in unique_ordinal_ids:
-                    unique_ordinal_ids.add(ordinal_id)  # Add to the set of seen 'ordinal_id'
-                    filtered_recordSetLst.append(record)  # Add the dictionary to the filtered list
-
-            recordSetLst = filtered_recordSetLst  # Replace the original list with the filtered list
+            recordSetLst = self.__getFileRefRecords()
 
             if self.__verbose and self.__debug and self.__debugLvl2:
                 for idx, row in enumerate(recordSetLst):
@@ -917,6 +1041,87 @@ class MessagingIo(object):
         #
         return rtrnDict
 
+    def getFileRfrncPath(self, p_depDataSetId, p_msgId, p_fileRefOrdinal):
+        """Resolve the archive path of a single file referenced by a message.
+
+        The path is derived solely from the file reference row recorded for the message, so only files that were
+        actually associated with a message of this deposition can ever be resolved.
+
+        :param `p_depDataSetId`:       ID of deposition dataset the message belongs to
+        :param `p_msgId`:              ID of the message referencing the file
+        :param `p_fileRefOrdinal`:     ordinal_id of the file reference row
+
+        :Returns: absolute path of the readable archive file, or None if no such reference exists
+        """
+        try:
+            for rcrd in self.__getFileRefRecords():
+                if rcrd["message_id"] != p_msgId or str(rcrd.get("ordinal_id")) != str(p_fileRefOrdinal):
+                    continue
+                rcrdDepId = rcrd.get("deposition_data_set_id")
+                if rcrdDepId and str(rcrdDepId).upper() != str(p_depDataSetId).upper():
+                    logger.warning("file reference %s of message %s does not belong to %s", p_fileRefOrdinal, p_msgId, p_depDataSetId)
+                    return None
+                if rcrd["storage_type"] != "archive":
+                    return None
+                archiveFilePth = self.__getFileRefArchivePath(rcrd)
+                if archiveFilePth and os.path.isfile(archiveFilePth) and os.access(archiveFilePth, os.R_OK):
+                    return archiveFilePth
+                return None
+        except:  # noqa: E722 pylint: disable=bare-except
+            logger.exception("In resolving file reference %s for message %s", p_fileRefOrdinal, p_msgId)
+        #
+        return None
+
+    def __getFileRefRecords(self):
+        """Read file reference rows recorded for both messages-from-depositor and messages-to-depositor data.
+
+        :Returns: list of dictionaries, one per file reference row, with duplicate ordinal_ids removed
+        """
+        recordSetLst = []
+        if self.__isWorkflow():
+            msgDI = MessagingDataImport(self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+            self.__msgsFrmDpstrFilePath = msgDI.getFilePath(contentType="messages-from-depositor", format="pdbx")
+            self.__msgsToDpstrFilePath = msgDI.getFilePath(contentType="messages-to-depositor", format="pdbx")
+            logger.info("self.__msgsFrmDpstrFilePath is: %s", self.__msgsFrmDpstrFilePath)
+            logger.info("self.__msgsToDpstrFilePath is: %s", self.__msgsToDpstrFilePath)
+
+        # For database-backed storage (dummy paths), skip file existence checks
+        if self.__msgsFrmDpstrFilePath is not None and (self.__msgsFrmDpstrFilePath.startswith("/dummy") or os.access(self.__msgsFrmDpstrFilePath, os.R_OK)):
+            mIIo = PdbxMessageIo(site_id=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+            with LockFile(
+                self.__msgsFrmDpstrFilePath, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh, site_id=self.__siteId
+            ) as _lf, FileSizeLogger(self.__msgsFrmDpstrFilePath, verbose=self.__verbose, log=self.__lfh, site_id=self.__siteId) as _fsl:
+                pid = os.getpid()
+                depId = str(self.__reqObj.getValue("identifier"))
+                ok = mIIo.read(self.__msgsFrmDpstrFilePath, "msgingmod" + str(pid), deposition_id=depId)
+            if ok:
+                recordSetLst = mIIo.getFileReferenceInfo()  # in recordSetLst we now have a list of dictionaries with item names as keys and respective data for values
+
+        # For database-backed storage (dummy paths), skip file existence checks
+        if self.__msgsToDpstrFilePath is not None and (self.__msgsToDpstrFilePath.startswith("/dummy") or os.access(self.__msgsToDpstrFilePath, os.R_OK)):
+            mIIo2 = PdbxMessageIo(site_id=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+            with LockFile(
+                self.__msgsToDpstrFilePath, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh, site_id=self.__siteId
+            ) as _lf, FileSizeLogger(  # noqa: F841
+                self.__msgsToDpstrFilePath, verbose=self.__verbose, log=self.__lfh, site_id=self.__siteId
+            ) as _fsl:  # noqa: F841
+                pid = os.getpid()
+                depId = str(self.__reqObj.getValue("identifier"))
+                ok = mIIo2.read(self.__msgsToDpstrFilePath, "msgingmod" + str(pid), deposition_id=depId)
+            if ok:
+                recordSetLst.extend(mIIo2.getFileReferenceInfo())  # in recordSetLst we now have a list of dictionaries with item names as keys and respective data for values
+        #
+        # Filter out duplicate dictionaries based on 'ordinal_id'
+        unique_ordinal_ids = set()
+        filtered_recordSetLst = []
+        for record in recordSetLst:
+            ordinal_id = record.get('ordinal_id')  # Extract 'ordinal_id' from the dictionary
+            if ordinal_id not in unique_ordinal_ids:
+                unique_ordinal_ids.add(ordinal_id)  # Add to the set of seen 'ordinal_id'
+                filtered_recordSetLst.append(record)  # Add the dictionary to the filtered list
+
+        return filtered_recordSetLst
+
     def getMsgReadList(self, p_depDataSetId):  # pylint: disable=unused-argument
         """For a given deposition dataset ID, retrieve list of messages already read
 
@@ -963,15 +1168,7 @@ class MessagingIo(object):
 
             # For database-backed storage (dummy paths), skip file existence checks
             if self.__notesFilePath is not None and (self.__notesFilePath.startswith("/dummy") or os.access(self.__notesFilePath, os.R_OK)):
-                mIIo = PdbxMessageIo(site_id=self.__siteId, verbose=self.__verbose, log=self.__lfh)
-                with LockFile(
-                    self.__notesFilePath, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh
-                ) as _lf, FileSizeLogger(  # noqa: F841
-                    self.__notesFilePath, verbose=self.__verbose, log=self.__lfh
-                ) as _fsl:  # noqa: F841
-                    pid = os.getpid()
-                    depId = str(self.__reqObj.getValue("identifier"))
-                    ok = mIIo.read(self.__notesFilePath, "msgingmod" + str(pid), deposition_id=depId)
+                ok, mIIo = self.__readMsgFile(self.__notesFilePath, p_bLock=True)
                 if ok:
                     recordSetLst = mIIo.getMessageInfo()  # in recordSetLst we now have a list of dictionaries with item names as keys and respective data for values
                 #
@@ -1006,6 +1203,7 @@ class MessagingIo(object):
         msgFileRefs = []
         failedFileRefs = []
         bVldtnRprtBeingSent = False
+        rmwLock = ExitStack()
         #
         try:
             if self.__verbose and self.__debug:
@@ -1045,9 +1243,14 @@ class MessagingIo(object):
             else:
                 logger.info("Using database storage - skipping file operations for: %s", outputFilePth)
             #
+            if p_msgObj.isDraft:
+                # draft updates modify an existing row so the deposition stays locked from read through to write
+                rmwLock.enter_context(self.__depositionLock(outputFilePth))
             mIIo = PdbxMessageIo(site_id=self.__siteId, verbose=self.__verbose, log=self.__lfh)
-            with LockFile(outputFilePth, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh) as _lf, FileSizeLogger(
-                outputFilePth, verbose=self.__verbose, log=self.__lfh
+            with LockFile(
+                outputFilePth, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh, site_id=self.__siteId
+            ) as _lf, FileSizeLogger(  # noqa: F841
+                outputFilePth, verbose=self.__verbose, log=self.__lfh, site_id=self.__siteId
             ) as _fsl:  # noqa: F841
                 pid = os.getpid()
                 depId = str(self.__reqObj.getValue("identifier"))
@@ -1115,15 +1318,18 @@ class MessagingIo(object):
 
                 self._updateSnapshotHistory(outputFilePth)
 
-                with LockFile(outputFilePth, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh) as _lf:  # noqa: F841
+                with LockFile(
+                    outputFilePth, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh, site_id=self.__siteId
+                ) as _lf:  # noqa: F841
                     bOk = mIIo.write(outputFilePth)
+                _SEARCH_INDEX_CACHE.invalidate(p_msgObj.depositionId)
 
                 # Write message to depositor message file and send email
                 if bOk and not self.__groupId:
                     if self.__isWorkflow() and p_msgObj.contentType == "msgs":
                         # update copy of messages-to-depositor file in depositor file system if necessary
                         with LockFile(
-                            depUiMsgsToDpstrFilePath, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh
+                            depUiMsgsToDpstrFilePath, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh, site_id=self.__siteId
                         ) as _lf:  # noqa: F841
                             mIIo.write(depUiMsgsToDpstrFilePath)
 
@@ -1156,6 +1362,8 @@ class MessagingIo(object):
         except:  # noqa: E722 pylint: disable=bare-except
             logger.exception("Message data append failed")
             bOk = False
+        finally:
+            rmwLock.close()
 
         endTime = time.time()
         logger.info("Completed at %s (%d seconds)", time.strftime("%Y %m %d %H:%M:%S", time.localtime()), endTime - startTime)
@@ -1657,9 +1865,9 @@ class MessagingIo(object):
         logger.info("self.__msgsFromDpstrFilePath is: %s", self.__msgsFrmDpstrFilePath)
         mIIo = PdbxMessageIo(site_id=self.__siteId, verbose=self.__verbose, log=self.__lfh)
         with LockFile(
-            self.__msgsFrmDpstrFilePath, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh
+            self.__msgsFrmDpstrFilePath, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh, site_id=self.__siteId
         ) as _lf, FileSizeLogger(  # noqa: F841
-            self.__msgsFrmDpstrFilePath, verbose=self.__verbose, log=self.__lfh
+            self.__msgsFrmDpstrFilePath, verbose=self.__verbose, log=self.__lfh, site_id=self.__siteId
         ) as _fsl:  # noqa: F841
             pid = os.getpid()
             depId = str(self.__reqObj.getValue("identifier"))
@@ -1678,13 +1886,22 @@ class MessagingIo(object):
         return ""
 
     def is_release_request(self, message_id):
-        subject = self.get_message_subject_from_depositor(message_id=message_id)
-        logger.info("Message %s subject is: %s", message_id, subject)
-        if subject in self.__release_message_subjects:
-            logger.info("Message is a release request\n")
+        if message_id in self.get_release_request_ids():
+            logger.info("Message %s is a release request", message_id)
             return True
         return False
 
+    def get_release_request_ids(self, message_list=None):
+        """IDs of the messages from depositor whose subject marks them as a release request
+
+        :param `message_list`:    messages from depositor as returned by get_message_list_from_depositor(), read if not given
+        """
+        if not self.__release_message_subjects:
+            return set()
+        if message_list is None:
+            message_list = self.get_message_list_from_depositor()
+        return set(row.get("message_id") for row in message_list if row.get("message_subject") in self.__release_message_subjects)
+
     def markMsgAsRead(self, p_msgStatusDict):
         """handle request to mark message as already "read"
 
@@ -1727,52 +1944,53 @@ class MessagingIo(object):
                 except IOError:
                     pass
             #
-            mIIo = PdbxMessageIo(site_id=self.__siteId, verbose=self.__verbose, log=self.__lfh)
-            with LockFile(
-                self.__msgsToDpstrFilePath, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh
-            ) as _lf, FileSizeLogger(
-                self.__msgsToDpstrFilePath, verbose=self.__verbose, log=self.__lfh
-            ) as _fsl:  # noqa: F841
-                pid = os.getpid()
-                depId = str(self.__reqObj.getValue("identifier"))
-                ok = mIIo.read(self.__msgsToDpstrFilePath, "msgingmod" + str(pid), deposition_id=depId)
-            if ok:
-                recordSetLst = mIIo.getMsgStatusInfo()  # in recordSetLst we now have a list of dictionaries with item names as keys and respective data for values
-                msgAlreadySeen = False
-                for idx, record in enumerate(recordSetLst):
-                    if record["message_id"] == msgId:
-                        msgAlreadySeen = True
-                        if record["read_status"] == "Y":
-                            # message had already been marked as "read" so can return True to caller
-                            return True
-                        else:
-                            # message not been marked as read before - but is in the list of messages in recordSetLst
-                            mIIo.update("pdbx_deposition_message_status", "read_status", "Y", idx)
-
-                mIIo.newBlock("messages")
-                if not msgAlreadySeen:
-                    logger.info("new message: %s", msgId)
-                    if self.is_release_request(message_id=msgId):
-                        mS.setReadyForRelStatus("Y")
-                    mIIo.appendMsgReadStatus(mS.get())
+            with self.__depositionLock(self.__msgsToDpstrFilePath):
+                mIIo = PdbxMessageIo(site_id=self.__siteId, verbose=self.__verbose, log=self.__lfh)
                 with LockFile(
-                    self.__msgsToDpstrFilePath, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh
-                ) as _lf:  # noqa: F841
-                    mIIo.write(self.__msgsToDpstrFilePath)
-
-                bOk = ok
+                    self.__msgsToDpstrFilePath, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh, site_id=self.__siteId
+                ) as _lf, FileSizeLogger(
+                    self.__msgsToDpstrFilePath, verbose=self.__verbose, log=self.__lfh, site_id=self.__siteId
+                ) as _fsl:  # noqa: F841
+                    pid = os.getpid()
+                    depId = str(self.__reqObj.getValue("identifier"))
+                    ok = mIIo.read(self.__msgsToDpstrFilePath, "msgingmod" + str(pid), deposition_id=depId)
+                if ok:
+                    recordSetLst = mIIo.getMsgStatusInfo()  # in recordSetLst we now have a list of dictionaries with item names as keys and respective data for values
+                    msgAlreadySeen = False
+                    for idx, record in enumerate(recordSetLst):
+                        if record["message_id"] == msgId:
+                            msgAlreadySeen = True
+                            if record["read_status"] == "Y":
+                                # message had already been marked as "read" so can return True to caller
+                                return True
+                            else:
+                                # message not been marked as read before - but is in the list of messages in recordSetLst
+                                mIIo.update("pdbx_deposition_message_status", "read_status", "Y", idx)
 
-            else:
-                # OR if there was no container list BUT the file is accessible-->indicates no content yet b/c no messages sent to depositor yet
-                # For database-backed storage (dummy paths), skip write access checks
-                if self.__msgsToDpstrFilePath.startswith("/dummy") or os.access(self.__msgsToDpstrFilePath, os.W_OK):
                     mIIo.newBlock("messages")
-                    mIIo.appendMsgReadStatus(mS.get())
+                    if not msgAlreadySeen:
+                        logger.info("new message: %s", msgId)
+                        if self.is_release_request(message_id=msgId):
+                            mS.setReadyForRelStatus("Y")
+                        mIIo.appendMsgReadStatus(mS.get())
                     with LockFile(
-                        self.__msgsToDpstrFilePath, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh
+                        self.__msgsToDpstrFilePath, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh, site_id=self.__siteId
                     ) as _lf:  # noqa: F841
                         mIIo.write(self.__msgsToDpstrFilePath)
-                    bOk = True
+
+                    bOk = ok
+
+                else:
+                    # OR if there was no container list BUT the file is accessible-->indicates no content yet b/c no messages sent to depositor yet
+                    # For database-backed storage (dummy paths), skip write access checks
+                    if self.__msgsToDpstrFilePath.startswith("/dummy") or os.access(self.__msgsToDpstrFilePath, os.W_OK):
+                        mIIo.newBlock("messages")
+                        mIIo.appendMsgReadStatus(mS.get())
+                        with LockFile(
+                            self.__msgsToDpstrFilePath, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh, site_id=self.__siteId
+                        ) as _lf:  # noqa: F841
+                            mIIo.write(self.__msgsToDpstrFilePath)
+                        bOk = True
         except:  # noqa: E722 pylint: disable=bare-except
             logger.exception("Message read status data update failed")
 
@@ -1788,6 +2006,9 @@ class MessagingIo(object):
 
         """
         logger.info("Starting at %s", time.strftime("%Y %m %d %H:%M:%S", time.localtime()))
+        summary = self.__getDepositionSummary()
+        if summary is not None:
+            return summary["num_unread"] == 0
         # are all messages read?
         bAllMsgsRead = self.__globalMessageStatusCheck(p_statusToCheck="read_status", p_flagForFalseReturn="N")
 
@@ -1800,6 +2021,9 @@ class MessagingIo(object):
 
         """
         logger.info("Starting at %s", time.strftime("%Y %m %d %H:%M:%S", time.localtime()))
+        summary = self.__getDepositionSummary()
+        if summary is not None:
+            return summary["num_unactioned"] == 0
         # are all messages "actioned"?
         bAllMsgsActioned = self.__globalMessageStatusCheck(p_statusToCheck="action_reqd", p_flagForFalseReturn="Y")
 
@@ -1812,6 +2036,13 @@ class MessagingIo(object):
 
         """
         logger.info("Starting")
+        summary = self.__getDepositionSummary()
+        if summary is not None:
+            if summary["num_for_release"] > 0:
+                return True
+            if summary["num_without_status"] == 0:
+                # release requests are only recognised by subject among messages without a status record
+                return False
         # asking, no flags exist that indicate "for release"?
         bNoFlagsForRelease = self.__globalMessageStatusCheck(p_statusToCheck="for_release", p_flagForFalseReturn="Y")
         # NOTE: in order to make semantic sense, we need to return the boolean opposite of the above return value
@@ -1843,6 +2074,12 @@ class MessagingIo(object):
         iNumNotesRecords = 0
         recordSetLst = []
         #
+        summary = self.__getDepositionSummary()
+        if summary is not None:
+            iNumNotesRecords = summary["num_notes"]
+            bAnnotNotes = summary["num_annotator_notes"] >= 1 or summary["num_flagged_notes"] >= 1
+            bBmrbNotes = summary["num_annotator_notes"] == 0 and summary["num_flagged_notes"] >= 1
+            return iNumNotesRecords >= 1, bAnnotNotes, bBmrbNotes, iNumNotesRecords
         try:
             if self.__isWorkflow():
                 msgDI = MessagingDataImport(self.__reqObj, verbose=self.__verbose, log=self.__lfh)
@@ -1851,9 +2088,7 @@ class MessagingIo(object):
 
             # For database-backed storage (dummy paths), skip file existence checks
             if self.__notesFilePath is not None and (self.__notesFilePath.startswith("/dummy") or os.access(self.__notesFilePath, os.R_OK)):
-                pdbxMsgIo_notes = PdbxMessageIo(site_id=self.__siteId, verbose=self.__verbose, log=self.__lfh)
-                depId = str(self.__reqObj.getValue("identifier"))
-                bGotContent = pdbxMsgIo_notes.read(self.__notesFilePath, deposition_id=depId)
+                bGotContent, pdbxMsgIo_notes = self.__readMsgFile(self.__notesFilePath)
 
                 if bGotContent:
                     recordSetLst = (
@@ -1928,50 +2163,51 @@ class MessagingIo(object):
                 except IOError:
                     pass
             #
-            mIIo = PdbxMessageIo(site_id=self.__siteId, verbose=self.__verbose, log=self.__lfh)
-            msgAlreadySeen = False
-            with LockFile(
-                self.__msgsToDpstrFilePath, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh
-            ) as _lf, FileSizeLogger(
-                self.__msgsToDpstrFilePath, verbose=self.__verbose, log=self.__lfh  # noqa: F841
-            ) as _fsl:  # noqa: F841
-                pid = os.getpid()
-                depId = str(self.__reqObj.getValue("identifier"))
-                ok = mIIo.read(self.__msgsToDpstrFilePath, "msgingmod" + str(pid), deposition_id=depId)
-            if ok:
-                # i.e. get here if mIIo successfully read/obtained container list,
-
-                recordSetLst = mIIo.getMsgStatusInfo()  # in recordSetLst we now have a list of dictionaries with item names as keys and respective data for values
+            with self.__depositionLock(self.__msgsToDpstrFilePath):
+                mIIo = PdbxMessageIo(site_id=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+                msgAlreadySeen = False
+                with LockFile(
+                    self.__msgsToDpstrFilePath, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh, site_id=self.__siteId
+                ) as _lf, FileSizeLogger(
+                    self.__msgsToDpstrFilePath, verbose=self.__verbose, log=self.__lfh, site_id=self.__siteId  # noqa: F841
+                ) as _fsl:  # noqa: F841
+                    pid = os.getpid()
+                    depId = str(self.__reqObj.getValue("identifier"))
+                    ok = mIIo.read(self.__msgsToDpstrFilePath, "msgingmod" + str(pid), deposition_id=depId)
+                if ok:
+                    # i.e. get here if mIIo successfully read/obtained container list,
 
-                for idx, record in enumerate(recordSetLst):
-                    if record["message_id"] == msgId:
-                        msgAlreadySeen = True
-                        mIIo.update("pdbx_deposition_message_status", "action_reqd", p_msgStatusDict["action_reqd"], idx)
-                        if record["read_status"] == "Y":  # i.e. only pertinent updates of 'read_status' in this method are when user is setting read flag back to 'N' for unread
-                            mIIo.update("pdbx_deposition_message_status", "read_status", p_msgStatusDict["read_status"], idx)
-                        mIIo.update("pdbx_deposition_message_status", "for_release", p_msgStatusDict["for_release"], idx)
-                        break
+                    recordSetLst = mIIo.getMsgStatusInfo()  # in recordSetLst we now have a list of dictionaries with item names as keys and respective data for values
 
-                mIIo.newBlock("messages")
-                if msgAlreadySeen is not True:  # which can occur if this is the first time any msgStatus is being recorded in the msgsToDpstrFile
-                    mIIo.appendMsgReadStatus(mS.get())
-                with LockFile(
-                    self.__msgsToDpstrFilePath, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh
-                ) as _lf:  # noqa: F841
-                    mIIo.write(self.__msgsToDpstrFilePath)
-                bOk = ok
+                    for idx, record in enumerate(recordSetLst):
+                        if record["message_id"] == msgId:
+                            msgAlreadySeen = True
+                            mIIo.update("pdbx_deposition_message_status", "action_reqd", p_msgStatusDict["action_reqd"], idx)
+                            if record["read_status"] == "Y":  # i.e. only pertinent updates of 'read_status' in this method are when user is setting read flag back to 'N' for unread
+                                mIIo.update("pdbx_deposition_message_status", "read_status", p_msgStatusDict["read_status"], idx)
+                            mIIo.update("pdbx_deposition_message_status", "for_release", p_msgStatusDict["for_release"], idx)
+                            break
 
-            else:
-                # OR if there was no container list BUT the file is accessible-->indicates no content yet b/c no messages sent to depositor yet
-                # For database-backed storage (dummy paths), skip write access checks
-                if self.__msgsToDpstrFilePath.startswith("/dummy") or os.access(self.__msgsToDpstrFilePath, os.W_OK):
                     mIIo.newBlock("messages")
-                    mIIo.appendMsgReadStatus(mS.get())
+                    if msgAlreadySeen is not True:  # which can occur if this is the first time any msgStatus is being recorded in the msgsToDpstrFile
+                        mIIo.appendMsgReadStatus(mS.get())
                     with LockFile(
-                        self.__msgsToDpstrFilePath, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh
+                        self.__msgsToDpstrFilePath, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh, site_id=self.__siteId
                     ) as _lf:  # noqa: F841
                         mIIo.write(self.__msgsToDpstrFilePath)
-                    bOk = True
+                    bOk = ok
+
+                else:
+                    # OR if there was no container list BUT the file is accessible-->indicates no content yet b/c no messages sent to depositor yet
+                    # For database-backed storage (dummy paths), skip write access checks
+                    if self.__msgsToDpstrFilePath.startswith("/dummy") or os.access(self.__msgsToDpstrFilePath, os.W_OK):
+                        mIIo.newBlock("messages")
+                        mIIo.appendMsgReadStatus(mS.get())
+                        with LockFile(
+                            self.__msgsToDpstrFilePath, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh, site_id=self.__siteId
+                        ) as _lf:  # noqa: F841
+                            mIIo.write(self.__msgsToDpstrFilePath)
+                        bOk = True
 
         except:  # noqa: E722 pylint: disable=bare-except
             logger.info("Update message tags failed")
@@ -1982,12 +2218,179 @@ class MessagingIo(object):
         #
         return bOk
 
+    def bulkUpdateMsgStatus(self, p_msgStatusDictList, p_keepUnread=False):
+        """handle request to apply status changes ("read", "action required", "for release") to many messages at once
+
+        With the messaging database all changes are applied with one multi-row upsert in a single transaction.
+        With legacy cif storage the messages-to-depositor file is read and written once for all changes.
+        As with markMsgAsRead(), a release request from the depositor is flagged "for release" when its first status is recorded.
+
+        :Params:
+            :param `p_msgStatusDictList`:    list of dictionaries each with "message_id" and any of "read_status", "action_reqd", "for_release"
+            :param `p_keepUnread`:           as for tagMsg(), apply "read_status" to a message already having a status only if
+                                             it is read, so that an unread message is never marked read on the side
+
+
+        :Returns:
+            dictionary of outcome per message ID: "created", "updated", "unchanged", "invalid", "not_found" or "failed"
+
+        """
+        startTime = time.time()
+        logger.info("Starting at %s", time.strftime("%Y %m %d %H:%M:%S", time.localtime()))
+        #
+        rtrnDict = {}
+        #
+        try:
+            if self.__isWorkflow():
+                msgDI = MessagingDataImport(self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+                self.__msgsToDpstrFilePath = msgDI.getFilePath(contentType="messages-to-depositor", format="pdbx")
+                self.__msgsFrmDpstrFilePath = msgDI.getFilePath(contentType="messages-from-depositor", format="pdbx")
+                self.__notesFilePath = msgDI.getFilePath(contentType="notes-from-annotator", format="pdbx")
+                logger.info("self.__msgsToDpstrFilePath is: %s", self.__msgsToDpstrFilePath)
+            #
+            depId = str(self.__reqObj.getValue("identifier"))
+            with self.__depositionLock(self.__msgsToDpstrFilePath):
+                mIIo = PdbxMessageIo(site_id=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+                if self.__legacycomm:
+                    rtrnDict = self.__bulkUpdateMsgStatusCif(mIIo, depId, p_msgStatusDictList, p_keepUnread)
+                else:
+                    mIIo.read(self.__msgsToDpstrFilePath, "msgingmod" + str(os.getpid()), deposition_id=depId)
+                    statusMsgIds = set(record["message_id"] for record in mIIo.getMsgStatusInfo())
+                    msgStatusDictList = self.__withReleaseRequests(p_msgStatusDictList, statusMsgIds, self.get_release_request_ids())
+                    rtrnDict = mIIo.bulkUpdateMsgStatus(msgStatusDictList, keep_unread=p_keepUnread)
+        except:  # noqa: E722 pylint: disable=bare-except
+            logger.exception("Bulk message status update failed")
+            for msgStatusDict in p_msgStatusDictList:
+                if msgStatusDict.get("message_id") and rtrnDict.get(msgStatusDict["message_id"]) in (None, "created", "updated", "unchanged"):
+                    rtrnDict[msgStatusDict["message_id"]] = "failed"
+
+        endTime = time.time()
+        logger.info("Completed at %s (%d seconds)", time.strftime("%Y %m %d %H:%M:%S", time.localtime()), endTime - startTime)
+        #
+        return rtrnDict
+
         ################################################################################################################
 
     # ------------------------------------------------------------------------------------------------------------
     #      Private helper methods
     # ------------------------------------------------------------------------------------------------------------
     #
+    def __depositionLock(self, p_filePath):
+        """Lock held across a read-modify-write of the messaging data file at p_filePath.
+
+        With the messaging database this is a re-entrant per-deposition database lock, so the LockFile
+        blocks nested within it for the individual read and write steps do not block. File locks used
+        with legacy cif storage are not re-entrant, so there the individual read/write locks are relied
+        upon as before and a no-op context is returned.
+        """
+        if self.__legacycomm:
+            return nullcontext()
+        return LockFile(p_filePath, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh, site_id=self.__siteId)
+
+    def __bulkUpdateMsgStatusCif(self, p_mIIo, p_depId, p_msgStatusDictList, p_keepUnread=False):
+        """Apply status changes to the legacy messages-to-depositor cif file with a single read and write"""
+        rtrnDict = {}
+        if not os.access(self.__msgsToDpstrFilePath, os.F_OK):
+            try:
+                f = open(self.__msgsToDpstrFilePath, "w")
+                f.close()
+                logger.info("Creating %s file", self.__msgsToDpstrFilePath)
+            except IOError:
+                pass
+        #
+        with LockFile(
+            self.__msgsToDpstrFilePath, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh, site_id=self.__siteId
+        ) as _lf, FileSizeLogger(
+            self.__msgsToDpstrFilePath, verbose=self.__verbose, log=self.__lfh, site_id=self.__siteId
+        ) as _fsl:  # noqa: F841
+            ok = p_mIIo.read(self.__msgsToDpstrFilePath, "msgingmod" + str(os.getpid()), deposition_id=p_depId)
+        #
+        rowIdxD = {}
+        msgIdSet = set()
+        if ok:
+            for idx, record in enumerate(p_mIIo.getMsgStatusInfo()):
+                rowIdxD[record["message_id"]] = (idx, record)
+            msgIdSet.update(msg["message_id"] for msg in p_mIIo.getMessageInfo())
+        #
+        # statuses may be recorded for any message of the deposition, as with the messaging database
+        msgsFrmDpstrLst = self.__readCifMsgInfo(self.__msgsFrmDpstrFilePath)
+        msgIdSet.update(msg["message_id"] for msg in msgsFrmDpstrLst)
+        msgIdSet.update(msg["message_id"] for msg in self.__readCifMsgInfo(self.__notesFilePath))
+        #
+        changeList = []
+        for msgStatusDict in self.__withReleaseRequests(p_msgStatusDictList, rowIdxD, self.get_release_request_ids(msgsFrmDpstrLst)):
+            msgId = msgStatusDict.get("message_id")
+            if not msgId:
+                continue
+            flagD = dict((k, msgStatusDict[k]) for k in ("read_status", "action_reqd", "for_release") if msgStatusDict.get(k) is not None)
+            if [v for v in flagD.values() if v not in ("Y", "N")]:
+                rtrnDict[msgId] = "invalid"
+            changeList.append((msgId, flagD))
+        #
+        bChanged = False
+        newStatusD = {}
+        for msgId, flagD in changeList:
+            if rtrnDict.get(msgId) == "invalid":
+                # a message with any invalid change is left untouched
+                continue
+            if msgId not in rowIdxD and msgId not in msgIdSet:
+                rtrnDict[msgId] = "not_found"
+            elif msgId in rowIdxD:
+                idx, record = rowIdxD[msgId]
+                if p_keepUnread and record.get("read_status") != "Y":
+                    flagD = dict((k, v) for k, v in flagD.items() if k != "read_status")
+                changedD = dict((k, v) for k, v in flagD.items() if record.get(k) != v)
+                for k, v in changedD.items():
+                    p_mIIo.update("pdbx_deposition_message_status", k, v, idx)
+                    record[k] = v
+                if changedD:
+                    bChanged = True
+                    rtrnDict[msgId] = "updated"
+                elif msgId not in rtrnDict:
+                    rtrnDict[msgId] = "unchanged"
+            else:
+                # first status recorded for this message - later changes to the same message are merged in
+                newStatusD.setdefault(msgId, {"message_id": msgId, "deposition_data_set_id": p_depId, "read_status": "N", "action_reqd": "N", "for_release": "N"}).update(flagD)
+                rtrnDict[msgId] = "created"
+        #
+        if bChanged or newStatusD:
+            p_mIIo.newBlock("messages")
+            for statusD in newStatusD.values():
+                mS = PdbxMessageStatusLegacy(verbose=self.__verbose, log=self.__lfh)
+                mS.set(statusD)
+                p_mIIo.appendMsgReadStatus(mS.get())
+            with LockFile(
+                self.__msgsToDpstrFilePath, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh, site_id=self.__siteId
+            ) as _lf:  # noqa: F841
+                if not p_mIIo.write(self.__msgsToDpstrFilePath):
+                    for msgId, outcome in rtrnDict.items():
+                        if outcome in ("created", "updated"):
+                            rtrnDict[msgId] = "failed"
+        return rtrnDict
+
+    def __readCifMsgInfo(self, p_filePath):
+        """Messages of the current deposition held in the legacy cif file at p_filePath, empty if there is no such file"""
+        if not p_filePath or not os.access(p_filePath, os.R_OK) or self.__getFileSizeBytes(p_filePath) == 0:
+            return []
+        ok, mIIo = self.__readMsgFile(p_filePath, p_bLock=True)
+        return mIIo.getMessageInfo() if ok else []
+
+    def __withReleaseRequests(self, p_msgStatusDictList, p_statusMsgIds, p_releaseMsgIds):
+        """Status changes where, as markMsgAsRead() does, a release request gets "for_release" set when its first status
+        is recorded, unless the change sets "for_release" itself.
+
+        :param `p_statusMsgIds`:     IDs of the messages that already have a status
+        :param `p_releaseMsgIds`:    IDs of the messages that are release requests (see get_release_request_ids())
+        """
+        rtrnList = []
+        for msgStatusDict in p_msgStatusDictList:
+            msgId = msgStatusDict.get("message_id")
+            if msgId in p_releaseMsgIds and msgId not in p_statusMsgIds and msgStatusDict.get("for_release") is None:
+                logger.info("new status for release request: %s", msgId)
+                msgStatusDict = dict(msgStatusDict, for_release="Y")
+            rtrnList.append(msgStatusDict)
+        return rtrnList
+
     def __getFileSizeBytes(self, p_filePath):
         statInfo = os.stat(p_filePath)
         fileSize = statInfo.st_size
@@ -2003,8 +2406,7 @@ class MessagingIo(object):
         msgsFrmDpstrLst = []
         msgStatusLst = []
         fileSizeToDpstr = 0
-        mIIo = PdbxMessageIo(site_id=self.__siteId, verbose=self.__verbose, log=self.__lfh)
-        mIIo2 = PdbxMessageIo(site_id=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+        mIIo2 = None
 
         try:
             # GET LIST OF IDS OF MSGS FROM DEPOSITOR
@@ -2019,14 +2421,7 @@ class MessagingIo(object):
             if self.__msgsFrmDpstrFilePath and (self.__msgsFrmDpstrFilePath.startswith("/dummy") or os.access(self.__msgsFrmDpstrFilePath, os.R_OK)):
                 fileSizeBytes = self.__getFileSizeBytes(self.__msgsFrmDpstrFilePath) if not self.__msgsFrmDpstrFilePath.startswith("/dummy") else 1
                 if fileSizeBytes > 0:
-                    with LockFile(
-                        self.__msgsFrmDpstrFilePath, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh
-                    ) as _lf, FileSizeLogger(
-                        self.__msgsFrmDpstrFilePath, verbose=self.__verbose, log=self.__lfh  # noqa: F841
-                    ) as _fsl:  # noqa: F841
-                        pid = os.getpid()
-                        depId = str(self.__reqObj.getValue("identifier"))
-                        ok = mIIo.read(self.__msgsFrmDpstrFilePath, "msgingmod" + str(pid), deposition_id=depId)
+                    ok, mIIo = self.__readMsgFile(self.__msgsFrmDpstrFilePath, p_bLock=True)
                     if ok:
                         msgsFrmDpstrLst = mIIo.getMessageInfo()  # in recordSetLst we now have a list of dictionaries with item names as keys and respective data for values
 
@@ -2034,14 +2429,7 @@ class MessagingIo(object):
             if self.__msgsToDpstrFilePath and (self.__msgsToDpstrFilePath.startswith("/dummy") or os.access(self.__msgsToDpstrFilePath, os.R_OK)):
                 fileSizeToDpstr = self.__getFileSizeBytes(self.__msgsToDpstrFilePath) if not self.__msgsToDpstrFilePath.startswith("/dummy") else 1
                 if fileSizeToDpstr > 0:
-                    with LockFile(
-                        self.__msgsToDpstrFilePath, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh
-                    ) as _lf, FileSizeLogger(  # noqa: F841
-                        self.__msgsToDpstrFilePath, verbose=self.__verbose, log=self.__lfh
-                    ) as _fsl:  # noqa: F841
-                        pid = os.getpid()
-                        depId = str(self.__reqObj.getValue("identifier"))
-                        ok = mIIo2.read(self.__msgsToDpstrFilePath, "msgingmod" + str(pid), deposition_id=depId)
+                    ok, mIIo2 = self.__readMsgFile(self.__msgsToDpstrFilePath, p_bLock=True)
                     if ok:
                         msgStatusLst = mIIo2.getMsgStatusInfo()  # in recordSetLst we now have a list of dictionaries with item names as keys and respective data for values
 
@@ -2066,7 +2454,7 @@ class MessagingIo(object):
             if p_statusToCheck == "for_release":  # for this status check we have to check messages authored by annotators as well for "for_release" flags
 
                 # For database-backed storage (dummy paths), skip file existence checks
-                if (self.__msgsToDpstrFilePath.startswith("/dummy") or (os.access(self.__msgsToDpstrFilePath, os.R_OK) and fileSizeToDpstr > 0)):
+                if mIIo2 is not None and (self.__msgsToDpstrFilePath.startswith("/dummy") or (os.access(self.__msgsToDpstrFilePath, os.R_OK) and fileSizeToDpstr > 0)):
 
                     annotatorMsgsLst = mIIo2.getMessageInfo()
 
@@ -2138,6 +2526,30 @@ class MessagingIo(object):
         #
         return bReturnStatus
 
+    def __readMsgFile(self, p_filePath, p_bLock=False):
+        """Read messages of the current deposition from p_filePath, optionally holding the lock on the file while reading.
+
+        When reads are reused (see setReuseReads()) a file already read by this instance is not read again.
+
+        :Returns: (success flag, PdbxMessageIo holding the messages read)
+        """
+        depId = str(self.__reqObj.getValue("identifier"))
+        if self.__readD is not None and (p_filePath, depId) in self.__readD:
+            return self.__readD[(p_filePath, depId)]
+        mIIo = PdbxMessageIo(site_id=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+        if p_bLock:
+            with LockFile(
+                p_filePath, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh, site_id=self.__siteId
+            ) as _lf, FileSizeLogger(  # noqa: F841
+                p_filePath, verbose=self.__verbose, log=self.__lfh, site_id=self.__siteId
+            ) as _fsl:  # noqa: F841
+                ok = mIIo.read(p_filePath, "msgingmod" + str(os.getpid()), deposition_id=depId)
+        else:
+            ok = mIIo.read(p_filePath, deposition_id=depId)
+        if self.__readD is not None:
+            self.__readD[(p_filePath, depId)] = (ok, mIIo)
+        return ok, mIIo
+
     def __getMsgsByStatus(self, p_statusToCheck, p_flagForInclusion):
 
         rtrnList = []
@@ -2153,15 +2565,7 @@ class MessagingIo(object):
             if self.__msgsToDpstrFilePath and (self.__msgsToDpstrFilePath.startswith("/dummy") or os.access(self.__msgsToDpstrFilePath, os.R_OK)):
                 fileSizeBytes = self.__getFileSizeBytes(self.__msgsToDpstrFilePath) if not self.__msgsToDpstrFilePath.startswith("/dummy") else 1
                 if fileSizeBytes > 0:
-                    mIIo = PdbxMessageIo(site_id=self.__siteId, verbose=self.__verbose, log=self.__lfh)
-                    with LockFile(
-                        self.__msgsToDpstrFilePath, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh
-                    ) as _lf, FileSizeLogger(  # noqa: F841
-                        self.__msgsToDpstrFilePath, verbose=self.__verbose, log=self.__lfh
-                    ) as _fsl:  # noqa: F841
-                        pid = os.getpid()
-                        depId = str(self.__reqObj.getValue("identifier"))
-                        ok = mIIo.read(self.__msgsToDpstrFilePath, "msgingmod" + str(pid), deposition_id=depId)
+                    ok, mIIo = self.__readMsgFile(self.__msgsToDpstrFilePath, p_bLock=True)
                     if ok:
                         recordSetLst = mIIo.getMsgStatusInfo()  # in recordSetLst we now have a list of dictionaries with item names as keys and respective data for values
                     #
@@ -2194,25 +2598,13 @@ class MessagingIo(object):
     #     return not self.__isNotCifNull(p_value)
 
     def __augmentWithOrigCommData(self, p_recordSetLst, p_origCommsLst):
+        """Attach original communication references to message records (orig_* items read back as "" when absent)"""
+        origCommByMsgId = {}
+        for origComm in p_origCommsLst:
+            origCommByMsgId.setdefault(origComm["message_id"], origComm)
+
         for record in p_recordSetLst:
-            record["orig_message_id"] = ""
-            record["orig_deposition_data_set_id"] = ""
-            record["orig_timestamp"] = ""
-            record["orig_sender"] = ""
-            record["orig_recipient"] = ""
-            record["orig_message_subject"] = ""
-            record["orig_attachments"] = ""
-
-            for origComm in p_origCommsLst:
-                if origComm["message_id"] == record["message_id"]:
-                    record["orig_message_id"] = origComm["orig_message_id"]
-                    record["orig_deposition_data_set_id"] = origComm["orig_deposition_data_set_id"]
-                    record["orig_timestamp"] = origComm["orig_timestamp"]
-                    record["orig_sender"] = origComm["orig_sender"]
-                    record["orig_recipient"] = origComm["orig_recipient"]
-                    record["orig_message_subject"] = origComm["orig_message_subject"]
-                    record["orig_attachments"] = origComm["orig_attachments"]
-                    break
+            record.origComm = origCommByMsgId.get(record.message_id)
 
     def __handleFileReferences(self, p_msgObj):
         """For given message, processes any files referenced for "attachment"
@@ -2281,6 +2673,8 @@ class MessagingIo(object):
             if self.__verbose:
                 logger.info("-- 'em-volume' was selected as file reference so automatically propagating 'model' also, for 'annotate' purposes on deposit side")
 
+        attachmentTasks = []
+
         for fileRef in workingFileRefsList:
             # fileRefs received correspond to content type acronyms encoded in ConfigInfoData
 
@@ -2310,44 +2704,16 @@ class MessagingIo(object):
                     fPath = msgDI.getFilePath(contentType, contentFormat)
 
                 if fPath is not None and os.access(fPath, os.R_OK):
-
-                    # make straight copy of the file to generate "-annotate" milestone version of the file
-                    bOk = self.__createAnnotateMilestone(
-                        p_msgObj.depositionId, p_msgObj.messageId, fPath, acronym, contentType, contentFormat, auxFilePartNum, msgFileRefs, failedMsgFileRefs
-                    )
-
-                    if not bOk:
-                        break
-
-                    if fileRef == "model" and sIsEmMapOnly != "true":
-                        # if dealing with model file then additionally make copy of model file in
-                        # which internal view items are stripped out--this serves as "-review" version of the file
-                        bOk = self.__createModelReviewCopy(p_msgObj.depositionId, p_msgObj.messageId, fPath, acronym, contentType, contentFormat, msgFileRefs, failedMsgFileRefs)
-
-                        if not bOk:
-                            break
-
-                    if fileRef == "cs":
-                        # if dealing with chemical shifts file then additionally make copy of
-                        # cs file in which internal view items are stripped out--this serves as "-review" version of the file
-                        bOk = self.__createChemShiftsReviewCopy(p_msgObj.depositionId, p_msgObj.messageId, fPath, acronym, contentType, "nmr-star", msgFileRefs, failedMsgFileRefs)
-
-                        if not bOk:
-                            break
-
-                    if fileRef == "nmr-data-str":
-                        # if dealing with nmr-data-str file then additionally make copy of cs file in which
-                        # internal view items are stripped out--this serves as "-review" version of the file
-                        bOk = self.__createNmrDataStarReviewCopy(p_msgObj.depositionId, p_msgObj.messageId, fPath, acronym, contentType, "nmr-star", msgFileRefs, failedMsgFileRefs)
-
-                        if not bOk:
-                            break
+                    # milestone and review copies for each attachment are independent of one another so are
+                    # processed as separate tasks once all attachments have been resolved
+                    attachmentTasks.append((fileRef, acronym, contentType, contentFormat, auxFilePartNum, fPath))
 
                 else:
                     bOk = False
                     failedMsgFileRefs.append(acronym)
                     if self.__verbose:
                         logger.error("-- problem with accessing fPath: %s", fPath)
+                    break
 
             else:  # not workflow, i.e. standalone testing, so just simulate behavior
                 annotVersionNum = 1
@@ -2364,6 +2730,150 @@ class MessagingIo(object):
                         self.__createMsgFileReference(p_msgObj.messageId, p_msgObj.depositionId, cntntTyp, contentFormat, annotPartitionNum, annotVersionNum, upldFileName)
                     )
 
+        if bOk and attachmentTasks:
+            bOk, msgFileRefs, failedMsgFileRefs = self.__runAttachmentTasks(p_msgObj, attachmentTasks)
+
+        return bOk, msgFileRefs, failedMsgFileRefs
+
+    def __runAttachmentTasks(self, p_msgObj, p_attachmentTasks):
+        """Process attachments on a bounded pool of worker threads.
+
+        Attachments written to the same milestone file (e.g. several aux-files when only a single aux-file
+        reference is allowed) take the "next version" of that file in turn, so they are processed one after
+        another within one task; only attachments with different targets are processed concurrently.
+
+        File references are returned in the order of p_attachmentTasks regardless of completion order.
+        Failure is all-or-nothing: if any attachment fails no file references are returned, tasks not yet
+        started are cancelled, and the milestone/version files already written are removed.
+
+        :Returns:
+            bOk : True if every attachment was processed
+            msgFileRefs : file references for all attachments (empty on failure)
+            failedMsgFileRefs : file references for which processing failed
+        """
+        startTime = time.time()
+        msgFileRefs = []
+        failedMsgFileRefs = []
+        createdFiles = []
+        bOk = True
+
+        groupD = {}
+        for idx, task in enumerate(p_attachmentTasks):
+            groupD.setdefault(self.__getAttachmentTarget(task), []).append((idx, task))
+        resultL = [None] * len(p_attachmentTasks)
+
+        numWorkers = max(1, min(self.__maxAttachmentWorkers, len(groupD)))
+        with ThreadPoolExecutor(max_workers=numWorkers) as executor:
+            futureL = [executor.submit(self.__processAttachmentGroup, p_msgObj, group) for group in groupD.values()]
+            for future, group in zip(futureL, groupD.values()):
+                try:
+                    bGroupOk, groupResultL, groupCreatedFiles = future.result()
+                except:  # noqa: E722 pylint: disable=bare-except
+                    logger.exception("Attachment processing failed")
+                    bGroupOk, groupResultL, groupCreatedFiles = False, [], []
+                for (idx, _task), result in zip(group, groupResultL):
+                    resultL[idx] = result
+                createdFiles.extend(groupCreatedFiles)
+                if not bGroupOk and bOk:
+                    bOk = False
+                    for pending in futureL:
+                        pending.cancel()
+
+        for result in resultL:
+            if result is not None:
+                msgFileRefs.extend(result[0])
+                failedMsgFileRefs.extend(result[1])
+
+        if not bOk:
+            msgFileRefs = []
+            self.__removeFiles(createdFiles)
+
+        logger.info("processed %d attachments in %d groups with %d workers in %.2f seconds ok=%r", len(p_attachmentTasks), len(groupD), numWorkers, time.time() - startTime, bOk)
+        return bOk, msgFileRefs, failedMsgFileRefs
+
+    def __getAttachmentTarget(self, p_task):
+        """Key of the milestone file an attachment task writes to"""
+        _fileRef, acronym, contentType, contentFormat, auxFilePartNum, _fPath = p_task
+        if acronym == "aux-file" and self.__allowingMultiAuxFiles:
+            return (contentType, contentFormat, auxFilePartNum)
+        return (contentType, contentFormat)
+
+    def __processAttachmentGroup(self, p_msgObj, p_group):
+        """Process attachment tasks with the same target in order, stopping at the first failure.
+
+        :Returns:
+            bOk : True if every attachment of the group was processed
+            resultL : (msgFileRefs, failedMsgFileRefs) for each task processed
+            createdFiles : milestone/version files written by the tasks
+        """
+        self.__attachmentFiles.createdL = []
+        resultL = []
+        bOk = True
+        try:
+            for _idx, task in p_group:
+                bOk, taskFileRefs, taskFailedFileRefs = self.__processAttachment(p_msgObj, task)
+                resultL.append((taskFileRefs, taskFailedFileRefs))
+                if not bOk:
+                    break
+        except:  # noqa: E722 pylint: disable=bare-except
+            logger.exception("Attachment processing failed")
+            bOk = False
+        createdFiles = self.__attachmentFiles.createdL
+        self.__attachmentFiles.createdL = None
+        return bOk, resultL, createdFiles
+
+    def __trackNewFile(self, filePath):
+        """Record filePath as written by the attachment task of the current thread, unless it exists already
+
+        :Returns: filePath
+        """
+        createdL = getattr(self.__attachmentFiles, "createdL", None)
+        if createdL is not None and filePath and not os.path.lexists(filePath):
+            createdL.append(filePath)
+        return filePath
+
+    def __removeFiles(self, filePathList):
+        for filePath in filePathList:
+            try:
+                if os.path.lexists(filePath):
+                    os.remove(filePath)
+                    logger.info("removed %s of failed message attachments", filePath)
+            except OSError as e:
+                logger.error("cannot remove %s: %s", filePath, e)
+
+    def __processAttachment(self, p_msgObj, p_task):
+        """Create the "-annotate" milestone and any "-review" copy for a single attachment.
+
+        :Returns:
+            bOk : boolean indicating success/failure
+            msgFileRefs : file references created for this attachment
+            failedMsgFileRefs : file references for which processing failed
+        """
+        fileRef, acronym, contentType, contentFormat, auxFilePartNum, fPath = p_task
+        sIsEmMapOnly = self.__reqObj.getValue("em_map_only")
+        startTime = time.time()
+        msgFileRefs = []
+        failedMsgFileRefs = []
+
+        # make straight copy of the file to generate "-annotate" milestone version of the file
+        bOk = self.__createAnnotateMilestone(p_msgObj.depositionId, p_msgObj.messageId, fPath, acronym, contentType, contentFormat, auxFilePartNum, msgFileRefs, failedMsgFileRefs)
+
+        if bOk and fileRef == "model" and sIsEmMapOnly != "true":
+            # if dealing with model file then additionally make copy of model file in
+            # which internal view items are stripped out--this serves as "-review" version of the file
+            bOk = self.__createModelReviewCopy(p_msgObj.depositionId, p_msgObj.messageId, fPath, acronym, contentType, contentFormat, msgFileRefs, failedMsgFileRefs)
+
+        if bOk and fileRef == "cs":
+            # if dealing with chemical shifts file then additionally make copy of
+            # cs file in which internal view items are stripped out--this serves as "-review" version of the file
+            bOk = self.__createChemShiftsReviewCopy(p_msgObj.depositionId, p_msgObj.messageId, fPath, acronym, contentType, "nmr-star", msgFileRefs, failedMsgFileRefs)
+
+        if bOk and fileRef == "nmr-data-str":
+            # if dealing with nmr-data-str file then additionally make copy of cs file in which
+            # internal view items are stripped out--this serves as "-review" version of the file
+            bOk = self.__createNmrDataStarReviewCopy(p_msgObj.depositionId, p_msgObj.messageId, fPath, acronym, contentType, "nmr-star", msgFileRefs, failedMsgFileRefs)
+
+        logger.info("attachment %s processed in %.2f seconds ok=%r", fileRef, time.time() - startTime, bOk)
         return bOk, msgFileRefs, failedMsgFileRefs
 
     def __createAnnotateMilestone(self, p_depId, p_msgId, fPath, acronym, contentType, contentFormat, auxFilePartNum, msgFileRefs, failedMsgFileRefs):
@@ -2419,9 +2929,9 @@ class MessagingIo(object):
                     annotMilestoneFilePth = curAnnotMilestoneFilePth
                     dpstMilestoneFilePth = curDpstMilestoneFilePth
                 else:
-                    shutil.copyfile(fPath, annotMilestoneFilePth)
+                    shutil.copyfile(fPath, self.__trackNewFile(annotMilestoneFilePth))
             else:
-                shutil.copyfile(fPath, annotMilestoneFilePth)
+                shutil.copyfile(fPath, self.__trackNewFile(annotMilestoneFilePth))
 
             if os.access(annotMilestoneFilePth, os.R_OK):
                 annotVersionNum = annotMilestoneFilePth.rsplit(".V")[1]
@@ -2444,13 +2954,13 @@ class MessagingIo(object):
                     if bEmdCnvrtRqrd and self.__copyMilestoneDeposit:
                         # generate "emd" dialect version of model file for storage/use on deposition side
                         # Only do this if copying to deposit directory
-                        bSuccess = self.__genAnnotMilestoneEmdVrsn(p_depId, fPath, dpstMilestoneFilePth)
+                        bSuccess = self.__genAnnotMilestoneEmdVrsn(p_depId, fPath, self.__trackNewFile(dpstMilestoneFilePth))
                         if not bSuccess:
                             if self.__verbose:
                                 logger.info("WARNING: problem creating 'emd' version of model file at: %s", dpstMilestoneFilePth)
                         #
                         mlstnFilePthDict = msgDE.getMileStoneFilePaths("em-volume-header-annotate", "xml")
-                        dpstEmHeaderMilestoneFilePth = mlstnFilePthDict["dpstPth"]
+                        dpstEmHeaderMilestoneFilePth = self.__trackNewFile(mlstnFilePthDict["dpstPth"])
 
                         if MessagingIo.bMakeEmXmlHeaderFiles is True:
                             bSuccess2 = self.__genAnnotMilestoneEmXmlHeader(p_depId, dpstMilestoneFilePth, dpstEmHeaderMilestoneFilePth) if dpstEmHeaderMilestoneFilePth else False
@@ -2467,7 +2977,7 @@ class MessagingIo(object):
                     else:
                         # else just propagate identifical copy to deposition side if requested
                         if self.__copyMilestoneDeposit:
-                            shutil.copyfile(fPath, dpstMilestoneFilePth)
+                            shutil.copyfile(fPath, self.__trackNewFile(dpstMilestoneFilePth))
                             logger.debug("Milestone copied to deposit %s", dpstMilestoneFilePth)
 
                     if (self.__copyMilestoneDeposit and os.access(dpstMilestoneFilePth, os.R_OK)) or (not self.__copyMilestoneDeposit):
@@ -2487,7 +2997,7 @@ class MessagingIo(object):
                         depFilePthDict = msgDE.getFilePathExt(contentType=contentType, format=contentFormat, fileSource="deposit", version="next")
                         logger.info("Symlink %s -> %s", depFilePthDict, annotMilestoneFilePth)
                         try:
-                            os.symlink(annotMilestoneFilePth, depFilePthDict)
+                            os.symlink(annotMilestoneFilePth, self.__trackNewFile(depFilePthDict))
                         except:  # noqa: E722 pylint: disable=bare-except
                             logger.exception("Failed to create symlink")
 
@@ -2508,6 +3018,9 @@ class MessagingIo(object):
         # bEmExclusion = (self.__emDeposition and acronym == "model")
         #
         logger.debug("STARTING")
+        from wwpdb.utils.dp import __version__ as dpVersion  # pylint: disable=import-outside-toplevel
+        from wwpdb.utils.dp.RcsbDpUtility import RcsbDpUtility  # pylint: disable=import-outside-toplevel
+
         msgDE = MessagingDataExport(self.__reqObj, verbose=self.__verbose, log=self.__lfh)
         reviewCntntTyp = contentType + "-review"
         reviewFilePthDict = msgDE.getMileStoneFilePaths(reviewCntntTyp, contentFormat)
@@ -2523,25 +3036,31 @@ class MessagingIo(object):
 
             sourceMdlFileName = os.path.basename(fPath)
             modelFileLocalPthAbslt = os.path.join(self.__sessionPath, sourceMdlFileName)
-            logger.debug("Copy %s to %s", fPath, modelFileLocalPthAbslt)
-            shutil.copyfile(fPath, modelFileLocalPthAbslt)
 
-            if os.access(modelFileLocalPthAbslt, os.R_OK):
+            def genPublicModel(outPath):
+                logger.debug("Copy %s to %s", fPath, modelFileLocalPthAbslt)
+                shutil.copyfile(fPath, modelFileLocalPthAbslt)
+                dp = RcsbDpUtility(tmpPath=self.__sessionPath, siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+                dp.imp(modelFileLocalPthAbslt)
+                dp.op("cif2pdbx-public")
+                logPath = os.path.join(self.__sessionPath, "cif2pdbx-public.log")
+                dp.expLog(logPath)
+                dp.exp(outPath)
+                if not self.__debug:
+                    dp.cleanup()
+                return True
+
+            if os.access(fPath, os.R_OK):
 
                 #
                 # Generate Public pdbx cif file
                 #
                 pdbxReviewFilePath = os.path.join(self.__sessionPath, p_depId + "_model-review_P1.cif")  # filename here is arbitrary just for temporary session processing purposes
+                if os.access(pdbxReviewFilePath, os.F_OK):
+                    os.remove(pdbxReviewFilePath)
 
                 try:
-                    dp = RcsbDpUtility(tmpPath=self.__sessionPath, siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
-                    dp.imp(modelFileLocalPthAbslt)
-                    dp.op("cif2pdbx-public")
-                    logPath = os.path.join(self.__sessionPath, "cif2pdbx-public.log")
-                    dp.expLog(logPath)
-                    dp.exp(pdbxReviewFilePath)
-                    if not self.__debug:
-                        dp.cleanup()
+                    self.__reviewCache.getOrCreate(fPath, "cif2pdbx-public", dpVersion, pdbxReviewFilePath, genPublicModel)
                 except:  # noqa: E722 pylint: disable=bare-except
                     logger.exception("Exception in generating review copy")
 
@@ -2553,9 +3072,9 @@ class MessagingIo(object):
                             reviewAnnotMilestoneFilePth = reviewAnnotCurMilestoneFilePth
                             reviewDpstMilestoneFilePth = reviewDpstCurMilestoneFilePth
                         else:
-                            shutil.copyfile(pdbxReviewFilePath, reviewAnnotMilestoneFilePth)
+                            shutil.copyfile(pdbxReviewFilePath, self.__trackNewFile(reviewAnnotMilestoneFilePth))
                     else:
-                        shutil.copyfile(pdbxReviewFilePath, reviewAnnotMilestoneFilePth)
+                        shutil.copyfile(pdbxReviewFilePath, self.__trackNewFile(reviewAnnotMilestoneFilePth))
 
                     annotVersionNum = reviewAnnotMilestoneFilePth.rsplit(".V")[1]
                     annotPartitionNum = (reviewAnnotMilestoneFilePth.split("_P")[1]).split(".", 1)[0]
@@ -2566,7 +3085,7 @@ class MessagingIo(object):
                     if reviewDpstMilestoneFilePth is not None:
                         if self.__copyMilestoneDeposit:
                             if os.access(reviewAnnotMilestoneFilePth, os.R_OK):
-                                shutil.copyfile(reviewAnnotMilestoneFilePth, reviewDpstMilestoneFilePth)
+                                shutil.copyfile(reviewAnnotMilestoneFilePth, self.__trackNewFile(reviewDpstMilestoneFilePth))
 
                                 if os.access(reviewDpstMilestoneFilePth, os.R_OK):
                                     if self.__verbose and self.__debug:
@@ -2601,6 +3120,9 @@ class MessagingIo(object):
         # if dealing with cs file then make additional copy of cs file in which
         # internal view items are stripped out--this serves as "-review" version of the file
         ##################################################################################
+        from wwpdb.utils.dp import __version__ as dpVersion  # pylint: disable=import-outside-toplevel
+        from wwpdb.utils.dp.DataFileAdapter import DataFileAdapter  # pylint: disable=import-outside-toplevel
+
         bOk = True
         #
         msgDE = MessagingDataExport(self.__reqObj, verbose=self.__verbose, log=self.__lfh)
@@ -2617,19 +3139,22 @@ class MessagingIo(object):
 
             sourceChemShiftsFileName = os.path.basename(fPath)
             chemShiftsFileLocalPthAbslt = os.path.join(self.__sessionPath, sourceChemShiftsFileName)
-            shutil.copyfile(fPath, chemShiftsFileLocalPthAbslt)
 
-            if os.access(chemShiftsFileLocalPthAbslt, os.R_OK):
+            def genNmrStar(outPath):
+                shutil.copyfile(fPath, chemShiftsFileLocalPthAbslt)
+                dfa = DataFileAdapter(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+                return dfa.pdbx2nmrstar(chemShiftsFileLocalPthAbslt, outPath, pdbId=p_depId)
+
+            if os.access(fPath, os.R_OK):
 
                 #
                 # Generate Public pdbx cif file
                 #
                 nmrStarReviewFilePath = os.path.join(self.__sessionPath, p_depId + "_cs-review_P1.cif")  # filename here is arbitrary just for temporary session processing purposes
 
+                ok = False
                 try:
-                    dfa = DataFileAdapter(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
-                    ok = dfa.pdbx2nmrstar(chemShiftsFileLocalPthAbslt, nmrStarReviewFilePath, pdbId=p_depId)
-
+                    ok = self.__reviewCache.getOrCreate(fPath, "pdbx2nmrstar", dpVersion, nmrStarReviewFilePath, genNmrStar, p_depId)
                 except:  # noqa: E722 pylint: disable=bare-except
                     logger.exception("In pdbx2nmrstar")
 
@@ -2640,9 +3165,9 @@ class MessagingIo(object):
                             reviewAnnotMilestoneFilePth = reviewAnnotCurMilestoneFilePth
                             reviewDpstMilestoneFilePth = reviewDpstCurMilestoneFilePth
                         else:
-                            shutil.copyfile(nmrStarReviewFilePath, reviewAnnotMilestoneFilePth)
+                            shutil.copyfile(nmrStarReviewFilePath, self.__trackNewFile(reviewAnnotMilestoneFilePth))
                     else:
-                        shutil.copyfile(nmrStarReviewFilePath, reviewAnnotMilestoneFilePth)
+                        shutil.copyfile(nmrStarReviewFilePath, self.__trackNewFile(reviewAnnotMilestoneFilePth))
 
                     annotVersionNum = reviewAnnotMilestoneFilePth.rsplit(".V")[1]
                     annotPartitionNum = (reviewAnnotMilestoneFilePth.split("_P")[1]).split(".", 1)[0]
@@ -2654,7 +3179,7 @@ class MessagingIo(object):
 
                         if os.access(reviewAnnotMilestoneFilePth, os.R_OK):
                             if self.__copyMilestoneDeposit:
-                                shutil.copyfile(reviewAnnotMilestoneFilePth, reviewDpstMilestoneFilePth)
+                                shutil.copyfile(reviewAnnotMilestoneFilePth, self.__trackNewFile(reviewDpstMilestoneFilePth))
 
                                 if os.access(reviewDpstMilestoneFilePth, os.R_OK):
                                     if self.__verbose and self.__debug:
@@ -2690,6 +3215,8 @@ class MessagingIo(object):
         # Also generate NEF file.
         ##################################################################################
         logger.info("-- Starting fPath=%s", fPath)
+        from wwpdb.utils.dp import __version__ as dpVersion  # pylint: disable=import-outside-toplevel
+        from wwpdb.utils.dp.RcsbDpUtility import RcsbDpUtility  # pylint: disable=import-outside-toplevel
 
         bOk = True
         #
@@ -2707,12 +3234,16 @@ class MessagingIo(object):
 
         if reviewAnnotMilestoneFilePth is not None:
 
-            dp = RcsbDpUtility(tmpPath=self.__sessionPath, siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
-            dp.imp(fPath)
-            dp.addInput(name="pdb_id", value=p_depId)
-            dp.op("annot-generte-nmr-data-str-file")
-            dp.exp(reviewAnnotMilestoneFilePth)
-            dp.cleanup()
+            def genNmrDataStr(outPath):
+                dp = RcsbDpUtility(tmpPath=self.__sessionPath, siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+                dp.imp(fPath)
+                dp.addInput(name="pdb_id", value=p_depId)
+                dp.op("annot-generte-nmr-data-str-file")
+                dp.exp(outPath)
+                dp.cleanup()
+                return True
+
+            self.__reviewCache.getOrCreate(fPath, "annot-generte-nmr-data-str-file", dpVersion, self.__trackNewFile(reviewAnnotMilestoneFilePth), genNmrDataStr, p_depId)
 
             logger.info("-- generated %s", reviewAnnotMilestoneFilePth)
 
@@ -2726,7 +3257,7 @@ class MessagingIo(object):
 
                 if os.access(reviewAnnotMilestoneFilePth, os.R_OK):
                     if self.__copyMilestoneDeposit:
-                        shutil.copyfile(reviewAnnotMilestoneFilePth, reviewDpstMilestoneFilePth)
+                        shutil.copyfile(reviewAnnotMilestoneFilePth, self.__trackNewFile(reviewDpstMilestoneFilePth))
 
                         if os.access(reviewDpstMilestoneFilePth, os.R_OK):
                             if self.__verbose and self.__debug:
@@ -2770,27 +3301,35 @@ class MessagingIo(object):
             logOutPath1 = os.path.join(self.__sessionPath, p_depId + "-logstrstr.json")  # output log for converted NMR-STAR file in "nmr-str2nef-release" op
             strOut = os.path.join(self.__sessionPath, p_depId + "-str.str")
 
-            np = NmrDpUtility()
-            # Must be before setDestination
+            from wwpdb.utils.nmr import __version__ as nmrVersion  # pylint: disable=import-outside-toplevel
+
+            def genNef(outPath):
+                from wwpdb.utils.nmr.NmrDpUtility import NmrDpUtility  # pylint: disable=import-outside-toplevel
+
+                np = NmrDpUtility()
+                # Must be before setDestination
 
-            np.setSource(reviewAnnotMilestoneFilePth)
+                np.setSource(reviewAnnotMilestoneFilePth)
 
-            np.setDestination(strOut)
-            np.addOutput(name="nef_file_path", value=nefReviewAnnotMilestoneFilePth, type="file")
+                np.setDestination(strOut)
+                np.addOutput(name="nef_file_path", value=outPath, type="file")
 
-            # Need to specify report_file path again???
-            np.addOutput(name="report_file_path", value=logOutPath2, type="file")  # Yes, see comments above
-            np.addOutput(name="insert_entry_id_to_loops", value=True, type="param")
-            np.setLog(logOutPath1)  #
-            logging.info("About to do OP")
-            np.op("nmr-str2nef-release")
+                # Need to specify report_file path again???
+                np.addOutput(name="report_file_path", value=logOutPath2, type="file")  # Yes, see comments above
+                np.addOutput(name="insert_entry_id_to_loops", value=True, type="param")
+                np.setLog(logOutPath1)  #
+                logging.info("About to do OP")
+                np.op("nmr-str2nef-release")
+                return True
+
+            self.__reviewCache.getOrCreate(reviewAnnotMilestoneFilePth, "nmr-str2nef-release", nmrVersion, self.__trackNewFile(nefReviewAnnotMilestoneFilePth), genNef)
 
             nexists = os.access(nefReviewAnnotMilestoneFilePth, os.R_OK)
             logger.info("NMRStar conversion to NEF completed out_exists %s", nexists)
 
             if nexists:
                 if self.__copyMilestoneDeposit:
-                    shutil.copyfile(nefReviewAnnotMilestoneFilePth, nefReviewDpstMilestoneFilePth)
+                    shutil.copyfile(nefReviewAnnotMilestoneFilePth, self.__trackNewFile(nefReviewDpstMilestoneFilePth))
 
                     if os.access(nefReviewDpstMilestoneFilePth, os.R_OK):
                         if self.__verbose and self.__debug:
@@ -2834,6 +3373,8 @@ class MessagingIo(object):
             logger.debug("Starting at %s", time.strftime("%Y %m %d %H:%M:%S", time.localtime()))
             try:
                 #
+                from mmcif_utils.trans.InstanceMapper import InstanceMapper  # pylint: disable=import-outside-toplevel
+
                 im = InstanceMapper(verbose=self.__verbose, log=self.__lfh)
                 im.setMappingFilePath(self.__emdDialectMappingFile)
                 # bOk = im.translate(p_srcFilePath, dpstModelEmFilePth_Local, mode="dst-src")
@@ -2879,6 +3420,8 @@ class MessagingIo(object):
             logger.info("Starting at %s", time.strftime("%Y %m %d %H:%M:%S", time.localtime()))
             try:
                 #
+                from wwpdb.apps.msgmodule.io.EmHeaderUtils import EmHeaderUtils  # pylint: disable=import-outside-toplevel
+
                 emHeaderUtil = EmHeaderUtils(self.__siteId, verbose=self.__verbose, log=self.__lfh)
                 bOk = emHeaderUtil.transHeader(p_srcFilePath, dpstModelEmHdrFilePth_Local, emHeaderUtilLocalLogPath)
 
@@ -2996,9 +3539,9 @@ class MessagingIo(object):
             if self.__msgsToDpstrFilePath is not None and os.access(self.__msgsToDpstrFilePath, os.R_OK):
                 mIIo = PdbxMessageIo(site_id=self.__siteId, verbose=self.__verbose, log=self.__lfh)
                 with LockFile(
-                    self.__msgsToDpstrFilePath, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh
+                    self.__msgsToDpstrFilePath, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__lfh, site_id=self.__siteId
                 ) as _lf, FileSizeLogger(  # noqa: F841
-                    self.__msgsToDpstrFilePath, verbose=self.__verbose, log=self.__lfh
+                    self.__msgsToDpstrFilePath, verbose=self.__verbose, log=self.__lfh, site_id=self.__siteId
                 ) as _fsl:  # noqa: F841
                     pid = os.getpid()
                     depId = str(self.__reqObj.getValue("identifier"))
@@ -3186,10 +3729,6 @@ class MessagingIo(object):
             if storageType != "archive":
                 continue
 
-            contentType = rcrd["content_type"]
-            contentFormat = rcrd["content_format"]
-            partitionNum = rcrd["partition_number"]
-            versionId = rcrd["version_id"]
             # Normalize upload_file_name to prevent None/null values (DAOTHER-10245)
             uploadFlName = (rcrd.get("upload_file_name") or "").strip()
 
@@ -3197,23 +3736,18 @@ class MessagingIo(object):
             if msgId not in rtrnDict:
                 rtrnDict[msgId] = []
             #
+            archiveFilePth = None
             try:
-
-                msgDI = MessagingDataImport(self.__reqObj, verbose=self.__verbose, log=self.__lfh)
-                pathDict = msgDI.getMileStoneFilePaths(contentType=contentType, format=contentFormat, version=versionId, partitionNum=partitionNum)
-                archiveFilePth = pathDict["annotPth"]
+                archiveFilePth = self.__getFileRefArchivePath(rcrd)
                 #
-                fileRef = os.path.basename(archiveFilePth)
-                toLocalSessionFilePthRltv = os.path.join(self.__sessionRelativePath, fileRef)
-                toLocalSessionFilePthAbslt = os.path.join(self.__sessionPath, fileRef)
-
-                if os.access(archiveFilePth, os.R_OK):
-                    if toLocalSessionFilePthRltv not in rtrnDict[msgId]:
+                if archiveFilePth and os.access(archiveFilePth, os.R_OK):
+                    fileUrl = self.__getFileRefDownloadUrl(msgId, rcrd["ordinal_id"])
+                    if fileUrl not in [fileRefDict["relative_file_url"] for fileRefDict in rtrnDict[msgId]]:
                         fileRefDict = {}
                         fileRefDict["upload_file_name"] = uploadFlName
-                        fileRefDict["relative_file_url"] = toLocalSessionFilePthRltv
+                        fileRefDict["file_name"] = os.path.basename(archiveFilePth)
+                        fileRefDict["relative_file_url"] = fileUrl
                         rtrnDict[msgId].append(fileRefDict)
-                        shutil.copyfile(archiveFilePth, toLocalSessionFilePthAbslt)
 
             except:  # noqa: E722 pylint: disable=bare-except
                 logger.info(" ----- problem importing a file reference from archiveFilePth: %s", archiveFilePth)
@@ -3221,30 +3755,70 @@ class MessagingIo(object):
         #
         return rtrnDict
 
+    def __getFileRefArchivePath(self, p_rcrd):
+        """Archive path of the milestone file described by the given file reference row"""
+        msgDI = MessagingDataImport(self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        pathDict = msgDI.getMileStoneFilePaths(
+            contentType=p_rcrd["content_type"], format=p_rcrd["content_format"], version=p_rcrd["version_id"], partitionNum=p_rcrd["partition_number"]
+        )
+        return pathDict["annotPth"]
+
+    def __getFileRefDownloadUrl(self, p_msgId, p_fileRefOrdinal):
+        """Link to the download service for a file reference row, see MessagingWebAppWorker._downloadFile()"""
+        paramD = {
+            "identifier": str(self.__reqObj.getValue("identifier")),
+            "msg_id": p_msgId,
+            "file_ref": str(p_fileRefOrdinal),
+            "filesource": str(self.__reqObj.getValue("filesource")),
+            "sessionid": self.__sObj.getId(),
+        }
+        return "/service/messaging/download_file?" + urlencode(paramD)
+
     def __trnsfrmMsgDictToLst(self, p_recordSetLst, p_bCommHstryRqstd=False):
-        """
+        """Render message records as lists of display strings, in the column order of getMsgColList()
 
-        :param `p_recordSetLst`:       list of dictionaries, each dictionary member represents one message record with attrib name as key
-                                        and corresponding data as value
+        :param `p_recordSetLst`:       list of MessageRecord objects, each representing one message record
 
+        Rendered rows are memoized across requests (see DisplayRowCache), so only messages not rendered
+        before in this process, or changed since, are transformed here.
         """
         rtrnLst = []
         #
         attribList = (self.getMsgColList(p_bCommHstryRqstd))[1]
         logger.info("----- Message attrib list is: %r", attribList)
         #
+        # display time zone is resolved once per request
+        localZone = tz.tzlocal()
+        tzKey = tuple(time.tzname)
+        numRendered = 0
 
         for rcrd in p_recordSetLst:
+            cacheKey = _DISPLAY_ROW_CACHE.getKey(rcrd, tzKey, p_bCommHstryRqstd)
+            row = _DISPLAY_ROW_CACHE.get(cacheKey)
+            if row is not None:
+                rtrnLst.append(row)
+                continue
+
             row = []
+            bComplete = True
+            numRendered += 1
             msgType = rcrd["message_type"]
 
             for attrNm in attribList:
                 try:
-                    if attrNm in ["timestamp", "orig_timestamp"]:
+                    if attrNm == "timestamp":
+                        # records hold the parsed UTC datetime, converted here to a
+                        # localtime string for display in the user interface
+                        value = self.__convertToLocalTimeZone(rcrd.timestamp, localZone) if rcrd.timestamp is not None else (rcrd.rawTimestamp or "")
+
+                    elif attrNm == "orig_timestamp":
                         # we have to convert from the timestamp in gmtime
                         # to one in localtime for display in the user interface
 
-                        value = self.__convertToLocalTimeZone(rcrd[attrNm])
+                        value = self.__convertToLocalTimeZone(rcrd[attrNm], localZone)
+
+                    elif attrNm == "content_type":
+                        value = str(rcrd[attrNm])
 
                     elif attrNm in ["message_text", "message_subject", "orig_subject"]:
                         # convert any content from ascii-safe to utf-8 encoded as necessary
@@ -3264,10 +3838,15 @@ class MessagingIo(object):
 
                     row.append(value if (value != "?") else "")
                 except:  # noqa: E722 pylint: disable=bare-except
+                    bComplete = False
                     logger.info("----- current rcrd in dict type message list is: %r", rcrd)
                     logger.exception("Internal failure")
+            if bComplete:
+                _DISPLAY_ROW_CACHE.put(cacheKey, row)
             rtrnLst.append(row)
 
+        logger.info("----- rendered %d of %d message rows (remainder from display row cache)", numRendered, len(p_recordSetLst))
+
         #
         return rtrnLst
 
@@ -3294,16 +3873,19 @@ class MessagingIo(object):
         else:
             return unescape(p_content).replace("\\xa0", " ")
 
-    def __convertToLocalTimeZone(self, p_timeStamp):
-        """convert from the timestamp in gmtime to one in localtime for display in the user interface"""
-        # create timezone objects representing UTC and local timezones
-        utcZone = tz.tzutc()
-        localZone = tz.tzlocal()
+    def __convertToLocalTimeZone(self, p_timeStamp, p_localZone=None):
+        """convert from the timestamp in gmtime (string or UTC-aware datetime) to one in localtime for display in the user interface
+
+        :param `p_localZone`:   local timezone object, if already created by the caller
+        """
+        localZone = p_localZone if p_localZone is not None else tz.tzlocal()
+        if isinstance(p_timeStamp, datetime):
+            return p_timeStamp.astimezone(localZone).strftime("%Y-%m-%d %H:%M:%S")
         try:
             utcDateTime = datetime.strptime(p_timeStamp, "%Y-%m-%d %H:%M:%S")
             # the datetime object we created above from the timestamp string doesn't
             # actually know that it is UTC timezone so below we explicitly tell it that it is
-            utcDateTime = utcDateTime.replace(tzinfo=utcZone)
+            utcDateTime = utcDateTime.replace(tzinfo=timezone.utc)
 
             # obtain local datetime object and then use it to generate a corresponding timestamp string
             localDateTime = utcDateTime.astimezone(localZone)
@@ -3343,6 +3925,20 @@ class MessagingIo(object):
         indentDict = {}
         parentDict = self.__genParentMsgDict(p_recordSetLst)
 
+        if p_recordSetLst and all(rcrd.thread_path for rcrd in p_recordSetLst):
+            # thread structure was materialized when the messages were stored: ordering by thread path places every
+            # message after its parent and replies in chronological order, so no reordering passes are needed
+            p_recordSetLst.sort(key=lambda rcrd: rcrd.thread_path)
+            for rcrd in p_recordSetLst:
+                msgId = rcrd.message_id
+                parentId = rcrd.parent_message_id
+                if parentId in indentDict:
+                    indentDict[msgId] = indentDict[parentId] + 1
+                else:
+                    indentDict[msgId] = self.__getNestLevel(msgId, parentDict)
+            p_rtrnDict["INDENT_DICT"] = indentDict
+            return
+
         # need to establish dictionary of "indent level" for threaded display
         for _rowIdx, row in enumerate(p_recordSetLst):
             msgId = row["message_id"]
@@ -3368,7 +3964,7 @@ class MessagingIo(object):
         for rowIdx, row in enumerate(p_recordSetLst):
             msgId = row["message_id"]
             parentId = row["parent_message_id"]
-            timeStamp = row["timestamp"]
+            timeStamp = row.sortKey
 
             # if there is a parent msg, need to ensure that this message is ordered properly amongst any sibling messages for display
 
@@ -3376,14 +3972,14 @@ class MessagingIo(object):
                 prevRecrdIdx = rowIdx - 1
                 prevMsgId = (p_recordSetLst[prevRecrdIdx])["message_id"]
                 prevMsgParentId = (p_recordSetLst[prevRecrdIdx])["parent_message_id"]
-                prevMsgTimeStamp = (p_recordSetLst[prevRecrdIdx])["timestamp"]
+                prevMsgTimeStamp = (p_recordSetLst[prevRecrdIdx]).sortKey
                 #
                 try:
                     # if previous msg is not a parent and prev msg is a sibling and current message is of equal thread level
                     if (prevMsgId != parentId) and (prevMsgParentId == parentId) and (p_indentDict[msgId] == p_indentDict[prevMsgId]):
                         # if we're inside this if block, then we know current record is sibling of previous record
 
-                        if datetime.strptime(prevMsgTimeStamp, "%Y-%m-%d %H:%M:%S") > datetime.strptime(timeStamp, "%Y-%m-%d %H:%M:%S"):
+                        if prevMsgTimeStamp > timeStamp:
                             # if we're inside this if block, previous sibling is actually more recent than current record and so we must reorder for proper chronological display
 
                             if self.__verbose and self.__debug and False:
@@ -3572,16 +4168,25 @@ class MessagingIo(object):
         else:
             return True
 
-    def __filterRsltSet(self, p_rsltSetList, p_sGlobalSrchFilter=None, p_dictColSrchFilter=None):
+    def __filterRsltSet(self, p_rsltSetList, p_sGlobalSrchFilter=None, p_dictColSrchFilter=None, p_searchIndex=None):
         """Performs filtering of resultset. Accommodates two mutually-exclusive filter modes: global search and column specific search modes.
 
         :Params:
             :param `p_sGlobalSrchFilter`:      DataTables related parameter indicating global search term against which records will be filtered
             :param `p_dictColSrchFilter`:      DataTables related parameter indicating column-specific search term against which records will be filtered
+            :param `p_searchIndex`:            optional MessageSearchIndex built for p_rsltSetList
 
         """
         fltrdList = []
 
+        if p_searchIndex is not None and (p_sGlobalSrchFilter or p_dictColSrchFilter):
+            # records are again tagged with their true row index, as explained for the global search filtering below
+            if p_sGlobalSrchFilter:
+                matchIdxs = p_searchIndex.search(p_sGlobalSrchFilter)
+            else:
+                matchIdxs = p_searchIndex.searchColumns(p_dictColSrchFilter)
+            return [{trueRowIdx: p_rsltSetList[trueRowIdx]} for trueRowIdx in matchIdxs]
+
         if p_sGlobalSrchFilter:
             if self.__verbose and self.__debug:
                 logger.debug("-- performing global search for string '%s'", p_sGlobalSrchFilter)
@@ -3652,7 +4257,7 @@ class MsgTmpltHlpr(object):
         # self.__sessionId = self.__sObj.getId()
         #
         self.__siteId = str(self.__reqObj.getValue("WWPDB_SITE_ID"))
-        self.__cI = ConfigInfo(self.__siteId)
+        self.__cI = getSiteInstance(ConfigInfo, self.__siteId)
         # self.__contentTypeDict = self.__cI.get("CONTENT_TYPE_DICTIONARY")
         self.__fileFormatExtDict = self.__cI.get("FILE_FORMAT_EXTENSION_DICTIONARY")
         self.__annotatorUserNameDict = self.__cI.get("ANNOTATOR_USER_NAME_DICT")
@@ -4332,6 +4937,8 @@ class MsgTmpltHlpr(object):
                 logger.exception("Recovering data from PdbxPersist for category: '%s'", ctgryNm)
 
         # 2014-10-30, decision was made to always include validated brain page email on notification emails
+        from wwpdb.utils.wf.dbapi.dbAPI import dbAPI  # pylint: disable=import-outside-toplevel
+
         ss = dbAPI(self.__depId, verbose=True)
         #
         if self.__depSystemVrsn2:
@@ -5034,6 +5641,8 @@ class MsgTmpltHlpr(object):
 
     def __getLastCommDate(self):
         # Retrieves last message sent date as well as last unlocked message
+        from mmcif.io.PdbxReader import PdbxReader  # pylint: disable=import-outside-toplevel
+
         myContainerList = []
         with open(self.__messagingFilePath, "r") as ifh:
             pRd = PdbxReader(ifh)
@@ -0,0 +1,110 @@
+##
+# File: ResultSetCache.py
+# Date: 18-Oct-2026
+#
+# Short-lived cache of fully processed message lists for DataTables paging and sorting.
+##
+"""
+Cache of processed message list result sets.
+
+Each DataTables interaction with a message table (next page, sort, search) is a separate request which
+otherwise reruns loading, filtering, threading, rendering and ordering of the whole message list.  The
+fully processed, ordered result set is kept for a short time under a key made up of the request
+parameters that shape it and a version stamp of the stored messages, so later page requests are served
+by slicing.
+
+Memory is bounded by number of result sets and an estimate of the characters they hold; entries expire
+after ttlSeconds.  getStats() reports hits, misses, expirations and current size.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+def _estimateChars(p_rsltSetList):
+    numChars = 0
+    for row in p_rsltSetList:
+        if isinstance(row, dict):
+            row = next(iter(row.values()), [])
+        numChars += sum(len(value) if isinstance(value, str) else 8 for value in row)
+    return numChars
+
+
+class ResultSetCache(object):
+    """Thread-safe TTL/LRU cache of processed result sets."""
+
+    def __init__(self, ttlSeconds=60, maxEntries=200, maxChars=128 * 1024 * 1024):
+        """
+        :param `ttlSeconds`:    time for which a result set is served from the cache
+        :param `maxEntries`:    upper bound on number of cached result sets
+        :param `maxChars`:      upper bound on the (estimated) total characters held by cached result sets
+        """
+        self.__ttlSeconds = ttlSeconds
+        self.__maxEntries = maxEntries
+        self.__maxChars = maxChars
+        self.__entryD = OrderedDict()
+        self.__numChars = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.__expired = 0
+        self.__lock = threading.Lock()
+
+    def get(self, key):
+        """Cached value for key, or None if absent or expired"""
+        now = time.monotonic()
+        with self.__lock:
+            entry = self.__entryD.get(key)
+            if entry is not None and entry[0] <= now:
+                self.__drop(key)
+                self.__expired += 1
+                entry = None
+            if entry is None:
+                self.__misses += 1
+                return None
+            self.__entryD.move_to_end(key)
+            self.__hits += 1
+            return entry[2]
+
+    def put(self, key, value):
+        """Cache value, a tuple whose first member is the result set (list of rows)"""
+        numChars = _estimateChars(value[0])
+        if numChars > self.__maxChars:
+            return
+        now = time.monotonic()
+        with self.__lock:
+            self.__drop(key)
+            self.__entryD[key] = (now + self.__ttlSeconds, numChars, value)
+            self.__numChars += numChars
+            # expired entries first, then least recently used
+            for oldKey in [oldKey for oldKey, entry in self.__entryD.items() if entry[0] <= now]:
+                self.__drop(oldKey)
+                self.__expired += 1
+            while len(self.__entryD) > self.__maxEntries or self.__numChars > self.__maxChars:
+                self.__drop(next(iter(self.__entryD)))
+
+    def clear(self):
+        with self.__lock:
+            self.__entryD.clear()
+            self.__numChars = 0
+
+    def getStats(self):
+        """Dictionary of entries, estimated characters held, hits, misses, expirations and hit ratio"""
+        with self.__lock:
+            numLookups = self.__hits + self.__misses
+            return {
+                "entries": len(self.__entryD),
+                "chars": self.__numChars,
+                "hits": self.__hits,
+                "misses": self.__misses,
+                "expired": self.__expired,
+                "hit_ratio": (float(self.__hits) / numLookups) if numLookups else 0.0,
+            }
+
+    def __drop(self, key):
+        entry = self.__entryD.pop(key, None)
+        if entry is not None:
+            self.__numChars -= entry[1]
@@ -0,0 +1,147 @@
+##
+# File: ReviewArtifactCache.py
+# Date: 18-Oct-2026
+#
+# Content addressed cache for "-review" copies generated when files are attached to messages.
+##
+"""
+Cache of converter outputs used when creating "-review" milestone copies of attached files.
+
+Review copies (public pdbx model files, NMR-STAR and NEF files) are produced by external converters
+which are comparatively expensive to run. The output of a conversion only depends on the content of
+the input file, the converter used and its version, so results are stored under a digest of exactly
+those inputs and reused whenever the same milestone input is attached to a later message.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class ReviewArtifactCache(object):
+    """Store converter outputs keyed by input file digest, converter name and converter version."""
+
+    def __init__(self, cachePath, maxEntries=500, verbose=False, log=sys.stderr):
+        """
+        :param `cachePath`:     directory holding cached artifacts (created as needed)
+        :param `maxEntries`:    upper bound on number of cached artifacts, least recently used entries are pruned beyond it
+        """
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__cachePath = cachePath
+        self.__maxEntries = maxEntries
+
+    @staticmethod
+    def fileDigest(filePath, blockSize=1024 * 1024):
+        """SHA-256 hex digest of the content of filePath"""
+        h = hashlib.sha256()
+        with open(filePath, "rb") as ifh:
+            for block in iter(lambda: ifh.read(blockSize), b""):
+                h.update(block)
+        return h.hexdigest()
+
+    def getKey(self, inputFilePath, converter, converterVersion, *params):
+        """Cache key for converting inputFilePath with the given converter, version and any extra parameters"""
+        h = hashlib.sha256()
+        for part in (self.fileDigest(inputFilePath), converter, converterVersion) + tuple(params):
+            h.update(str(part).encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def getOrCreate(self, inputFilePath, converter, converterVersion, outputFilePath, convertFn, *params):
+        """Place the converted form of inputFilePath at outputFilePath, running convertFn only on a cache miss.
+
+        :param `inputFilePath`:     file being converted
+        :param `converter`:         name of the conversion (e.g. "cif2pdbx-public")
+        :param `converterVersion`:  version of the software performing the conversion
+        :param `outputFilePath`:    where the converted file is required
+        :param `convertFn`:         callable(outputFilePath) performing the conversion, returning True on success
+        :param `params`:            any further values the conversion output depends on
+
+        :Returns: True if outputFilePath holds the converted file
+
+        An exception raised by convertFn is logged and raised again to the caller. Only successful conversions are cached.
+        """
+        startTime = time.time()
+        key = None
+        try:
+            key = self.getKey(inputFilePath, converter, converterVersion, *params)
+            if self.__fetch(key, outputFilePath):
+                logger.info("review artifact %s for %s: cache hit (%.3f seconds)", converter, os.path.basename(inputFilePath), time.time() - startTime)
+                return True
+        except:  # noqa: E722 pylint: disable=bare-except
+            logger.exception("Review artifact cache lookup failed for %s", inputFilePath)
+        #
+        try:
+            bOk = convertFn(outputFilePath)
+        except:  # noqa: E722 pylint: disable=bare-except
+            logger.exception("Conversion %s failed for %s", converter, inputFilePath)
+            raise
+        bOk = bool(bOk) and os.access(outputFilePath, os.R_OK)
+        logger.info("review artifact %s for %s: generated ok=%r (%.2f seconds)", converter, os.path.basename(inputFilePath), bOk, time.time() - startTime)
+        #
+        if bOk and key is not None:
+            try:
+                self.__store(key, outputFilePath)
+            except:  # noqa: E722 pylint: disable=bare-except
+                logger.exception("Unable to store review artifact %s in cache", outputFilePath)
+        return bOk
+
+    def __entryPath(self, key):
+        return os.path.join(self.__cachePath, key[:2], key)
+
+    def __fetch(self, key, outputFilePath):
+        entryPath = self.__entryPath(key)
+        if not os.access(entryPath, os.R_OK):
+            return False
+        shutil.copyfile(entryPath, outputFilePath)
+        # touch entry so that pruning is least recently used
+        os.utime(entryPath, None)
+        return True
+
+    def __store(self, key, filePath):
+        entryPath = self.__entryPath(key)
+        dirPath = os.path.dirname(entryPath)
+        if not os.path.isdir(dirPath):
+            os.makedirs(dirPath, exist_ok=True)
+        # write to a temporary name first so concurrent readers never see partial content
+        fd, tmpPath = tempfile.mkstemp(dir=dirPath, prefix=".tmp-")
+        os.close(fd)
+        try:
+            shutil.copyfile(filePath, tmpPath)
+            os.replace(tmpPath, entryPath)
+        finally:
+            if os.path.exists(tmpPath):
+                os.remove(tmpPath)
+        self.__prune()
+
+    def __prune(self):
+        if not self.__maxEntries:
+            return
+        entryL = []
+        for subDir in os.listdir(self.__cachePath):
+            subPath = os.path.join(self.__cachePath, subDir)
+            if not os.path.isdir(subPath):
+                continue
+            for fn in os.listdir(subPath):
+                if fn.startswith(".tmp-"):
+                    continue
+                fPath = os.path.join(subPath, fn)
+                try:
+                    entryL.append((os.path.getmtime(fPath), fPath))
+                except OSError:
+                    pass
+        if len(entryL) <= self.__maxEntries:
+            return
+        entryL.sort()
+        for _mtime, fPath in entryL[: len(entryL) - self.__maxEntries]:
+            try:
+                os.remove(fPath)
+            except OSError:
+                pass
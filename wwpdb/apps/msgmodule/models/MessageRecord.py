@@ -0,0 +1,195 @@
+##
+# File: MessageRecord.py
+# Date: 18-Oct-2026
+#
+# Compact typed in-memory representation of message rows used by the read paths.
+##
+"""
+Typed, compact message records for the read paths.
+
+Message rows are read once per load into MessageRecord instances, with the timestamp
+parsed to a UTC-aware datetime, the send status held as a boolean and the content type
+held as an interned ContentType value. Sorting, threading and filtering then work on
+native values, and display strings are only produced when rows are rendered.
+
+For code written against the string dictionaries returned by PdbxMessageIo.getMessageInfo(),
+records also support read access by mmCIF attribute name (record["message_id"]).
+"""
+
+import sys
+from datetime import datetime, timezone
+from enum import Enum
+
+_FALLBACK_TIMESTAMP_FORMATS = ("%d-%b-%Y %H:%M:%S", "%d-%b-%Y")
+
+# sorts before any real timestamp
+MIN_TIMESTAMP = datetime.min.replace(tzinfo=timezone.utc)
+
+
+class ContentType(str, Enum):
+    """Message content types. Members compare equal to their string values."""
+
+    MESSAGES_TO_DEPOSITOR = "messages-to-depositor"
+    MESSAGES_FROM_DEPOSITOR = "messages-from-depositor"
+    NOTES_FROM_ANNOTATOR = "notes-from-annotator"
+
+    def __str__(self):
+        return self.value
+
+    @classmethod
+    def fromValue(cls, value):
+        """ContentType member for value, or the interned string for values outside the enumeration"""
+        try:
+            return cls(value)
+        except ValueError:
+            return sys.intern(value) if isinstance(value, str) else value
+
+
+def parseTimestamp(value):
+    """Parse a stored (UTC) message timestamp to an aware datetime.
+
+    :param `value`:    datetime (naive values are taken to be UTC) or timestamp string
+
+    :Returns:
+        UTC-aware datetime, or None if value is empty or not in a recognised format
+    """
+    if isinstance(value, datetime):
+        return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        # fast path for the canonical "%Y-%m-%d %H:%M:%S" (and "%Y-%m-%d") forms
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        dt = None
+        for fmt in _FALLBACK_TIMESTAMP_FORMATS:
+            try:
+                dt = datetime.strptime(value, fmt)
+                break
+            except ValueError:
+                continue
+        if dt is None:
+            return None
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)
+
+
+class MessageRecord(object):
+    """One message, as read from the messaging data store.
+
+    Attributes named after the mmCIF pdbx_deposition_message_info items hold the stored
+    values, except that timestamp is a UTC-aware datetime (None if it could not be parsed,
+    with the stored text kept in rawTimestamp), the send status is the boolean isSent and
+    content_type is a ContentType. origComm optionally holds the original communication
+    reference (orig_* items) for the communication history view, updated_at the time the
+    database row was last changed and thread_root_id/thread_depth/thread_path the stored
+    thread structure (all None for CIF storage).
+    """
+
+    __slots__ = (
+        "ordinal_id",
+        "message_id",
+        "deposition_data_set_id",
+        "timestamp",
+        "rawTimestamp",
+        "sender",
+        "context_type",
+        "context_value",
+        "parent_message_id",
+        "message_subject",
+        "message_text",
+        "message_type",
+        "isSent",
+        "content_type",
+        "origComm",
+        "updated_at",
+        "thread_root_id",
+        "thread_depth",
+        "thread_path",
+    )
+
+    def __init__(
+        self,
+        ordinal_id=None,
+        message_id=None,
+        deposition_data_set_id=None,
+        timestamp=None,
+        sender=None,
+        context_type=None,
+        context_value=None,
+        parent_message_id=None,
+        message_subject=None,
+        message_text=None,
+        message_type=None,
+        send_status="Y",
+        content_type=None,
+        updated_at=None,
+        thread_root_id=None,
+        thread_depth=None,
+        thread_path=None,
+    ):
+        self.ordinal_id = ordinal_id
+        self.message_id = message_id
+        self.deposition_data_set_id = deposition_data_set_id
+        self.timestamp = parseTimestamp(timestamp)
+        self.rawTimestamp = timestamp if isinstance(timestamp, str) else None
+        self.sender = sender
+        self.context_type = context_type
+        self.context_value = context_value
+        self.parent_message_id = parent_message_id
+        self.message_subject = message_subject
+        self.message_text = message_text
+        self.message_type = message_type
+        self.isSent = send_status == "Y" or send_status is True
+        self.content_type = ContentType.fromValue(content_type)
+        self.origComm = None
+        self.updated_at = updated_at
+        self.thread_root_id = thread_root_id
+        self.thread_depth = thread_depth
+        self.thread_path = thread_path
+
+    @classmethod
+    def fromDict(cls, p_rowDict):
+        """Record for a message row dictionary as returned by PdbxMessageIo.getMessageInfo() (or a database row mapping)"""
+        return cls(
+            ordinal_id=p_rowDict.get("ordinal_id"),
+            message_id=p_rowDict.get("message_id"),
+            deposition_data_set_id=p_rowDict.get("deposition_data_set_id"),
+            timestamp=p_rowDict.get("timestamp"),
+            sender=p_rowDict.get("sender"),
+            context_type=p_rowDict.get("context_type"),
+            context_value=p_rowDict.get("context_value"),
+            parent_message_id=p_rowDict.get("parent_message_id"),
+            message_subject=p_rowDict.get("message_subject"),
+            message_text=p_rowDict.get("message_text"),
+            message_type=p_rowDict.get("message_type"),
+            send_status=p_rowDict.get("send_status", "Y"),
+            content_type=p_rowDict.get("content_type"),
+            updated_at=p_rowDict.get("updated_at"),
+            thread_root_id=p_rowDict.get("thread_root_id"),
+            thread_depth=p_rowDict.get("thread_depth"),
+            thread_path=p_rowDict.get("thread_path"),
+        )
+
+    @property
+    def sortKey(self):
+        """Chronological sort key (records without a valid timestamp sort first)"""
+        return self.timestamp or MIN_TIMESTAMP
+
+    def __getitem__(self, key):
+        """Read access by mmCIF attribute name, with stored string values for send_status and orig_* items"""
+        if key == "send_status":
+            return "Y" if self.isSent else "N"
+        if key.startswith("orig_"):
+            return self.origComm.get(key, "") if self.origComm else ""
+        if key in self.__slots__:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __repr__(self):
+        return "MessageRecord(message_id=%r, timestamp=%r, content_type=%r)" % (self.message_id, self.timestamp, self.content_type)
@@ -4,6 +4,7 @@
 #
 # Update:
 #    2024-09-09    CS     Add function to send reminder on AUTH entry deposited as REL
+#    2026-10-18           Add submitReminderBulk() running bulk messages as background job
 ##
 """
 Support for automatic scripts to send template drive email messages and archive in normal message stream/notes
@@ -18,6 +19,8 @@ __license__ = "Creative Commons Attribution 3.0 Unported"
 import sys
 import logging
 from wwpdb.utils.config.ConfigInfo import ConfigInfo, getSiteId
+from wwpdb.apps.msgmodule.util.SiteRegistry import getSiteInstance
+from wwpdb.apps.msgmodule.util.JobRunner import getJobRunner, registerJobHandler
 from wwpdb.apps.msgmodule.io.MessagingIo import MessagingIo
 from wwpdb.utils.session.WebRequest import InputRequest
 from mmcif.io.IoAdapterCore import IoAdapterCore
@@ -27,6 +30,9 @@ from wwpdb.io.locator.PathInfo import PathInfo
 
 logger = logging.getLogger(__name__)
 
+# template types of the messages sent by MessagingIo.autoMsg()
+AUTO_MSG_TEMPLATES = ("release-publ", "release-nopubl", "remind-unlocked", "approval-impl", "approval-expl", "obsolete", "reminder", "reminder-auth-to-rel")
+
 
 class AutoMessage(object):
     def __init__(self, siteId=None, topSessionDir=None, verbose=False, log=sys.stderr):
@@ -35,7 +41,7 @@ class AutoMessage(object):
         else:
             self.__siteId = getSiteId()
         logger.debug("Site id is %s", self.__siteId)
-        self.__cI = ConfigInfo(self.__siteId)
+        self.__cI = getSiteInstance(ConfigInfo, self.__siteId)
         self.__verbose = verbose
         self.__log = log
 
@@ -86,6 +92,29 @@ class AutoMessage(object):
         if emdents:
             mio.autoMsg(emdents, p_tmpltType=p_tmplt, p_isEmdbEntry=True)
 
+    def submitReminderBulk(self, depidlist, p_tmplt, idempotencyKey=None):
+        """Sends the bulk messages in a background job (see util/JobRunner.py), e.g. for requests from a web UI
+
+        :param `depidlist`:         deposition ids
+        :param `p_tmplt`:           message template type, as for _sendReminderBulk()
+        :param `idempotencyKey`:    token of the submission -- a submission repeated with the same token is not run again
+
+        :Returns:
+            job id, for getJobStatus()
+
+        :Raises:
+            ValueError: for an unknown template type, or an idempotency key already used for another submission
+        """
+        if p_tmplt not in AUTO_MSG_TEMPLATES:
+            raise ValueError("Unknown message template type %s" % p_tmplt)
+        payload = {"site_id": self.__siteId, "top_session_dir": self.__topSessionDir, "depids": list(depidlist), "template": p_tmplt}
+        job = getJobRunner(self.__siteId).submit("auto_msg", payload, idempotencyKey=idempotencyKey)
+        return job["job_id"]
+
+    def getJobStatus(self, jobId):
+        """Job dictionary (status, error, ...) of a job of submitReminderBulk(), None for an unknown job"""
+        return getJobRunner(self.__siteId).getJob(jobId)
+
     def _getExptl(self, depid):
         ctrgs = ["exptl"]
 
@@ -137,17 +166,15 @@ class AutoMessage(object):
         return ret
 
     def tagMessageStatus(self, depId, msgidlist, actionReqd="N", forReleaseFlg="N"):
-        """Tags a message"""
+        """Tags messages -- as with MessagingIo.tagMsg() a message which is still unread stays unread"""
 
-        ret = True
         mio = self.__getmsgio(depId)
-        for msgId in msgidlist:
-            msgStatusDict = {"message_id": msgId, "deposition_data_set_id": depId, "read_status": "Y", "action_reqd": actionReqd, "for_release": forReleaseFlg}
-            bOk = mio.tagMsg(msgStatusDict)
-            if not bOk:
-                ret = False
+        msgStatusDictList = [
+            {"message_id": msgId, "deposition_data_set_id": depId, "read_status": "Y", "action_reqd": actionReqd, "for_release": forReleaseFlg} for msgId in msgidlist
+        ]
+        outcomeD = mio.bulkUpdateMsgStatus(msgStatusDictList, p_keepUnread=True)
 
-        return ret
+        return all(outcomeD.get(msgId) in ("created", "updated", "unchanged") for msgId in msgidlist)
 
     def getAllMsgsActioned(self, depId):
         """Returns True if all messages are actioned"""
@@ -166,3 +193,13 @@ class AutoMessage(object):
         bAllMsgsRead = mio.areAllMsgsRead()
 
         return bAllMsgsRead
+
+
+def runAutoMsgJob(payload):
+    """Job handler sending the bulk messages of AutoMessage.submitReminderBulk()"""
+    am = AutoMessage(siteId=payload["site_id"], topSessionDir=payload["top_session_dir"])
+    am._sendReminderBulk(payload["depids"], p_tmplt=payload["template"])  # pylint: disable=protected-access
+    return {"depids": len(payload["depids"])}
+
+
+registerJobHandler("auto_msg", runAutoMsgJob)
@@ -3,17 +3,89 @@
 # Date:    2024-08-30
 # Updates:
 # 2024-12-23    CS     Add support on extended PDB ID
+# 2026-10-18           Batched parameterized lookups, connection reuse within the process and cache of id mappings
 #
 # =============================================================================
 """
 DA_INTERNAL database utility
+
+Identifiers are looked up in batches with parameterized IN (...) queries, one round trip per kind of
+identifier rather than per identifier. Connections to DA_INTERNAL are kept open and reused by all
+DaInternalDb instances of a thread. Since an accession code maps to the same deposition id for good
+once assigned, found mappings are cached process-wide for an hour; identifiers not found are always
+looked up again.
 """
 
-from wwpdb.utils.db.MyConnectionBase import MyConnectionBase
 import logging
+import threading
+import time
+from collections import OrderedDict
 
 logger = logging.getLogger(__name__)
 
+# Lookup queries by kind of identifier: (identifier, deposition id) rows for identifiers in the IN list
+_LOOKUP_QUERIES = {
+    "dep": "select structure_id, structure_id from rcsb_status where structure_id in (%s)",
+    "pdb": "select pdb_id, structure_id from rcsb_status where pdb_id in (%s)",
+    "pdb_ext": "select pdbx_database_accession, structure_id from database_2 where database_id = 'PDB' and pdbx_database_accession in (%s)",
+    "emdb": "select database_code, structure_id from database_2 where database_id = 'EMDB' and database_code in (%s)",
+}
+# Upper bound on the number of identifiers in one IN list
+_LOOKUP_BATCH_SIZE = 500
+
+# DA_INTERNAL connections of the current thread by (site id, resource)
+_connections = threading.local()
+
+
+class _IdMappingCache(object):
+    """Thread-safe TTL/LRU cache of identifier -> deposition id mappings"""
+
+    def __init__(self, ttlSeconds=3600, maxEntries=10000):
+        self.__ttlSeconds = ttlSeconds
+        self.__maxEntries = maxEntries
+        self.__entryD = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+        self.__lock = threading.Lock()
+
+    def get(self, key):
+        now = time.monotonic()
+        with self.__lock:
+            entry = self.__entryD.get(key)
+            if entry is not None and entry[0] <= now:
+                del self.__entryD[key]
+                entry = None
+            if entry is None:
+                self.__misses += 1
+                return None
+            self.__entryD.move_to_end(key)
+            self.__hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        with self.__lock:
+            self.__entryD.pop(key, None)
+            self.__entryD[key] = (time.monotonic() + self.__ttlSeconds, value)
+            while len(self.__entryD) > self.__maxEntries:
+                self.__entryD.popitem(last=False)
+
+    def clear(self):
+        with self.__lock:
+            self.__entryD.clear()
+
+    def getStats(self):
+        with self.__lock:
+            numLookups = self.__hits + self.__misses
+            return {
+                "entries": len(self.__entryD),
+                "hits": self.__hits,
+                "misses": self.__misses,
+                "hit_ratio": (float(self.__hits) / numLookups) if numLookups else 0.0,
+            }
+
+
+_ID_MAPPING_CACHE = _IdMappingCache()
+
 
 class DaInternalDb(object):
     """DA_INTERNAL DB class for data lookup
@@ -21,23 +93,24 @@ class DaInternalDb(object):
     Args:
         object (obj): object
     """
-    def __init__(self, siteId=None):
+    def __init__(self, siteId=None, connection=None, paramstyle="format"):
         """Initiator
 
         Args:
             siteId (str, optional): SITE ID. Defaults to None that will use the SITE ID of the current server.
+            connection (obj, optional): DB-API connection to query instead of DA_INTERNAL, e.g. a sqlite3 connection
+                holding the rcsb_status and database_2 tables. Defaults to None for the DA_INTERNAL connection of the site.
+            paramstyle (str, optional): DB-API parameter style of connection, "format" (MySQLdb) or "qmark" (sqlite3).
         """
         self.__mydb = None
         self.__siteId = siteId
-        self.__open()
-
-    def __del__(self):
-        """Finalizer. Close DB connection when all references to the object have been deleted.
-        """
-        self.__close()
+        self.__connection = connection
+        self.__placeholder = "?" if paramstyle == "qmark" else "%s"
+        if connection is None:
+            self.__open()
 
     def __open(self, resource="DA_INTERNAL"):
-        """Open DB connection
+        """Open DB connection, or reuse the one opened before by this thread
 
         Args:
             resource (str, optional): DB name. Defaults to "DA_INTERNAL".
@@ -45,6 +118,16 @@ class DaInternalDb(object):
         Returns:
             bool: True/False for DB connection
         """
+        key = (self.__siteId, resource)
+        connD = getattr(_connections, "connD", None)
+        if connD is None:
+            connD = _connections.connD = {}
+        if key in connD:
+            self.__mydb = connD[key]
+            return True
+
+        from wwpdb.utils.db.MyConnectionBase import MyConnectionBase  # pylint: disable=import-outside-toplevel
+
         self.__mydb = MyConnectionBase(siteId=self.__siteId)
         self.__mydb.setResource(resourceName=resource)
         ok = self.__mydb.openConnection()
@@ -53,29 +136,131 @@ class DaInternalDb(object):
             self.__mydb = None
             return False
 
+        connD[key] = self.__mydb
         return True
 
-    def __close(self):
-        """Proper DB closure
+    def __close(self, resource="DA_INTERNAL"):
+        """Proper DB closure, for a connection found broken
         """
         if self.__mydb:
-            self.__mydb.closeConnection()
+            getattr(_connections, "connD", {}).pop((self.__siteId, resource), None)
+            try:
+                self.__mydb.closeConnection()
+            except Exception as e:  # pylint: disable=broad-except
+                logger.debug("Error closing DA_INTERNAL connection: %s", e)
             self.__mydb = None
 
-    def run(self, query):
-        """Simplified query runner
+    def __execute(self, query, params):
+        cur = self.__connection.cursor() if self.__connection is not None else self.__mydb.getCursor()
+        try:
+            if params:
+                cur.execute(query, params)
+            else:
+                cur.execute(query)
+            return cur.fetchall()
+        finally:
+            cur.close()
+
+    def run(self, query, params=None):
+        """Simplified query runner. A reused connection found broken is reopened and the query retried once.
 
         Args:
-            query (str): Full text of a query
+            query (str): Full text of a query, with placeholders for params
+            params (sequence, optional): Query parameters
 
         Returns:
             tuple: raw query results as tuple of tuples, e.g. ((1,2),(3,4))
         """
-        cur = self.__mydb.getCursor()
-        cur.execute(query)
-        rows = cur.fetchall()
-        cur.close()
-        return rows
+        if self.__connection is not None:
+            return self.__execute(query, params)
+        if self.__mydb is None and not self.__open():
+            raise RuntimeError("No DA_INTERNAL connection")
+        try:
+            return self.__execute(query, params)
+        except Exception as e:  # pylint: disable=broad-except
+            logger.warning("DA_INTERNAL query failed, reconnecting: %s", e)
+            self.__close()
+            if not self.__open():
+                raise
+            return self.__execute(query, params)
+
+    def __lookup(self, kind, ids):
+        """Deposition ids for identifiers of one kind
+
+        Args:
+            kind (str): "dep", "pdb", "pdb_ext" or "emdb"
+            ids (list): identifiers
+
+        Returns:
+            dict: identifier -> deposition id, or None if not found, for each of ids
+        """
+        retD = {}
+        pending = []
+        for id_in in dict.fromkeys(ids):
+            dep_id = _ID_MAPPING_CACHE.get((self.__siteId, kind, id_in))
+            if dep_id is not None:
+                retD[id_in] = dep_id
+            else:
+                pending.append(id_in)
+
+        foundD = {}
+        for start in range(0, len(pending), _LOOKUP_BATCH_SIZE):
+            chunk = pending[start:start + _LOOKUP_BATCH_SIZE]
+            query = _LOOKUP_QUERIES[kind] % ", ".join([self.__placeholder] * len(chunk))
+            for id_found, dep_id in self.run(query, chunk):
+                # the first row for each identifier, matched case-insensitively as in DA_INTERNAL
+                foundD.setdefault(str(id_found).upper(), dep_id)
+
+        for id_in in pending:
+            dep_id = foundD.get(id_in.upper())
+            if dep_id is not None:
+                _ID_MAPPING_CACHE.put((self.__siteId, kind, id_in), dep_id)
+            retD[id_in] = dep_id
+        return retD
+
+    def verifyDepIds(self, dep_ids):
+        """Verify which of ids are deposition ids
+
+        Args:
+            dep_ids (list): presumed dep id inputs
+
+        Returns:
+            dict: dep id -> True/False
+        """
+        return {dep_id: found is not None for dep_id, found in self.__lookup("dep", dep_ids).items()}
+
+    def convertPdbIdsToDepIds(self, pdb_ids):
+        """Convert PDB IDs to deposition ids
+
+        Args:
+            pdb_ids (list): presumed PDB IDs
+
+        Returns:
+            dict: PDB ID -> valid deposition id at this site, or None
+        """
+        return self.__lookup("pdb", pdb_ids)
+
+    def convertExtendedPdbIdsToDepIds(self, pdb_ext_ids):
+        """Convert extended PDB IDs to deposition ids
+
+        Args:
+            pdb_ext_ids (list): presumed extended PDB IDs
+
+        Returns:
+            dict: extended PDB ID -> valid deposition id at this site, or None
+        """
+        return self.__lookup("pdb_ext", pdb_ext_ids)
+
+    def convertEmdbIdsToDepIds(self, emdb_ids):
+        """Convert EMDB IDs to deposition ids
+
+        Args:
+            emdb_ids (list): presumed EMDB IDs
+
+        Returns:
+            dict: EMDB ID -> valid deposition id at this site, or None
+        """
+        return self.__lookup("emdb", emdb_ids)
 
     def verifyDepId(self, dep_id):
         """Verify if an id is deposition id
@@ -86,12 +271,7 @@ class DaInternalDb(object):
         Returns:
             bool: True/False
         """
-        query = "select structure_id from rcsb_status where structure_id = '%s'" % dep_id
-        rows = self.run(query)
-        if rows:
-            return True
-        else:
-            return False
+        return self.verifyDepIds([dep_id])[dep_id]
 
     def verifyPdbId(self, pdb_id):
         """Verify if an id is PDB ID
@@ -102,12 +282,7 @@ class DaInternalDb(object):
         Returns:
             bool: True/False
         """
-        query = "select structure_id from rcsb_status where pdb_id = '%s'" % pdb_id
-        rows = self.run(query)
-        if rows:
-            return True
-        else:
-            return False
+        return self.convertPdbIdToDepId(pdb_id) is not None
 
     def verifyExtendedPdbId(self, pdb_ext_id):
         """Verify if an id is extended PDB ID
@@ -118,12 +293,7 @@ class DaInternalDb(object):
         Returns:
             bool: True/False
         """
-        query = "select structure_id from database_2 where database_id = 'PDB' and pdbx_database_accession = '%s'" % pdb_ext_id
-        rows = self.run(query)
-        if rows:
-            return True
-        else:
-            return False
+        return self.convertExtendedPdbIdToDepId(pdb_ext_id) is not None
 
     def verifyEmdbId(self, emdb_id):
         """Verify if an id is EMDB ID
@@ -134,12 +304,7 @@ class DaInternalDb(object):
         Returns:
             bool: True/False
         """
-        query = "select structure_id from database_2 where database_id = 'EMDB' and database_code = '%s'" % emdb_id
-        rows = self.run(query)
-        if rows:
-            return True
-        else:
-            return False
+        return self.convertEmdbIdToDepId(emdb_id) is not None
 
     def convertPdbIdToDepId(self, pdb_id):
         """Convert PDB ID to deposition id
@@ -150,12 +315,7 @@ class DaInternalDb(object):
         Returns:
             str: valid deposition id at this site, or None
         """
-        query = "select structure_id from rcsb_status where pdb_id = '%s'" % pdb_id
-        rows = self.run(query)
-        if rows:
-            return rows[0][0]
-        else:
-            return None
+        return self.convertPdbIdsToDepIds([pdb_id])[pdb_id]
 
     def convertExtendedPdbIdToDepId(self, pdb_ext_id):
         """Convert extended PDB ID to deposition id
@@ -166,12 +326,7 @@ class DaInternalDb(object):
         Returns:
             str: valid deposition id at this site, or None
         """
-        query = "select structure_id from database_2 where database_id = 'PDB' and pdbx_database_accession = '%s'" % pdb_ext_id
-        rows = self.run(query)
-        if rows:
-            return rows[0][0]
-        else:
-            return None
+        return self.convertExtendedPdbIdsToDepIds([pdb_ext_id])[pdb_ext_id]
 
     def convertEmdbIdToDepId(self, emdb_id):
         """Convert EMDB ID to deposition id
@@ -182,16 +337,21 @@ class DaInternalDb(object):
         Returns:
             str: valid deposition id at this site, or None
         """
-        query = "select structure_id from database_2 where database_id = 'EMDB' and database_code = '%s'" % emdb_id
-        rows = self.run(query)
-        if rows:
-            return rows[0][0]
-        else:
-            return None
+        return self.convertEmdbIdsToDepIds([emdb_id])[emdb_id]
+
+    @staticmethod
+    def getCacheStats():
+        """Usage statistics of the process-wide cache of id mappings"""
+        return _ID_MAPPING_CACHE.getStats()
+
+    @staticmethod
+    def clearCache():
+        """Drop the cached id mappings"""
+        _ID_MAPPING_CACHE.clear()
 
 
 if __name__ == "__main__":
-    # Minimal temporary testing, cannot develop unit test because the IDs at the test sites are cleaned up regularly.
+    # Minimal temporary testing against DA_INTERNAL - see DaInternalDbTests for tests on a SQLite fixture.
     db_da_internal = DaInternalDb()
     print(db_da_internal.verifyDepId("D_1000272951"))
     print(db_da_internal.verifyPdbId("8GI8"))
@@ -24,36 +24,86 @@ import sys
 import datetime
 import logging
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from wwpdb.utils.config.ConfigInfo import ConfigInfo
 from wwpdb.utils.config.ConfigInfoApp import ConfigInfoAppMessaging
+from wwpdb.apps.msgmodule.util.SiteRegistry import getSiteInstance
 # from mmcif_utils.persist.LockFile import LockFile
 from wwpdb.apps.msgmodule.io.CompatIo import LockFile, PdbxMessageIo, getSiteId
 # from wwpdb.io.locator.PathInfo import PathInfo
 from wwpdb.apps.msgmodule.util.MessagingDataRouter import MessagingDataImport
+from wwpdb.apps.msgmodule.util.ExtractMessageCache import ExtractMessageCache
 # from mmcif_utils.message.PdbxMessageIo import PdbxMessageIo
 # from wwpdb.apps.msgmodule.db.PdbxMessageIo import PdbxMessageIo
 from wwpdb.utils.session.WebRequest import InputRequest
 
 logger = logging.getLogger(__name__)
 
+# parsed message data, shared by the ExtractMessage instances of this process
+_SHARED_CACHE = ExtractMessageCache()
+
+
+class _SimpleCategory(object):
+    """Category-like view of message or file reference rows, with values as strings"""
+
+    def __init__(self, rows, refcontainer=False):
+        self._rows = rows
+        self._attributes = list(rows[0].keys()) if rows else []
+        self._refcont = refcontainer
+        self._rowList = None
+
+    def getItemNameList(self):
+        if self._refcont:
+            return [f"_pdbx_deposition_message_file_reference.{attr}" for attr in self._attributes]
+        else:
+            return [f"_pdbx_deposition_message_info.{attr}" for attr in self._attributes]
+
+    def getRowList(self):
+        # built on first use only, and kept with the cached container
+        if self._rowList is None:
+            self._rowList = [[str(row.get(attr, "")) for attr in self._attributes] for row in self._rows]
+        return self._rowList
+
+
+class _SimpleContainer(object):
+    """Container-like structure holding the message and file reference categories read for a message file"""
+
+    def __init__(self, data, refdata):
+        self._data = data
+        self._refdata = refdata
+        # Only provide a category if it has rows
+        self.__categoryD = {
+            "pdbx_deposition_message_info": _SimpleCategory(data) if data else None,
+            "pdbx_deposition_message_file_reference": _SimpleCategory(refdata, True) if refdata else None,
+        }
+
+    def getObj(self, category_name):
+        return self.__categoryD.get(category_name)
+
 
 class ExtractMessage(object):
     """Class to read message files and extract message date and contents
     """
-    def __init__(self, siteId=None, verbose=False, log=sys.stderr):
+    def __init__(self, siteId=None, verbose=False, log=sys.stderr, cache=None):
+        """
+        :param `cache`:    ExtractMessageCache for parsed message data (default: the cache shared within the process)
+        """
         self.__siteId = siteId
         self.__verbose = verbose
         self.__log = log
-        self.__legacycomm = not ConfigInfoAppMessaging(siteId).get_msgdb_support()
+        self.__legacycomm = not getSiteInstance(ConfigInfoAppMessaging, siteId).get_msgdb_support()
 
         # self.__pI = PathInfo(siteId=self.__siteId, verbose=self.__verbose, log=self.__log)
         # Parameters to tune lock file management --
         self.__timeoutSeconds = 10
         self.__retrySeconds = 0.2
 
-        self.__depid = None  # deposition id is stored as cached class variable, see __readMsgFile() for re-use cached data
-        self.__contentType = None  # contentType is stored as cached class variable
-        self.__lc = []  # list of data containers for the message file as cached class variable
+        self.__depid = None  # deposition id of the message data in self.__lc
+        self.__lc = []  # list of data containers for the message file, see __readMsgFile()
+        self.__cache = cache if cache is not None else _SHARED_CACHE
+        # Upper bound on number of depositions whose message files are read concurrently by the batch getters
+        self.__maxBatchWorkers = 8
 
     def __getMsgFilePath(self, depid, contentType, test_folder=None):
         """Returns message filepath in the archive
@@ -96,79 +146,104 @@ class ExtractMessage(object):
 
         return filepath_msg
 
+    def __getDataVersion(self, depid, filepath_msg):
+        """Returns version stamp of the message data read from filepath_msg: modification time and size of the
+        message file, or the version stamp of the deposition's messages in the messaging database
+        """
+        if self.__legacycomm:
+            try:
+                st = os.stat(filepath_msg)
+                return (filepath_msg, st.st_mtime_ns, st.st_size)
+            except OSError:
+                return (filepath_msg, None, None)
+        siteId = self.__siteId if self.__siteId is not None else getSiteId()
+        pdbxMsgIo = PdbxMessageIo(site_id=siteId, verbose=self.__verbose, log=self.__log)
+        try:
+            pdbxMsgIo.read(filepath_msg, deposition_id=depid)
+            return pdbxMsgIo.getDataVersion()
+        finally:
+            pdbxMsgIo.close()
+
     def __readMsgFile(self, depid, contentType, b_use_cache=True, test_folder=None):
         """Parse message file to data in self.__lc.
         Message file can be either messages-from-depositor, messages-to-depositor, or notes-from-annotator
+
+        Parsed data is kept in the cache shared by the ExtractMessage instances of the process (see ExtractMessageCache),
+        and reused while the message data is unchanged. With b_use_cache False the message file is always read.
         """
-        if b_use_cache and self.__depid == depid and self.__contentType == contentType and self.__lc:
-            logger.info("use cached message data in self.__lc for %s, ignore new contents", depid)
-            # If the same message file was just read and parsed, use the cached data in self.__lc, in order to avoid parsing
-            # the same file multiple times with different functions since each function uses depid as argument.
-            # This should be used for read-only functions. Be mindful of the consequence of ignoring new data written into the
-            # message file while the program is running
-        else:
-            self.__lc = []  # must reset so that parsed data from the previous message file is not mixed with current
-            filepath_msg = self.__getMsgFilePath(depid, contentType, test_folder)
-            if not filepath_msg:
-                return None
-            logger.info("read message file for %s at %s", depid, filepath_msg)
+        self.__lc = []  # must reset so that parsed data from the previous message file is not mixed with current
+        self.__depid = depid
+        filepath_msg = self.__getMsgFilePath(depid, contentType, test_folder)
+        if not filepath_msg:
+            return None
 
+        dataVersion = None
+        if self.__cache.validate:
             try:
-                # Pass site_id explicitly to keep DB/file routing deterministic.
-                siteId = self.__siteId if self.__siteId is not None else getSiteId()
-                pdbxMsgIo = PdbxMessageIo(site_id=siteId, verbose=self.__verbose, log=self.__log)
-                with LockFile(filepath_msg, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__log):
-                    ok = pdbxMsgIo.read(filepath_msg, deposition_id=depid)
-                    if ok:
-                        # Store the messages data directly - no conversion needed
-                        messages = pdbxMsgIo.getMessageInfo()
-                        messagesref = pdbxMsgIo.getFileReferenceInfo()
-                        if messages or messagesref:
-                            # Create a simple container-like structure for compatibility
-                            class SimpleContainer:
-                                def __init__(self, data, refdata):
-                                    self._data = data
-                                    self._refdata = refdata
-
-                                def getObj(self, category_name):
-                                    if category_name == "pdbx_deposition_message_info":
-                                        # Only return category if messages exist
-                                        if not self._data:
-                                            return None
-                                        return SimpleCategory(self._data)
-                                    if category_name == "pdbx_deposition_message_file_reference":
-                                        # Only return category if file references exist
-                                        if not self._refdata:
-                                            return None
-                                        return SimpleCategory(self._refdata, True)
-                                    return None
-
-                            class SimpleCategory:
-                                def __init__(self, messages, refcontainer=False):
-                                    self._messages = messages
-                                    self._attributes = list(messages[0].keys()) if messages else []
-                                    self._refcont = refcontainer
-
-                                def getItemNameList(self):
-                                    if self._refcont:
-                                        return [f"_pdbx_deposition_message_file_reference.{attr}" for attr in self._attributes]
-                                    else:
-                                        return [f"_pdbx_deposition_message_info.{attr}" for attr in self._attributes]
-
-                                def getRowList(self):
-                                    return [[str(msg.get(attr, "")) for attr in self._attributes] for msg in self._messages]
-
-                            container = SimpleContainer(messages, messagesref)
-                            self.__lc = [container]
-                        else:
-                            self.__lc = []
-                    else:
-                        self.__lc = []
+                dataVersion = self.__getDataVersion(depid, filepath_msg)
             except Exception as e:
-                logger.warning("Error reading message file for %s: %s", depid, e)
-                self.__lc = []
+                logger.warning("Error determining message data version for %s: %s", depid, e)
+        if b_use_cache and (dataVersion is not None or not self.__cache.validate):
+            lc = self.__cache.get(depid, contentType, dataVersion)
+            if lc is not None:
+                logger.info("use cached message data for %s %s", depid, contentType)
+                self.__lc = lc
+                return None
+
+        logger.info("read message file for %s at %s", depid, filepath_msg)
+        try:
+            # Pass site_id explicitly to keep DB/file routing deterministic.
+            siteId = self.__siteId if self.__siteId is not None else getSiteId()
+            pdbxMsgIo = PdbxMessageIo(site_id=siteId, verbose=self.__verbose, log=self.__log)
+            with LockFile(filepath_msg, timeoutSeconds=self.__timeoutSeconds, retrySeconds=self.__retrySeconds, verbose=self.__verbose, log=self.__log):
+                ok = pdbxMsgIo.read(filepath_msg, deposition_id=depid)
+                if ok:
+                    # Store the messages data directly - no conversion needed
+                    messages = pdbxMsgIo.getMessageInfo()
+                    messagesref = pdbxMsgIo.getFileReferenceInfo()
+                    if messages or messagesref:
+                        self.__lc = [_SimpleContainer(messages, messagesref)]
+        except Exception as e:
+            logger.warning("Error reading message file for %s: %s", depid, e)
+            return None
+
+        if dataVersion is not None or not self.__cache.validate:
+            self.__cache.put(depid, contentType, dataVersion, self.__lc)
+        return None
+
+    def __queryDb(self, depid, test_folder, fromSummary, query):
+        """Answers a getter from the messaging database without loading the message history: from the stored message
+        summary of the deposition with fromSummary(summary) where there is one (and fromSummary is given), otherwise with
+        query(pdbxMsgIo), typed queries filtering in SQL.
+
+        Returns (True, answer), or (False, None) for cif storage and author-provided test folders - or should the
+        database query fail - in which case the message file is scanned instead.
+        """
+        if self.__legacycomm or test_folder:
+            return (False, None)
+        try:
+            siteId = self.__siteId if self.__siteId is not None else getSiteId()
+            pdbxMsgIo = PdbxMessageIo(site_id=siteId, verbose=self.__verbose, log=self.__log)
+            try:
+                pdbxMsgIo.read("", deposition_id=depid)
+                if fromSummary is not None:
+                    summary = pdbxMsgIo.getDepositionSummary()
+                    if summary is not None:
+                        return (True, fromSummary(summary))
+                return (True, query(pdbxMsgIo))
+            finally:
+                pdbxMsgIo.close()
+        except Exception as e:
+            logger.warning("Error querying messages of %s: %s", depid, e)
+            return (False, None)
 
-            self.__depid = depid
+    @staticmethod
+    def __lastByContextOrSubject(pdbxMsgIo, contentType, contextTypes, phrase):
+        """Date of the last message matched by context type or, failing that, by subject phrase"""
+        msg = pdbxMsgIo.getLastMessageByContextType(contentType, contextTypes)
+        if msg is not None and msg["timestamp"]:
+            return msg["timestamp"]
+        return pdbxMsgIo.getLastMessageDateBySubject(contentType, phrase)
 
     def __selectLastMsgByTitlePhrase(self, phrase):
         ret = None
@@ -326,6 +401,13 @@ class ExtractMessage(object):
         """ Return date of last reminder in notes as python datetime.
         Notes only records automatically-sent messages unless annotators specifically archived a message.
         """
+        ok, ret = self.__queryDb(
+            depid, test_folder, lambda summary: summary["last_auto_reminder_at"],
+            lambda io: self.__lastByContextOrSubject(io, "notes-from-annotator", ["reminder", "reminder-auth-to-rel"], "Still awaiting feedback for"),
+        )
+        if ok:
+            return ret
+
         ret = None
         self.__readMsgFile(depid, contentType="notes-from-annotator", b_use_cache=b_use_cache, test_folder=test_folder)
         if len(self.__lc) >= 1:
@@ -343,6 +425,13 @@ class ExtractMessage(object):
         """Return date of last reminder message to depositor as python datetime.
         System-sent messages in archived notes file are not counted.
         """
+        ok, ret = self.__queryDb(
+            depid, test_folder, lambda summary: summary["last_manual_reminder_at"],
+            lambda io: self.__lastByContextOrSubject(io, "messages-to-depositor", ["reminder"], "Still awaiting feedback for"),
+        )
+        if ok:
+            return ret
+
         ret = None
         self.__readMsgFile(depid, contentType="messages-to-depositor", b_use_cache=b_use_cache, test_folder=test_folder)
         if len(self.__lc) >= 1:
@@ -359,6 +448,13 @@ class ExtractMessage(object):
     def getLastReleaseNoticeDatetime(self, depid, b_use_cache=True, test_folder=None):
         """Return date of last release notice to depositor as python datetime.
         """
+        ok, ret = self.__queryDb(
+            depid, test_folder, lambda summary: summary["last_release_notice_at"],
+            lambda io: self.__lastByContextOrSubject(io, "messages-to-depositor", ["release-publ", "release-nopubl"], "Release of"),
+        )
+        if ok:
+            return ret
+
         ret = None
         self.__readMsgFile(depid, contentType="messages-to-depositor", b_use_cache=b_use_cache, test_folder=test_folder)
         if len(self.__lc) >= 1:
@@ -404,6 +500,10 @@ class ExtractMessage(object):
         # if len(myContainerList) >= 1:
         #     c0 = myContainerList[0]
 
+        ok, lastUnlock = self.__queryDb(depid, test_folder, lambda summary: summary["last_unlock_at"], lambda io: io.getLastUnlockDates([depid])[depid])
+        if ok:
+            return lastUnlock.strftime("%Y-%m-%d %H:%M:%S") if lastUnlock else None
+
         ret = None
         self.__readMsgFile(depid, contentType="messages-to-depositor", b_use_cache=b_use_cache, test_folder=test_folder)
 
@@ -471,6 +571,12 @@ class ExtractMessage(object):
         # if len(myContainerList) >= 1:
         #     c0 = myContainerList[0]
 
+        ok, ret = self.__queryDb(
+            depid, test_folder, lambda summary: (summary["last_validation_at"], summary["last_validation_major"]), self.__lastValidationFromDb
+        )
+        if ok:
+            return ret
+
         lastvalid = None
         major = None
 
@@ -575,6 +681,16 @@ class ExtractMessage(object):
         logger.info("Returning (%s, %s)", lastvalid, major)
         return (lastvalid, major)
 
+    def __lastValidationFromDb(self, pdbxMsgIo):
+        """(datetime, major issue) of the last validation letter, by context type/value or else by attached report and subject"""
+        msg = pdbxMsgIo.getLastMessageByContextType("messages-to-depositor", ["vldtn", "maponly-authstatus-em"])
+        if msg is not None and msg["timestamp"]:
+            return (msg["timestamp"], msg["context_value"] == "major-issue-in-validation")
+        letter = pdbxMsgIo.getLastValidationLetter()
+        if letter is None:
+            return (None, None)
+        return (letter["timestamp"], self._majorValidation(letter["message_text"]))
+
     def _majorValidation(self, msgText):
         """Returns true if there appears to be a major error in the validation test - otherwise False"""
 
@@ -612,6 +728,14 @@ class ExtractMessage(object):
         # if len(myContainerList) >= 1:
         #     c0 = myContainerList[0]
 
+        ok, ret = self.__queryDb(
+            depid, test_folder, lambda summary: summary["last_sent_at"] if msgtodepositor else summary["last_received_at"],
+            lambda io: io.getLastSentDates([depid], msg_content)[depid],
+        )
+        if ok:
+            logger.info("Returning %s (from messaging database)", ret)
+            return ret
+
         ret = None
         self.__readMsgFile(depid, contentType=msg_content, b_use_cache=b_use_cache, test_folder=test_folder)
 
@@ -694,6 +818,11 @@ class ExtractMessage(object):
 
         logger.info("Starting for deposition %s", depid)
 
+        # messages of the deposition with no status, or one requiring action - one set-based query with the messaging database
+        ok, ret = self.__queryDb(depid, None, None, lambda io: io.getPendingDepositorMessages([depid])[depid])
+        if ok:
+            return ret
+
         dep_fpath = self.__getMsgFilePath(depid, "messages-from-depositor", test_folder=None)
         bio_fpath = self.__getMsgFilePath(depid, "messages-to-depositor", test_folder=None)
 
@@ -714,28 +843,93 @@ class ExtractMessage(object):
             # Assume all messages unacknowledged
             return depRecordSetLst
 
-        bioStatusSetLst = (
-            pdbxMsgIo_toDpstr.getMsgStatusInfo()
-        )
+        # action required flag of the first status record of each message
+        actionReqdD = {}
+        for s in pdbxMsgIo_toDpstr.getMsgStatusInfo():
+            actionReqdD.setdefault(s["message_id"], s["action_reqd"])
 
-        ret = []
-        for dep in depRecordSetLst:
-            msgid = dep["message_id"]
+        return [dep for dep in depRecordSetLst if actionReqdD.get(dep["message_id"], "Y") == "Y"]
 
-            found = False
-            for s in bioStatusSetLst:
-                if s["message_id"] == msgid:
-                    found = True
-                    if s["action_reqd"] == "Y":
-                        ret.append(dep)
-                    break
+    def __runPerDeposition(self, depids, methodName, default, test_folder=None):
+        """Calls the single deposition getter methodName for each of depids on a bounded pool of worker threads,
+        so that message files are read and parsed concurrently. Each worker thread has its own ExtractMessage
+        since the parsed message file is cached per instance.
+        """
+        local = threading.local()
 
-            if not found:
-                ret.append(dep)
+        def run(depid):
+            exMsg = getattr(local, "exMsg", None)
+            if exMsg is None:
+                exMsg = local.exMsg = ExtractMessage(siteId=self.__siteId, verbose=self.__verbose, log=self.__log)
+            try:
+                return getattr(exMsg, methodName)(depid, test_folder=test_folder)
+            except Exception as e:
+                logger.warning("Error processing %s for %s: %s", methodName, depid, e)
+                return default
 
-        return ret
+        numWorkers = max(1, min(self.__maxBatchWorkers, len(depids)))
+        with ThreadPoolExecutor(max_workers=numWorkers) as executor:
+            return dict(zip(depids, executor.map(run, depids)))
+
+    def __batch(self, depids, dbQuery, methodName, default, test_folder=None):
+        """Answers a getter for many depositions: with the messaging database by dbQuery(pdbxMsgIo, depids), a grouped
+        query over all depositions, otherwise (or should the query fail) with methodName per deposition.
+        Returns dictionary keyed by deposition id.
+        """
+        depids = list(dict.fromkeys(depids))
+        if not depids:
+            return {}
+        if not self.__legacycomm and not test_folder:
+            try:
+                siteId = self.__siteId if self.__siteId is not None else getSiteId()
+                pdbxMsgIo = PdbxMessageIo(site_id=siteId, verbose=self.__verbose, log=self.__log)
+                try:
+                    return dbQuery(pdbxMsgIo, depids)
+                finally:
+                    pdbxMsgIo.close()
+            except Exception as e:
+                logger.warning("Grouped query for %s failed, processing depositions one by one: %s", methodName, e)
+        return self.__runPerDeposition(depids, methodName, default, test_folder=test_folder)
+
+    def getLastSentMsgDatetimeBatch(self, depids, test_folder=None):
+        """Return dictionary of deposition id -> date of last message to depositor as python datetime (None if none sent),
+        see getLastSentMsgDatetime().
+        """
+        return self.__batch(depids, lambda io, ids: io.getLastSentDates(ids, "messages-to-depositor"), "getLastSentMsgDatetime", None, test_folder)
+
+    def getLastReceivedMsgDatetimeBatch(self, depids, test_folder=None):
+        """Return dictionary of deposition id -> date of last message from depositor as python datetime (None if none),
+        see getLastReceivedMsgDatetime().
+        """
+        return self.__batch(depids, lambda io, ids: io.getLastSentDates(ids, "messages-from-depositor"), "getLastReceivedMsgDatetime", None, test_folder)
+
+    def getLastUnlockDatetimeBatch(self, depids, test_folder=None):
+        """Return dictionary of deposition id -> date of last unlock message as python datetime (None if never unlocked),
+        see getLastUnlockDatetime().
+        """
+        return self.__batch(depids, lambda io, ids: io.getLastUnlockDates(ids), "getLastUnlockDatetime", None, test_folder)
+
+    def getLastUnlockedBatch(self, depids, test_folder=None):
+        """Return dictionary of deposition id -> datetime string of last unlock message (None if never unlocked),
+        see getLastUnlocked().
+        """
+        def query(io, ids):
+            return {depid: dt.strftime("%Y-%m-%d %H:%M:%S") if dt else None for depid, dt in io.getLastUnlockDates(ids).items()}
+
+        return self.__batch(depids, query, "getLastUnlocked", None, test_folder)
+
+    def getPendingDepositorMessagesBatch(self, depids, test_folder=None):
+        """Return dictionary of deposition id -> list of messages sent by depositor with action pending,
+        see getPendingDepositorMessages().
+        """
+        return self.__batch(depids, lambda io, ids: io.getPendingDepositorMessages(ids), "getPendingDepositorMessages", [], test_folder)
+
+    @staticmethod
+    def getCacheStats():
+        """Usage statistics of the message data cache shared by the ExtractMessage instances of this process"""
+        return _SHARED_CACHE.getStats()
 
     def getApprovalNoCorrectSubjects(self):
         """Returns list of subjects used for approval without corrections"""
-        cI = ConfigInfo(self.__siteId)
+        cI = getSiteInstance(ConfigInfo, self.__siteId)
         return cI.get("COMMUNICATION_APPROVAL_WITHOUT_CHANGES_MESSAGE_SUBJECTS")
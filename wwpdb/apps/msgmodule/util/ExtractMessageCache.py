@@ -0,0 +1,109 @@
+##
+# File: ExtractMessageCache.py
+# Date: 18-Oct-2026
+#
+# Process-wide cache of parsed message data for ExtractMessage.
+##
+"""
+Cache of parsed message data for ExtractMessage.
+
+Entries hold the parsed messages of one deposition and content type and are looked up by
+(deposition id, content type). Each entry records the data version it was read at - the modification
+time and size of the message file, or the per-deposition version stamp of the messaging database
+(message count, highest ordinal, latest updated_at) - and is only served for that version, so new
+messages are picked up at the cost of a stat() or one aggregate query per lookup. With validation
+disabled entries are served without that check until they expire.
+
+The cache is bounded by number of entries (least recently used are evicted) and entries expire after
+ttlSeconds. It is thread-safe and meant to be shared by all ExtractMessage instances of a process;
+getStats() reports hits, misses, expirations and entries invalidated by a newer data version.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractMessageCache(object):
+    """Thread-safe TTL/LRU cache of parsed message data keyed by deposition id and content type."""
+
+    def __init__(self, ttlSeconds=300, maxEntries=256, validate=True):
+        """
+        :param `ttlSeconds`:    time for which an entry is served from the cache
+        :param `maxEntries`:    upper bound on number of cached entries
+        :param `validate`:      serve entries only for the data version they were read at
+        """
+        self.__ttlSeconds = ttlSeconds
+        self.__maxEntries = maxEntries
+        self.__validate = validate
+        self.__entryD = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+        self.__expired = 0
+        self.__invalidated = 0
+        self.__lock = threading.Lock()
+
+    @property
+    def validate(self):
+        """Whether entries are checked against the current data version"""
+        return self.__validate
+
+    def get(self, depId, contentType, dataVersion=None):
+        """Cached value for depId and contentType, or None if absent, expired or read at another data version
+
+        :param `dataVersion`:   current data version (ignored unless validating)
+        """
+        key = (depId, contentType)
+        now = time.monotonic()
+        with self.__lock:
+            entry = self.__entryD.get(key)
+            if entry is not None and entry[0] <= now:
+                del self.__entryD[key]
+                self.__expired += 1
+                entry = None
+            elif entry is not None and self.__validate and entry[1] != dataVersion:
+                del self.__entryD[key]
+                self.__invalidated += 1
+                entry = None
+            if entry is None:
+                self.__misses += 1
+                return None
+            self.__entryD.move_to_end(key)
+            self.__hits += 1
+            return entry[2]
+
+    def put(self, depId, contentType, dataVersion, value):
+        """Cache value, read for depId and contentType at dataVersion"""
+        key = (depId, contentType)
+        now = time.monotonic()
+        with self.__lock:
+            self.__entryD.pop(key, None)
+            self.__entryD[key] = (now + self.__ttlSeconds, dataVersion, value)
+            while len(self.__entryD) > self.__maxEntries:
+                self.__entryD.popitem(last=False)
+
+    def invalidate(self, depId, contentType=None):
+        """Drop the entries of depId (for one content type, or all)"""
+        with self.__lock:
+            for key in [key for key in self.__entryD if key[0] == depId and contentType in (None, key[1])]:
+                del self.__entryD[key]
+
+    def clear(self):
+        with self.__lock:
+            self.__entryD.clear()
+
+    def getStats(self):
+        """Dictionary of entries, hits, misses, expirations, invalidations and hit ratio"""
+        with self.__lock:
+            numLookups = self.__hits + self.__misses
+            return {
+                "entries": len(self.__entryD),
+                "hits": self.__hits,
+                "misses": self.__misses,
+                "expired": self.__expired,
+                "invalidated": self.__invalidated,
+                "hit_ratio": (float(self.__hits) / numLookups) if numLookups else 0.0,
+            }
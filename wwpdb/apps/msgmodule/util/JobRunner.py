@@ -0,0 +1,254 @@
+##
+# File: JobRunner.py
+# Date: 18-Oct-2026
+#
+# Local runner for message submissions executed in the background.
+##
+"""
+Local runner for long-running message submissions (sending a message with attachments, bulk
+auto-messages), executed by a process pool outside of the HTTP request.
+
+A submission is stored as a job in the msgmodule_job table (see db/Models.MessageJob) and dispatched
+to the pool, and the caller gets the job id back at once; the outcome is read back with getJob().
+Submissions carrying an idempotency key are run at most once: a retried submission with the same key,
+job type and deposition gets the job of the first one, whatever its state, and a submission reusing the
+key with other parameters is refused with ValueError. A worker claims a job with a conditional update
+from 'queued' to 'running' before running it, so that a job dispatched twice (e.g. again by
+resumeQueued() while still in the pool queue of another process) still runs once.
+
+Handlers are module level functions (they are pickled by reference to the worker processes) taking
+the job payload and returning a JSON serializable result; they are registered per job type once, when
+the module defining them is imported, with registerJobHandler() (or for one runner with registerHandler()).
+
+The job table is the one of the messaging database when database support is enabled for the site, or
+the database given by SITE_MSGMODULE_JOB_DB_URL. Without either, jobs are kept in an SQLite database in
+the temporary directory of the host -- not in the sessions directory, which is shared over NFS where
+SQLite locking is unreliable. Such a store is private to the host: jobs are then run within the
+submitting request (as with wait=True), a job can only be looked up on the host which ran it, and
+idempotency keys are only honoured per host. Site settings:
+
+    SITE_MSGMODULE_JOB_DB_URL -- SQLAlchemy URL of the job database, shared by all hosts of the site
+    SITE_MSGMODULE_JOB_WORKERS -- number of worker processes (default 2)
+    SITE_MSGMODULE_JOB_TIMEOUT -- seconds after which a running job is taken as interrupted (default 3600)
+
+Example:
+    registerJobHandler("submit_msg", runSubmitMsgJob)  # at module level
+    ...
+    runner = getJobRunner(siteId)
+    job = runner.submit("submit_msg", payload, depositionId="D_1000000001", idempotencyKey=key)
+    ...
+    job = runner.getJob(job["job_id"])
+"""
+
+import os
+import json
+import logging
+import multiprocessing
+import socket
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+from wwpdb.utils.config.ConfigInfo import ConfigInfo
+from wwpdb.utils.config.ConfigInfoApp import ConfigInfoAppMessaging
+from wwpdb.apps.msgmodule.db.DataAccessLayer import DataAccessLayer
+from wwpdb.apps.msgmodule.db.PdbxMessageIo import get_db_config
+from wwpdb.apps.msgmodule.util.SiteRegistry import getSiteInstance, getSiteValue
+
+logger = logging.getLogger(__name__)
+
+# final job states
+FINISHED_STATES = ("succeeded", "failed")
+
+# handlers of all runners by job type (see registerJobHandler())
+_jobHandlerD = {}
+
+
+def registerJobHandler(jobType, handler):
+    """Have jobs of jobType run by handler(payload) in all runners -- a module level function returning a JSON serializable
+    result, registered when the module defining it is imported"""
+    _jobHandlerD[jobType] = handler
+
+
+def _executeJob(handler, dbConfig, jobId):
+    """Run a job in a worker process: claim it, call the handler with its payload and record the outcome.
+
+    :Returns:
+        final job status, or None if the job was not claimed (already run or running elsewhere)
+    """
+    jobs = DataAccessLayer(dbConfig).jobs
+    if not jobs.claim(jobId):
+        logger.info("Job %s is not queued any more, not running it", jobId)
+        return None
+    job = jobs.get_job(jobId)
+    try:
+        result = handler(json.loads(job["payload"]))
+    except Exception as e:  # pylint: disable=broad-except
+        logger.exception("Job %s (%s) failed", jobId, job["job_type"])
+        jobs.finish(jobId, "failed", error="%s: %s" % (type(e).__name__, e))
+        return "failed"
+    jobs.finish(jobId, "succeeded", result=json.dumps(result, default=str))
+    return "succeeded"
+
+
+def isJobDbShared(siteId):
+    """Whether the job table of a site is in a database shared by its hosts (see module documentation)"""
+    return bool(getSiteInstance(ConfigInfo, siteId).get("SITE_MSGMODULE_JOB_DB_URL")) or getSiteInstance(ConfigInfoAppMessaging, siteId).get_msgdb_support()
+
+
+def getJobDbConfig(siteId):
+    """Database configuration of the job table of a site (see module documentation)"""
+    dbUrl = getSiteInstance(ConfigInfo, siteId).get("SITE_MSGMODULE_JOB_DB_URL")
+    if dbUrl:
+        return {"url": dbUrl}
+    if getSiteInstance(ConfigInfoAppMessaging, siteId).get_msgdb_support():
+        return get_db_config(siteId)
+    fileName = "msgmodule-jobs-%s-%s.sqlite" % (siteId, socket.gethostname())
+    return {"url": "sqlite:///" + os.path.join(tempfile.gettempdir(), fileName)}
+
+
+class JobRunner(object):
+    """Queues jobs in the job table and runs them with a pool of worker processes"""
+
+    def __init__(self, dbConfig, maxWorkers=2, executor=None, interruptedAfter=3600, background=True):
+        """
+        :param `dbConfig`:          database configuration of the job table (as for DataAccessLayer)
+        :param `maxWorkers`:        number of worker processes
+        :param `executor`:          concurrent.futures executor to use instead of a process pool of its own
+        :param `interruptedAfter`:  seconds after which a job still running is taken as interrupted by resumeQueued()
+        :param `background`:        run jobs in the worker processes -- if False, every job is run within submit()
+                                    as with wait=True (for job tables not shared by the hosts of the site)
+        """
+        self.__dbConfig = dbConfig
+        self.__maxWorkers = maxWorkers
+        self.__executor = executor
+        self.__interruptedAfter = interruptedAfter
+        self.__background = background
+        self.__handlerD = {}
+        self.__lock = threading.Lock()
+        self.__jobs = DataAccessLayer(dbConfig).jobs
+        self.__jobs.ensure_table()
+
+    def registerHandler(self, jobType, handler):
+        """Have jobs of jobType run by handler(payload) in this runner, rather than by the handler of registerJobHandler()
+        -- a module level function returning a JSON serializable result"""
+        self.__handlerD[jobType] = handler
+
+    def __getHandler(self, jobType):
+        return self.__handlerD.get(jobType) or _jobHandlerD.get(jobType)
+
+    def __getExecutor(self):
+        with self.__lock:
+            if self.__executor is None:
+                # spawned rather than forked: the web server process may hold threads and open connections
+                self.__executor = ProcessPoolExecutor(max_workers=self.__maxWorkers, mp_context=multiprocessing.get_context("spawn"))
+            return self.__executor
+
+    def __dispatch(self, job):
+        handler = self.__getHandler(job["job_type"])
+        if handler is None:
+            logger.warning("No handler registered for job type %s, job %s left queued", job["job_type"], job["job_id"])
+            return
+        future = self.__getExecutor().submit(_executeJob, handler, self.__dbConfig, job["job_id"])
+        future.add_done_callback(lambda f, jobId=job["job_id"]: self.__logOutcome(jobId, f))
+
+    @staticmethod
+    def __logOutcome(jobId, future):
+        if future.exception() is not None:
+            # the job could not be run or its outcome not be stored -- it stays queued or running
+            logger.error("Job %s could not be run: %s", jobId, future.exception())
+        else:
+            logger.info("Job %s finished with status %s", jobId, future.result())
+
+    def isBackground(self):
+        """Whether jobs submitted without wait are run in the background"""
+        return self.__background
+
+    def submit(self, jobType, payload, depositionId=None, idempotencyKey=None, wait=False):
+        """Queue a job and dispatch it to the worker processes.
+
+        :param `jobType`:           kind of job, a handler must be registered for it
+        :param `payload`:           JSON serializable job parameters
+        :param `depositionId`:      deposition the job concerns
+        :param `idempotencyKey`:    client supplied token of the submission -- if a job of jobType was already
+                                    submitted with it for depositionId, that job is returned and nothing is queued
+        :param `wait`:              run the job in the calling process and return once it has finished
+
+        :Returns:
+            job dictionary (job_id, status, result, error, ...)
+
+        :Raises:
+            ValueError: for an unknown job type, or an idempotency key already used with another payload
+        """
+        handler = self.__getHandler(jobType)
+        if handler is None:
+            raise ValueError("No handler registered for job type %s" % jobType)
+        # keys sorted, so that the payloads of a submission and of its retries compare equal
+        job, created = self.__jobs.submit(jobType, json.dumps(payload, sort_keys=True), deposition_id=depositionId, idempotency_key=idempotencyKey)
+        if not created:
+            logger.info("Job %s already submitted with idempotency key %s (status %s)", job["job_id"], idempotencyKey, job["status"])
+            return self.getJob(job["job_id"])
+        if wait or not self.__background:
+            _executeJob(handler, self.__dbConfig, job["job_id"])
+            return self.getJob(job["job_id"])
+        self.__dispatch(job)
+        return job
+
+    def getJob(self, jobId):
+        """Job dictionary of jobId, with the decoded result of a finished job -- None if there is no such job"""
+        return self.__decodeResult(self.__jobs.get_job(jobId))
+
+    def getJobByIdempotencyKey(self, jobType, idempotencyKey, depositionId=None):
+        """Job dictionary of the submission of jobType for depositionId made with idempotencyKey -- None if there is none.
+
+        Lets a retried submission be answered before anything is prepared for it; submit() checks the key again.
+        """
+        return self.__decodeResult(self.__jobs.get_by_idempotency_key(idempotencyKey, jobType, depositionId))
+
+    @staticmethod
+    def __decodeResult(job):
+        if job is not None and job["result"] is not None:
+            job["result"] = json.loads(job["result"])
+        return job
+
+    def resumeQueued(self, queuedBefore=60):
+        """Dispatch again the jobs queued more than queuedBefore seconds ago (e.g. by a process which has since
+        exited), and mark as failed the jobs running for longer than the interruption timeout.
+
+        :Returns:
+            (number of jobs dispatched, number of jobs marked as failed)
+        """
+        now = datetime.now()
+        numFailed = self.__jobs.fail_interrupted(now - timedelta(seconds=self.__interruptedAfter))
+        jobIds = self.__jobs.get_queued_ids(now - timedelta(seconds=queuedBefore))
+        for jobId in jobIds:
+            self.__dispatch(self.__jobs.get_job(jobId))
+        if jobIds or numFailed:
+            logger.info("Resumed %d queued jobs, %d interrupted jobs marked as failed", len(jobIds), numFailed)
+        return len(jobIds), numFailed
+
+    def shutdown(self, wait=True):
+        """Stop the worker processes, after the dispatched jobs have finished if wait is set"""
+        with self.__lock:
+            executor, self.__executor = self.__executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+def getJobRunner(siteId):
+    """JobRunner of the site, shared within the process"""
+
+    def build():
+        cI = getSiteInstance(ConfigInfo, siteId)
+        background = isJobDbShared(siteId)
+        if not background:
+            logger.warning("No job database shared by the hosts of site %s, message submissions are run within the request", siteId)
+        return JobRunner(
+            getJobDbConfig(siteId),
+            maxWorkers=int(cI.get("SITE_MSGMODULE_JOB_WORKERS", 2)),
+            interruptedAfter=int(cI.get("SITE_MSGMODULE_JOB_TIMEOUT", 3600)),
+            background=background,
+        )
+
+    return getSiteValue(siteId, "job_runner", build)
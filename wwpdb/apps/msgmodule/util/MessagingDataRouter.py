@@ -14,6 +14,7 @@ Uses original file-based implementation for: everything else
 """
 
 from wwpdb.utils.config.ConfigInfoApp import ConfigInfoAppMessaging
+from wwpdb.apps.msgmodule.util.SiteRegistry import getSiteInstance
 from wwpdb.apps.msgmodule.db.MessagingDataImport import MessagingDataImport as DbMessagingDataImport
 from wwpdb.apps.msgmodule.db.MessagingDataExport import MessagingDataExport as DbMessagingDataExport
 from wwpdb.apps.msgmodule.io.MessagingDataImport import MessagingDataImport as IoMessagingDataImport
@@ -58,7 +59,7 @@ class MessagingDataImport(object):
         self._db_impl = None
         self._io_impl = None
         siteId = str(self._reqObj.getValue("WWPDB_SITE_ID"))
-        self.__legacycomm = not ConfigInfoAppMessaging(siteId).get_msgdb_support()
+        self.__legacycomm = not getSiteInstance(ConfigInfoAppMessaging, siteId).get_msgdb_support()
 
     def _get_db_impl(self):
         """Lazy initialization of database-backed MessagingDataImport.
@@ -143,7 +144,7 @@ class MessagingDataExport(object):
         self._db_impl = None
         self._io_impl = None
         siteId = str(self._reqObj.getValue("WWPDB_SITE_ID"))
-        self.__legacycomm = not ConfigInfoAppMessaging(siteId).get_msgdb_support()
+        self.__legacycomm = not getSiteInstance(ConfigInfoAppMessaging, siteId).get_msgdb_support()
 
     def _get_db_impl(self):
         """Lazy initialization of database-backed MessagingDataExport.
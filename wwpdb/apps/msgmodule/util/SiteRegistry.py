@@ -0,0 +1,104 @@
+##
+# File: SiteRegistry.py
+# Date: 18-Oct-2026
+#
+# Per-process registry of site configuration objects.
+##
+"""
+Per-process registry of the site configuration objects (ConfigInfo, ConfigInfoAppEm,
+ConfigInfoAppMessaging, ...) and settings derived from them.
+
+Each is built once per site id on first use and then shared by the requests handled by the process,
+rather than being constructed anew by every request handler. The configuration objects are only read
+after construction and are shared by all threads. reload() drops the registered objects, so that they
+are built again from the current site configuration on next use.
+
+Objects holding a database connection of their own (e.g. StatusDbApi) are not registered: their
+connection would be kept for the life of the process, and is not reestablished once the server
+has closed it as idle.
+
+Example:
+    cI = getSiteInstance(ConfigInfo, siteId)
+"""
+
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class _SiteRegistry(object):
+    """Thread-safe registry of objects built per (kind, site id)"""
+
+    def __init__(self):
+        self.__entryD = {}
+        self.__generation = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.__lock = threading.Lock()
+
+    def get(self, key, builder):
+        """Object registered under key, built by builder() on first use"""
+        with self.__lock:
+            if key in self.__entryD:
+                self.__hits += 1
+                return self.__entryD[key]
+            self.__misses += 1
+        # built outside of the lock -- concurrent first uses may build twice, the first registered wins
+        value = builder()
+        with self.__lock:
+            return self.__entryD.setdefault(key, value)
+
+    def reload(self, siteId=None):
+        """Drop the objects registered for siteId (default: for all sites)"""
+        with self.__lock:
+            if siteId is None:
+                self.__entryD.clear()
+            else:
+                for key in [key for key in self.__entryD if key[1] == siteId]:
+                    del self.__entryD[key]
+            self.__generation += 1
+
+    def getStats(self):
+        with self.__lock:
+            return {
+                "entries": len(self.__entryD),
+                "sites": len(set(key[1] for key in self.__entryD)),
+                "hits": self.__hits,
+                "misses": self.__misses,
+                "reloads": self.__generation,
+            }
+
+
+_REGISTRY = _SiteRegistry()
+
+
+def getSiteInstance(cls, siteId):
+    """Instance of cls for the site, built as cls(siteId) on first use and shared within the process.
+
+    :param `cls`:           class taking the site id as first argument, e.g. ConfigInfo or ConfigInfoAppEm
+    :param `siteId`:        WWPDB site id (None for the site of the current server)
+    """
+    return _REGISTRY.get((cls, siteId), lambda: cls(siteId))
+
+
+def getSiteValue(siteId, name, builder):
+    """Value derived from the site configuration, computed by builder() on first use and shared within the process.
+
+    :param `siteId`:        WWPDB site id
+    :param `name`:          name of the value, unique within the site
+    :param `builder`:       callable computing the value
+    """
+    return _REGISTRY.get((name, siteId), builder)
+
+
+def reload(siteId=None):
+    """Have the configuration objects and values of siteId (default: of all sites) built again on next use,
+    e.g. after the site configuration has changed"""
+    logger.info("Reloading registered site configuration for %s", siteId if siteId is not None else "all sites")
+    _REGISTRY.reload(siteId)
+
+
+def getStats():
+    """Usage statistics of the registry"""
+    return _REGISTRY.getStats()
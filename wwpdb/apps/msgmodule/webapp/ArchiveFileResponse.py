@@ -0,0 +1,187 @@
+##
+# File: ArchiveFileResponse.py
+# Date: 18-Oct-2026
+#
+# Response content for serving message file references straight from the archive.
+##
+"""
+Response content used to serve files referenced by messages directly out of the archive.
+
+Files are streamed in chunks (honouring a single HTTP byte range) or, when the site is configured
+for it, handed off to the front-end web server via X-Sendfile / X-Accel-Redirect so that no copy
+of the file is ever made into the session directory.
+"""
+
+import os
+import sys
+import logging
+from email.utils import formatdate
+
+from wwpdb.utils.session.WebRequest import ResponseContent
+
+logger = logging.getLogger(__name__)
+
+
+def parseByteRange(rangeHeader, fileSize):
+    """Parse the value of an HTTP Range header for a file of the given size.
+
+    Only a single byte range is supported. Multi-range requests, other units and
+    malformed headers are ignored so that the complete file is served instead.
+
+    :param `rangeHeader`:   raw value of the Range request header (e.g. "bytes=0-1023")
+    :param `fileSize`:      size of the file in bytes
+
+    :Returns:
+        ``None`` if the whole file should be served, otherwise a (start, end) tuple of inclusive offsets.
+
+    :Raises:
+        ValueError if the range is syntactically valid but cannot be satisfied
+    """
+    if not rangeHeader:
+        return None
+    units, _sep, spec = rangeHeader.strip().partition("=")
+    if units.strip().lower() != "bytes" or not spec or "," in spec:
+        return None
+    startStr, sep, endStr = spec.strip().partition("-")
+    if not sep:
+        return None
+    startStr = startStr.strip()
+    endStr = endStr.strip()
+    if not (startStr.isdigit() or startStr == "") or not (endStr.isdigit() or endStr == "") or not (startStr or endStr):
+        return None
+    if not startStr:
+        # suffix range -- last N bytes
+        suffixLen = int(endStr)
+        if suffixLen <= 0 or fileSize <= 0:
+            raise ValueError("Unsatisfiable suffix range %r" % rangeHeader)
+        return (max(fileSize - suffixLen, 0), fileSize - 1)
+    start = int(startStr)
+    end = int(endStr) if endStr else fileSize - 1
+    if endStr and end < start:
+        return None
+    if start >= fileSize:
+        raise ValueError("Range start %d beyond end of file (%d bytes)" % (start, fileSize))
+    return (start, min(end, fileSize - 1))
+
+
+class RangeFileIterator(object):
+    """Iterates over the bytes [start, end] of a file in fixed size chunks."""
+
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, filePath, start=0, end=None):
+        self.__fp = open(filePath, "rb")
+        self.__fp.seek(start)
+        if end is None:
+            end = os.path.getsize(filePath) - 1
+        self.__remaining = end - start + 1
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.__remaining <= 0:
+            self.close()
+            raise StopIteration
+        chunk = self.__fp.read(min(self.CHUNK_SIZE, self.__remaining))
+        if not chunk:
+            self.close()
+            raise StopIteration
+        self.__remaining -= len(chunk)
+        return chunk
+
+    next = __next__
+
+    def close(self):
+        if not self.__fp.closed:
+            self.__fp.close()
+
+
+class ArchiveFileResponse(ResponseContent):
+    """ResponseContent variant that streams a single archive file.
+
+    The response dictionary returned by get() extends the usual CONTENT_TYPE/RETURN_STRING pair with
+    STATUS (HTTP status line), HEADERS (extra response headers) and, for streamed bodies, FILE_ITERATOR.
+    """
+
+    def __init__(self, reqObj=None, verbose=False, log=sys.stderr):
+        super(ArchiveFileResponse, self).__init__(reqObj=reqObj, verbose=verbose, log=log)
+        self.__verbose = verbose
+        self.__rspD = None
+
+    def setNotFound(self, errMsg="File not found"):
+        self.__rspD = self.__initErrorResponse("404 Not Found", errMsg)
+
+    def setForbidden(self, errMsg="Access denied"):
+        self.__rspD = self.__initErrorResponse("403 Forbidden", errMsg)
+
+    def setArchiveFile(self, filePath, rangeHeader=None, sendFileMode=None, accelRedirectRoot=None, accelRedirectPrefix=None):
+        """Prepare the response for the given (already access checked) archive file.
+
+        :param `filePath`:              absolute path of the file to serve
+        :param `rangeHeader`:           value of the Range request header, if any
+        :param `sendFileMode`:          "x-sendfile" or "x-accel-redirect" to offload the transfer to the web server,
+                                        anything else to stream the file from this process
+        :param `accelRedirectRoot`:     filesystem prefix mapped by the X-Accel-Redirect internal location
+        :param `accelRedirectPrefix`:   URI prefix of the internal location used for X-Accel-Redirect
+        """
+        fileName = os.path.basename(filePath)
+        fileSize = os.path.getsize(filePath)
+        contentType, encodingType = ResponseContent.getMimetypeAndEncoding(filePath)
+        headers = {
+            "Accept-Ranges": "bytes",
+            "Last-Modified": formatdate(os.path.getmtime(filePath), usegmt=True),
+            "Content-Disposition": 'inline; filename="%s"' % fileName,
+        }
+        if encodingType:
+            headers["Content-Encoding"] = encodingType
+        rspD = {"CONTENT_TYPE": contentType, "STATUS": "200 OK", "HEADERS": headers}
+        #
+        mode = (sendFileMode or "").strip().lower()
+        if mode == "x-accel-redirect" and accelRedirectRoot and accelRedirectPrefix:
+            rootPath = os.path.realpath(accelRedirectRoot)
+            realPath = os.path.realpath(filePath)
+            if realPath.startswith(rootPath.rstrip(os.sep) + os.sep):
+                headers["X-Accel-Redirect"] = accelRedirectPrefix.rstrip("/") + "/" + os.path.relpath(realPath, rootPath).replace(os.sep, "/")
+                rspD["RETURN_STRING"] = b""
+                self.__rspD = rspD
+                return
+            logger.warning("%s is outside of X-Accel-Redirect root %s, streaming instead", filePath, accelRedirectRoot)
+        elif mode == "x-sendfile":
+            headers["X-Sendfile"] = filePath
+            rspD["RETURN_STRING"] = b""
+            self.__rspD = rspD
+            return
+        #
+        try:
+            byteRange = parseByteRange(rangeHeader, fileSize)
+        except ValueError:
+            self.__rspD = self.__initErrorResponse("416 Range Not Satisfiable", "Requested range not satisfiable")
+            self.__rspD["HEADERS"]["Content-Range"] = "bytes */%d" % fileSize
+            return
+        #
+        if byteRange is None:
+            start, end = 0, fileSize - 1
+        else:
+            start, end = byteRange
+            rspD["STATUS"] = "206 Partial Content"
+            headers["Content-Range"] = "bytes %d-%d/%d" % (start, end, fileSize)
+        headers["Content-Length"] = str(max(end - start + 1, 0))
+        rspD["FILE_ITERATOR"] = RangeFileIterator(filePath, start, end)
+        if self.__verbose:
+            logger.info("serving %s bytes %d-%d of %d", filePath, start, end, fileSize)
+        self.__rspD = rspD
+
+    def get(self):
+        if self.__rspD is None:
+            return self.__initErrorResponse("404 Not Found", "File not found")
+        return self.__rspD
+
+    @staticmethod
+    def __initErrorResponse(status, errMsg):
+        rspDict = {}
+        rspDict["CONTENT_TYPE"] = "text/plain"
+        rspDict["STATUS"] = status
+        rspDict["HEADERS"] = {}
+        rspDict["RETURN_STRING"] = errMsg
+        return rspDict
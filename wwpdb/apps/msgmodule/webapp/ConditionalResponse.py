@@ -0,0 +1,115 @@
+##
+# File: ConditionalResponse.py
+# Date: 18-Oct-2026
+#
+# Response content for conditional requests validated against the data version of a deposition.
+##
+"""
+Conditional request support (ETag / If-None-Match) for the polled messaging status services.
+
+Responses carry an entity tag derived from the request parameters and the version stamp of the
+stored messages and message statuses of the deposition (see MessagingIo.getDataVersion()). A request
+presenting a matching tag in If-None-Match is answered with 304 Not Modified, before any messages
+are read.
+
+Tags are weak: the same tag validates the gzip, deflate and identity encodings of a response body
+(the content coding is chosen later, in the WSGI layer), and responses vary by Accept-Encoding.
+Services whose responses echo a per-request value (e.g. sEcho of DataTables requests) are not
+suited to conditional handling, as a 304 could not carry it.
+"""
+
+import hashlib
+import json
+import sys
+import time
+import logging
+
+from wwpdb.apps.msgmodule.webapp.ResponseEncoding import JsonResponseContent
+
+logger = logging.getLogger(__name__)
+
+# request parameters which do not affect the content of a response
+_IGNORED_PARAMS = frozenset(["http_if_none_match", "http_range", "sessionid", "_"])
+
+
+def makeEntityTag(requestPath, paramD, dataVersion, extra=None):
+    """Entity tag for the response to a request, given the data version it is computed from.
+
+    :param `requestPath`:   service path of the request
+    :param `paramD`:        request parameters (e.g. InputRequest.getDictionary())
+    :param `dataVersion`:   version stamp of the data the response is computed from
+    :param `extra`:         any further state the response depends on (JSON serializable)
+
+    :Returns:
+        weak entity tag, as used in the ETag header
+    """
+    keyD = {
+        "path": requestPath,
+        "params": {k: v for k, v in paramD.items() if k not in _IGNORED_PARAMS},
+        "version": dataVersion,
+        "extra": extra,
+        "tz": time.tzname,  # dates are rendered in local time
+    }
+    return 'W/"%s"' % hashlib.sha1(json.dumps(keyD, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def matchesEntityTag(ifNoneMatch, etag):
+    """Whether the value of an If-None-Match request header matches the entity tag (weak comparison).
+
+    :param `ifNoneMatch`:   raw header value, e.g. '"abc", W/"def"' or '*'
+    :param `etag`:          quoted entity tag of the current response
+    """
+    if not ifNoneMatch or not etag:
+        return False
+    if ifNoneMatch.strip() == "*":
+        return True
+    etag = etag[2:] if etag.startswith("W/") else etag
+    for tag in ifNoneMatch.split(","):
+        tag = tag.strip()
+        if (tag[2:] if tag.startswith("W/") else tag) == etag:
+            return True
+    return False
+
+
+class ConditionalResponseContent(JsonResponseContent):
+    """ResponseContent variant carrying an entity tag, which may be answered with 304 Not Modified.
+
+    The response dictionary returned by get() and getDeferred() is extended with HEADERS (ETag and
+    Cache-Control, so that browsers revalidate their copy, and Vary) and, for 304 responses, STATUS.
+    """
+
+    def __init__(self, reqObj=None, verbose=False, log=sys.stderr):
+        super(ConditionalResponseContent, self).__init__(reqObj=reqObj, verbose=verbose, log=log)
+        self.__etag = None
+        self.__notModified = False
+
+    def setEntityTag(self, etag):
+        self.__etag = etag
+
+    def setNotModified(self):
+        """Answer with 304 Not Modified -- the client's copy tagged with the entity tag is current"""
+        self.__notModified = True
+
+    def isNotModified(self):
+        return self.__notModified
+
+    def get(self):
+        if self.__notModified:
+            return self.__getNotModified()
+        return self.__addHeaders(super(ConditionalResponseContent, self).get())
+
+    def getDeferred(self):
+        if self.__notModified:
+            return self.__getNotModified()
+        return self.__addHeaders(super(ConditionalResponseContent, self).getDeferred())
+
+    def __getNotModified(self):
+        return {"CONTENT_TYPE": "application/json", "STATUS": "304 Not Modified", "HEADERS": self.__getHeaders(), "RETURN_STRING": ""}
+
+    def __addHeaders(self, rD):
+        if self.__etag is not None and not self.isError():
+            rD.setdefault("HEADERS", {}).update(self.__getHeaders())
+        return rD
+
+    def __getHeaders(self):
+        return {"ETag": self.__etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
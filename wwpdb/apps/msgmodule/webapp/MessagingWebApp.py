@@ -39,6 +39,14 @@
 # 2024-04-04    CS     Add process on context_type/context_value of message-to-depositor recorded by frontend JavaScript and passed here through wsgi message submit URL
 # 2024-08-30    CS     Add MessagingWebAppWorker._verifyOrConvertId() used by _propagateMsg("archive") to archive messages by PDB or EMDB IDs
 # 2024-12-23    CS     Add support on extended PDB ID for _verifyOrConvertId() to convert ID for archiving
+# 2026-10-18           Add MessagingWebAppWorker._verifyOrConvertIds() to verify/convert all ids of a request with batched DA_INTERNAL lookups
+# 2026-10-18           Add MessagingWebAppWorker._getMsgViewBundle() returning everything for opening the message view of a deposition in one response
+# 2026-10-18           ETag/If-None-Match support for check_global_msg_status, validated by the data version of the deposition
+# 2026-10-18           MessagingWebApp.doOp(deferJsonEncoding=True) leaves serialization (and compression) of JSON responses to the WSGI layer
+# 2026-10-18           Configuration objects taken from the per-process SiteRegistry instead of being built per request
+# 2026-10-18           Import the workflow engine stack on first use rather than on module load
+# 2026-10-18           Run message submissions as background jobs (async_job, idempotency_key), add get_job_status
+# 2026-10-18           Add send_auto_msg, sending templated messages to a list of depositions in a background job
 ##
 """
 wwPDB Messaging web request and response processing modules.
@@ -58,6 +66,7 @@ __email__ = "rsala@rcsb.rutgers.edu"
 __license__ = "Creative Commons Attribution 3.0 Unported"
 __version__ = "V0.07"
 
+import json
 import ntpath
 import os
 import sys
@@ -70,24 +79,26 @@ try:
 except ImportError:
     from HTMLParser import HTMLParser
 
-from wwpdb.utils.session.WebRequest import InputRequest, ResponseContent
+from wwpdb.utils.session.WebRequest import InputRequest
 from wwpdb.apps.msgmodule.depict.MessagingDepict import MessagingDepict
 from wwpdb.apps.msgmodule.io.MessagingIo import MessagingIo
 from wwpdb.utils.wf.dbapi.StatusDbApi import StatusDbApi
 from wwpdb.apps.msgmodule.models.Message import Message
 from wwpdb.apps.msgmodule.util.DaInternalDb import DaInternalDb
+from wwpdb.apps.msgmodule.webapp.ArchiveFileResponse import ArchiveFileResponse
+from wwpdb.apps.msgmodule.webapp.ConditionalResponse import ConditionalResponseContent, makeEntityTag, matchesEntityTag
+from wwpdb.apps.msgmodule.webapp.ResponseEncoding import JsonResponseContent
 
 #
 # from wwpdb.apps.msgmodule.utils.WfTracking              import WfTracking
 #
 from wwpdb.utils.config.ConfigInfo import ConfigInfo
+from wwpdb.apps.msgmodule.util.SiteRegistry import getSiteInstance, getSiteValue
+from wwpdb.apps.msgmodule.util.JobRunner import getJobRunner, registerJobHandler
+from wwpdb.apps.msgmodule.util.AutoMessage import AutoMessage
 
 #
-from wwpdb.utils.wf.dbapi.WfDbApi import WfDbApi
-
-#
-from wwpdb.apps.wf_engine.engine.WFEapplications import getdepUIPassword
-
+# WfDbApi and the workflow engine (for getdepUIPassword) are imported on first use, see __getDepUiPassword()
 #
 from wwpdb.io.locator.PathInfo import PathInfo
 
@@ -115,7 +126,7 @@ class MessagingWebApp(object):
         self.__lfh = log
         self.__debug = False
         self.__siteId = siteId
-        self.__cI = ConfigInfo(self.__siteId)
+        self.__cI = getSiteInstance(ConfigInfo, self.__siteId)
         self.__topPath = self.__cI.get("SITE_WEB_APPS_TOP_PATH")
         self.__topSessionPath = self.__cI.get("SITE_WEB_APPS_TOP_SESSIONS_PATH")
         self.__templatePath = os.path.join(self.__topPath, "htdocs", "msgmodule")
@@ -147,9 +158,12 @@ class MessagingWebApp(object):
             logger.info("%s", str(self.__reqObj))
             logger.info("---------------MessagingWebApp - done -------------------------------")
 
-    def doOp(self):
+    def doOp(self, deferJsonEncoding=False):
         """Execute request and package results in response dictionary.
 
+        :param `deferJsonEncoding`:  return JSON responses unserialized, under JSON_OBJECT instead of RETURN_STRING
+                                     (see ResponseEncoding.encodeJsonResponse())
+
         :Returns:
              A dictionary containing response data for the input request.
              Minimally, the content of this dictionary will include the
@@ -169,6 +183,8 @@ class MessagingWebApp(object):
         #
         # Package return according to the request return_format -
         #
+        if deferJsonEncoding and isinstance(rC, JsonResponseContent):
+            return rC.getDeferred()
         return rC.get()
 
     def __dumpRequest(self):
@@ -224,10 +240,15 @@ class MessagingWebAppWorker(object):
             "/service/messaging/launch": "_launchOp",
             "/service/messaging/get_dtbl_data": "_getDataTblData",
             "/service/messaging/get_dtbl_config_dtls": "_getDataTblConfigDtls",
+            "/service/messaging/get_msg_view_bundle": "_getMsgViewBundle",
             "/service/messaging/mark_msg_read": "_markMsgAsRead",
             "/service/messaging/tag_msg": "_tagMsg",
+            "/service/messaging/update_msg_status_bulk": "_bulkUpdateMsgStatus",
+            "/service/messaging/cache_stats": "_getCacheStats",
             "/service/messaging/submit_msg": "_submitMsg",
             "/service/messaging/update_draft_state": "_updateDraftState",
+            "/service/messaging/get_job_status": "_getJobStatus",
+            "/service/messaging/send_auto_msg": "_sendAutoMsg",
             # "/service/messaging/delete_row": "_deleteRowOp",  # Not implemented on client or server properly
             # "/service/messaging/test_see_json": "_getDataTblDataRawJsonOp",  # Disable for now
             "/service/messaging/exit_not_finished": "_exit_notFinished",
@@ -235,6 +256,7 @@ class MessagingWebAppWorker(object):
             "/service/messaging/get_msg": "_getMsg",
             "/service/messaging/check_avail_files": "_checkAvailFiles",
             "/service/messaging/get_files_rfrncd": "_getFilesRfrncd",
+            "/service/messaging/download_file": "_downloadFile",
             "/service/messaging/check_global_msg_status": "_checkGlobalMsgStatus",
             "/service/messaging/archive_msg": "_archiveMsg",
             "/service/messaging/forward_msg": "_forwardMsg",
@@ -275,7 +297,7 @@ class MessagingWebAppWorker(object):
     #     reqPath = self.__reqObj.getRequestPath()
     #     if reqPath not in self.__appPathD:
     #         # bail out if operation is unknown -
-    #         rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+    #         rC = JsonResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
     #         rC.setError(errMsg="Unknown operation")
     #         return rC
     #     else:
@@ -295,7 +317,7 @@ class MessagingWebAppWorker(object):
             reqPath = self.__reqObj.getRequestPath()
             if reqPath not in self.__appPathD:
                 # bail out if operation is unknown -
-                rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+                rC = JsonResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
                 rC.setError(errMsg="Unknown operation")
             else:
                 mth = getattr(self, self.__appPathD[reqPath], None)
@@ -303,7 +325,7 @@ class MessagingWebAppWorker(object):
             return rC
         except:  # noqa: E722 pylint: disable=bare-except
             logger.exception("In processing doOpException")
-            rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+            rC = JsonResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
             rC.setError(errMsg="Operation failure")
             return rC
 
@@ -313,7 +335,7 @@ class MessagingWebAppWorker(object):
     # ------------------------------------------------------------------------------------------------------------
     #
     def _dumpOp(self):
-        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        rC = JsonResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
         rC.setHtmlList(self.__reqObj.dump(format="html"))
         return rC
 
@@ -339,7 +361,7 @@ class MessagingWebAppWorker(object):
         # depId = str(self.__reqObj.getValue("identifier")).upper()
         #
         self.__reqObj.setDefaultReturnFormat(return_format="html")
-        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        rC = JsonResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
         #
         if self.__verbose:
             logger.info("+MessagingWebAppWorker._launchOp() workflow flag is %r", bIsWorkflow)
@@ -383,7 +405,7 @@ class MessagingWebAppWorker(object):
             logger.info("-- dep_id is: %s", depId)
         #
         self.__reqObj.setReturnFormat(return_format="json")
-        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        rC = JsonResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
         #
         pI = PathInfo(siteId=self.__siteId, sessionPath=self.__sessionPath, verbose=self.__verbose, log=self.__lfh)
         archivePth = pI.getArchivePath(depId)
@@ -417,7 +439,7 @@ class MessagingWebAppWorker(object):
         #
         self.__reqObj.setDefaultReturnFormat(return_format="html")
         self.__reqObj.setValue("filesource", "archive")  # setting here for downstream processing
-        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        rC = JsonResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
         #
         msgngDpct = MessagingDepict(self.__verbose, self.__lfh)
         msgngDpct.setSessionPaths(self.__reqObj)
@@ -465,7 +487,7 @@ class MessagingWebAppWorker(object):
             bUseThreadedRsltSet = True
             #
         self.__reqObj.setReturnFormat(return_format="json")
-        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        rC = JsonResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
         #
         msgingIo = MessagingIo(self.__reqObj, self.__verbose, self.__lfh)
         rsltSetDict = msgingIo.getMsgRowList(
@@ -527,16 +549,16 @@ class MessagingWebAppWorker(object):
             logger.info(" -- dep_id is: %s", depId)
         #
         self.__reqObj.setReturnFormat(return_format="json")
-        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        rC = JsonResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
         #
         msgingIo = MessagingIo(self.__reqObj, self.__verbose, self.__lfh)
         _bOk, msgColList = msgingIo.getMsgColList(bCommHstryRqstd)
         #
         # if( sUseServerSide == 'true' ):
         # DataTables related query string params:
-        iDisplayStart = int(self.__reqObj.getValue("iDisplayStart"))
-        iDisplayLength = int(self.__reqObj.getValue("iDisplayLength"))
-        sEcho = int(self.__reqObj.getValue("sEcho"))  # casting to int as recommended by DataTables
+        iDisplayStart = self.__getIntValue("iDisplayStart", 0)
+        iDisplayLength = self.__getIntValue("iDisplayLength", 10)
+        sEcho = self.__getIntValue("sEcho", 0)  # casting to int as recommended by DataTables
 
         ##################################################################
         # we need to accommodate any search filtering taking place
@@ -597,6 +619,83 @@ class MessagingWebAppWorker(object):
 
         return rC
 
+    def _getMsgViewBundle(self):
+        """Get everything needed for opening the message view of a deposition in a single response, instead of
+        separate get_dtbl_config_dtls/get_dtbl_data requests per tab plus check_global_msg_status and check_avail_files.
+        Messages are read once and shared by all parts of the response.
+
+        Request parameters are those of get_dtbl_config_dtls, plus optionally:
+            "content_types" -- comma separated content types of the tabs to include (default "msgs,notes,commhstry")
+            "iDisplayLength" -- number of records in the first page of each tab (default 10)
+
+        :Returns:
+            Operation output is packaged in a ResponseContent() object.
+            The output consists of JSON object with properties:
+                'tabs' --> per content type, the 'html' and 'dtbl_config_dict' as returned by get_dtbl_config_dtls
+                           and the first page of records as 'dtbl_data', as returned by get_dtbl_data
+                'msg_status' --> collective messaging status conditions as returned by check_global_msg_status
+                'file_list' --> files available for attaching, as returned by check_avail_files
+        """
+        #
+        if self.__verbose:
+            logger.info("-- Starting.")
+
+        self.__getSession()
+
+        depId = self.__reqObj.getValue("identifier")
+        sendStatus = self.__reqObj.getValue("send_status")
+        bUseThreadedRsltSet = self.__reqObj.getValue("usethreaded") == "true"
+        sContentTypes = self.__reqObj.getValue("content_types")
+        contentTypeList = [ct.strip() for ct in sContentTypes.split(",") if ct.strip()] if sContentTypes else ["msgs", "notes", "commhstry"]
+        iDisplayLength = self.__getIntValue("iDisplayLength", 10)
+        origContentType = self.__reqObj.getValue("content_type")
+        #
+        self.__reqObj.setReturnFormat(return_format="json")
+        rC = JsonResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        #
+        msgingIo = MessagingIo(self.__reqObj, self.__verbose, self.__lfh)
+        msgingIo.setReuseReads()
+        msgingDpct = MessagingDepict(verbose=self.__verbose, log=self.__lfh)
+        #
+        tabsDict = {}
+        try:
+            for contentType in contentTypeList:
+                self.__reqObj.setValue("content_type", contentType)
+                _bOk, msgColList = msgingIo.getMsgColList(contentType == "commhstry")
+                rsltSetDict = msgingIo.getMsgRowList(
+                    p_depDataSetId=depId,
+                    p_sSendStatus=sendStatus,
+                    p_bServerSide=True,
+                    p_iDisplayStart=0,
+                    p_iDisplayLength=iDisplayLength,
+                    p_colSearchDict={},
+                    p_bThreadedRslts=bUseThreadedRsltSet,
+                )
+                dataTblTmplt, dtblConfigDict = msgingDpct.getDataTableTemplate(self.__reqObj, msgingIo)
+                for key in ("CURRENT_NUM_MSGS_TO_DPSTR", "CURRENT_NUM_NOTES"):
+                    if key in rsltSetDict:
+                        dtblConfigDict[key] = rsltSetDict[key]
+                if bUseThreadedRsltSet and "INDENT_DICT" in rsltSetDict:
+                    dtblConfigDict["INDENT_DICT"] = rsltSetDict["INDENT_DICT"]
+                #
+                dataTblDict = msgingDpct.getJsonDataTable(rsltSetDict["RECORD_LIST"], msgColList, 0)
+                dataTblDict["sEcho"] = 1
+                dataTblDict["iTotalRecords"] = rsltSetDict["TOTAL_RECORDS"]
+                dataTblDict["iTotalDisplayRecords"] = rsltSetDict["TOTAL_DISPLAY_RECORDS"]
+                #
+                tabsDict[contentType] = {"html": "".join(dataTblTmplt), "dtbl_config_dict": dtblConfigDict, "dtbl_data": dataTblDict}
+        finally:
+            self.__reqObj.setValue("content_type", origContentType)
+        #
+        rtrnDict = {"tabs": tabsDict, "msg_status": self.__getGlobalMsgStatus(msgingIo)}
+        #
+        msgingIo.initializeDataStore()  # THIS CALL MUST BE MADE HERE TO PARSE MODEL FILE AND FILTER
+        rtrnDict["file_list"] = msgingIo.checkAvailFiles(depId)
+
+        rC.addDictionaryItems(rtrnDict)
+
+        return rC
+
     # def _getDataTblDataRawJsonOp(self):
     #     """for DEV -- return payload input to DataTables to be displayed on webpage as JSON object for inspection"""
 
@@ -616,7 +715,7 @@ class MessagingWebAppWorker(object):
     #     #
     #     self.__reqObj.setDefaultReturnFormat(return_format="html")
 
-    #     rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+    #     rC = JsonResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
 
     #     msgingIo = MessagingIo(self.__reqObj, self.__verbose, self.__lfh)
     #     _bOk, msgColList = msgingIo.getMsgColList()
@@ -651,7 +750,7 @@ class MessagingWebAppWorker(object):
         bIsWorkflow = self.__isWorkflow()
         #
         self.__reqObj.setReturnFormat(return_format="json")
-        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        rC = JsonResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
         #
         bIsWorkflow = self.__isWorkflow()
         msgngDpct = MessagingDepict(self.__verbose, self.__lfh)
@@ -678,16 +777,38 @@ class MessagingWebAppWorker(object):
 
         """
         #
-        rtrnDict = {}
-        bAllMsgsRead = False
-        bAllMsgsActioned = False
-        bAnyFlagsForRelease = False
-        #
         if self.__verbose:
             logger.info("Starting")
 
         self.__getSession()
         #
+        self.__reqObj.setReturnFormat(return_format="json")
+        msgingIo = MessagingIo(self.__reqObj, self.__verbose, self.__lfh)
+        # the flags also depend on the notes flagging settings of the deposition
+        rC = self.__newConditionalResponse(msgingIo, [self._getNotesFlaggingStatus(), self._getNotesFlaggingStatus("bmrb")])
+        if rC.isNotModified():
+            # nothing changed since the client's copy was computed, nor is there any status to register anew
+            return rC
+        #
+        rC.addDictionaryItems(self.__getGlobalMsgStatus(msgingIo))
+
+        return rC
+
+    def __getGlobalMsgStatus(self, p_msgingIo):
+        """Collective messaging status conditions of the current deposition, as reported by _checkGlobalMsgStatus(),
+        which are also registered in the database.
+
+        :param `p_msgingIo`:    MessagingIo instance used for all checks
+
+        :Returns: dictionary of relevant name/value pairs for various conditions
+
+        """
+        #
+        rtrnDict = {}
+        bAllMsgsRead = False
+        bAllMsgsActioned = False
+        bAnyFlagsForRelease = False
+        #
         depId = str(self.__reqObj.getValue("identifier"))
         #
         if self.__verbose:
@@ -695,14 +816,11 @@ class MessagingWebAppWorker(object):
         #
         activateNotesFlagging = self._getNotesFlaggingStatus()
         #
-        self.__reqObj.setReturnFormat(return_format="json")
-        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
-        #
-        bAllMsgsRead = self.__checkAllMsgsRead()
-        bAllMsgsActioned = self.__checkAllMsgsActioned()
-        bAnyFlagsForRelease = self.__checkAnyReleaseFlags()
-        bAnyApproval = self.__checkAnyApprovalFlags()
-        bAnyNotesIncldngArchvdMsgs, bAnnotNotes, bBmrbNotes, iNumNotesRecords = self.__checkAnyNotesExist()
+        bAllMsgsRead = self.__checkAllMsgsRead(p_msgingIo)
+        bAllMsgsActioned = self.__checkAllMsgsActioned(p_msgingIo)
+        bAnyFlagsForRelease = self.__checkAnyReleaseFlags(p_msgingIo)
+        bAnyApproval = self.__checkAnyApprovalFlags(p_msgingIo)
+        bAnyNotesIncldngArchvdMsgs, bAnnotNotes, bBmrbNotes, iNumNotesRecords = self.__checkAnyNotesExist(p_msgingIo)
 
         # logger.info(("+%s.%s() -- bAnyNotesIncldngArchvdMsgs is '%s' -- bAnnotNotes is '%s' -- iNumNotesRecords is '%s' for DEPID %s \n" % (className, methodName,bAnyNotesIncldngArchvdMsgs,bAnnotNotes,iNumNotesRecords,depId))  # noqa: E501
 
@@ -769,9 +887,7 @@ class MessagingWebAppWorker(object):
         if self.__verbose and bSuccess:
             logger.info("-- NOTIFY status updated to '%s' for DEPID %s", aggregateFlag, depId)
 
-        rC.addDictionaryItems(rtrnDict)
-
-        return rC
+        return rtrnDict
 
     def _getNotesFlaggingStatus(self, subtype=""):
         """Gets flagging status for notes content
@@ -820,7 +936,7 @@ class MessagingWebAppWorker(object):
         :Returns:
             Operation output is packaged in a ResponseContent() object.
         """
-        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        rC = JsonResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
         fstatus = self._toggleNotesFlagging()
         rC.setText(fstatus)
         return rC
@@ -930,7 +1046,7 @@ class MessagingWebAppWorker(object):
         #
         return notesFlaggingStatusFilePathAbs
 
-    def __checkAllMsgsRead(self):
+    def __checkAllMsgsRead(self, p_msgingIo=None):
         """Get
 
         :Helpers:
@@ -945,13 +1061,13 @@ class MessagingWebAppWorker(object):
             logger.info("-- Starting")
 
             #
-        msgingIo = MessagingIo(self.__reqObj, self.__verbose, self.__lfh)
+        msgingIo = p_msgingIo if p_msgingIo is not None else MessagingIo(self.__reqObj, self.__verbose, self.__lfh)
         #
         bAllMsgsRead = msgingIo.areAllMsgsRead()
 
         return bAllMsgsRead
 
-    def __checkAllMsgsActioned(self):
+    def __checkAllMsgsActioned(self, p_msgingIo=None):
         """Get
 
         :Helpers:
@@ -966,13 +1082,13 @@ class MessagingWebAppWorker(object):
             logger.info("Starting.")
 
             #
-        msgingIo = MessagingIo(self.__reqObj, self.__verbose, self.__lfh)
+        msgingIo = p_msgingIo if p_msgingIo is not None else MessagingIo(self.__reqObj, self.__verbose, self.__lfh)
         #
         bAllMsgsActioned = msgingIo.areAllMsgsActioned()
 
         return bAllMsgsActioned
 
-    def __checkAnyReleaseFlags(self):
+    def __checkAnyReleaseFlags(self, p_msgingIo=None):
         """Checks whether there are any messages flagged to indicate entry is ready for release.
 
         :Helpers:
@@ -986,13 +1102,13 @@ class MessagingWebAppWorker(object):
             logger.info("-- Starting.")
 
             #
-        msgingIo = MessagingIo(self.__reqObj, self.__verbose, self.__lfh)
+        msgingIo = p_msgingIo if p_msgingIo is not None else MessagingIo(self.__reqObj, self.__verbose, self.__lfh)
         #
         bForRelease = msgingIo.anyReleaseFlags()
 
         return bForRelease
 
-    def __checkAnyApprovalFlags(self):
+    def __checkAnyApprovalFlags(self, p_msgingIo=None):
         """Checks whether there are any messages in which approval without correction flagged and not actions.
 
         :Helpers:
@@ -1006,13 +1122,13 @@ class MessagingWebAppWorker(object):
             logger.info("-- Starting.")
 
         #
-        msgingIo = MessagingIo(self.__reqObj, self.__verbose, self.__lfh)
+        msgingIo = p_msgingIo if p_msgingIo is not None else MessagingIo(self.__reqObj, self.__verbose, self.__lfh)
         #
         bForApproval = msgingIo.anyUnactionApprovalWithoutCorrection()
 
         return bForApproval
 
-    def __checkAnyNotesExist(self):
+    def __checkAnyNotesExist(self, p_msgingIo=None):
         """Get
 
         :Helpers:
@@ -1025,7 +1141,7 @@ class MessagingWebAppWorker(object):
             logger.info("-- Starting.")
 
             #
-        msgingIo = MessagingIo(self.__reqObj, self.__verbose, self.__lfh)
+        msgingIo = p_msgingIo if p_msgingIo is not None else MessagingIo(self.__reqObj, self.__verbose, self.__lfh)
         #
         return msgingIo.anyNotesExist()
 
@@ -1088,7 +1204,7 @@ class MessagingWebAppWorker(object):
             logger.info("dep_id is:%s", depId)
         #
         self.__reqObj.setReturnFormat(return_format="json")
-        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        rC = JsonResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
         #
         msgingIo = MessagingIo(self.__reqObj, self.__verbose, self.__lfh)
         #
@@ -1098,6 +1214,51 @@ class MessagingWebAppWorker(object):
 
         return rC
 
+    def _downloadFile(self):
+        """Stream a file referenced by a message directly from the archive.
+
+        Request parameters 'identifier', 'msg_id' and 'file_ref' (ordinal of the file reference row) identify the file,
+        which is only served if such a reference is recorded for the given message of the given deposition.
+        Single byte ranges are honoured. If the site configures SITE_MSGMODULE_SENDFILE_MODE as "x-sendfile" or
+        "x-accel-redirect" the transfer is delegated to the front-end web server instead.
+
+        :Returns:
+            Operation output is packaged in an ArchiveFileResponse() object.
+        """
+        if self.__verbose:
+            logger.info("Starting.")
+
+        self.__getSession()
+        #
+        depId = str(self.__reqObj.getValue("identifier")).upper()
+        msgId = str(self.__reqObj.getValue("msg_id"))
+        fileRef = str(self.__reqObj.getValue("file_ref"))
+        #
+        if self.__verbose:
+            logger.info("dep_id is:%s msg_id is:%s file_ref is:%s", depId, msgId, fileRef)
+        #
+        rC = ArchiveFileResponse(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        if not depId or not msgId or not fileRef:
+            rC.setForbidden("Missing file reference")
+            return rC
+        #
+        msgingIo = MessagingIo(self.__reqObj, self.__verbose, self.__lfh)
+        filePath = msgingIo.getFileRfrncPath(depId, msgId, fileRef)
+        if filePath is None:
+            logger.info("no accessible file reference %s for message %s of %s", fileRef, msgId, depId)
+            rC.setNotFound()
+            return rC
+        #
+        cI = getSiteInstance(ConfigInfo, self.__siteId)
+        rC.setArchiveFile(
+            filePath,
+            rangeHeader=self.__reqObj.getValue("http_range"),
+            sendFileMode=cI.get("SITE_MSGMODULE_SENDFILE_MODE"),
+            accelRedirectRoot=cI.get("SITE_ARCHIVE_STORAGE_PATH"),
+            accelRedirectPrefix=cI.get("SITE_MSGMODULE_ACCEL_REDIRECT_PREFIX"),
+        )
+        return rC
+
     def _checkAvailFiles(self):
         """Get
 
@@ -1121,7 +1282,7 @@ class MessagingWebAppWorker(object):
             logger.info(" dep_id is:%s", depId)
         #
         self.__reqObj.setReturnFormat(return_format="json")
-        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        rC = JsonResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
         #
         msgingIo = MessagingIo(self.__reqObj, self.__verbose, self.__lfh)
         msgingIo.initializeDataStore()  # THIS CALL MUST BE MADE HERE TO PARSE MODEL FILE AND FILTER
@@ -1158,7 +1319,7 @@ class MessagingWebAppWorker(object):
             logger.info(" dep_id is: %s", depId)
         #
         self.__reqObj.setReturnFormat(return_format="json")
-        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        rC = JsonResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
         #
         msgingIo = MessagingIo(self.__reqObj, self.__verbose, self.__lfh)
         msgDict = msgingIo.getMsg(msgId, depId)
@@ -1194,7 +1355,7 @@ class MessagingWebAppWorker(object):
         if self.__verbose:
             logger.info("dep_id is:%s", depId)
         #
-        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        rC = JsonResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
         #
         msgingIo = MessagingIo(self.__reqObj, self.__verbose, self.__lfh)
         msgDict = msgingIo.getMsg(msgId, depId)
@@ -1232,8 +1393,6 @@ class MessagingWebAppWorker(object):
         If the id is not a deposition id, verify whether it's PDB ID or EMDB ID, and if so, attempt to convert
         such ids to valid deposition id, which aims to handle message archving based on PDB or EMDB ID.
         The verification and conversion is site-id specific, and do NOT work cross sites or corss site-ids.
-        Because DA_INTERNAL DB doesn't record pdb extension id at the time this function is created,
-        extended pdb id is handled by truncate the last 4 characters for temporary use.
 
         Args:
             id (_type_): Deposition id, PDB ID, extended PDB ID, or EMDB ID, or any input text string as ID
@@ -1241,47 +1400,52 @@ class MessagingWebAppWorker(object):
         Returns:
             _type_: verfied or converted deposition id at the same site, or 'None' for invalid id input
         """
-        id_to_check = id_to_check.strip()
-        if not id_to_check:
-            return None
+        return self._verifyOrConvertIds([id_to_check])[id_to_check]
 
-        logger.info("verify or convert id: %s through DA_INTERNAL DB", id_to_check)
-        db_da_internal = DaInternalDb()  # connect to DA_INTERNAL DB utility
-        id_to_check = id_to_check.upper()
-        if id_to_check.startswith("D_"):  # format of deposition id
-            dep_id = id_to_check
-            if db_da_internal.verifyDepId(dep_id):
-                logger.debug("%s is valid deposition id at this site", dep_id)
-                return dep_id  # return the input id itself is vefified
-            else:
-                return None
-        elif id_to_check.startswith("EMD-"):  # format of EMDB ID
-            emdb_id = id_to_check
-            if db_da_internal.verifyEmdbId(emdb_id):
-                logger.debug("%s is valid EMDB ID, convert it to deposition id", emdb_id)
-                return db_da_internal.convertEmdbIdToDepId(emdb_id)  # EMDB->dep conversion
-            else:
-                return None
-        elif id_to_check.startswith("PDB_") and len(id_to_check) == 12:  # format of extended PDB ID
-            # pdb_id = id_to_check[-4:]  # truncate the last 4 chars as temporary solution
-            # if db_da_internal.verifyPdbId(pdb_id):
-            #     logger.debug("%s is valid extended PDB ID, convert it to deposition id", id_to_check)
-            #     return db_da_internal.convertPdbIdToDepId(pdb_id)  # PDB->dep conversion
-            pdb_ext_id = id_to_check
-            if db_da_internal.verifyExtendedPdbId(pdb_ext_id):
-                logger.debug("%s is valid extended PDB ID, convert it to deposition id", pdb_ext_id)
-                return db_da_internal.convertExtendedPdbIdToDepId(pdb_ext_id)  # PDB extended->dep conversion
-            else:
-                return None
-        elif len(id_to_check) == 4:  # format of PDB ID
-            pdb_id = id_to_check
-            if db_da_internal.verifyPdbId(pdb_id):
-                logger.debug("%s is valid PDB ID, convert it to deposition id", pdb_id)
-                return db_da_internal.convertPdbIdToDepId(pdb_id)  # PDB->dep conversion
-            else:
-                return None
-        else:  # wrong id input
-            return None
+    def _verifyOrConvertIds(self, ids_to_check):
+        """Verify or convert a list of ids as _verifyOrConvertId(), with one DA_INTERNAL query per kind of id.
+
+        Args:
+            ids_to_check (list): Deposition ids, PDB IDs, extended PDB IDs, or EMDB IDs, or any input text strings as IDs
+
+        Returns:
+            dict: input id -> verfied or converted deposition id at the same site, or 'None' for invalid id input
+        """
+        # kind of each id by its format
+        kindD = {}
+        for id_in in ids_to_check:
+            id_to_check = id_in.strip().upper()
+            if id_to_check.startswith("D_"):  # format of deposition id
+                kindD[id_in] = ("dep", id_to_check)
+            elif id_to_check.startswith("EMD-"):  # format of EMDB ID
+                kindD[id_in] = ("emdb", id_to_check)
+            elif id_to_check.startswith("PDB_") and len(id_to_check) == 12:  # format of extended PDB ID
+                kindD[id_in] = ("pdb_ext", id_to_check)
+            elif len(id_to_check) == 4:  # format of PDB ID
+                kindD[id_in] = ("pdb", id_to_check)
+            # else wrong id input
+
+        retD = dict.fromkeys(ids_to_check)
+        if not kindD:
+            return retD
+
+        logger.info("verify or convert ids: %s through DA_INTERNAL DB", ", ".join(id_to_check for _kind, id_to_check in kindD.values()))
+        db_da_internal = DaInternalDb()  # DA_INTERNAL DB utility, reusing the connection of this thread
+
+        def idsOfKind(kind):
+            return [id_to_check for k, id_to_check in kindD.values() if k == kind]
+
+        verifiedD = db_da_internal.verifyDepIds(idsOfKind("dep"))
+        convertedD = {
+            "dep": {dep_id: dep_id for dep_id, ok in verifiedD.items() if ok},  # the input id itself is verified
+            "emdb": db_da_internal.convertEmdbIdsToDepIds(idsOfKind("emdb")),  # EMDB->dep conversion
+            "pdb_ext": db_da_internal.convertExtendedPdbIdsToDepIds(idsOfKind("pdb_ext")),  # PDB extended->dep conversion
+            "pdb": db_da_internal.convertPdbIdsToDepIds(idsOfKind("pdb")),  # PDB->dep conversion
+        }
+        for id_in, (kind, id_to_check) in kindD.items():
+            retD[id_in] = convertedD[kind].get(id_to_check)
+            logger.debug("%s verified or converted to %s", id_in, retD[id_in])
+        return retD
 
     def _propagateMsg(self, actionType):
         """
@@ -1333,7 +1497,7 @@ class MessagingWebAppWorker(object):
         rtrnDict["success"]["job"] = "error"
         #
         self.__reqObj.setReturnFormat(return_format="json")
-        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        rC = JsonResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
         #
         msgingIo = MessagingIo(self.__reqObj, self.__verbose, self.__lfh)
         #
@@ -1343,11 +1507,13 @@ class MessagingWebAppWorker(object):
         #
         # statusApi = StatusDbApi(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
 
+        depIdLst = [depId.strip() for depId in depIdLst]
+        verifiedIdD = self._verifyOrConvertIds(depIdLst)  # CS 2024-08-30 verify dep id or convert PDB/EMDB ID to dep id for archiving
+
         bOk = False  # initiate bOk in case of exit from loop below
         for depId in depIdLst:
-            depId = depId.strip()
             logger.debug("start processing %s", depId)
-            depId_2 = self._verifyOrConvertId(depId)  # CS 2024-08-30 verify dep id or convert PDB/EMDB ID to dep id for archiving
+            depId_2 = verifiedIdD[depId]
             logger.debug("verified or converted id %s", depId_2)
 
             if not depId_2:
@@ -1421,8 +1587,6 @@ class MessagingWebAppWorker(object):
         #
         #
         self.__getSession()
-        #
-        rtrnDict = {}
 
         # CS 2024-04-04 start processing context_value, add "major-issue-in-validation" if frontend submitted validation message contains major issue
         if self.__reqObj.getValue("context_type") == "vldtn":
@@ -1435,11 +1599,22 @@ class MessagingWebAppWorker(object):
         self.__reqObj.setReturnFormat(return_format="json")
         self.__reqObj.setValue("message_state", p_msgState)  # setting here for downstream processing, used only for processing purposes
         # NOTE: this field is not part of the PdbxMessage data structure, and thus is not persisted to data file.
-        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        rC = JsonResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
         #
         msgObj = Message.fromReqObj(self.__reqObj, self.__verbose, self.__lfh)
         #
-        msgingIo = MessagingIo(self.__reqObj, self.__verbose, self.__lfh)
+        idempotencyKey = self.__reqObj.getValue("idempotency_key").strip()
+        if idempotencyKey:
+            # a retried submission is answered with the job of the first one, without staging its uploads again
+            try:
+                job = self.__getSubmittedJob(msgObj.depositionId, idempotencyKey)
+            except ValueError as e:
+                logger.warning("submission for %s refused: %s", msgObj.depositionId, e)
+                rC.setError(errMsg=str(e))
+                return rC
+            if job is not None:
+                rC.addDictionaryItems(self.__getJobItems(job))
+                return rC
         #
         if self.__verbose:
             logger.info("checking for attached files.")
@@ -1457,7 +1632,32 @@ class MessagingWebAppWorker(object):
             logger.info("msgObj.messageText is: %r", msgObj.messageText)
             logger.info("msgObj.getFileReferences() is: %r", msgObj.getFileReferences())
         #
+        if self.__isAsyncSubmit() or idempotencyKey:
+            try:
+                rC.addDictionaryItems(self.__submitMsgJob(msgObj, idempotencyKey))
+            except ValueError as e:
+                logger.warning("submission for %s refused: %s", msgObj.depositionId, e)
+                rC.setError(errMsg=str(e))
+        else:
+            rtrnDict = self._completeMsg(msgObj)
+            self.__addDepUiPassword(rtrnDict, msgObj.depositionId)
+            rC.addDictionaryItems(rtrnDict)
+        return rC
 
+    def _completeMsg(self, msgObj):
+        """Process a message submitted by _processMsg() once any attached files are in the session directory:
+        store it, generate the review files, send the email and update the status flags.
+
+        Run within the request, or by a background job (see runSubmitMsgJob()). The deposition UI password
+        for an updated model file is not among the items returned, which are stored with the job; it is added
+        when the response is built (see __addDepUiPassword()).
+
+        :Returns: dictionary of the response items
+        """
+        if self.__sObj is None:
+            self.__getSession()
+        rtrnDict = {}
+        msgingIo = MessagingIo(self.__reqObj, self.__verbose, self.__lfh)
         bOk, bPdbxMdlFlUpdtd, failedFileRefs = msgingIo.processMsg(msgObj)
         #
         if bOk:
@@ -1476,12 +1676,6 @@ class MessagingWebAppWorker(object):
                 sMsg += "\nIf you are attaching an auxiliary file, please ensure that the file name ends with a known file extension/type."
             rtrnDict["append_msg"] = sMsg
 
-        if bPdbxMdlFlUpdtd:
-            wfApi = WfDbApi(verbose=True)
-            pw = getdepUIPassword(wfApi, msgObj.depositionId)
-            rtrnDict["depid_pw"] = pw
-
-        rC.addDictionaryItems(rtrnDict)
         #
         if self.__verbose:
             logger.info("msgObj.messageId is:%s", msgObj.messageId)
@@ -1489,8 +1683,164 @@ class MessagingWebAppWorker(object):
             logger.info("msgObj.getFileReferences() is: %r", msgObj.getFileReferences())
             logger.info("pdbx_model_updated is: %s", rtrnDict["pdbx_model_updated"])
         #
+        return rtrnDict
+
+    def __isAsyncSubmit(self):
+        """Run submissions as background jobs if requested by the client (async_job), or for all submissions of the site"""
+        asyncJob = self.__reqObj.getValue("async_job").strip().lower()
+        if asyncJob:
+            return asyncJob == "true"
+        return str(getSiteInstance(ConfigInfo, self.__siteId).get("SITE_MSGMODULE_ASYNC_SUBMIT", "false")).lower() == "true"
+
+    def __getJobRunner(self):
+        """JobRunner of the site with the handlers of the messaging application, queued jobs resumed on first use"""
+
+        def build():
+            runner = getJobRunner(self.__siteId)
+            runner.resumeQueued()
+            return runner
+
+        return getSiteValue(self.__siteId, "messaging_job_runner", build)
+
+    def __submitMsgJob(self, msgObj, idempotencyKey):
+        """Queue the processing of a submitted message as a background job (or, for a submission which is only to be made
+        idempotent, run it as a job in this process). The request is passed on to the job without the uploads, which have
+        already been copied to the session directory.
+
+        :Returns: dictionary of the response items -- for a job which has finished, those of _completeMsg() -- with
+                  job_id and job_status
+
+        :Raises: ValueError if the idempotency key was already used for another submission
+        """
+        bAsync = self.__isAsyncSubmit()
+        # the file references, including the uploaded files, are taken from the request by the job
+        self.__reqObj.setValueList("msg_file_references", list(msgObj.getFileReferences()))
+        job = self.__getJobRunner().submit(
+            "submit_msg", {"request": self.__getSubmissionRequest()}, depositionId=msgObj.depositionId, idempotencyKey=idempotencyKey or None, wait=not bAsync
+        )
+        if self.__verbose:
+            logger.info("submission of %s as job %s, status %s", msgObj.depositionId, job["job_id"], job["status"])
+        return self.__getJobItems(job)
+
+    def __getSubmissionRequest(self):
+        """Request parameters passed on to the job of a submission (those with string values, not the uploads)"""
+        requestD = {}
+        for key, valueL in self.__reqObj.getDictionary().items():
+            if isinstance(valueL, list) and all(isinstance(value, str) for value in valueL):
+                requestD[key] = valueL
+        return requestD
+
+    @staticmethod
+    def __withoutUploads(requestD):
+        """Request parameters of a submission other than those describing its uploaded files (see __uploadFile())"""
+        retD = {key: valueL for key, valueL in requestD.items() if not re.match(r"auxFile(Name|Path|Type)\d$", key)}
+        retD["msg_file_references"] = [ref for ref in requestD.get("msg_file_references", []) if not ref.startswith("aux-file")]
+        return retD
+
+    def __getSubmittedJob(self, depId, idempotencyKey):
+        """Job of an earlier submission of a message for depId made with idempotencyKey, None if there is none
+
+        :Raises: ValueError if the idempotency key was used for another message
+        """
+        job = self.__getJobRunner().getJobByIdempotencyKey("submit_msg", idempotencyKey, depositionId=depId)
+        if job is None:
+            return None
+        # the request of the earlier submission also describes its uploads, staged to the session directory by then
+        if self.__withoutUploads(json.loads(job["payload"])["request"]) != self.__withoutUploads(self.__getSubmissionRequest()):
+            raise ValueError("Idempotency key %r was already used for a different submission (job %s)" % (idempotencyKey, job["job_id"]))
+        return job
+
+    def __getJobItems(self, job):
+        rtrnDict = {}
+        if job["status"] == "succeeded":
+            rtrnDict.update(job["result"])
+            self.__addDepUiPassword(rtrnDict, job["deposition_data_set_id"])
+        elif job["status"] == "failed":
+            rtrnDict["success"] = "false"
+            rtrnDict["append_msg"] = "Processing of the message failed: %s" % job["error"]
+        else:
+            # queued or running -- state of the job is polled with get_job_status
+            rtrnDict["success"] = "true"
+        rtrnDict["job_id"] = job["job_id"]
+        rtrnDict["job_status"] = job["status"]
+        return rtrnDict
+
+    def _getJobStatus(self):
+        """Status of a background job of a message submission
+
+        :Returns:
+            "job_id" and "job_status" (queued, running, succeeded or failed), and for a finished job the
+            response items of the submission
+        """
+        #
+        self.__getSession()
+        #
+        self.__reqObj.setReturnFormat(return_format="json")
+        rC = JsonResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        jobId = self.__reqObj.getValue("job_id")
+        depId = self.__reqObj.getValue("identifier")
+        job = self.__getJobRunner().getJob(jobId) if jobId else None
+        # only the jobs of the deposition of the session are disclosed
+        if job is None or not depId or depId not in self.__getJobDepIds(job):
+            rC.setError(errMsg="Unknown job %s" % jobId)
+            return rC
+        rC.addDictionaryItems(self.__getJobItems(job))
         return rC
 
+    @staticmethod
+    def __getJobDepIds(job):
+        """Depositions concerned by a job -- for a job of send_auto_msg, those the messages are sent to"""
+        if job["job_type"] == "auto_msg":
+            return json.loads(job["payload"])["depids"]
+        return [job["deposition_data_set_id"]]
+
+    def _sendAutoMsg(self):
+        """Send a message of a template type (e.g. a reminder) to each of a list of depositions, in a background job
+        (see AutoMessage.submitReminderBulk())
+
+        :Params:
+            "target_identifier": comma separated deposition ids
+            "msg_tmplt_type": template type (see AutoMessage.AUTO_MSG_TEMPLATES)
+            "idempotency_key": optional token of the submission -- a submission repeated with it is not run again
+
+        :Returns:
+            "job_id" and "job_status" of the job, polled with get_job_status for any of the depositions
+        """
+        #
+        self.__getSession()
+        #
+        self.__reqObj.setReturnFormat(return_format="json")
+        rC = JsonResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        depIdL = [depId.strip().upper() for depId in self.__reqObj.getValue("target_identifier").split(",") if depId.strip()]
+        tmpltType = self.__reqObj.getValue("msg_tmplt_type").strip()
+        idempotencyKey = self.__reqObj.getValue("idempotency_key").strip()
+        if not depIdL:
+            rC.setError(errMsg="No depositions given")
+            return rC
+        try:
+            jobId = AutoMessage(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh).submitReminderBulk(depIdL, tmpltType, idempotencyKey=idempotencyKey or None)
+        except ValueError as e:
+            logger.warning("auto message %s for %s refused: %s", tmpltType, depIdL, e)
+            rC.setError(errMsg=str(e))
+            return rC
+        if self.__verbose:
+            logger.info("auto message %s for %d depositions submitted as job %s", tmpltType, len(depIdL), jobId)
+        rC.addDictionaryItems(self.__getJobItems(self.__getJobRunner().getJob(jobId)))
+        return rC
+
+    def __addDepUiPassword(self, rtrnDict, depId):
+        """Add the deposition UI password of depId to the response items of a submission which updated the model file"""
+        if rtrnDict.get("pdbx_model_updated") == "true":
+            rtrnDict["depid_pw"] = self.__getDepUiPassword(depId)
+
+    def __getDepUiPassword(self, depId):
+        """Deposition UI password of depId -- the workflow engine stack is only loaded by the requests needing it"""
+        from wwpdb.utils.wf.dbapi.WfDbApi import WfDbApi  # pylint: disable=import-outside-toplevel
+        from wwpdb.apps.wf_engine.engine.WFEapplications import getdepUIPassword  # pylint: disable=import-outside-toplevel
+
+        wfApi = WfDbApi(verbose=True)
+        return getdepUIPassword(wfApi, depId)
+
     def _getDepUiPwd(self):
         """
         :Helpers:
@@ -1505,11 +1855,9 @@ class MessagingWebAppWorker(object):
         rtrnDict = {}
         #
         self.__reqObj.setReturnFormat(return_format="json")
-        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        rC = JsonResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
         #
-        wfApi = WfDbApi(verbose=True)
-        pw = getdepUIPassword(wfApi, depId)
-        rtrnDict["depui_pwd"] = pw
+        rtrnDict["depui_pwd"] = self.__getDepUiPassword(depId)
 
         rC.addDictionaryItems(rtrnDict)
         #
@@ -1525,6 +1873,16 @@ class MessagingWebAppWorker(object):
         else:
             return unescape(p_content.decode("utf-8"))
 
+    def __getIntValue(self, p_paramName, p_default):
+        """Integer value of request parameter p_paramName (e.g. DataTables paging parameters), p_default if missing or not a number"""
+        sValue = self.__reqObj.getValue(p_paramName)
+        try:
+            return int(sValue)
+        except (TypeError, ValueError):
+            if sValue:
+                logger.warning("Ignoring invalid value %r of request parameter %s", sValue, p_paramName)
+            return p_default
+
     def __encodeForSearching(self, p_content):
         ##################################################################
         # we need to accommodate any search filtering taking place
@@ -1568,7 +1926,7 @@ class MessagingWebAppWorker(object):
             logger.info(" -- dep_id is:%s", depId)
         #
         self.__reqObj.setReturnFormat(return_format="json")
-        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        rC = JsonResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
         #
         actionReqd = "Y" if (actionReqd is None or len(actionReqd) < 1) else actionReqd
         forReleaseFlg = "N" if (forReleaseFlg is None or len(forReleaseFlg) < 1) else forReleaseFlg
@@ -1611,7 +1969,7 @@ class MessagingWebAppWorker(object):
             logger.info(" -- forReleaseFlg is:%s", forReleaseFlg)
         #
         self.__reqObj.setReturnFormat(return_format="json")
-        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        rC = JsonResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
         #
         msgingIo = MessagingIo(self.__reqObj, self.__verbose, self.__lfh)
         msgStatusDict = {"message_id": msgId, "deposition_data_set_id": depId, "read_status": readStatusFlg, "action_reqd": actionReqdFlg, "for_release": forReleaseFlg}
@@ -1626,6 +1984,79 @@ class MessagingWebAppWorker(object):
 
         return rC
 
+    def _bulkUpdateMsgStatus(self):
+        """Apply status changes to many messages of a deposition in one request
+
+        :Helpers:
+            "status_changes" request parameter holds a JSON list of objects, each with "message_id"
+            (or "msg_id") and any of "read_status", "action_reqd", "for_release"
+
+        :Returns:
+            "success" and "results", the outcome per message ID ("created", "updated", "unchanged",
+            "invalid", "not_found" or "failed")
+
+        """
+        #
+        self.__getSession()
+        depId = self.__reqObj.getValue("identifier")
+        statusChanges = self.__reqObj.getValue("status_changes")
+        #
+        rtrnDict = {}
+        #
+        if self.__verbose:
+            logger.info(" -- dep_id is:%s", depId)
+        #
+        self.__reqObj.setReturnFormat(return_format="json")
+        rC = JsonResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        #
+        try:
+            changeList = json.loads(statusChanges) if statusChanges else []
+            if not isinstance(changeList, list):
+                raise ValueError("status_changes must be a list")
+        except ValueError as e:
+            logger.error("Invalid status_changes parameter: %s", e)
+            rC.setError(errMsg="Invalid status_changes parameter")
+            return rC
+        #
+        msgStatusDictList = []
+        for change in changeList:
+            if not isinstance(change, dict):
+                continue
+            msgStatusDict = {"message_id": change.get("message_id", change.get("msg_id")), "deposition_data_set_id": depId}
+            for flag in ("read_status", "action_reqd", "for_release"):
+                if change.get(flag):
+                    msgStatusDict[flag] = change[flag]
+            msgStatusDictList.append(msgStatusDict)
+        #
+        msgingIo = MessagingIo(self.__reqObj, self.__verbose, self.__lfh)
+        outcomeD = msgingIo.bulkUpdateMsgStatus(msgStatusDictList)
+        #
+        bOk = all(outcome in ("created", "updated", "unchanged") for outcome in outcomeD.values())
+        rtrnDict["success"] = "true" if bOk else "false"
+        rtrnDict["results"] = outcomeD
+
+        rC.addDictionaryItems(rtrnDict)
+
+        return rC
+
+    def _getCacheStats(self):
+        """Report usage of the in-process message list caches
+
+        :Returns:
+            "cache_stats", per cache the number of entries, estimated characters held, hits and misses
+            (and for the result set cache, expirations and hit ratio)
+
+        """
+        #
+        self.__getSession()
+        #
+        self.__reqObj.setReturnFormat(return_format="json")
+        rC = JsonResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        #
+        rC.addDictionaryItems({"cache_stats": MessagingIo.getCacheStats()})
+
+        return rC
+
     # Not implemened in backend code
     # def _deleteRowOp(self):
     #     #
@@ -1645,7 +2076,7 @@ class MessagingWebAppWorker(object):
     #         logger.info("dep_id is:%s", depId)
     #     #
     #     self.__reqObj.setReturnFormat("json")
-    #     rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+    #     rC = JsonResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
     #     #
     #     msgingIo = MessagingIo(self.__reqObj, self.__verbose, self.__lfh)
     #     if self.__debug:
@@ -1803,7 +2234,7 @@ class MessagingWebAppWorker(object):
         #
         self.__reqObj.setReturnFormat("json")
         #
-        rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        rC = JsonResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
         #
         # Update WF status database and persist chem comp assignment states -- ONLY if lig module was running in context of wf-engine
         #
@@ -1965,6 +2396,30 @@ class MessagingWebAppWorker(object):
             logger.debug("+MessagingWebApp.__isFileUpload() - file upload is found to be True")
         return True
 
+    def __newConditionalResponse(self, p_msgingIo, p_extra=None):
+        """Response content for the current request, tagged with an entity tag computed from the request
+        and the data version of the deposition's messages (see MessagingIo.getDataVersion()).
+
+        If the request carries a matching If-None-Match header the response is set to 304 Not Modified,
+        and callers return it as is without doing any other work.
+
+        :param `p_msgingIo`:    MessagingIo instance for the deposition
+        :param `p_extra`:       any other state the response depends on
+
+        :Returns: ConditionalResponseContent object
+        """
+        rC = ConditionalResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        dataVersion = p_msgingIo.getDataVersion()
+        if dataVersion is None:
+            return rC
+        etag = makeEntityTag(self.__reqObj.getRequestPath(), self.__reqObj.getDictionary(), dataVersion, p_extra)
+        rC.setEntityTag(etag)
+        if matchesEntityTag(self.__reqObj.getValue("http_if_none_match"), etag):
+            if self.__verbose:
+                logger.info("-- %s not modified for %s", self.__reqObj.getRequestPath(), self.__reqObj.getValue("identifier"))
+            rC.setNotModified()
+        return rC
+
     def __getSession(self):
         """Join existing session or create new session as required."""
         #
@@ -2068,6 +2523,28 @@ class MessagingWebAppWorker(object):
             return False
 
 
+def runSubmitMsgJob(payload):
+    """Job handler (see util/JobRunner.py) processing a message submitted by MessagingWebAppWorker._processMsg()
+
+    :param `payload`:   {"request": parameter dictionary of the submission}
+
+    :Returns: dictionary of the response items of the submission
+
+    The site id is taken from the request of the submission and passed on explicitly, the environment of
+    the worker process is left alone.
+    """
+    reqObj = InputRequest(payload["request"], verbose=False, log=sys.stderr)
+    if not reqObj.getValue("WWPDB_SITE_ID"):
+        raise ValueError("No site id in the submitted request")
+    reqObj.setReturnFormat(return_format="json")
+    msgObj = Message.fromReqObj(reqObj, False, sys.stderr)
+    worker = MessagingWebAppWorker(reqObj=reqObj, verbose=False, log=sys.stderr)
+    return worker._completeMsg(msgObj)  # pylint: disable=protected-access
+
+
+registerJobHandler("submit_msg", runSubmitMsgJob)
+
+
 class RedirectDevice:
     def write(self, s):
         pass
@@ -22,7 +22,9 @@ import logging
 
 from webob import Request, Response
 from wwpdb.apps.msgmodule.webapp.MessagingWebApp import MessagingWebApp
-from wwpdb.utils.config.ConfigInfo import getSiteId
+from wwpdb.apps.msgmodule.webapp.ResponseEncoding import SUPPORTED_ENCODINGS, encodeJsonResponse
+from wwpdb.apps.msgmodule.util.SiteRegistry import getSiteInstance, getSiteValue
+from wwpdb.utils.config.ConfigInfo import ConfigInfo, getSiteId
 
 # Create logger
 FORMAT = "[%(levelname)s]-%(module)s.%(funcName)s: %(message)s"
@@ -49,6 +51,26 @@ class MyRequestApp(object):
         self.__verbose = verbose
         self.__lfh = log
 
+    def __getEncodingSettings(self, siteId):
+        """Response encoding settings of the site, read once per process (see SiteRegistry):
+
+        SITE_MSGMODULE_RESPONSE_COMPRESSION -- comma separated content codings offered (gzip, deflate), or "none" (default "gzip,deflate")
+        SITE_MSGMODULE_RESPONSE_COMPRESSION_MIN_BYTES -- smallest response body compressed (default 2048)
+        SITE_MSGMODULE_RESPONSE_COMPRESSION_LEVEL -- zlib compression level (default 1)
+        SITE_MSGMODULE_FAST_JSON -- serialize JSON with orjson when installed, "true" or "false" (default "true")
+        """
+        return getSiteValue(siteId, "response_encoding", lambda: self.__readEncodingSettings(siteId))
+
+    def __readEncodingSettings(self, siteId):
+        cI = getSiteInstance(ConfigInfo, siteId)
+        codings = str(cI.get("SITE_MSGMODULE_RESPONSE_COMPRESSION", ",".join(SUPPORTED_ENCODINGS))).lower()
+        return {
+            "encodings": tuple(enc.strip() for enc in codings.split(",") if enc.strip() in SUPPORTED_ENCODINGS),
+            "minCompressSize": int(cI.get("SITE_MSGMODULE_RESPONSE_COMPRESSION_MIN_BYTES", 2048)),
+            "level": int(cI.get("SITE_MSGMODULE_RESPONSE_COMPRESSION_LEVEL", 1)),
+            "useFastSerializer": str(cI.get("SITE_MSGMODULE_FAST_JSON", "true")).lower() != "false",
+        }
+
     def __dumpEnv(self, request):
         outL = []
         # outL.append('<pre align="left">')
@@ -90,6 +112,12 @@ class MyRequestApp(object):
                 myParameterDict[name].append(value)
                 self.__lfh.write("+MyRequestApp.__call__() - REQUEST parameter:    %s:  %r\n" % (name, value))
             myParameterDict["request_path"] = [myRequest.path.lower()]
+            if myRequest.range is not None:
+                # byte range requests are honoured when streaming referenced files
+                myParameterDict["http_range"] = [myRequest.headers.get("Range")]
+            if myRequest.if_none_match:
+                # polled services answer with 304 Not Modified when the client's copy is current
+                myParameterDict["http_if_none_match"] = [myRequest.headers.get("If-None-Match")]
         except:  # noqa: E722 pylint: disable=bare-except
             traceback.print_exc(file=self.__lfh)
             self.__lfh.write("+MyRequestApp.__call__() - contents of request data\n")
@@ -106,10 +134,25 @@ class MyRequestApp(object):
         #   Application receives path and parameter info only!
         ###
         msgmodule = MessagingWebApp(parameterDict=myParameterDict, verbose=self.__verbose, log=self.__lfh, siteId=siteId)
-        rspD = msgmodule.doOp()
+        rspD = msgmodule.doOp(deferJsonEncoding=True)
         myResponse.content_type = rspD["CONTENT_TYPE"]
-
-        if sys.version_info[0] > 2:
+        if "STATUS" in rspD:
+            myResponse.status = rspD["STATUS"]
+
+        if "JSON_OBJECT" in rspD:
+            encoding, bodyIter, contentLength = encodeJsonResponse(
+                rspD["JSON_OBJECT"], acceptEncoding=myRequest.headers.get("Accept-Encoding"), **self.__getEncodingSettings(siteId)
+            )
+            myResponse.charset = "utf-8"
+            myResponse.app_iter = bodyIter
+            if contentLength is not None:
+                myResponse.content_length = contentLength
+            if encoding:
+                myResponse.content_encoding = encoding
+            myResponse.vary = ("Accept-Encoding",)
+        elif "FILE_ITERATOR" in rspD:
+            myResponse.app_iter = rspD["FILE_ITERATOR"]
+        elif sys.version_info[0] > 2:
             if isinstance(rspD["RETURN_STRING"], str):
                 myResponse.text = rspD["RETURN_STRING"]
             else:
@@ -117,6 +160,13 @@ class MyRequestApp(object):
         else:
             myResponse.body = rspD["RETURN_STRING"]
 
+        if rspD.get("DISPOSITION"):
+            myResponse.content_disposition = rspD["DISPOSITION"]
+        if rspD.get("ENCODING"):
+            myResponse.content_encoding = rspD["ENCODING"]
+        for name, value in rspD.get("HEADERS", {}).items():
+            myResponse.headers[name] = value
+
         ####
         ###
         return myResponse(environment, responseApplication)
@@ -396,6 +396,46 @@ class TestMessagingIoPersistence(unittest.TestCase):
 
         print("   ✅ Status persistence verified: message correctly appears in read list and tagMsg succeeded")
 
+    def test_bulk_status_update_persistence(self):
+        """Apply several status changes in one bulk update and verify the per-message outcomes."""
+        print("\n📊 Testing bulk message status update...")
+
+        io = self._new_io()
+        message_ids = []
+        for i in range(3):
+            req_for_msg = self._Req(
+                self.site_id, self.dep_id,
+                sender="status@test.com",
+                subject="BULK STATUS TEST %d" % i,
+                message_text=f"Message for bulk status testing: {datetime.utcnow().isoformat()}Z",
+            )
+            msg_obj = self.Message.fromReqObj(req_for_msg, verbose=True)
+            write_res = io.processMsg(msg_obj)
+            self.assertTrue(write_res[0] if isinstance(write_res, tuple) else bool(write_res), "Message should be written successfully")
+            message_ids.append(msg_obj.messageId)
+
+        changes = [{"message_id": msg_id, "read_status": "Y", "action_reqd": "N"} for msg_id in message_ids]
+        changes.append({"message_id": message_ids[0], "for_release": "Y"})
+        changes.append({"message_id": "NO_SUCH_MESSAGE", "read_status": "Y"})
+        changes.append({"message_id": message_ids[1], "read_status": "X"})
+        outcomes = io.bulkUpdateMsgStatus(changes)
+        print(f"   📋 Bulk update outcomes: {outcomes}")
+
+        self.assertIn(outcomes[message_ids[0]], ("created", "updated"))
+        self.assertEqual(outcomes[message_ids[1]], "invalid")
+        self.assertIn(outcomes[message_ids[2]], ("created", "updated"))
+        self.assertEqual(outcomes["NO_SUCH_MESSAGE"], "not_found")
+
+        io = self._new_io()
+        read_list = io.getMsgReadList(self.dep_id)
+        self.assertIn(message_ids[0], read_list)
+        self.assertIn(message_ids[2], read_list)
+        self.assertIn(message_ids[0], io.getMsgForReleaseList(self.dep_id))
+
+        # repeating the same changes writes nothing
+        outcomes = io.bulkUpdateMsgStatus([{"message_id": message_ids[2], "read_status": "Y", "action_reqd": "N"}])
+        self.assertEqual(outcomes, {message_ids[2]: "unchanged"})
+
     def test_list_recent_test_messages(self):
         """List all recent test messages to verify persistence via API."""
         print("\n📋 Listing recent test messages via API...")
@@ -0,0 +1,86 @@
+##
+# File:    ArchiveFileResponseTests.py
+# Date:    18-Oct-2026
+##
+"""Test cases for serving referenced files directly from the archive"""
+
+import os
+import sys
+import unittest
+
+if __package__ is None or __package__ == "":
+    from os import path
+
+    sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT  # noqa: F401
+
+from wwpdb.apps.msgmodule.webapp.ArchiveFileResponse import ArchiveFileResponse, parseByteRange
+
+
+class ArchiveFileResponseTests(unittest.TestCase):
+    def setUp(self):
+        self.__filePath = os.path.join(TESTOUTPUT, "D_000000_model-review_P1.cif.V1")
+        self.__content = b"".join(b"%04d\n" % i for i in range(1000))
+        with open(self.__filePath, "wb") as ofh:
+            ofh.write(self.__content)
+
+    def tearDown(self):
+        os.remove(self.__filePath)
+
+    def testParseByteRange(self):
+        self.assertIsNone(parseByteRange(None, 100))
+        self.assertIsNone(parseByteRange("items=0-10", 100))
+        self.assertIsNone(parseByteRange("bytes=0-10,20-30", 100))
+        self.assertIsNone(parseByteRange("bytes=abc", 100))
+        self.assertEqual(parseByteRange("bytes=0-9", 100), (0, 9))
+        self.assertEqual(parseByteRange("bytes=90-", 100), (90, 99))
+        self.assertEqual(parseByteRange("bytes=90-500", 100), (90, 99))
+        self.assertEqual(parseByteRange("bytes=-10", 100), (90, 99))
+        self.assertEqual(parseByteRange("bytes=-500", 100), (0, 99))
+        self.assertRaises(ValueError, parseByteRange, "bytes=100-", 100)
+
+    def testStreamWholeFile(self):
+        rC = ArchiveFileResponse()
+        rC.setArchiveFile(self.__filePath)
+        rspD = rC.get()
+        self.assertEqual(rspD["STATUS"], "200 OK")
+        self.assertEqual(rspD["HEADERS"]["Content-Length"], str(len(self.__content)))
+        self.assertEqual(b"".join(rspD["FILE_ITERATOR"]), self.__content)
+
+    def testStreamRange(self):
+        rC = ArchiveFileResponse()
+        rC.setArchiveFile(self.__filePath, rangeHeader="bytes=10-19")
+        rspD = rC.get()
+        self.assertEqual(rspD["STATUS"], "206 Partial Content")
+        self.assertEqual(rspD["HEADERS"]["Content-Range"], "bytes 10-19/%d" % len(self.__content))
+        self.assertEqual(b"".join(rspD["FILE_ITERATOR"]), self.__content[10:20])
+
+    def testUnsatisfiableRange(self):
+        rC = ArchiveFileResponse()
+        rC.setArchiveFile(self.__filePath, rangeHeader="bytes=999999-")
+        rspD = rC.get()
+        self.assertEqual(rspD["STATUS"], "416 Range Not Satisfiable")
+        self.assertNotIn("FILE_ITERATOR", rspD)
+
+    def testSendFileOffload(self):
+        rC = ArchiveFileResponse()
+        rC.setArchiveFile(self.__filePath, sendFileMode="X-Sendfile")
+        rspD = rC.get()
+        self.assertEqual(rspD["HEADERS"]["X-Sendfile"], self.__filePath)
+        self.assertEqual(rspD["RETURN_STRING"], b"")
+        #
+        rC = ArchiveFileResponse()
+        rC.setArchiveFile(self.__filePath, sendFileMode="x-accel-redirect", accelRedirectRoot=TESTOUTPUT, accelRedirectPrefix="/protected/")
+        rspD = rC.get()
+        self.assertEqual(rspD["HEADERS"]["X-Accel-Redirect"], "/protected/D_000000_model-review_P1.cif.V1")
+
+    def testNotFound(self):
+        rC = ArchiveFileResponse()
+        rC.setNotFound()
+        self.assertEqual(rC.get()["STATUS"], "404 Not Found")
+
+
+if __name__ == "__main__":
+    unittest.main()
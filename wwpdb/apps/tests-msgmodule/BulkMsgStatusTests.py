@@ -0,0 +1,99 @@
+##
+# File:    BulkMsgStatusTests.py
+# Date:    18-Oct-2026
+##
+"""Test cases for the update_msg_status_bulk service (legacy cif message files)"""
+
+import json
+import os
+import shutil
+import sys
+import unittest
+from unittest.mock import patch
+
+if __package__ is None or __package__ == "":
+    from os import path
+
+    sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT, HERE, configInfo  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT, HERE, configInfo  # noqa: F401
+
+import wwpdb.apps.msgmodule.webapp.MessagingWebApp as MessagingWebAppModule  # noqa: E402
+from wwpdb.apps.msgmodule.io.CompatIo import PdbxMessageIo  # noqa: E402
+from wwpdb.apps.msgmodule.util import SiteRegistry  # noqa: E402
+
+# release request from the depositor, its status is removed from the test data
+_RELEASE_MSG_ID = "f3777fd5-a449-43df-b62f-bb9875029371"
+# message to the depositor with a status
+_TAGGED_MSG_ID = "c8b1ad66-57c8-4ff7-b22e-0cf78dd827ec"
+
+
+class BulkMsgStatusTests(unittest.TestCase):
+    def setUp(self):
+        self.__siteId = "WWPDB_DEPLOY_TEST"
+        self.__depId = "D_0000265933"
+        archivePath = os.path.join(TESTOUTPUT, "data", "archive", self.__depId)
+        if not os.path.exists(archivePath):
+            os.makedirs(archivePath)
+        testDataPath = os.path.join(HERE, "test_data")
+        for fileName in os.listdir(testDataPath):
+            if fileName.startswith(self.__depId + "_"):
+                shutil.copy(os.path.join(testDataPath, fileName), archivePath)
+        self.__msgsToDpstrFilePath = os.path.join(archivePath, self.__depId + "_messages-to-depositor_P1.cif.V1")
+        with open(self.__msgsToDpstrFilePath) as ifh:
+            lines = [line for line in ifh if not line.startswith(_RELEASE_MSG_ID + " ")]
+        with open(self.__msgsToDpstrFilePath, "w") as ofh:
+            ofh.writelines(lines)
+        self.__patchers = [
+            patch.object(MessagingWebAppModule, "StatusDbApi"),
+            patch.dict(
+                configInfo,
+                {
+                    "SITE_WEB_APPS_TOP_SESSIONS_PATH": os.path.join(TESTOUTPUT, "sessions"),
+                    "COMMUNICATION_RELEASE_MESSAGE_SUBJECTS": ["Re-upload files"],
+                    "COMMUNICATION_APPROVAL_WITHOUT_CHANGES_MESSAGE_SUBJECTS": [],
+                },
+            ),
+        ]
+        for patcher in self.__patchers:
+            patcher.start()
+        # no status database -- the deposition is not part of a group
+        MessagingWebAppModule.StatusDbApi.return_value.getGroupId.return_value = None
+        SiteRegistry.reload(self.__siteId)
+
+    def tearDown(self):
+        for patcher in self.__patchers:
+            patcher.stop()
+        SiteRegistry.reload(self.__siteId)
+
+    def __getStatusD(self):
+        mIIo = PdbxMessageIo(site_id=self.__siteId)
+        self.assertTrue(mIIo.read(self.__msgsToDpstrFilePath, deposition_id=self.__depId))
+        return dict((record["message_id"], record) for record in mIIo.getMsgStatusInfo())
+
+    def testBulkUpdate(self):
+        statusChanges = [
+            {"message_id": _RELEASE_MSG_ID, "read_status": "Y"},
+            {"message_id": _TAGGED_MSG_ID, "action_reqd": "N"},
+            {"message_id": "no-such-message", "read_status": "Y"},
+        ]
+        paramD = {
+            "request_path": ["/service/messaging/update_msg_status_bulk"],
+            "identifier": [self.__depId],
+            "filesource": ["archive"],
+            "status_changes": [json.dumps(statusChanges)],
+        }
+        rspD = MessagingWebAppModule.MessagingWebApp(parameterDict=paramD, siteId=self.__siteId).doOp(deferJsonEncoding=True)["JSON_OBJECT"]
+        self.assertEqual(rspD["results"], {_RELEASE_MSG_ID: "created", _TAGGED_MSG_ID: "updated", "no-such-message": "not_found"})
+        self.assertEqual(rspD["success"], "false")
+
+        statusD = self.__getStatusD()
+        self.assertNotIn("no-such-message", statusD)
+        self.assertEqual(statusD[_TAGGED_MSG_ID]["action_reqd"], "N")
+        # as when marking a single message read, the release request is flagged for release
+        self.assertEqual((statusD[_RELEASE_MSG_ID]["read_status"], statusD[_RELEASE_MSG_ID]["for_release"]), ("Y", "Y"))
+
+
+if __name__ == "__main__":
+    unittest.main()
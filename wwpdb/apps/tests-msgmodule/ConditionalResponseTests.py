@@ -0,0 +1,73 @@
+##
+# File:    ConditionalResponseTests.py
+# Date:    18-Oct-2026
+##
+"""Test cases for ETag / If-None-Match handling of polled services"""
+
+import sys
+import unittest
+
+if __package__ is None or __package__ == "":
+    from os import path
+
+    sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT  # noqa: F401
+
+from wwpdb.utils.session.WebRequest import InputRequest
+from wwpdb.apps.msgmodule.webapp.ConditionalResponse import ConditionalResponseContent, makeEntityTag, matchesEntityTag
+
+
+class ConditionalResponseTests(unittest.TestCase):
+    def setUp(self):
+        self.__paramD = {"identifier": ["D_000000"], "request_path": ["/service/messaging/check_global_msg_status"]}
+        self.__version = (3, 42, "2026-10-18 10:00:00", 2, 1, 0, 0, "2026-10-18 10:05:00")
+
+    def testMakeEntityTag(self):
+        path = "/service/messaging/check_global_msg_status"
+        etag = makeEntityTag(path, self.__paramD, self.__version)
+        # weak, as it validates every content coding of the response
+        self.assertTrue(etag.startswith('W/"') and etag.endswith('"'))
+        # parameters not affecting the content are ignored
+        otherD = dict(self.__paramD, _=["1760781234567"], sessionid=["abc"], http_if_none_match=[etag])
+        self.assertEqual(makeEntityTag(path, otherD, self.__version), etag)
+        # but everything else is not
+        self.assertNotEqual(makeEntityTag(path, dict(self.__paramD, identifier=["D_000001"]), self.__version), etag)
+        self.assertNotEqual(makeEntityTag(path, self.__paramD, self.__version[:-1] + ("2026-10-18 10:06:00",)), etag)
+        self.assertNotEqual(makeEntityTag(path, self.__paramD, self.__version, ["false"]), etag)
+        self.assertTrue(matchesEntityTag(etag, etag))
+        self.assertTrue(matchesEntityTag(etag[2:], etag))
+
+    def testMatchesEntityTag(self):
+        self.assertFalse(matchesEntityTag(None, '"abc"'))
+        self.assertFalse(matchesEntityTag('"abc"', None))
+        self.assertTrue(matchesEntityTag('"abc"', '"abc"'))
+        self.assertTrue(matchesEntityTag('"xyz", W/"abc"', '"abc"'))
+        self.assertTrue(matchesEntityTag("*", '"abc"'))
+        self.assertFalse(matchesEntityTag('"abcd"', '"abc"'))
+
+    def testResponse(self):
+        reqObj = InputRequest(self.__paramD)
+        reqObj.setReturnFormat(return_format="json")
+        rC = ConditionalResponseContent(reqObj=reqObj)
+        rC.setEntityTag('"abc"')
+        rC.addDictionaryItems({"all_msgs_read": "true"})
+        rD = rC.get()
+        self.assertIn("all_msgs_read", rD["RETURN_STRING"])
+        self.assertEqual(rD["HEADERS"], {"ETag": '"abc"', "Cache-Control": "no-cache", "Vary": "Accept-Encoding"})
+        self.assertNotIn("STATUS", rD)
+
+        rC.setNotModified()
+        self.assertTrue(rC.isNotModified())
+        rD = rC.get()
+        self.assertEqual((rD["STATUS"], rD["RETURN_STRING"], rD["HEADERS"]["ETag"]), ("304 Not Modified", "", '"abc"'))
+        self.assertEqual(rD["HEADERS"]["Vary"], "Accept-Encoding")
+
+        # untagged responses are passed through unchanged
+        rC = ConditionalResponseContent(reqObj=reqObj)
+        self.assertNotIn("HEADERS", rC.get())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+##
+# File:    DaInternalDbTests.py
+# Date:    18-Oct-2026
+##
+"""Test cases for DA_INTERNAL id verification and conversion, on a SQLite stand-in for DA_INTERNAL"""
+
+import os
+import sqlite3
+import sys
+import unittest
+
+if __package__ is None or __package__ == "":
+    from os import path
+
+    sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT  # noqa: F401
+
+from wwpdb.apps.msgmodule.util.DaInternalDb import DaInternalDb
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_data")
+
+
+class DaInternalDbTests(unittest.TestCase):
+    def setUp(self):
+        self.__conn = sqlite3.connect(":memory:")
+        with open(os.path.join(DATA_DIR, "da_internal.sql")) as ifh:
+            self.__conn.executescript(ifh.read())
+        self.__queries = []
+        self.__conn.set_trace_callback(self.__queries.append)
+        self.__db = DaInternalDb(connection=self.__conn, paramstyle="qmark")
+        DaInternalDb.clearCache()
+
+    def tearDown(self):
+        DaInternalDb.clearCache()
+        self.__conn.close()
+
+    def testSingleLookups(self):
+        self.assertTrue(self.__db.verifyDepId("D_1000000001"))
+        self.assertFalse(self.__db.verifyDepId("D_1000000009"))
+        self.assertTrue(self.__db.verifyPdbId("9XA2"))
+        self.assertEqual(self.__db.convertPdbIdToDepId("9XA2"), "D_1000000002")
+        self.assertEqual(self.__db.convertExtendedPdbIdToDepId("PDB_00009XA1"), "D_1000000001")
+        self.assertEqual(self.__db.convertEmdbIdToDepId("EMD-90003"), "D_1000000003")
+        self.assertFalse(self.__db.verifyEmdbId("EMD-99999"))
+        # no SQL injection through the id
+        self.assertFalse(self.__db.verifyDepId("x' or '1'='1"))
+
+    def testBatchLookups(self):
+        ids = ["EMD-90002", "EMD-90003", "EMD-99999", "EMD-90002"]
+        self.assertEqual(self.__db.convertEmdbIdsToDepIds(ids), {"EMD-90002": "D_1000000002", "EMD-90003": "D_1000000003", "EMD-99999": None})
+        self.assertEqual(len(self.__queries), 1)
+        self.assertEqual(self.__db.verifyDepIds(["D_1000000001", "D_1000000003", "D_1000000009"]),
+                         {"D_1000000001": True, "D_1000000003": True, "D_1000000009": False})
+        self.assertEqual(self.__db.convertPdbIdsToDepIds([]), {})
+        self.assertEqual(len(self.__queries), 2)
+
+    def testCache(self):
+        self.__db.convertPdbIdsToDepIds(["9XA1", "9XA9"])
+        # found mappings are cached for all instances, ids not found are looked up again
+        other = DaInternalDb(connection=self.__conn, paramstyle="qmark")
+        self.assertEqual(other.convertPdbIdsToDepIds(["9XA1"]), {"9XA1": "D_1000000001"})
+        self.assertEqual(len(self.__queries), 1)
+        self.assertEqual(other.convertPdbIdsToDepIds(["9XA1", "9XA9"]), {"9XA1": "D_1000000001", "9XA9": None})
+        self.assertEqual(len(self.__queries), 2)
+        self.assertEqual(DaInternalDb.getCacheStats()["entries"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
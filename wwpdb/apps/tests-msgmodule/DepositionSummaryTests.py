@@ -0,0 +1,151 @@
+##
+# File:    DepositionSummaryTests.py
+# Date:    18-Oct-2026
+##
+"""Test cases for the per-deposition message summary (SQLite)"""
+
+import sys
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+if __package__ is None or __package__ == "":
+    from os import path
+
+    sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT  # noqa: F401
+
+from sqlalchemy import text
+
+from wwpdb.apps.msgmodule.db import DepositionSummary
+from wwpdb.apps.msgmodule.db.DataAccessLayer import DataAccessLayer
+from wwpdb.apps.msgmodule.db.Models import Base, MessageFileReference, MessageInfo, MessageStatus
+
+
+class DepositionSummaryTests(unittest.TestCase):
+    def setUp(self):
+        self.__dal = DataAccessLayer({"url": "sqlite://"})
+        self.__dal.create_tables()
+        self.__depId = "D_8000000001"
+
+    def tearDown(self):
+        Base.metadata.drop_all(self.__dal.db_connection.engine)
+        self.__dal.close()
+
+    def __addMessage(self, msgId, contentType, timestamp, subject="Subject", **kwargs):
+        kwargs.setdefault("message_text", "Text")
+        kwargs.setdefault("sender", "annotator")
+        message = MessageInfo(
+            message_id=msgId, deposition_data_set_id=self.__depId, timestamp=datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S"),
+            message_subject=subject, content_type=contentType, **kwargs
+        )
+        self.assertTrue(self.__dal.create_message(message))
+
+    def testMaintainedOnWrite(self):
+        self.assertIsNone(self.__dal.get_deposition_summary(self.__depId))
+        self.__addMessage("TO-1", "messages-to-depositor", "2026-10-01 10:00:00", "Still awaiting feedback for D_8000000001")
+        self.__addMessage("TO-2", "messages-to-depositor", "2026-10-02 10:00:00", "System Unlocked")
+        self.__addMessage(
+            "TO-3", "messages-to-depositor", "2026-10-03 10:00:00", "Your processed files are ready for your review",
+            message_text="Some major issues were found"
+        )
+        self.assertTrue(self.__dal.create_file_reference(MessageFileReference(
+            message_id="TO-3", deposition_data_set_id=self.__depId, content_type="validation-report-annotate", content_format="pdf",
+        )))
+        self.__addMessage("TO-4", "messages-to-depositor", "2026-10-04 10:00:00", "Not sent", send_status="N")
+        self.__addMessage("FROM-1", "messages-from-depositor", "2026-10-05 10:00:00", sender="depositor")
+        self.__addMessage("FROM-2", "messages-from-depositor", "2026-10-06 10:00:00", sender="depositor")
+        self.__addMessage("NOTE-1", "notes-from-annotator", "2026-10-07 10:00:00", context_type="reminder", message_type="text")
+        self.__addMessage("NOTE-2", "notes-from-annotator", "2026-10-08 10:00:00", message_type="archive_manual")
+
+        summary = self.__dal.get_deposition_summary(self.__depId)
+        self.assertEqual(
+            {k: summary[k] for k in ("num_messages_to_depositor", "num_messages_from_depositor", "num_notes", "num_annotator_notes", "num_flagged_notes")},
+            {"num_messages_to_depositor": 4, "num_messages_from_depositor": 2, "num_notes": 2, "num_annotator_notes": 1, "num_flagged_notes": 0},
+        )
+        self.assertEqual((summary["num_unread"], summary["num_unactioned"], summary["num_for_release"], summary["num_without_status"]), (2, 2, 0, 2))
+        self.assertEqual(summary["last_sent_at"], datetime(2026, 10, 3, 10))
+        self.assertEqual(summary["last_received_at"], datetime(2026, 10, 6, 10))
+        self.assertEqual(summary["last_manual_reminder_at"], datetime(2026, 10, 1, 10))
+        self.assertEqual(summary["last_auto_reminder_at"], datetime(2026, 10, 7, 10))
+        self.assertEqual(summary["last_unlock_at"], datetime(2026, 10, 2, 10))
+        self.assertEqual((summary["last_validation_at"], summary["last_validation_major"]), (datetime(2026, 10, 3, 10), True))
+        self.assertIsNone(summary["last_release_notice_at"])
+
+        # status writes, single and bulk
+        self.assertTrue(self.__dal.create_or_update_status(MessageStatus(
+            message_id="FROM-1", deposition_data_set_id=self.__depId, read_status="Y", action_reqd="N", for_release="N"
+        )))
+        self.__dal.bulk_update_status(self.__depId, [{"message_id": "FROM-2", "read_status": "Y", "for_release": "Y"}])
+        summary = self.__dal.get_deposition_summary(self.__depId)
+        self.assertEqual((summary["num_unread"], summary["num_unactioned"], summary["num_for_release"], summary["num_without_status"]), (0, 0, 1, 0))
+
+        # validation letter with context type takes precedence
+        self.__addMessage("TO-5", "messages-to-depositor", "2026-09-01 10:00:00", "Validation", context_type="vldtn", context_value="no-major-issue")
+        summary = self.__dal.get_deposition_summary(self.__depId)
+        self.assertEqual((summary["last_validation_at"], summary["last_validation_major"]), (datetime(2026, 9, 1, 10), False))
+        self.assertEqual(self.__dal.check_deposition_summary(self.__depId), [])
+
+    def testRebuild(self):
+        self.__addMessage("TO-1", "messages-to-depositor", "2026-10-01 10:00:00")
+        self.__addMessage("FROM-1", "messages-from-depositor", "2026-10-05 10:00:00", sender="depositor")
+        self.assertEqual(self.__dal.rebuild_deposition_summary(self.__depId), False)
+
+        # changes made behind the data access layer
+        with self.__dal.db_connection.engine.begin() as conn:
+            conn.execute(text("UPDATE deposition_message_summary SET num_unread = 0"))
+            conn.execute(text("DELETE FROM pdbx_deposition_message_info WHERE message_id = 'TO-1'"))
+        problems = self.__dal.check_deposition_summary(self.__depId)
+        self.assertEqual(sorted(p.split(":")[0] for p in problems), ["last_sent_at", "num_messages_to_depositor", "num_unread"])
+        self.assertTrue(self.__dal.rebuild_deposition_summary(self.__depId, dry_run=True))
+        self.assertTrue(self.__dal.rebuild_deposition_summary(self.__depId))
+        self.assertEqual(self.__dal.check_deposition_summary(self.__depId), [])
+        self.assertEqual(self.__dal.get_deposition_summary(self.__depId)["num_unread"], 1)
+
+        with self.__dal.db_connection.engine.begin() as conn:
+            conn.execute(text("DELETE FROM pdbx_deposition_message_info"))
+        self.assertEqual(self.__dal.get_summary_deposition_ids(), [self.__depId])
+        self.assertTrue(self.__dal.rebuild_deposition_summary(self.__depId))
+        self.assertIsNone(self.__dal.get_deposition_summary(self.__depId))
+        self.assertEqual(self.__dal.get_summary_deposition_ids(), [])
+
+    def testDeferredRefresh(self):
+        with patch("wwpdb.apps.msgmodule.db.DataAccessLayer.refresh_deposition_summary", wraps=DepositionSummary.refresh_deposition_summary) as refresh:
+            with self.__dal.deferred_summary_refresh():
+                self.__addMessage("TO-1", "messages-to-depositor", "2026-10-01 10:00:00")
+                self.__addMessage("FROM-1", "messages-from-depositor", "2026-10-05 10:00:00", sender="depositor")
+                with self.__dal.deferred_summary_refresh():
+                    self.assertTrue(self.__dal.create_or_update_status(MessageStatus(
+                        message_id="FROM-1", deposition_data_set_id=self.__depId, read_status="Y", action_reqd="N", for_release="N"
+                    )))
+                self.assertIsNone(self.__dal.get_deposition_summary(self.__depId))
+            self.assertEqual(refresh.call_count, 1)
+        summary = self.__dal.get_deposition_summary(self.__depId)
+        self.assertEqual((summary["num_messages_to_depositor"], summary["num_messages_from_depositor"], summary["num_unread"]), (1, 1, 0))
+        self.assertEqual(self.__dal.check_deposition_summary(self.__depId), [])
+
+    def testSummaryTableCheckCached(self):
+        engine = self.__dal.db_connection.engine
+        with engine.begin() as conn:
+            conn.execute(text("DROP TABLE deposition_message_summary"))
+        DepositionSummary._summaryTableByEngine.pop(engine, None)  # pylint: disable=protected-access
+        self.__addMessage("TO-1", "messages-to-depositor", "2026-10-01 10:00:00")
+        self.assertIsNone(self.__dal.get_deposition_summary(self.__depId))
+
+        Base.metadata.create_all(engine)
+        with patch.object(DepositionSummary, "inspect", wraps=DepositionSummary.inspect) as inspect:
+            self.__addMessage("TO-2", "messages-to-depositor", "2026-10-02 10:00:00")
+            self.assertIsNone(self.__dal.get_deposition_summary(self.__depId))
+            self.assertEqual(inspect.call_count, 0)
+            # the missing table is looked up again once the recheck interval has passed
+            with patch.object(DepositionSummary, "_MISSING_TABLE_RECHECK_SECONDS", 0.0):
+                self.__addMessage("TO-3", "messages-to-depositor", "2026-10-03 10:00:00")
+            self.assertEqual(self.__dal.get_deposition_summary(self.__depId)["num_messages_to_depositor"], 3)
+            self.__addMessage("TO-4", "messages-to-depositor", "2026-10-04 10:00:00")
+            self.assertEqual(inspect.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
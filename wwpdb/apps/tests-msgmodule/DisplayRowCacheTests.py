@@ -0,0 +1,59 @@
+##
+# File:    DisplayRowCacheTests.py
+# Date:    18-Oct-2026
+##
+"""Test cases for the rendered message row cache"""
+
+import sys
+import unittest
+from datetime import datetime
+
+if __package__ is None or __package__ == "":
+    from os import path
+
+    sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT  # noqa: F401
+
+from wwpdb.apps.msgmodule.io.DisplayRowCache import DisplayRowCache
+from wwpdb.apps.msgmodule.models.MessageRecord import MessageRecord
+
+
+class DisplayRowCacheTests(unittest.TestCase):
+    def testKey(self):
+        rec = MessageRecord(message_id="MSG-1", timestamp="2026-10-18 10:00:00", updated_at=datetime(2026, 10, 18, 10, 0, 0))
+        key = DisplayRowCache.getKey(rec, ("UTC", "UTC"), False)
+        self.assertNotEqual(key, DisplayRowCache.getKey(rec, ("EST", "EDT"), False))
+        self.assertNotEqual(key, DisplayRowCache.getKey(rec, ("UTC", "UTC"), True))
+        rec.updated_at = datetime(2026, 10, 18, 11, 0, 0)
+        self.assertNotEqual(key, DisplayRowCache.getKey(rec, ("UTC", "UTC"), False))
+
+    def testGetPut(self):
+        cache = DisplayRowCache()
+        self.assertIsNone(cache.get("k"))
+        cache.put("k", ["a", "b"])
+        row = cache.get("k")
+        self.assertEqual(row, ["a", "b"])
+        row.append("c")
+        self.assertEqual(cache.get("k"), ["a", "b"])
+        self.assertEqual(cache.getStats(), {"entries": 1, "chars": 2, "hits": 2, "misses": 1})
+
+    def testBounds(self):
+        cache = DisplayRowCache(maxEntries=2, maxChars=10)
+        cache.put("k1", ["aaa"])
+        cache.put("k2", ["bbb"])
+        cache.get("k1")
+        cache.put("k3", ["ccc"])
+        # least recently used row evicted
+        self.assertIsNone(cache.get("k2"))
+        self.assertIsNotNone(cache.get("k1"))
+        cache.put("k4", ["d" * 8])
+        self.assertEqual(cache.getStats()["entries"], 1)
+        # rows larger than the character bound are not cached
+        cache.put("k5", ["e" * 11])
+        self.assertIsNone(cache.get("k5"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+##
+# File:    ExtractMessageCacheTests.py
+# Date:    18-Oct-2026
+##
+"""Test cases for the ExtractMessage message data cache"""
+
+import sys
+import time
+import unittest
+
+if __package__ is None or __package__ == "":
+    from os import path
+
+    sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT  # noqa: F401
+
+from wwpdb.apps.msgmodule.util.ExtractMessageCache import ExtractMessageCache
+
+
+class ExtractMessageCacheTests(unittest.TestCase):
+    def testGetPut(self):
+        cache = ExtractMessageCache()
+        value = [object()]
+        self.assertIsNone(cache.get("D_1", "msgs", ("f", 1, 10)))
+        cache.put("D_1", "msgs", ("f", 1, 10), value)
+        self.assertIs(cache.get("D_1", "msgs", ("f", 1, 10)), value)
+        self.assertIsNone(cache.get("D_1", "notes", ("f", 1, 10)))
+        stats = cache.getStats()
+        self.assertEqual((stats["entries"], stats["hits"], stats["misses"]), (1, 1, 2))
+        self.assertAlmostEqual(stats["hit_ratio"], 1.0 / 3)
+
+    def testDataVersion(self):
+        cache = ExtractMessageCache()
+        cache.put("D_1", "msgs", ("f", 1, 10), [1])
+        self.assertIsNone(cache.get("D_1", "msgs", ("f", 2, 12)))
+        self.assertEqual(cache.getStats()["invalidated"], 1)
+        self.assertIsNone(cache.get("D_1", "msgs", ("f", 1, 10)))
+
+        unvalidated = ExtractMessageCache(validate=False)
+        unvalidated.put("D_1", "msgs", None, [1])
+        self.assertEqual(unvalidated.get("D_1", "msgs", ("f", 2, 12)), [1])
+
+    def testExpiry(self):
+        cache = ExtractMessageCache(ttlSeconds=0.05)
+        cache.put("D_1", "msgs", 1, [1])
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("D_1", "msgs", 1))
+        self.assertEqual(cache.getStats()["expired"], 1)
+
+    def testBoundsAndInvalidate(self):
+        cache = ExtractMessageCache(maxEntries=2)
+        cache.put("D_1", "msgs", 1, [1])
+        cache.put("D_1", "notes", 1, [2])
+        cache.get("D_1", "msgs", 1)
+        cache.put("D_2", "msgs", 1, [3])
+        # least recently used entry evicted
+        self.assertIsNone(cache.get("D_1", "notes", 1))
+        self.assertEqual(cache.getStats()["entries"], 2)
+        cache.invalidate("D_1")
+        self.assertIsNone(cache.get("D_1", "msgs", 1))
+        self.assertEqual(cache.get("D_2", "msgs", 1), [3])
+        cache.clear()
+        self.assertEqual(cache.getStats()["entries"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -24,6 +24,7 @@ else:
     from .commonsetup import TESTOUTPUT  # noqa: F401
 
 from wwpdb.apps.msgmodule.util.ExtractMessage import ExtractMessage
+from wwpdb.apps.msgmodule.util.ExtractMessageCache import ExtractMessageCache
 
 
 DIR = os.path.dirname(os.path.abspath(__file__))
@@ -226,6 +227,34 @@ class TestExtractMessage(unittest.TestCase):
         dt_ref2 = self.exmsg.convertStrToDatetime('2023-10-25 21:51:35')
         self.assertEqual(rt2, dt_ref2)
 
+    def test_batch(self):
+        logger.info("test batch getters")
+        depids = ["D_9000265933", "D_9000277853", "D_0000265933", "D_9000265933"]
+        rt1 = self.exmsg.getLastSentMsgDatetimeBatch(depids, test_folder=DATA_DIR)
+        self.assertEqual(list(rt1), depids[:3])
+        for depid in depids[:3]:
+            self.assertEqual(rt1[depid], self.exmsg.getLastSentMsgDatetime(depid, test_folder=DATA_DIR))
+
+        rt2 = self.exmsg.getLastReceivedMsgDatetimeBatch(depids, test_folder=DATA_DIR)
+        self.assertEqual(rt2["D_9000265933"], self.exmsg.convertStrToDatetime("2022-12-18 07:30:00"))
+
+        rt3 = self.exmsg.getLastUnlockedBatch(depids, test_folder=DATA_DIR)
+        self.assertEqual(rt3["D_9000265933"], "2022-12-19 13:33:27")
+        self.assertFalse(rt3["D_9000277853"])
+        self.assertEqual(self.exmsg.getLastUnlockDatetimeBatch([], test_folder=DATA_DIR), {})
+
+    def test_cache(self):
+        logger.info("test message data cache")
+        cache = ExtractMessageCache()
+        exmsg = ExtractMessage(cache=cache)
+        rt1 = exmsg.getLastSentMsgDatetime("D_9000265933", test_folder=DATA_DIR)
+        rt2 = exmsg.getLastReceivedMsgDatetime("D_9000265933", test_folder=DATA_DIR)
+        # same message data read with another instance sharing the cache
+        self.assertEqual(ExtractMessage(cache=cache).getLastSentMsgDatetime("D_9000265933", test_folder=DATA_DIR), rt1)
+        self.assertEqual(exmsg.getLastReceivedMsgDatetime("D_9000265933", test_folder=DATA_DIR), rt2)
+        stats = cache.getStats()
+        self.assertEqual((stats["hits"], stats["entries"]), (2, 2))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,117 @@
+##
+# File:    FlockLockFileTests.py
+# Date:    18-Oct-2026
+##
+"""Test cases for flock based lock files"""
+
+import os
+import socket
+import sys
+import threading
+import time
+import unittest
+
+if __package__ is None or __package__ == "":
+    from os import path
+
+    sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT  # noqa: F401
+
+from wwpdb.apps.msgmodule.db.LockFile import FlockLockFile, LockFileTimeoutException
+
+
+class FlockLockFileTests(unittest.TestCase):
+    def setUp(self):
+        self.__filePath = os.path.join(TESTOUTPUT, "D_000000_messages-to-depositor_P1.cif.V1")
+        self.__lockPath = self.__filePath + ".lock"
+        if os.path.exists(self.__lockPath):
+            os.remove(self.__lockPath)
+
+    def tearDown(self):
+        for fPath in (self.__lockPath, FlockLockFile.getWaitFilePath(self.__filePath)):
+            if os.path.exists(fPath):
+                os.remove(fPath)
+
+    def testLockAndRelease(self):
+        with FlockLockFile(self.__filePath, timeoutSeconds=1):
+            with open(self.__lockPath) as ifh:
+                self.assertEqual(ifh.read().split(), [str(os.getpid()), socket.gethostname()])
+        self.assertFalse(os.path.exists(self.__lockPath))
+        # wait file is kept in the local lock directory, not next to the archive file
+        self.assertFalse(os.path.exists(self.__lockPath + ".wait"))
+        self.assertTrue(os.path.exists(FlockLockFile.getWaitFilePath(self.__filePath)))
+
+    def testTimeout(self):
+        with FlockLockFile(self.__filePath, timeoutSeconds=1):
+            startTime = time.time()
+            threadCount = threading.active_count()
+            self.assertRaises(LockFileTimeoutException, FlockLockFile(self.__filePath, timeoutSeconds=0.3).acquire)
+            self.assertLess(time.time() - startTime, 1.0)
+            # nothing is left waiting for the lock after the timeout
+            self.assertEqual(threading.active_count(), threadCount)
+
+    def testWaiterWokenOnRelease(self):
+        holder = FlockLockFile(self.__filePath, timeoutSeconds=1)
+        holder.acquire()
+        waits = []
+
+        def waiter():
+            startTime = time.time()
+            with FlockLockFile(self.__filePath, timeoutSeconds=5, retrySeconds=2):
+                waits.append(time.time() - startTime)
+
+        t = threading.Thread(target=waiter)
+        t.start()
+        time.sleep(0.2)
+        holder.release()
+        t.join()
+        # taken soon after release rather than after a retrySeconds sleep
+        self.assertLess(waits[0], 1.0)
+
+    def testStaleOwnerRecovered(self):
+        # lock file left behind by a crashed process holds an owner record but no flock
+        with open(self.__lockPath, "w") as ofh:
+            ofh.write("999999999 %s\n" % socket.gethostname())
+        with FlockLockFile(self.__filePath, timeoutSeconds=1):
+            pass
+        self.assertFalse(os.path.exists(self.__lockPath))
+
+    def testOtherHostRespected(self):
+        # flock gives no exclusion across hosts, so the lock file of another host is never taken over
+        with open(self.__lockPath, "w") as ofh:
+            ofh.write("%d other-%s\n" % (os.getpid(), socket.gethostname()))
+        self.assertRaises(LockFileTimeoutException, FlockLockFile(self.__filePath, timeoutSeconds=0.3, retrySeconds=0.05).acquire)
+        self.assertTrue(os.path.exists(self.__lockPath))
+        # ... unless older than an explicit lease
+        oldTime = time.time() - 7200
+        os.utime(self.__lockPath, (oldTime, oldTime))
+        with FlockLockFile(self.__filePath, timeoutSeconds=1, staleSeconds=3600):
+            pass
+        self.assertFalse(os.path.exists(self.__lockPath))
+
+    def testExclusiveLockFileRespected(self):
+        # empty lock file created by an O_EXCL style lock holder
+        open(self.__lockPath, "w").close()
+        self.assertRaises(LockFileTimeoutException, FlockLockFile(self.__filePath, timeoutSeconds=0.3, retrySeconds=0.05).acquire)
+        self.assertTrue(os.path.exists(self.__lockPath))
+
+    def testEmptyLockFileRecovered(self):
+        # empty lock file left by a holder which crashed before recording itself
+        open(self.__lockPath, "w").close()
+        oldTime = time.time() - 600
+        os.utime(self.__lockPath, (oldTime, oldTime))
+        with FlockLockFile(self.__filePath, timeoutSeconds=1, retrySeconds=0.05):
+            with open(self.__lockPath) as ifh:
+                self.assertEqual(ifh.read().split(), [str(os.getpid()), socket.gethostname()])
+        self.assertFalse(os.path.exists(self.__lockPath))
+        # ... after a configurable grace period
+        open(self.__lockPath, "w").close()
+        os.utime(self.__lockPath, (oldTime, oldTime))
+        self.assertRaises(LockFileTimeoutException, FlockLockFile(self.__filePath, timeoutSeconds=0.3, retrySeconds=0.05, emptyStaleSeconds=3600).acquire)
+        self.assertTrue(os.path.exists(self.__lockPath))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+##
+# File:    ImportTimeTests.py
+# Date:    18-Oct-2026
+##
+"""Import-time budget of the modules loaded on start of a WSGI worker or command line tool.
+
+Each module is imported in a fresh interpreter with "python -X importtime". The test fails when the
+cumulative import time exceeds its budget, or when one of the heavy modules only needed by a few
+requests (annotation tools, NMR utilities, workflow engine) is loaded on import. Budgets can be scaled
+for slow machines with the environment variable MSGMODULE_IMPORT_BUDGET_SCALE (e.g. 2.0).
+"""
+
+import os
+import re
+import subprocess
+import sys
+import unittest
+
+if __package__ is None or __package__ == "":
+    from os import path
+
+    sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT  # noqa: F401
+
+# module -> budget for its cumulative import time in milliseconds
+_BUDGETS_MS = {
+    "wwpdb.apps.msgmodule.webapp.MessagingWebApp": 1500,
+    "wwpdb.apps.msgmodule.io.MessagingIo": 1200,
+    "wwpdb.apps.msgmodule.util.ExtractMessage": 750,
+}
+# modules (and packages) which must only be loaded on first use
+_DEFERRED_MODULES = (
+    "wwpdb.utils.dp.RcsbDpUtility",
+    "wwpdb.utils.dp.DataFileAdapter",
+    "wwpdb.utils.nmr.NmrDpUtility",
+    "wwpdb.utils.wf.dbapi.dbAPI",
+    "wwpdb.utils.wf.dbapi.WfDbApi",
+    "wwpdb.apps.wf_engine",
+    "wwpdb.apps.msgmodule.io.EmHeaderUtils",
+    "mmcif_utils.trans.InstanceMapper",
+    "oslo_concurrency",
+)
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)\s*$")
+
+
+def parseImportTime(text):
+    """Parse the output of python -X importtime.
+
+    :Returns:
+        dictionary of module name -> (self time, cumulative time) in microseconds
+    """
+    timeD = {}
+    for line in text.splitlines():
+        m = _IMPORTTIME_RE.match(line)
+        if m:
+            timeD[m.group(4)] = (int(m.group(1)), int(m.group(2)))
+    return timeD
+
+
+class ImportTimeTests(unittest.TestCase):
+    def setUp(self):
+        self.__env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+        self.__scale = float(os.environ.get("MSGMODULE_IMPORT_BUDGET_SCALE", "1.0"))
+
+    def __importTime(self, module):
+        cmd = [sys.executable, "-X", "importtime", "-c", "import %s" % module]
+        # first run compiles and caches the byte code, second run is measured
+        for _i in range(2):
+            proc = subprocess.run(cmd, env=self.__env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, check=False)
+        if proc.returncode != 0:
+            errorLines = [line for line in proc.stderr.splitlines() if not line.startswith("import time:")]
+            if "ModuleNotFoundError" in proc.stderr:
+                self.skipTest("%s cannot be imported here: %s" % (module, errorLines[-1]))
+            self.fail("importing %s failed:\n%s" % (module, "\n".join(errorLines)))
+        return parseImportTime(proc.stderr)
+
+    def testParseImportTime(self):
+        text = "import time: self [us] | cumulative | imported package\nimport time:       120 |        120 |   zlib\nimport time:       350 |       1470 | gzip\n"
+        self.assertEqual(parseImportTime(text), {"zlib": (120, 120), "gzip": (350, 1470)})
+
+    def testImportBudget(self):
+        for module, budgetMs in sorted(_BUDGETS_MS.items()):
+            with self.subTest(module=module):
+                timeD = self.__importTime(module)
+                self.assertIn(module, timeD)
+                deferred = sorted(name for name in timeD for prefix in _DEFERRED_MODULES if name == prefix or name.startswith(prefix + "."))
+                self.assertEqual(deferred, [], "%s loads modules which should be imported on first use" % module)
+                cumulativeMs = timeD[module][1] / 1000.0
+                self.assertLessEqual(cumulativeMs, budgetMs * self.__scale, "import of %s took %.0f ms" % (module, cumulativeMs))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+##
+# File:    JobRunnerTests.py
+# Date:    18-Oct-2026
+##
+"""Test cases for background jobs of message submissions (job table and local runner)"""
+
+import os
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+if __package__ is None or __package__ == "":
+    from os import path
+
+    sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT  # noqa: F401
+
+from wwpdb.apps.msgmodule.db.DataAccessLayer import DataAccessLayer
+from wwpdb.apps.msgmodule.util.JobRunner import JobRunner, registerJobHandler
+
+_CALLS = []
+
+
+def _recordJob(payload):
+    _CALLS.append(payload)
+    return {"success": "true", "identifier": payload["identifier"]}
+
+
+def _failJob(payload):
+    raise RuntimeError("cannot send %s" % payload["identifier"])
+
+
+def _countJob(payload):
+    _CALLS.append(payload)
+    return {"depids": len(payload["depids"])}
+
+
+registerJobHandler("count", _countJob)
+
+
+class JobRunnerTests(unittest.TestCase):
+    def setUp(self):
+        # one database per test, in a directory of its own -- engines are cached per connection string
+        self.__tmpDir = tempfile.TemporaryDirectory()
+        self.__dbConfig = {"url": "sqlite:///%s" % os.path.join(self.__tmpDir.name, "jobs.sqlite")}
+        self.__executor = ThreadPoolExecutor(max_workers=2)
+        self.__runners = []
+        self.__runner = self.__newRunner()
+        self.__runner.registerHandler("fail", _failJob)
+        self.__dal = DataAccessLayer(self.__dbConfig)
+        self.__jobs = self.__dal.jobs
+        del _CALLS[:]
+
+    def tearDown(self):
+        for runner in self.__runners:
+            runner.shutdown()
+        self.__executor.shutdown(wait=True)
+        self.__dal.db_connection.engine.dispose()
+        self.__tmpDir.cleanup()
+
+    def __newRunner(self, **kwargs):
+        runner = JobRunner(self.__dbConfig, executor=self.__executor, **kwargs)
+        runner.registerHandler("submit_msg", _recordJob)
+        self.__runners.append(runner)
+        return runner
+
+    def testIdempotentSubmit(self):
+        job = self.__runner.submit("submit_msg", {"identifier": "D_000001"}, depositionId="D_000001", idempotencyKey="key-1")
+        self.__executor.shutdown(wait=True)
+        retried = self.__runner.submit("submit_msg", {"identifier": "D_000001"}, depositionId="D_000001", idempotencyKey="key-1")
+        self.assertEqual(retried["job_id"], job["job_id"])
+        self.assertEqual(retried["status"], "succeeded")
+        self.assertEqual(retried["result"], {"success": "true", "identifier": "D_000001"})
+        self.assertEqual(len(_CALLS), 1)
+
+    def testIdempotencyScope(self):
+        runner = self.__newRunner(background=False)
+        job = runner.submit("submit_msg", {"identifier": "D_000001", "message": "hello"}, depositionId="D_000001", idempotencyKey="key-1")
+        # the same key for another deposition is another submission
+        other = runner.submit("submit_msg", {"identifier": "D_000002", "message": "hello"}, depositionId="D_000002", idempotencyKey="key-1")
+        self.assertNotEqual(other["job_id"], job["job_id"])
+        self.assertEqual(len(_CALLS), 2)
+        # but reusing it for other parameters is refused
+        self.assertRaises(ValueError, runner.submit, "submit_msg", {"identifier": "D_000001", "message": "bye"}, depositionId="D_000001", idempotencyKey="key-1")
+        retried = runner.submit("submit_msg", {"message": "hello", "identifier": "D_000001"}, depositionId="D_000001", idempotencyKey="key-1")
+        self.assertEqual(retried["job_id"], job["job_id"])
+        self.assertEqual(len(_CALLS), 2)
+        # jobs without a deposition
+        job, created = self.__jobs.submit("submit_msg", "{}", idempotency_key="key-1")
+        self.assertTrue(created)
+        self.assertEqual(self.__jobs.submit("submit_msg", "{}", idempotency_key="key-1")[0]["job_id"], job["job_id"])
+
+    def testRegisteredJobHandler(self):
+        # handlers registered at module level are used by every runner
+        job = self.__newRunner().submit("count", {"depids": ["D_000007", "D_000008"]}, wait=True)
+        self.assertEqual((job["status"], job["result"]), ("succeeded", {"depids": 2}))
+
+    def testGetJobByIdempotencyKey(self):
+        runner = self.__newRunner(background=False)
+        self.assertIsNone(runner.getJobByIdempotencyKey("submit_msg", "key-1", depositionId="D_000001"))
+        job = runner.submit("submit_msg", {"identifier": "D_000001"}, depositionId="D_000001", idempotencyKey="key-1")
+        found = runner.getJobByIdempotencyKey("submit_msg", "key-1", depositionId="D_000001")
+        self.assertEqual((found["job_id"], found["result"]), (job["job_id"], {"success": "true", "identifier": "D_000001"}))
+        self.assertIsNone(runner.getJobByIdempotencyKey("submit_msg", "key-1", depositionId="D_000002"))
+        self.assertIsNone(runner.getJobByIdempotencyKey("count", "key-1", depositionId="D_000001"))
+
+    def testLocalStore(self):
+        # job tables not shared by the hosts of a site run every job within the submission
+        runner = self.__newRunner(background=False)
+        self.assertFalse(runner.isBackground())
+        job = runner.submit("submit_msg", {"identifier": "D_000006"})
+        self.assertEqual(job["status"], "succeeded")
+        self.assertEqual(_CALLS, [{"identifier": "D_000006"}])
+
+    def testClaimOnce(self):
+        job, created = self.__jobs.submit("submit_msg", "{}")
+        self.assertTrue(created)
+        self.assertTrue(self.__jobs.claim(job["job_id"]))
+        self.assertFalse(self.__jobs.claim(job["job_id"]))
+        self.assertTrue(self.__jobs.finish(job["job_id"], "succeeded", result="{}"))
+        self.assertFalse(self.__jobs.finish(job["job_id"], "failed"))
+        self.assertEqual(self.__jobs.get_job(job["job_id"])["status"], "succeeded")
+        self.assertRaises(ValueError, self.__jobs.finish, job["job_id"], "running")
+
+    def testWaitAndFailure(self):
+        job = self.__runner.submit("submit_msg", {"identifier": "D_000002"}, wait=True)
+        self.assertEqual(job["status"], "succeeded")
+        self.assertIsNotNone(job["finished_at"])
+        job = self.__runner.submit("fail", {"identifier": "D_000003"}, wait=True)
+        self.assertEqual(job["status"], "failed")
+        self.assertIn("cannot send D_000003", job["error"])
+        self.assertIsNone(self.__runner.getJob("no-such-job"))
+        self.assertRaises(ValueError, self.__runner.submit, "unknown", {})
+
+    def testResumeQueued(self):
+        queued, _created = self.__jobs.submit("submit_msg", '{"identifier": "D_000004"}')
+        running, _created = self.__jobs.submit("submit_msg", '{"identifier": "D_000005"}')
+        self.__jobs.claim(running["job_id"])
+        # as seen a day later, by a process started after the one which queued the jobs has gone
+        runner = self.__newRunner(interruptedAfter=-86400)
+        self.assertEqual(runner.resumeQueued(queuedBefore=-86400), (1, 1))
+        self.__executor.shutdown(wait=True)
+        self.assertEqual(runner.getJob(queued["job_id"])["status"], "succeeded")
+        self.assertEqual(runner.getJob(running["job_id"])["status"], "failed")
+        self.assertEqual(_CALLS, [{"identifier": "D_000004"}])
+        self.assertEqual(self.__jobs.get_queued_ids(datetime.now() + timedelta(days=1)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
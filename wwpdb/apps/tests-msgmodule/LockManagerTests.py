@@ -0,0 +1,119 @@
+##
+# File:    LockManagerTests.py
+# Date:    18-Oct-2026
+##
+"""Test cases for database-native deposition locks (lease table backend)"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+if __package__ is None or __package__ == "":
+    from os import path
+
+    sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT  # noqa: F401
+
+from sqlalchemy import create_engine
+
+from wwpdb.apps.msgmodule.db.LockFile import LockFile, LockFileTimeoutException
+from wwpdb.apps.msgmodule.db.LockManager import DbLock, LockManager, getLockStats, resetLockStats
+
+
+class LockManagerTests(unittest.TestCase):
+    def setUp(self):
+        self.__dbPath = os.path.join(TESTOUTPUT, "lock-manager-test.sqlite")
+        if os.path.exists(self.__dbPath):
+            os.remove(self.__dbPath)
+        self.__engine = create_engine("sqlite:///%s" % self.__dbPath)
+        self.__lm = LockManager(self.__engine)
+        resetLockStats()
+
+    def tearDown(self):
+        self.__engine.dispose()
+        os.remove(self.__dbPath)
+
+    def testReentrant(self):
+        with self.__lm.getDepositionLock("D_000000", timeoutSeconds=1):
+            with self.__lm.getDepositionLock("D_000000", timeoutSeconds=1):
+                pass
+            # still held by this thread after the nested block exits
+            self.assertTrue(self.__heldElsewhere("D_000000"))
+        self.assertFalse(self.__heldElsewhere("D_000000"))
+        stats = getLockStats()
+        self.assertEqual((stats["acquired"], stats["timeouts"]), (2, 1))
+
+    def testContention(self):
+        with self.__lm.getDepositionLock("D_000001", timeoutSeconds=1):
+            self.assertTrue(self.__heldElsewhere("D_000001"))
+            self.assertFalse(self.__heldElsewhere("D_000002"))
+        self.assertEqual(getLockStats()["timeouts"], 1)
+
+    def testExpiredLeaseReclaimed(self):
+        stale = DbLock(self.__engine, "msgmodule:D_000003", timeoutSeconds=1, leaseSeconds=-1)
+        stale.acquire()
+        # lease has already expired, so another thread may take the lock
+        self.assertFalse(self.__heldElsewhere("D_000003"))
+        stale.release()
+
+    def testReentrantReleasedOutOfOrder(self):
+        outer = self.__lm.getDepositionLock("D_000005", timeoutSeconds=1)
+        inner = self.__lm.getDepositionLock("D_000005", timeoutSeconds=1)
+        outer.acquire()
+        inner.acquire()
+        outer.release()
+        self.assertTrue(self.__heldElsewhere("D_000005"))
+        # the last release gives up the lock taken by the outer instance
+        inner.release()
+        self.assertFalse(self.__heldElsewhere("D_000005"))
+
+    def testLeaseRenewed(self):
+        with DbLock(self.__engine, "msgmodule:D_000006", timeoutSeconds=1, leaseSeconds=0.3):
+            time.sleep(0.6)
+            self.assertTrue(self.__heldElsewhere("D_000006"))
+        self.assertFalse(self.__heldElsewhere("D_000006"))
+        self.assertEqual([t for t in threading.enumerate() if t.name.startswith("lease-renewal:")], [])
+
+    def testMysqlReleaseFailureDiscardsConnection(self):
+        engine = MagicMock()
+        engine.dialect.name = "mysql"
+        conn = engine.connect.return_value
+        conn.execute.return_value.scalar.side_effect = [1, Exception("lost connection")]
+        with DbLock(engine, "msgmodule:D_000007", timeoutSeconds=1):
+            pass
+        # not returned to the pool with the user lock possibly still held
+        conn.invalidate.assert_called_once_with()
+        conn.close.assert_called_once_with()
+
+    def testUrlOnlyConfig(self):
+        # the lock backend follows the engine dialect -- a url-only configuration (no host) still locks
+        dbConfig = {"url": "sqlite:///%s" % self.__dbPath}
+        with patch("wwpdb.apps.msgmodule.db.PdbxMessageIo.get_db_config", return_value=dbConfig):
+            with LockFile("/dummy/messaging/D_000004/D_000004_messages-to-depositor_P1.cif.V1", timeoutSeconds=1, site_id="WWPDB_DEPLOY_TEST"):
+                self.assertTrue(self.__heldElsewhere("D_000004"))
+        self.assertFalse(self.__heldElsewhere("D_000004"))
+
+    def __heldElsewhere(self, depId):
+        """True if another thread times out trying to take the deposition lock"""
+        result = []
+
+        def tryLock():
+            try:
+                with self.__lm.getDepositionLock(depId, timeoutSeconds=0.3, retrySeconds=0.05):
+                    result.append(False)
+            except LockFileTimeoutException:
+                result.append(True)
+
+        t = threading.Thread(target=tryLock)
+        t.start()
+        t.join()
+        return result[0]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+##
+# File:    MessageRecordTests.py
+# Date:    18-Oct-2026
+##
+"""Test cases for typed message records"""
+
+import sys
+import unittest
+from datetime import datetime, timezone
+
+if __package__ is None or __package__ == "":
+    from os import path
+
+    sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT  # noqa: F401
+
+from wwpdb.apps.msgmodule.models.MessageRecord import ContentType, MessageRecord, parseTimestamp
+
+
+class MessageRecordTests(unittest.TestCase):
+    def testParseTimestamp(self):
+        expected = datetime(2013, 8, 14, 15, 41, 52, tzinfo=timezone.utc)
+        self.assertEqual(parseTimestamp("2013-08-14 15:41:52"), expected)
+        self.assertEqual(parseTimestamp("14-Aug-2013 15:41:52"), expected)
+        self.assertEqual(parseTimestamp(datetime(2013, 8, 14, 15, 41, 52)), expected)
+        self.assertEqual(parseTimestamp("2013-08-14"), datetime(2013, 8, 14, tzinfo=timezone.utc))
+        self.assertIsNone(parseTimestamp("?"))
+        self.assertIsNone(parseTimestamp(None))
+
+    def testFromDict(self):
+        rec = MessageRecord.fromDict(
+            {
+                "ordinal_id": 1,
+                "message_id": "MSG-1",
+                "timestamp": "2013-08-14 15:41:52",
+                "parent_message_id": "MSG-1",
+                "message_type": "text",
+                "send_status": "N",
+                "content_type": "messages-to-depositor",
+            }
+        )
+        self.assertEqual(rec.timestamp.tzinfo, timezone.utc)
+        self.assertFalse(rec.isSent)
+        self.assertEqual(rec["send_status"], "N")
+        self.assertIs(rec.content_type, ContentType.MESSAGES_TO_DEPOSITOR)
+        self.assertEqual(rec["content_type"], "messages-to-depositor")
+        self.assertEqual(str(rec.content_type), "messages-to-depositor")
+        self.assertEqual(rec["parent_message_id"], "MSG-1")
+        self.assertRaises(KeyError, rec.__getitem__, "no_such_item")
+
+        self.assertEqual(rec["orig_sender"], "")
+        rec.origComm = {"message_id": "MSG-1", "orig_sender": "depositor@example.org"}
+        self.assertEqual(rec["orig_sender"], "depositor@example.org")
+
+        # unknown content types are kept as interned strings
+        self.assertEqual(MessageRecord.fromDict({"content_type": "other"}).content_type, "other")
+
+    def testSortKey(self):
+        recs = [MessageRecord(message_id=m, timestamp=ts) for m, ts in (("B", "2014-01-01 00:00:00"), ("C", "bad"), ("A", "2013-01-01 00:00:00"))]
+        recs.sort(key=lambda rec: rec.sortKey)
+        self.assertEqual([rec.message_id for rec in recs], ["C", "A", "B"])
+        self.assertEqual(recs[0].rawTimestamp, "bad")
+
+
+if __name__ == "__main__":
+    unittest.main()
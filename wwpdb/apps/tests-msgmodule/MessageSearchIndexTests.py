@@ -0,0 +1,62 @@
+##
+# File:    MessageSearchIndexTests.py
+# Date:    18-Oct-2026
+##
+"""Test cases for search indexes over rendered message rows"""
+
+import sys
+import unittest
+
+if __package__ is None or __package__ == "":
+    from os import path
+
+    sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT  # noqa: F401
+
+from wwpdb.apps.msgmodule.io.MessageSearchIndex import MessageSearchIndex, SearchIndexCache
+from wwpdb.apps.msgmodule.models.MessageRecord import MessageRecord
+
+
+class MessageSearchIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.__rows = [
+            [1, "MSG-1", "Coordinates &amp; structure factors", "Dear depositor,<br />please check", "annotator &lt;ann@example.org&gt;"],
+            [2, "MSG-2", "Release request", "Please release " + "the entry now. " * 200, "depositor"],
+            [3, "MSG-3", "Re: Release request", "Thanks", "annotator"],
+        ]
+
+    def testSearch(self):
+        for longRowChars in (None, 2000, 1):
+            index = MessageSearchIndex(self.__rows, longRowChars=longRowChars)
+            self.assertEqual(index.search("RELEASE"), [1, 2])
+            self.assertEqual(index.search("entry now"), [1])
+            # entity and line break markup decoded
+            self.assertEqual(index.search("& structure"), [0])
+            self.assertEqual(index.search("<ann@"), [0])
+            self.assertEqual(index.search("depositor,\nplease"), [0])
+            self.assertEqual(index.search("br"), [])
+            # no match across fields
+            self.assertEqual(index.search("factorsdear"), [])
+            self.assertEqual(index.search("no such text"), [])
+
+    def testSearchColumns(self):
+        index = MessageSearchIndex(self.__rows)
+        self.assertEqual(index.searchColumns({2: "release"}), [1, 2])
+        self.assertEqual(index.searchColumns({2: "release", 4: "annotator"}), [2])
+
+    def testCache(self):
+        cache = SearchIndexCache(maxEntries=2)
+        recs = [MessageRecord(message_id=row[1], timestamp="2026-10-18 10:00:00") for row in self.__rows]
+        fingerprint = cache.getFingerprint(recs)
+        index = cache.getIndex("D_1", "msgs", fingerprint, self.__rows)
+        self.assertIs(cache.getIndex("D_1", "msgs", fingerprint, self.__rows), index)
+        self.assertIsNot(cache.getIndex("D_1", "msgs", cache.getFingerprint(recs[:2]), self.__rows[:2]), index)
+        index = cache.getIndex("D_1", "msgs", fingerprint, self.__rows)
+        cache.invalidate("D_1")
+        self.assertIsNot(cache.getIndex("D_1", "msgs", fingerprint, self.__rows), index)
+
+
+if __name__ == "__main__":
+    unittest.main()
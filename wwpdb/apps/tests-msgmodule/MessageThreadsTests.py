@@ -0,0 +1,62 @@
+##
+# File:    MessageThreadsTests.py
+# Date:    18-Oct-2026
+##
+"""Test cases for the materialized message thread columns"""
+
+import sys
+import unittest
+from datetime import datetime
+
+if __package__ is None or __package__ == "":
+    from os import path
+
+    sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT  # noqa: F401
+
+from wwpdb.apps.msgmodule.db.MessageThreads import THREAD_PATH_MAX_LENGTH, child_thread_columns, compute_thread_columns, thread_segment
+
+
+def _row(ordinalId, msgId, parentId, timestamp):
+    return {"ordinal_id": ordinalId, "message_id": msgId, "parent_message_id": parentId, "timestamp": timestamp}
+
+
+class MessageThreadsTests(unittest.TestCase):
+    def testSegment(self):
+        self.assertEqual(thread_segment(datetime(2026, 10, 18, 9, 5, 1), 42), "202610180905010000000042")
+        self.assertEqual(thread_segment("2026-10-18 09:05:01", 42), "202610180905010000000042")
+        self.assertEqual(thread_segment(None, None), "0" * 24)
+
+    def testComputeColumns(self):
+        rows = [
+            _row(1, "A", "A", "2026-10-18 10:00:00"),
+            _row(2, "B", "A", "2026-10-18 11:00:00"),
+            _row(3, "C", "B", "2026-10-18 12:00:00"),
+            _row(4, "D", None, "2026-10-18 09:00:00"),
+            _row(5, "E", "NOT-IN-DEPOSITION", "2026-10-18 13:00:00"),
+            _row(6, "F", "G", "2026-10-18 14:00:00"),
+            _row(7, "G", "F", "2026-10-18 15:00:00"),
+        ]
+        columnD = compute_thread_columns(rows)
+        self.assertEqual([columnD[msgId][:2] for msgId in "ABCDE"], [("A", 0), ("A", 1), ("A", 2), ("D", 0), ("E", 0)])
+        self.assertEqual(columnD["C"][2], "/".join(thread_segment(row["timestamp"], row["ordinal_id"]) for row in rows[:3]))
+        # cycle broken, every message placed
+        self.assertEqual(sorted(columnD["F"][:2] + columnD["G"][:2], key=str), sorted(("G", 0, "G", 1), key=str))
+        # display order
+        order = sorted(columnD, key=lambda msgId: columnD[msgId][2])
+        self.assertEqual(order[:4], ["D", "A", "B", "C"])
+
+    def testMaxLength(self):
+        parent = ("A", 0, "x" * (THREAD_PATH_MAX_LENGTH - 10))
+        self.assertIsNone(child_thread_columns("B", "2026-10-18 10:00:00", 2, parent))
+        rows = [_row(i, "M%d" % i, "M%d" % (i - 1) if i else None, "2026-10-18 10:00:00") for i in range(30)]
+        columnD = compute_thread_columns(rows)
+        self.assertEqual(columnD["M19"][1], 19)
+        self.assertIsNone(columnD["M20"])
+        self.assertIsNone(columnD["M29"])
+
+
+if __name__ == "__main__":
+    unittest.main()
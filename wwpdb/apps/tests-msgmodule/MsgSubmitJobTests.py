@@ -0,0 +1,115 @@
+##
+# File:    MsgSubmitJobTests.py
+# Date:    18-Oct-2026
+##
+"""Test cases for message submissions run as jobs (idempotent retries, send_auto_msg)"""
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+if __package__ is None or __package__ == "":
+    from os import path
+
+    sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT, configInfo  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT, configInfo  # noqa: F401
+
+import wwpdb.apps.msgmodule.webapp.MessagingWebApp as MessagingWebAppModule  # noqa: E402
+from wwpdb.apps.msgmodule.util import SiteRegistry  # noqa: E402
+from wwpdb.apps.msgmodule.util.JobRunner import JobRunner  # noqa: E402
+
+_CALLS = []
+
+
+def _recordSubmission(payload):
+    _CALLS.append(payload["request"])
+    return {"success": "true", "pdbx_model_updated": "false"}
+
+
+def _recordAutoMsg(payload):
+    _CALLS.append(payload)
+    return {"depids": len(payload["depids"])}
+
+
+class _Upload(object):
+    def __init__(self, fileName, content):
+        self.filename = fileName
+        self.file = io.BytesIO(content)
+
+
+class MsgSubmitJobTests(unittest.TestCase):
+    def setUp(self):
+        self.__siteId = "WWPDB_DEPLOY_TEST"
+        self.__depId = "D_000000"
+        self.__sessionId = "msg-submit-job-test"
+        self.__sessionPath = os.path.join(TESTOUTPUT, "sessions", "sessions", self.__sessionId)
+        shutil.rmtree(self.__sessionPath, ignore_errors=True)
+        self.__tmpDir = tempfile.TemporaryDirectory()
+        self.__runner = JobRunner({"url": "sqlite:///%s" % os.path.join(self.__tmpDir.name, "jobs.sqlite")}, background=False)
+        self.__runner.registerHandler("submit_msg", _recordSubmission)
+        self.__runner.registerHandler("auto_msg", _recordAutoMsg)
+        self.__patchers = [
+            patch.object(MessagingWebAppModule, "getJobRunner", return_value=self.__runner),
+            patch.object(MessagingWebAppModule, "StatusDbApi"),
+            patch("wwpdb.apps.msgmodule.util.AutoMessage.getJobRunner", return_value=self.__runner),
+            patch.dict(configInfo, {"SITE_WEB_APPS_TOP_SESSIONS_PATH": os.path.join(TESTOUTPUT, "sessions")}),
+        ]
+        for patcher in self.__patchers:
+            patcher.start()
+        SiteRegistry.reload(self.__siteId)
+        del _CALLS[:]
+
+    def tearDown(self):
+        for patcher in self.__patchers:
+            patcher.stop()
+        SiteRegistry.reload(self.__siteId)
+        self.__tmpDir.cleanup()
+
+    def __doOp(self, requestPath, **kwargs):
+        paramD = {"request_path": [requestPath], "identifier": [self.__depId], "sessionid": [self.__sessionId]}
+        paramD.update((key, [value]) for key, value in kwargs.items())
+        return MessagingWebAppModule.MessagingWebApp(parameterDict=paramD, siteId=self.__siteId).doOp(deferJsonEncoding=True)["JSON_OBJECT"]
+
+    def __submit(self, message, uploadContent):
+        return self.__doOp(
+            "/service/messaging/submit_msg", subject="Subject", message=message, content_type="msgs", send_status="Y",
+            idempotency_key="key-1", **{"aux-file1": _Upload("notes.txt", uploadContent)}
+        )
+
+    def testRetriedSubmission(self):
+        rspD = self.__submit("Text", b"first")
+        self.assertEqual((rspD["success"], rspD["job_status"]), ("true", "succeeded"))
+        stagedPath = os.path.join(self.__sessionPath, "notes.txt")
+        with open(stagedPath, "rb") as ifh:
+            self.assertEqual(ifh.read(), b"first")
+        self.assertEqual(_CALLS[0]["msg_file_references"], ["aux-file1"])
+
+        # the retry gets the job of the first submission, its upload is not staged again
+        retryD = self.__submit("Text", b"retried")
+        self.assertEqual((retryD["job_id"], retryD["job_status"]), (rspD["job_id"], "succeeded"))
+        with open(stagedPath, "rb") as ifh:
+            self.assertEqual(ifh.read(), b"first")
+        self.assertEqual(len(_CALLS), 1)
+
+        # reusing the key for another message is refused
+        self.assertTrue(self.__submit("Other text", b"other")["errorflag"])
+        self.assertEqual(len(_CALLS), 1)
+
+    def testSendAutoMsg(self):
+        rspD = self.__doOp("/service/messaging/send_auto_msg", target_identifier="D_000001, d_000002", msg_tmplt_type="reminder")
+        self.assertEqual((rspD["job_status"], rspD["depids"]), ("succeeded", 2))
+        self.assertEqual((_CALLS[0]["depids"], _CALLS[0]["template"]), (["D_000001", "D_000002"], "reminder"))
+        # the job is disclosed for the depositions the messages were sent to
+        self.assertEqual(self.__doOp("/service/messaging/get_job_status", job_id=rspD["job_id"], identifier="D_000002")["job_status"], "succeeded")
+        self.assertTrue(self.__doOp("/service/messaging/get_job_status", job_id=rspD["job_id"], identifier="D_000003")["errorflag"])
+        self.assertTrue(self.__doOp("/service/messaging/send_auto_msg", target_identifier="D_000001", msg_tmplt_type="no-such-template")["errorflag"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+##
+# File:    MsgViewBundleTests.py
+# Date:    18-Oct-2026
+##
+"""Test cases for the get_msg_view_bundle service (legacy cif message files)"""
+
+import os
+import shutil
+import sys
+import unittest
+from unittest.mock import patch
+
+if __package__ is None or __package__ == "":
+    from os import path
+
+    sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT, HERE, configInfo  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT, HERE, configInfo  # noqa: F401
+
+import wwpdb.apps.msgmodule.webapp.MessagingWebApp as MessagingWebAppModule  # noqa: E402
+
+
+class MsgViewBundleTests(unittest.TestCase):
+    def setUp(self):
+        self.__depId = "D_0000265933"
+        archivePath = os.path.join(TESTOUTPUT, "data", "archive", self.__depId)
+        if not os.path.exists(archivePath):
+            os.makedirs(archivePath)
+        testDataPath = os.path.join(HERE, "test_data")
+        for fileName in os.listdir(testDataPath):
+            if fileName.startswith(self.__depId + "_"):
+                shutil.copy(os.path.join(testDataPath, fileName), archivePath)
+        self.__configD = {
+            "SITE_WEB_APPS_TOP_SESSIONS_PATH": os.path.join(TESTOUTPUT, "sessions"),
+            "COMMUNICATION_RELEASE_MESSAGE_SUBJECTS": [],
+            "COMMUNICATION_APPROVAL_WITHOUT_CHANGES_MESSAGE_SUBJECTS": [],
+        }
+        self.__prevConfigD = {ky: configInfo.get(ky) for ky in self.__configD}
+        configInfo.update(self.__configD)
+
+    def tearDown(self):
+        for ky, val in self.__prevConfigD.items():
+            if val is None:
+                configInfo.pop(ky, None)
+            else:
+                configInfo[ky] = val
+
+    def testBundleRows(self):
+        paramD = {
+            "request_path": ["/service/messaging/get_msg_view_bundle"],
+            "identifier": [self.__depId],
+            "filesource": ["archive"],
+            "send_status": ["Y"],
+            "content_types": ["msgs,notes"],
+        }
+        # no status database -- the deposition is not part of a group
+        with patch.object(MessagingWebAppModule, "StatusDbApi") as statusDbApi:
+            statusDbApi.return_value.getGroupId.return_value = None
+            rspD = MessagingWebAppModule.MessagingWebApp(parameterDict=paramD, siteId="WWPDB_DEPLOY_TEST").doOp(deferJsonEncoding=True)
+        bundleD = rspD["JSON_OBJECT"]
+        self.assertFalse(bundleD["errorflag"])
+        self.assertEqual(sorted(bundleD["tabs"]), ["msgs", "notes"])
+        for contentType, tabD in bundleD["tabs"].items():
+            dataTblD = tabD["dtbl_data"]
+            self.assertGreater(dataTblD["iTotalRecords"], 0, contentType)
+            # the first page holds the records, not only their count
+            self.assertEqual(dataTblD["iTotalDisplayRecords"], dataTblD["iTotalRecords"], contentType)
+            self.assertEqual(len(dataTblD["aaData"]), min(dataTblD["iTotalRecords"], 10), contentType)
+        self.assertIn("all_msgs_read", bundleD["msg_status"])
+
+
+if __name__ == "__main__":
+    unittest.main()
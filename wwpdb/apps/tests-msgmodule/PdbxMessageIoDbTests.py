@@ -0,0 +1,224 @@
+##
+# File:    PdbxMessageIoDbTests.py
+# Date:    18-Oct-2026
+##
+"""Test cases for the database backed PdbxMessageIo read/write paths (SQLite)"""
+
+import sys
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+if __package__ is None or __package__ == "":
+    from os import path
+
+    sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT  # noqa: F401
+
+from wwpdb.apps.msgmodule.db.DataAccessLayer import MessageStatusDAO
+from wwpdb.apps.msgmodule.db.Models import Base
+from wwpdb.apps.msgmodule.db.PdbxMessageIo import PdbxMessageIo
+
+
+class PdbxMessageIoDbTests(unittest.TestCase):
+    def setUp(self):
+        # in-memory database, shared by all instances through the engine cached for the URL
+        self.__dbConfig = {"url": "sqlite://"}
+        self.__depId = "D_8000000001"
+        self.__filePath = "/dummy/messaging/%s/%s_messages-to-depositor_P1.cif.V1" % (self.__depId, self.__depId)
+        mIIo = self.__newIo()
+        mIIo._dal.create_tables()  # pylint: disable=protected-access
+        mIIo.read(self.__filePath, deposition_id=self.__depId)
+        for i in range(3):
+            mIIo.appendMessage(
+                {
+                    "message_id": "MSG-%d" % i,
+                    "deposition_data_set_id": self.__depId,
+                    "timestamp": "2026-10-18 10:0%d:00" % i,
+                    "sender": "annotator",
+                    "message_subject": "Subject %d" % i,
+                    "message_text": "Text %d" % i,
+                    "content_type": "messages-to-depositor",
+                }
+            )
+        mIIo.appendFileReference({"message_id": "MSG-0", "content_type": "auxiliary-file-annotate", "content_format": "pdf", "upload_file_name": None})
+        self.assertTrue(mIIo.write(self.__filePath))
+
+    def tearDown(self):
+        Base.metadata.drop_all(self.__newIo()._dal.db_connection.engine)  # pylint: disable=protected-access
+
+    def __newIo(self):
+        return PdbxMessageIo(site_id="TEST", verbose=False, db_config=self.__dbConfig)
+
+    def testLoadRows(self):
+        mIIo = self.__newIo()
+        mIIo.read(self.__filePath, deposition_id=self.__depId)
+        msgs = mIIo.getMessageInfo()
+        self.assertEqual([m["message_id"] for m in msgs], ["MSG-0", "MSG-1", "MSG-2"])
+        self.assertEqual(msgs[1]["timestamp"], "2026-10-18 10:01:00")
+        self.assertEqual(mIIo.getFileReferenceInfo()[0]["upload_file_name"], "")
+        self.assertEqual(mIIo.nextMessageOrdinal(), 4)
+
+        recs = mIIo.getMessageRecords()
+        self.assertEqual([rec.message_id for rec in recs], ["MSG-0", "MSG-1", "MSG-2"])
+        self.assertEqual(recs[1].timestamp, datetime(2026, 10, 18, 10, 1, tzinfo=timezone.utc))
+        self.assertTrue(recs[1].isSent)
+
+    def testDataVersion(self):
+        mIIo = self.__newIo()
+        mIIo.read(self.__filePath, deposition_id=self.__depId)
+        version = mIIo.getDataVersion()
+        self.assertEqual(version[:2], (3, 3))
+        self.assertEqual(mIIo.getDataVersion(), version)
+        self.assertEqual(mIIo.getDepositionSummary()["num_messages_to_depositor"], 3)
+        mIIo.appendMessage({"message_id": "MSG-3", "deposition_data_set_id": self.__depId, "timestamp": "2026-10-18 11:00:00", "message_subject": "Subject 3"})
+        self.assertTrue(mIIo.write(self.__filePath))
+        self.assertNotEqual(mIIo.getDataVersion(), version)
+
+        # status changes only show in the version including statuses
+        version = mIIo.getDataVersion()
+        fullVersion = mIIo.getDataVersion(includeStatuses=True)
+        self.assertEqual(fullVersion[:3], version)
+        mIIo.bulkUpdateMsgStatus([{"message_id": "MSG-0", "read_status": "Y"}])
+        self.assertEqual(mIIo.getDataVersion(), version)
+        self.assertNotEqual(mIIo.getDataVersion(includeStatuses=True), fullVersion)
+        fullVersion = mIIo.getDataVersion(includeStatuses=True)
+        mIIo.bulkUpdateMsgStatus([{"message_id": "MSG-0", "read_status": "N"}])
+        self.assertNotEqual(mIIo.getDataVersion(includeStatuses=True), fullVersion)
+
+        # content type filter applied in the query
+        mIIo.read("/dummy/messaging/%s/%s_notes-from-annotator_P1.cif.V1" % (self.__depId, self.__depId), deposition_id=self.__depId)
+        self.assertEqual(mIIo.getMessageInfo(), [])
+
+    def testBulkUpdateMsgStatus(self):
+        mIIo = self.__newIo()
+        mIIo.read(self.__filePath, deposition_id=self.__depId)
+        outcomes = mIIo.bulkUpdateMsgStatus(
+            [
+                {"message_id": "MSG-0", "read_status": "Y"},
+                {"message_id": "MSG-1", "action_reqd": "Y"},
+                {"message_id": "MSG-1", "for_release": "maybe"},
+                {"message_id": "MSG-0", "for_release": "Y"},
+                {"message_id": "NO-SUCH-MSG", "read_status": "Y"},
+            ]
+        )
+        self.assertEqual(outcomes, {"MSG-0": "created", "MSG-1": "invalid", "NO-SUCH-MSG": "not_found"})
+        statusD = {st["message_id"]: st for st in mIIo.getMsgStatusInfo()}
+        self.assertEqual(list(statusD), ["MSG-0"])
+        self.assertEqual((statusD["MSG-0"]["read_status"], statusD["MSG-0"]["action_reqd"], statusD["MSG-0"]["for_release"]), ("Y", "N", "Y"))
+
+        outcomes = mIIo.bulkUpdateMsgStatus([{"message_id": "MSG-0", "read_status": "Y"}, {"message_id": "MSG-2", "action_reqd": "Y"}])
+        self.assertEqual(outcomes, {"MSG-0": "unchanged", "MSG-2": "created"})
+        outcomes = mIIo.bulkUpdateMsgStatus([{"message_id": "MSG-0", "read_status": "N"}])
+        self.assertEqual(outcomes, {"MSG-0": "updated"})
+        self.assertEqual({st["message_id"]: st["read_status"] for st in mIIo.getMsgStatusInfo()}, {"MSG-0": "N", "MSG-2": "N"})
+
+    def testBulkUpdateKeepUnread(self):
+        mIIo = self.__newIo()
+        mIIo.read(self.__filePath, deposition_id=self.__depId)
+        mIIo.bulkUpdateMsgStatus([{"message_id": "MSG-0", "read_status": "N"}, {"message_id": "MSG-1", "read_status": "Y"}])
+        # tagging, as AutoMessage.tagMessageStatus() does: an unread message stays unread
+        tagL = [{"message_id": msgId, "read_status": "Y", "action_reqd": "Y", "for_release": "N"} for msgId in ("MSG-0", "MSG-1", "MSG-2")]
+        outcomes = mIIo.bulkUpdateMsgStatus(tagL, keep_unread=True)
+        self.assertEqual(outcomes, {"MSG-0": "updated", "MSG-1": "updated", "MSG-2": "created"})
+        statusD = dict((st["message_id"], (st["read_status"], st["action_reqd"])) for st in mIIo.getMsgStatusInfo())
+        self.assertEqual(statusD, {"MSG-0": ("N", "Y"), "MSG-1": ("Y", "Y"), "MSG-2": ("Y", "Y")})
+
+        # record by record on databases without multi-row upsert
+        with patch.object(MessageStatusDAO, "_upsert_statement", return_value=None):
+            tagL = [{"message_id": msgId, "read_status": "Y", "action_reqd": "N", "for_release": "Y"} for msgId in ("MSG-0", "MSG-1")]
+            outcomes = mIIo.bulkUpdateMsgStatus(tagL, keep_unread=True)
+        self.assertEqual(outcomes, {"MSG-0": "updated", "MSG-1": "updated"})
+        statusD = dict((st["message_id"], (st["read_status"], st["for_release"])) for st in mIIo.getMsgStatusInfo())
+        self.assertEqual(statusD, {"MSG-0": ("N", "Y"), "MSG-1": ("Y", "Y"), "MSG-2": ("Y", "N")})
+
+    def testThreadColumns(self):
+        mIIo = self.__newIo()
+        mIIo.read(self.__filePath, deposition_id=self.__depId)
+        # reply to a reply, stored before the reply it answers (as the CIF migration may do)
+        mIIo.appendMessage({"message_id": "MSG-4", "deposition_data_set_id": self.__depId, "timestamp": "2026-10-18 12:00:00", "parent_message_id": "MSG-3"})
+        self.assertTrue(mIIo.write(self.__filePath))
+        mIIo.appendMessage({"message_id": "MSG-3", "deposition_data_set_id": self.__depId, "timestamp": "2026-10-18 11:00:00", "parent_message_id": "MSG-0"})
+        mIIo.appendMessage({"message_id": "MSG-5", "deposition_data_set_id": self.__depId, "timestamp": "2026-10-18 11:30:00", "parent_message_id": "MSG-0"})
+        self.assertTrue(mIIo.write(self.__filePath))
+
+        mIIo.read(self.__filePath, deposition_id=self.__depId)
+        recD = {rec.message_id: rec for rec in mIIo.getMessageRecords()}
+        self.assertEqual((recD["MSG-0"].thread_root_id, recD["MSG-0"].thread_depth), ("MSG-0", 0))
+        self.assertEqual((recD["MSG-3"].thread_root_id, recD["MSG-3"].thread_depth), ("MSG-0", 1))
+        self.assertTrue(recD["MSG-3"].thread_path.startswith(recD["MSG-0"].thread_path + "/"))
+        # parent was not stored yet when written
+        self.assertEqual((recD["MSG-4"].thread_root_id, recD["MSG-4"].thread_depth), ("MSG-4", 0))
+
+        dal = mIIo._dal  # pylint: disable=protected-access
+        problems = dal.check_deposition_threads(self.__depId)
+        self.assertEqual(len(problems), 1)
+        self.assertTrue(problems[0].startswith("MSG-4:"))
+        self.assertEqual(dal.rebuild_deposition_threads(self.__depId, dry_run=True), 1)
+        self.assertEqual(dal.rebuild_deposition_threads(self.__depId), 1)
+        self.assertEqual(dal.check_deposition_threads(self.__depId), [])
+        self.assertEqual(dal.rebuild_deposition_threads(self.__depId), 0)
+        self.assertEqual(dal.get_message_deposition_ids(), [self.__depId])
+
+        rows = dal.messages.get_thread_rows_by_deposition(self.__depId)
+        self.assertEqual([row["message_id"] for row in rows], ["MSG-0", "MSG-3", "MSG-4", "MSG-5", "MSG-1", "MSG-2"])
+        self.assertEqual([row["thread_depth"] for row in rows], [0, 1, 2, 1, 0, 0])
+
+    def testBatchQueries(self):
+        otherDepId = "D_8000000002"
+        mIIo = self.__newIo()
+        mIIo.read("/dummy/messaging/%s/%s_messages-from-depositor_P1.cif.V1" % (otherDepId, otherDepId), deposition_id=otherDepId)
+        for i in range(3):
+            mIIo.appendMessage({"message_id": "DEP-%d" % i, "deposition_data_set_id": otherDepId, "timestamp": "2026-10-19 10:0%d:00" % i,
+                                "sender": "depositor", "content_type": "messages-from-depositor"})
+        self.assertTrue(mIIo.write(self.__filePath))
+        mIIo.read(self.__filePath, deposition_id=self.__depId)
+        mIIo.appendMessage({"message_id": "MSG-3", "deposition_data_set_id": self.__depId, "timestamp": "2026-10-18 11:00:00",
+                            "message_subject": "System Unlocked", "content_type": "messages-to-depositor"})
+        self.assertTrue(mIIo.write(self.__filePath))
+        mIIo.read("", deposition_id=otherDepId)
+        mIIo.bulkUpdateMsgStatus([{"message_id": "DEP-0", "action_reqd": "N"}, {"message_id": "DEP-1", "action_reqd": "Y"}])
+
+        depIds = [self.__depId, otherDepId, "D_8000000003"]
+        self.assertEqual(mIIo.getLastSentDates(depIds, "messages-to-depositor"), {self.__depId: datetime(2026, 10, 18, 11), otherDepId: None, "D_8000000003": None})
+        self.assertEqual(mIIo.getLastSentDates(depIds, "messages-from-depositor")[otherDepId], datetime(2026, 10, 19, 10, 2))
+        self.assertEqual(mIIo.getLastUnlockDates(depIds), {self.__depId: datetime(2026, 10, 18, 11), otherDepId: None, "D_8000000003": None})
+        pendingD = mIIo.getPendingDepositorMessages(depIds)
+        self.assertEqual([m["message_id"] for m in pendingD[otherDepId]], ["DEP-1", "DEP-2"])
+        self.assertEqual(pendingD[otherDepId][0]["timestamp"], "2026-10-19 10:01:00")
+        self.assertEqual(pendingD[self.__depId], [])
+
+    def testTypedQueries(self):
+        mIIo = self.__newIo()
+        mIIo.read(self.__filePath, deposition_id=self.__depId)
+        self.assertIsNone(mIIo.getLastMessageByContextType("messages-to-depositor", ["reminder"]))
+        self.assertIsNone(mIIo.getLastValidationLetter())
+        for msgId, timestamp, subject, extra in (
+            ("MSG-3", "2026-10-18 11:00:00", "Still awaiting feedback for D_8000000001", {}),
+            ("MSG-4", "2026-10-18 12:00:00", "still awaiting feedback for D_8000000001", {}),
+            ("MSG-5", "2026-10-18 13:00:00", "Reminder", {"context_type": "reminder", "context_value": "first"}),
+            ("MSG-6", "2026-10-18 14:00:00", "Your processed files are ready for your review", {"message_text": "Some major issues"}),
+            ("MSG-7", "2026-10-18 14:00:00", "Your processed files are ready for your review", {}),
+            ("MSG-8", "2026-10-18 15:00:00", "Release of D_8000000001", {}),
+        ):
+            mIIo.appendMessage(dict({"message_id": msgId, "deposition_data_set_id": self.__depId, "timestamp": timestamp, "message_subject": subject,
+                                     "content_type": "messages-to-depositor"}, **extra))
+        for msgId in ("MSG-6", "MSG-7", "MSG-8"):
+            mIIo.appendFileReference({"message_id": msgId, "content_type": "validation-report-annotate", "content_format": "pdf"})
+        self.assertTrue(mIIo.write(self.__filePath))
+
+        mIIo.read("", deposition_id=self.__depId)
+        self.assertEqual(mIIo.getLastMessageByContextType("messages-to-depositor", ["reminder", "vldtn"]),
+                         {"timestamp": datetime(2026, 10, 18, 13), "context_value": "first"})
+        # case sensitive, as ExtractMessage scanning the messages
+        self.assertEqual(mIIo.getLastMessageDateBySubject("messages-to-depositor", "Still awaiting feedback for"), datetime(2026, 10, 18, 11))
+        self.assertIsNone(mIIo.getLastMessageDateBySubject("messages-to-depositor", "Still_awaiting"))
+        self.assertIsNone(mIIo.getLastMessageDateBySubject("notes-from-annotator", "Still awaiting feedback for"))
+        # the earliest of the latest letters, release notice with a validation report attached ignored
+        self.assertEqual(mIIo.getLastValidationLetter(), {"timestamp": datetime(2026, 10, 18, 14), "message_text": "Some major issues"})
+
+
+if __name__ == "__main__":
+    unittest.main()
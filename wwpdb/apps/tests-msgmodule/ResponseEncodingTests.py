@@ -0,0 +1,89 @@
+##
+# File:    ResponseEncodingTests.py
+# Date:    18-Oct-2026
+##
+"""Test cases for JSON serialization and compression of service responses"""
+
+import gzip
+import json
+import sys
+import unittest
+import zlib
+from datetime import datetime
+
+if __package__ is None or __package__ == "":
+    from os import path
+
+    sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT  # noqa: F401
+
+from wwpdb.utils.session.WebRequest import InputRequest
+from wwpdb.apps.msgmodule.webapp.ResponseEncoding import JsonResponseContent, encodeJsonResponse, iterJsonChunks, negotiateEncoding
+
+
+class ResponseEncodingTests(unittest.TestCase):
+    def setUp(self):
+        self.__obj = {
+            "sEcho": 1,
+            "aaData": [{"DT_RowId": "row_%d" % i, "message_text": "Dear depositor, été %d " % i * 20} for i in range(200)],
+            "timestamp": datetime(2026, 10, 18, 10, 0, 0),
+        }
+
+    def __decode(self, chunks):
+        return json.loads(b"".join(chunks).decode("utf-8"))
+
+    def testIterJsonChunks(self):
+        expected = dict(self.__obj, timestamp="2026-10-18T10:00:00")
+        for useFastSerializer in (True, False):
+            chunks = list(iterJsonChunks(self.__obj, useFastSerializer=useFastSerializer, chunkSize=4096))
+            self.assertGreater(len(chunks), 1)
+            self.assertEqual(self.__decode(chunks), expected)
+        self.assertEqual(self.__decode(iterJsonChunks({1: "x"}, useFastSerializer=True)), {"1": "x"})
+
+    def testNegotiateEncoding(self):
+        self.assertIsNone(negotiateEncoding(None))
+        self.assertIsNone(negotiateEncoding("identity"))
+        self.assertEqual(negotiateEncoding("gzip, deflate, br"), "gzip")
+        self.assertEqual(negotiateEncoding("deflate, gzip;q=0.5"), "deflate")
+        self.assertEqual(negotiateEncoding("gzip;q=0, deflate"), "deflate")
+        self.assertEqual(negotiateEncoding("*"), "gzip")
+        self.assertIsNone(negotiateEncoding("*;q=0"))
+        self.assertIsNone(negotiateEncoding("gzip", encodings=()))
+        self.assertEqual(negotiateEncoding("gzip, deflate", encodings=("deflate",)), "deflate")
+
+    def testEncodeJsonResponse(self):
+        encoding, bodyIter, contentLength = encodeJsonResponse(self.__obj, acceptEncoding="gzip")
+        self.assertEqual((encoding, contentLength), ("gzip", None))
+        body = b"".join(bodyIter)
+        self.assertEqual(json.loads(gzip.decompress(body))["sEcho"], 1)
+
+        encoding, bodyIter, contentLength = encodeJsonResponse(self.__obj, acceptEncoding="deflate", useFastSerializer=False)
+        self.assertEqual(encoding, "deflate")
+        self.assertEqual(len(json.loads(zlib.decompress(b"".join(bodyIter)))["aaData"]), 200)
+
+        # not negotiated, or below the threshold
+        encoding, bodyIter, contentLength = encodeJsonResponse(self.__obj, acceptEncoding=None)
+        self.assertIsNone(encoding)
+        self.assertEqual(self.__decode(bodyIter)["sEcho"], 1)
+        encoding, bodyIter, contentLength = encodeJsonResponse({"all_msgs_read": "true"}, acceptEncoding="gzip")
+        self.assertIsNone(encoding)
+        self.assertEqual(contentLength, len(b"".join(bodyIter)))
+
+    def testDeferred(self):
+        reqObj = InputRequest({"request_path": ["/service/messaging/check_global_msg_status"]})
+        reqObj.setReturnFormat(return_format="json")
+        rC = JsonResponseContent(reqObj=reqObj)
+        rC.addDictionaryItems({"all_msgs_read": "true"})
+        rD = rC.getDeferred()
+        self.assertNotIn("RETURN_STRING", rD)
+        self.assertEqual(rD["JSON_OBJECT"]["all_msgs_read"], "true")
+        self.assertEqual(json.loads(rC.get()["RETURN_STRING"])["all_msgs_read"], "true")
+
+        rC.setReturnFormat("html")
+        self.assertIn("RETURN_STRING", rC.getDeferred())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+##
+# File:    ResultSetCacheTests.py
+# Date:    18-Oct-2026
+##
+"""Test cases for the processed message list cache"""
+
+import sys
+import time
+import unittest
+
+if __package__ is None or __package__ == "":
+    from os import path
+
+    sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT  # noqa: F401
+
+from wwpdb.apps.msgmodule.io.ResultSetCache import ResultSetCache
+
+
+class ResultSetCacheTests(unittest.TestCase):
+    def testGetPut(self):
+        cache = ResultSetCache(ttlSeconds=60)
+        rsltSet = ([["1", "MSG-1"], {1: ["2", "MSG-2"]}], 2, 2, {})
+        self.assertIsNone(cache.get("k"))
+        cache.put("k", rsltSet)
+        self.assertIs(cache.get("k"), rsltSet)
+        stats = cache.getStats()
+        self.assertEqual((stats["entries"], stats["chars"], stats["hits"], stats["misses"]), (1, 12, 1, 1))
+        self.assertEqual(stats["hit_ratio"], 0.5)
+
+    def testExpiry(self):
+        cache = ResultSetCache(ttlSeconds=0.05)
+        cache.put("k", ([], 0, 0, {}))
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("k"))
+        self.assertEqual(cache.getStats()["expired"], 1)
+        self.assertEqual(cache.getStats()["entries"], 0)
+
+    def testBounds(self):
+        cache = ResultSetCache(maxEntries=2, maxChars=10)
+        cache.put("k1", ([["aaa"]], 1, 1, {}))
+        cache.put("k2", ([["bbb"]], 1, 1, {}))
+        cache.get("k1")
+        cache.put("k3", ([["ccc"]], 1, 1, {}))
+        self.assertIsNone(cache.get("k2"))
+        cache.put("k4", ([["d" * 8]], 1, 1, {}))
+        self.assertEqual(cache.getStats()["entries"], 1)
+        cache.put("k5", ([["e" * 11]], 1, 1, {}))
+        self.assertIsNone(cache.get("k5"))
+
+
+if __name__ == "__main__":
+    unittest.main()
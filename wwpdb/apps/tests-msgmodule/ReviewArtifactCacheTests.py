@@ -0,0 +1,91 @@
+##
+# File:    ReviewArtifactCacheTests.py
+# Date:    18-Oct-2026
+##
+"""Test cases for cache of generated review copies"""
+
+import os
+import shutil
+import sys
+import unittest
+
+if __package__ is None or __package__ == "":
+    from os import path
+
+    sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT  # noqa: F401
+
+from wwpdb.apps.msgmodule.io.ReviewArtifactCache import ReviewArtifactCache
+
+
+class ReviewArtifactCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.__workPath = os.path.join(TESTOUTPUT, "review-cache-test")
+        if os.path.exists(self.__workPath):
+            shutil.rmtree(self.__workPath)
+        os.makedirs(self.__workPath)
+        self.__inPath = os.path.join(self.__workPath, "D_000000_model_P1.cif.V1")
+        with open(self.__inPath, "w") as ofh:
+            ofh.write("data_D_000000\n")
+        self.__calls = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.__workPath)
+
+    def __convert(self, outPath):
+        self.__calls += 1
+        with open(self.__inPath) as ifh, open(outPath, "w") as ofh:
+            ofh.write(ifh.read().upper())
+        return True
+
+    def testHitAndMiss(self):
+        cache = ReviewArtifactCache(os.path.join(self.__workPath, "cache"))
+        out1 = os.path.join(self.__workPath, "out1.cif")
+        out2 = os.path.join(self.__workPath, "out2.cif")
+        self.assertTrue(cache.getOrCreate(self.__inPath, "upper", "1.0", out1, self.__convert))
+        self.assertTrue(cache.getOrCreate(self.__inPath, "upper", "1.0", out2, self.__convert))
+        self.assertEqual(self.__calls, 1)
+        with open(out2) as ifh:
+            self.assertEqual(ifh.read(), "DATA_D_000000\n")
+        # new converter version or changed input invalidates
+        self.assertTrue(cache.getOrCreate(self.__inPath, "upper", "1.1", out2, self.__convert))
+        self.assertEqual(self.__calls, 2)
+        with open(self.__inPath, "a") as ofh:
+            ofh.write("#\n")
+        self.assertTrue(cache.getOrCreate(self.__inPath, "upper", "1.1", out2, self.__convert))
+        self.assertEqual(self.__calls, 3)
+
+    def testFailedConversionNotCached(self):
+        cache = ReviewArtifactCache(os.path.join(self.__workPath, "cache"))
+        outPath = os.path.join(self.__workPath, "out.cif")
+        self.assertFalse(cache.getOrCreate(self.__inPath, "fail", "1.0", outPath, lambda _p: False))
+        self.assertTrue(cache.getOrCreate(self.__inPath, "fail", "1.0", outPath, self.__convert))
+        self.assertEqual(self.__calls, 1)
+
+    def testConversionErrorRaised(self):
+        cache = ReviewArtifactCache(os.path.join(self.__workPath, "cache"))
+        outPath = os.path.join(self.__workPath, "out.cif")
+
+        def convertAndFail(outPath):
+            self.__convert(outPath)
+            raise RuntimeError("converter failed")
+
+        # the error reaches the caller and the output written before it is not cached
+        with self.assertRaises(RuntimeError):
+            cache.getOrCreate(self.__inPath, "upper", "1.0", outPath, convertAndFail)
+        self.assertTrue(cache.getOrCreate(self.__inPath, "upper", "1.0", outPath, self.__convert))
+        self.assertEqual(self.__calls, 2)
+
+    def testPrune(self):
+        cache = ReviewArtifactCache(os.path.join(self.__workPath, "cache"), maxEntries=2)
+        outPath = os.path.join(self.__workPath, "out.cif")
+        for version in ("1", "2", "3"):
+            cache.getOrCreate(self.__inPath, "upper", version, outPath, self.__convert)
+        numEntries = sum(len(fL) for _d, _sd, fL in os.walk(os.path.join(self.__workPath, "cache")))
+        self.assertEqual(numEntries, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+##
+# File:    SchemaMigrationsTests.py
+# Date:    18-Oct-2026
+##
+"""Test cases for the messaging database schema migrations and query plan report (SQLite)"""
+
+import sys
+import unittest
+
+if __package__ is None or __package__ == "":
+    from os import path
+
+    sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT  # noqa: F401
+
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.pool import StaticPool
+
+from wwpdb.apps.msgmodule.db.QueryPlans import get_dao_queries, get_query_plan_report
+from wwpdb.apps.msgmodule.db.SchemaMigrations import LATEST_VERSION, get_pending_migrations, get_schema_version, migrate
+
+# messages and status tables as created before the thread columns and composite indexes were added
+_OLD_SCHEMA = [
+    """CREATE TABLE pdbx_deposition_message_info (
+        ordinal_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        message_id VARCHAR(64) UNIQUE NOT NULL,
+        deposition_data_set_id VARCHAR(50) NOT NULL,
+        timestamp DATETIME NOT NULL,
+        sender VARCHAR(150) NOT NULL,
+        context_type VARCHAR(50),
+        context_value VARCHAR(255),
+        parent_message_id VARCHAR(64),
+        message_subject TEXT NOT NULL,
+        message_text TEXT NOT NULL,
+        message_type VARCHAR(20) DEFAULT 'text',
+        send_status CHAR(1) DEFAULT 'Y',
+        content_type VARCHAR(23) NOT NULL,
+        created_at DATETIME,
+        updated_at DATETIME)""",
+    "CREATE INDEX idx_deposition_id ON pdbx_deposition_message_info (deposition_data_set_id)",
+    "CREATE INDEX idx_dep_content_ts ON pdbx_deposition_message_info (deposition_data_set_id, content_type, timestamp)",
+    """CREATE TABLE pdbx_deposition_message_status (
+        message_id VARCHAR(64) PRIMARY KEY,
+        deposition_data_set_id VARCHAR(50) NOT NULL,
+        read_status CHAR(1) DEFAULT 'N',
+        action_reqd CHAR(1) DEFAULT 'N',
+        for_release CHAR(1) DEFAULT 'N',
+        created_at DATETIME,
+        updated_at DATETIME)""",
+    "INSERT INTO pdbx_deposition_message_info (message_id, deposition_data_set_id, timestamp, sender, message_subject, message_text, content_type) "
+    "VALUES ('MSG-0', 'D_8000000001', '2026-10-18 10:00:00', 'annotator', 'Subject', 'Text', 'messages-to-depositor')",
+]
+
+
+class SchemaMigrationsTests(unittest.TestCase):
+    def setUp(self):
+        self.__engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+
+    def tearDown(self):
+        self.__engine.dispose()
+
+    def __indexColumns(self, tableName):
+        return {idx["name"]: tuple(idx["column_names"]) for idx in inspect(self.__engine).get_indexes(tableName)}
+
+    def testMigrateOldSchema(self):
+        with self.__engine.begin() as conn:
+            for stmt in _OLD_SCHEMA:
+                conn.exec_driver_sql(stmt)
+        self.assertEqual(get_schema_version(self.__engine), 0)
+        self.assertEqual(len(migrate(self.__engine, dry_run=True)), LATEST_VERSION)
+        self.assertEqual(get_schema_version(self.__engine), 0)
+
+        self.assertEqual([m.version for m in migrate(self.__engine, target_version=2)], [1, 2])
+        self.assertEqual([m.version for m in get_pending_migrations(self.__engine)], list(range(3, LATEST_VERSION + 1)))
+        migrate(self.__engine)
+        self.assertEqual(get_schema_version(self.__engine), LATEST_VERSION)
+        self.assertEqual(migrate(self.__engine), [])
+
+        columns = {col["name"] for col in inspect(self.__engine).get_columns("pdbx_deposition_message_info")}
+        self.assertTrue({"thread_root_id", "thread_depth", "thread_path"} <= columns)
+        msgIndexes = self.__indexColumns("pdbx_deposition_message_info")
+        self.assertEqual(msgIndexes["idx_deposition_updated_at"], ("deposition_data_set_id", "updated_at"))
+        self.assertEqual(msgIndexes["idx_deposition_thread_path"], ("deposition_data_set_id", "thread_path"))
+        # existing index on the same columns kept, not duplicated
+        self.assertNotIn("idx_deposition_content_timestamp", msgIndexes)
+        self.assertIn("idx_status_deposition_flags", self.__indexColumns("pdbx_deposition_message_status"))
+        self.assertTrue(inspect(self.__engine).has_table("pdbx_deposition_message_file_reference"))
+
+        with self.__engine.connect() as conn:
+            self.assertEqual(conn.exec_driver_sql("SELECT message_id, thread_path FROM pdbx_deposition_message_info").all(), [("MSG-0", None)])
+
+    def testQueryPlanReport(self):
+        migrate(self.__engine)
+        report = get_query_plan_report(self.__engine, "D_8000000001", message_id="MSG-0")
+        self.assertEqual([entry["query"] for entry in report], [query[0] for query in get_dao_queries()])
+        for entry in report:
+            self.assertNotIn("error", entry, entry["query"])
+            self.assertTrue(entry["plan"], entry["query"])
+        planD = {entry["query"]: " ".join(entry["plan"]) for entry in report}
+        self.assertIn("COVERING INDEX idx_deposition_updated_at", planD["MessageDAO.get_version_by_deposition"])
+        self.assertIn("idx_deposition_content_timestamp", planD["MessageDAO.get_by_deposition_and_content_type"])
+
+
+if __name__ == "__main__":
+    unittest.main()
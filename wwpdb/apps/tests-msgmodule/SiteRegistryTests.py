@@ -0,0 +1,68 @@
+##
+# File:    SiteRegistryTests.py
+# Date:    18-Oct-2026
+##
+"""Test cases for the per-process registry of site configuration objects"""
+
+import sys
+import threading
+import unittest
+
+if __package__ is None or __package__ == "":
+    from os import path
+
+    sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+    from commonsetup import TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import TESTOUTPUT  # noqa: F401
+
+from wwpdb.apps.msgmodule.util.SiteRegistry import getSiteInstance, getSiteValue, getStats, reload
+
+
+class _SiteConfig(object):
+    numBuilt = 0
+
+    def __init__(self, siteId):
+        _SiteConfig.numBuilt += 1
+        self.siteId = siteId
+
+
+class SiteRegistryTests(unittest.TestCase):
+    def setUp(self):
+        reload()
+        _SiteConfig.numBuilt = 0
+
+    def tearDown(self):
+        reload()
+
+    def testShared(self):
+        cI = getSiteInstance(_SiteConfig, "WWPDB_DEPLOY_TEST")
+        self.assertIs(getSiteInstance(_SiteConfig, "WWPDB_DEPLOY_TEST"), cI)
+        self.assertEqual(cI.siteId, "WWPDB_DEPLOY_TEST")
+        self.assertIsNot(getSiteInstance(_SiteConfig, "PDBE_DEV"), cI)
+        self.assertEqual(_SiteConfig.numBuilt, 2)
+
+        # shared by all threads
+        resultL = []
+        thread = threading.Thread(target=lambda: resultL.append(getSiteInstance(_SiteConfig, "WWPDB_DEPLOY_TEST")))
+        thread.start()
+        thread.join()
+        self.assertIs(resultL[0], cI)
+        self.assertEqual(getStats()["sites"], 2)
+
+    def testReload(self):
+        cI = getSiteInstance(_SiteConfig, "WWPDB_DEPLOY_TEST")
+        other = getSiteInstance(_SiteConfig, "PDBE_DEV")
+        self.assertEqual(getSiteValue("WWPDB_DEPLOY_TEST", "setting", lambda: 1), 1)
+        self.assertEqual(getSiteValue("WWPDB_DEPLOY_TEST", "setting", lambda: 2), 1)
+
+        numReloads = getStats()["reloads"]
+        reload("WWPDB_DEPLOY_TEST")
+        self.assertIsNot(getSiteInstance(_SiteConfig, "WWPDB_DEPLOY_TEST"), cI)
+        self.assertIs(getSiteInstance(_SiteConfig, "PDBE_DEV"), other)
+        self.assertEqual(getSiteValue("WWPDB_DEPLOY_TEST", "setting", lambda: 2), 2)
+        self.assertEqual(getStats()["reloads"], numReloads + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,15 @@
+-- Minimal DA_INTERNAL stand-in for DaInternalDbTests: the columns of rcsb_status and database_2 used by DaInternalDb
+CREATE TABLE rcsb_status (structure_id VARCHAR(15) NOT NULL, pdb_id VARCHAR(4));
+CREATE TABLE database_2 (
+    structure_id VARCHAR(15) NOT NULL,
+    database_id VARCHAR(10) NOT NULL,
+    database_code VARCHAR(20),
+    pdbx_database_accession VARCHAR(20)
+);
+INSERT INTO rcsb_status VALUES ('D_1000000001', '9XA1');
+INSERT INTO rcsb_status VALUES ('D_1000000002', '9XA2');
+INSERT INTO rcsb_status VALUES ('D_1000000003', NULL);
+INSERT INTO database_2 VALUES ('D_1000000001', 'PDB', '9XA1', 'PDB_00009XA1');
+INSERT INTO database_2 VALUES ('D_1000000002', 'PDB', '9XA2', 'PDB_00009XA2');
+INSERT INTO database_2 VALUES ('D_1000000002', 'EMDB', 'EMD-90002', NULL);
+INSERT INTO database_2 VALUES ('D_1000000003', 'EMDB', 'EMD-90003', NULL);